@@ -0,0 +1,97 @@
+"""Disk used by full ARP snapshots vs row deltas between periodic full snapshots.
+
+Writes ``--snapshots`` synthetic ``show ip arp`` tables of one device (every
+poll moves ``--churn`` of the hosts to another port and refreshes every age)
+the way ``--cisco-arp`` stores them: with every snapshot in full, with
+``--keyframe-interval``, and with that interval while keeping the last table
+in memory as ``arp-poll`` does. Reports bytes on disk and time per poll.
+
+Usage: ``python benchmarks/arp_delta.py [--hosts 2000] [--snapshots 200] [--churn 0.01] [--keyframe-interval 24]``
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from app.cisco.arp import (  # noqa: E402
+    compare_arp_tables,
+    format_arp_entry,
+    parse_arp_table,
+    read_arp_head,
+    store_arp_snapshot,
+)
+from app.common.arp_store import ArpEntry  # noqa: E402
+
+
+def _tables(hosts: int, snapshots: int, churn: float) -> list[str]:
+    rng = random.Random(7)
+    ports = [host % 48 + 1 for host in range(hosts)]
+    moves = max(1, int(hosts * churn))
+    tables: list[str] = []
+    for _ in range(snapshots):
+        for host in rng.sample(range(hosts), moves):
+            ports[host] = rng.randint(1, 48)
+        rows = ["Protocol  Address          Age (min)  Hardware Addr   Type   Interface"]
+        rows += [
+            format_arp_entry(
+                ArpEntry(f"10.0.{host >> 8}.{host & 255}", f"02:00:00:00:{host >> 8:02x}:{host & 255:02x}",
+                         f"GigabitEthernet1/0/{ports[host]}", None, rng.randint(0, 240))
+            )
+            for host in range(hosts)
+        ]
+        tables.append("\r\n".join(rows) + "\r\nsw1#")
+    return tables
+
+
+def _store(device_dir: Path, tables: list[str], keyframe_interval: int, poller: bool) -> tuple[int, float]:
+    """Store ``tables``; ``poller`` keeps the head rows in memory like ``arp-poll``, else each poll reads the head."""
+
+    device_dir.mkdir()
+    started = time.perf_counter()
+    head = None
+    for number, text in enumerate(tables):
+        if not poller:
+            head = read_arp_head(device_dir)
+        entries = parse_arp_table(text)
+        changes = compare_arp_tables(head.table(device_dir), entries) if head is not None else None
+        path = device_dir / f"2026-01-{number // 24 + 1:02d}_{number % 24:02d}0000_arp.txt"
+        head = store_arp_snapshot(path, text, entries, changes, head, keyframe_interval)
+    seconds = time.perf_counter() - started
+    return sum(path.stat().st_size for path in device_dir.iterdir()), seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hosts", type=int, default=2000)
+    parser.add_argument("--snapshots", type=int, default=200)
+    parser.add_argument("--churn", type=float, default=0.01)
+    parser.add_argument("--keyframe-interval", type=int, default=24)
+    args = parser.parse_args()
+
+    tables = _tables(args.hosts, args.snapshots, args.churn)
+    with TemporaryDirectory() as tmp:
+        runs = (
+            ("full", 1, False),
+            (f"delta/{args.keyframe_interval}", args.keyframe_interval, False),
+            (f"poll/{args.keyframe_interval}", args.keyframe_interval, True),
+        )
+        for label, interval, poller in runs:
+            size, seconds = _store(Path(tmp) / label.replace("/", "_"), tables, interval, poller)
+            print(
+                f"{label:>10}: {args.snapshots} snapshots x {args.hosts} hosts  "
+                f"{size / (1024 * 1024):7.2f} MB  {seconds / args.snapshots * 1000:6.2f} ms/poll"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Size of the ARP sighting index and latency of MAC/IP lookups.
+
+Feeds hourly synthetic ARP snapshots of a fleet into an :class:`ArpStore`
+(every snapshot moves ``--churn`` of the hosts to another port), then times
+lookups of random MACs and IPs. Reports rows stored, database size, time per
+recorded snapshot and lookup latency.
+
+Usage: ``python benchmarks/arp_lookup.py [--devices 20] [--hosts 500] [--snapshots 500] [--churn 0.01]``
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from app.common.arp_store import ArpEntry, ArpStore  # noqa: E402
+
+
+def _host(device: int, host: int, port: int) -> ArpEntry:
+    mac = f"02:{device >> 8 & 255:02x}:{device & 255:02x}:00:{host >> 8 & 255:02x}:{host & 255:02x}"
+    return ArpEntry(f"10.{device % 256}.{host >> 8}.{host & 255}", mac, f"Gi1/0/{port}", None, 0)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=20)
+    parser.add_argument("--hosts", type=int, default=500)
+    parser.add_argument("--snapshots", type=int, default=500)
+    parser.add_argument("--churn", type=float, default=0.01)
+    parser.add_argument("--lookups", type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    started_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    with TemporaryDirectory() as tmp:
+        store = ArpStore(Path(tmp) / "arp.sqlite3")
+        ports = {(device, host): host % 48 + 1 for device in range(args.devices) for host in range(args.hosts)}
+        moves = max(1, int(args.hosts * args.churn))
+
+        started = time.perf_counter()
+        for snapshot in range(args.snapshots):
+            taken_at = started_at + timedelta(hours=snapshot)
+            for device in range(args.devices):
+                for host in rng.sample(range(args.hosts), moves):
+                    ports[(device, host)] = rng.randint(1, 48)
+                entries = [_host(device, host, ports[(device, host)]) for host in range(args.hosts)]
+                store.record(f"sw{device}", taken_at, entries)
+        record_seconds = time.perf_counter() - started
+
+        latencies: list[float] = []
+        for _ in range(args.lookups):
+            entry = _host(rng.randrange(args.devices), rng.randrange(args.hosts), 1)
+            started = time.perf_counter()
+            if rng.random() < 0.5:
+                store.lookup(mac=entry.mac)
+            else:
+                store.lookup(ip=entry.ip)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+        with store._connect() as connection:
+            rows = connection.execute("SELECT COUNT(*) FROM arp_sightings").fetchone()[0]
+        snapshots = args.snapshots * args.devices
+        size_mb = sum(path.stat().st_size for path in Path(tmp).iterdir()) / (1024 * 1024)
+        print(
+            f"snapshots={snapshots} rows_parsed={snapshots * args.hosts} sightings_stored={rows} "
+            f"db={size_mb:.1f} MB record={record_seconds / snapshots * 1000:.2f} ms/snapshot"
+        )
+        latencies.sort()
+        print(
+            f"lookups={args.lookups} median={statistics.median(latencies):.2f} ms "
+            f"p99={latencies[int(len(latencies) * 0.99) - 1]:.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
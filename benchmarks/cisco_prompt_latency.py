@@ -0,0 +1,122 @@
+"""Per-command latency of the Cisco prompt reader against a fake SSH channel.
+
+Compares the previous ``recv_ready()`` + ``sleep(0.1)`` polling loop with the
+deadline-based blocking reader in :class:`app.cisco.client.CiscoSSHSession`.
+The fake device answers every command after ``--device-delay`` seconds, so any
+latency above that is overhead added by the reader itself.
+
+Usage: ``python benchmarks/cisco_prompt_latency.py [--commands 20] [--device-delay 0.005]``
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from app.cisco.client import CiscoSSHSession, _extract_prompt  # noqa: E402
+
+# enable, terminal length 0, show running-config, show ip arp
+COMMANDS_PER_DEVICE = 4
+
+
+class FakeChannel:
+    """Minimal paramiko.Channel stand-in with a blocking ``recv``."""
+
+    def __init__(self, device_delay: float) -> None:
+        self._device_delay = device_delay
+        self._pending = bytearray()
+        self._condition = threading.Condition()
+        self._timeout: float | None = None
+        self.closed = False
+
+    def settimeout(self, timeout: float | None) -> None:
+        self._timeout = timeout
+
+    def send(self, data: str) -> int:
+        reply = f"{data.strip()}\r\nhostname sw1\r\nsw1#".encode()
+
+        def _deliver() -> None:
+            time.sleep(self._device_delay)
+            with self._condition:
+                self._pending.extend(reply)
+                self._condition.notify_all()
+
+        threading.Thread(target=_deliver, daemon=True).start()
+        return len(data)
+
+    def recv_ready(self) -> bool:
+        with self._condition:
+            return bool(self._pending)
+
+    def recv(self, size: int) -> bytes:
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._pending, self._timeout):
+                raise TimeoutError("timed out")
+            chunk = bytes(self._pending[:size])
+            del self._pending[:size]
+            return chunk
+
+
+def legacy_run_command(channel: FakeChannel, command: str, timeout: float = 5.0) -> str:
+    """The sleep-polling loop ``CiscoSSHSession.wait_for_prompt`` used before."""
+
+    channel.send(command + "\n")
+    buffer = ""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if channel.recv_ready():
+            buffer += channel.recv(4096).decode("utf-8", errors="replace")
+            if _extract_prompt(buffer):
+                return buffer
+        else:
+            time.sleep(0.1)
+    raise TimeoutError("Timed out waiting for prompt.")
+
+
+def _measure(run, commands: int) -> list[float]:
+    samples = []
+    for index in range(commands):
+        started = time.perf_counter()
+        run(f"show test {index}")
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--commands", type=int, default=20)
+    parser.add_argument("--device-delay", type=float, default=0.005)
+    args = parser.parse_args()
+
+    legacy_channel = FakeChannel(args.device_delay)
+    legacy = _measure(lambda command: legacy_run_command(legacy_channel, command), args.commands)
+
+    session = CiscoSSHSession(
+        client=None, timeout=5.0, logger=logging.getLogger("bench"), log_extra={}, device_name="sw1"
+    )
+    session.channel = FakeChannel(args.device_delay)
+    current = _measure(session.run_command, args.commands)
+
+    print(f"device delay: {args.device_delay * 1000:.1f} ms, commands: {args.commands}")
+    for label, samples in (("sleep-polling", legacy), ("blocking reader", current)):
+        mean = statistics.mean(samples)
+        p95 = sorted(samples)[max(int(len(samples) * 0.95) - 1, 0)]
+        print(
+            f"{label:>16}: mean {mean * 1000:7.2f} ms  p95 {p95 * 1000:7.2f} ms"
+            f"  per device ({COMMANDS_PER_DEVICE} commands) {mean * COMMANDS_PER_DEVICE * 1000:7.1f} ms"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
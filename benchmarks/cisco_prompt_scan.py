@@ -0,0 +1,95 @@
+"""Prompt-scan cost while capturing large Cisco outputs.
+
+Feeds a synthetic multi-megabyte running-config in 4 KB chunks and compares
+the previous ``buffer += chunk`` + ``_extract_prompt(buffer)`` loop (which
+re-splits the whole buffer on every chunk) with the incremental
+:class:`app.cisco.client._ShellBuffer` used by ``CiscoSSHSession``.
+
+Usage: ``python benchmarks/cisco_prompt_scan.py [--sizes-mb 1 2 4] [--chunk-size 4096]``
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from app.cisco.client import _ShellBuffer, _extract_prompt  # noqa: E402
+
+
+def synthetic_running_config(size_bytes: int) -> bytes:
+    lines = ["show running-config", "Building configuration...", "!", "hostname sw1", "!"]
+    index = 0
+    total = sum(len(line) + 2 for line in lines)
+    while total < size_bytes:
+        block = [
+            f"interface GigabitEthernet1/0/{index}",
+            f" description access-port-{index} user vlan",
+            " switchport mode access",
+            f" switchport access vlan {index % 4000 + 1}",
+            " spanning-tree portfast",
+            "!",
+        ]
+        lines.extend(block)
+        total += sum(len(line) + 2 for line in block)
+        index += 1
+    lines.append("end")
+    return ("\r\n".join(lines) + "\r\nsw1#").encode("utf-8")
+
+
+def _chunks(payload: bytes, size: int) -> list[bytes]:
+    return [payload[offset : offset + size] for offset in range(0, len(payload), size)]
+
+
+def legacy_capture(chunks: list[bytes]) -> str:
+    buffer = ""
+    for data in chunks:
+        buffer += data.decode("utf-8", errors="replace")
+        if _extract_prompt(buffer):
+            return buffer
+    raise RuntimeError("prompt not found")
+
+
+def incremental_capture(chunks: list[bytes]) -> str:
+    buffer = _ShellBuffer()
+    for data in chunks:
+        buffer.feed_bytes(data)
+        if buffer.prompt:
+            return buffer.getvalue()
+    raise RuntimeError("prompt not found")
+
+
+def _timed(func, chunks: list[bytes]) -> tuple[float, str]:
+    started = time.perf_counter()
+    result = func(chunks)
+    return time.perf_counter() - started, result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes-mb", type=float, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--chunk-size", type=int, default=4096)
+    args = parser.parse_args()
+
+    print(f"{'size':>8} {'chunks':>7} {'full rescan':>12} {'incremental':>12} {'speedup':>8}")
+    for size_mb in args.sizes_mb:
+        chunks = _chunks(synthetic_running_config(int(size_mb * 1024 * 1024)), args.chunk_size)
+        legacy_time, legacy_output = _timed(legacy_capture, chunks)
+        incremental_time, incremental_output = _timed(incremental_capture, chunks)
+        if legacy_output != incremental_output:
+            raise SystemExit("outputs differ")
+        print(
+            f"{size_mb:>6.1f}MB {len(chunks):>7} {legacy_time * 1000:>10.1f}ms {incremental_time * 1000:>10.1f}ms"
+            f" {legacy_time / incremental_time:>7.0f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
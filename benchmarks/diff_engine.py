@@ -0,0 +1,122 @@
+"""Diff engine cost on large configs with many similar lines.
+
+Builds a synthetic Cisco config (access-port stanzas, VLAN definitions and a
+long ACL, so ``!``, ``switchport mode access`` and friends repeat thousands of
+times), applies a typical change set (a new ACL block, a few edited ports, a
+removed VLAN range) and times :func:`difflib.unified_diff` against the
+engines in :mod:`app.common.diff_engine`, reporting added/removed counts and
+whether each engine's output is identical to difflib's. The structural diff
+(:mod:`app.common.structural_diff`, Cisco stanzas) is timed last; its output
+is hunk-per-stanza, so only its counts are comparable.
+
+Usage: ``python benchmarks/diff_engine.py [--lines 50000] [--repeat 3]``
+"""
+
+from __future__ import annotations
+
+import argparse
+import difflib
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from app.common.diff import _count_added_removed  # noqa: E402
+from app.common.diff_engine import DIFF_ENGINES, unified_diff  # noqa: E402
+from app.common.structural_diff import cisco_blocks, structural_diff  # noqa: E402
+
+
+def synthetic_config(total_lines: int) -> list[str]:
+    lines = ["version 17.9", "hostname core1", "!"]
+    third = total_lines // 3
+    index = 0
+    while len(lines) < third:
+        lines += [
+            f"interface GigabitEthernet{index // 48 + 1}/0/{index % 48 + 1}",
+            f" description access-port-{index}",
+            " switchport mode access",
+            f" switchport access vlan {index % 200 + 10}",
+            " spanning-tree portfast",
+            "!",
+        ]
+        index += 1
+    vlan = 1
+    while len(lines) < 2 * third:
+        lines += [f"vlan {vlan}", f" name users-{vlan}", "!"]
+        vlan += 1
+    lines.append("ip access-list extended EDGE-IN")
+    entry = 10
+    while len(lines) < total_lines - 1:
+        network = f"10.{entry // 65536 % 256}.{entry // 256 % 256}.{entry % 256}"
+        lines.append(f" {entry} permit tcp {network} 0.0.0.255 any eq 443")
+        entry += 10
+    lines.append("end")
+    return lines
+
+
+def apply_changes(lines: list[str], seed: int = 7) -> list[str]:
+    rng = random.Random(seed)
+    changed = list(lines)
+    for position in sorted(rng.sample(range(10, len(changed) // 3), 25), reverse=True):
+        if changed[position].startswith(" switchport access vlan"):
+            changed[position] = " switchport access vlan 999"
+        else:
+            changed.insert(position, " shutdown")
+    start = next(i for i, line in enumerate(changed) if line == "vlan 500")
+    del changed[start : start + 30]
+    acl = next(i for i, line in enumerate(changed) if line.startswith("ip access-list"))
+    changed[acl + 1 : acl + 1] = [f" 5 deny ip host 192.0.2.{n} any" for n in range(40)]
+    return changed
+
+
+def _time(function, repeat: int) -> tuple[float, list[str]]:
+    best = float("inf")
+    result: list[str] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    before = synthetic_config(args.lines)
+    after = apply_changes(before)
+    print(f"config lines before={len(before)} after={len(after)}")
+
+    baseline_seconds, baseline = _time(
+        lambda: list(difflib.unified_diff(before, after, "before", "after", lineterm="")), args.repeat
+    )
+    baseline_counts = _count_added_removed(baseline)
+    print(f"{'difflib.unified_diff':>22}: {baseline_seconds * 1000:9.1f} ms  added/removed={baseline_counts}")
+
+    for engine in DIFF_ENGINES:
+        seconds, output = _time(
+            lambda engine=engine: list(unified_diff(before, after, "before", "after", engine=engine)), args.repeat
+        )
+        counts = _count_added_removed(output)
+        identical = "identical" if output == baseline else "differs"
+        print(
+            f"{engine:>22}: {seconds * 1000:9.1f} ms  added/removed={counts}  "
+            f"output={identical}  speedup={baseline_seconds / seconds:5.1f}x"
+        )
+
+    seconds, structural = _time(lambda: structural_diff(before, after, cisco_blocks, "before", "after"), args.repeat)
+    print(
+        f"{'structural':>22}: {seconds * 1000:9.1f} ms  added/removed={(structural.added, structural.removed)}  "
+        f"sections={len(structural.sections)}  speedup={baseline_seconds / seconds:5.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Wall time of diffing many devices inline in worker threads vs on the process-pool diff stage.
+
+Creates ``--devices`` device directories, each with an indexed baseline and a
+changed synthetic Cisco running-config, then evaluates every device from a
+pool of device threads (as ``scripts/run.py --workers`` does), first with
+the diff inline in the threads and then on a :class:`DiffStage` with
+``--diff-workers`` processes. Inline, the threads serialize on the GIL.
+
+Usage: ``python benchmarks/diff_stage.py [--devices 16] [--megabytes 2] [--diff-workers N]``
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+if str(BENCHMARKS_DIR) not in sys.path:
+    sys.path.insert(0, str(BENCHMARKS_DIR))
+
+from app.cisco.backup import RUNNING_CONFIG_PATTERN  # noqa: E402
+from app.common.diff import evaluate_change  # noqa: E402
+from app.common.diff_stage import DiffJob, DiffStage  # noqa: E402
+from app.core.normalize import normalize_cisco_running_config  # noqa: E402
+from normalize import synthetic_cisco  # noqa: E402
+
+
+def _prepare(root: Path, devices: int, text: str) -> list[Path]:
+    lines = text.split("\r\n")
+    changed = "\r\n".join(
+        line.replace("vlan 1", "vlan 9") if index % 97 == 0 else line for index, line in enumerate(lines)
+    )
+    current: list[Path] = []
+    for number in range(devices):
+        device_dir = root / f"sw{number}"
+        device_dir.mkdir(parents=True)
+        baseline = device_dir / "2026-01-01_000000_running-config.txt"
+        baseline.write_text(text, encoding="utf-8", newline="")
+        evaluate_change(baseline, RUNNING_CONFIG_PATTERN, normalize_cisco_running_config)
+        path = device_dir / "2026-01-02_000000_running-config.txt"
+        path.write_text(changed, encoding="utf-8", newline="")
+        current.append(path)
+    return current
+
+
+def _run(stage: DiffStage, paths: list[Path]) -> float:
+    def _handle(path: Path) -> None:
+        stage.run(DiffJob(path, RUNNING_CONFIG_PATTERN, normalize_cisco_running_config))
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(paths)) as executor:
+        list(executor.map(_handle, paths))
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=16)
+    parser.add_argument("--megabytes", type=float, default=2.0)
+    parser.add_argument("--diff-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    text = synthetic_cisco(int(args.megabytes * 1024 * 1024))
+    with TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        for label, stage in (("inline", DiffStage()), (f"{args.diff_workers} processes", DiffStage(args.diff_workers))):
+            with stage:
+                paths = _prepare(root / "devices", args.devices, text)
+                seconds = _run(stage, paths)
+            shutil.rmtree(root / "devices")
+            print(f"{label:>14}: {args.devices} devices x {args.megabytes:.1f} MB  {seconds:6.2f}s")
+
+
+if __name__ == "__main__":
+    main()
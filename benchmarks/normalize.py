@@ -0,0 +1,151 @@
+"""Normalizer throughput on multi-megabyte configs.
+
+Builds a synthetic Cisco running-config and MikroTik export of the requested
+size (with volatile header lines, CRLF line endings and trailing whitespace),
+then times the per-line loop the normalizers used to run (every volatile
+pattern tried on every line, text copied by ``replace``/``split``/``rstrip``/
+``join``) against :mod:`app.core.normalize`, checking both give identical
+output.
+
+Usage: ``python benchmarks/normalize.py [--megabytes 8] [--repeat 3]``
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from app.core.normalize import normalize_cisco_running_config, normalize_mikrotik_export  # noqa: E402
+
+_LEGACY_MIKROTIK = (
+    re.compile(r"^#\s*backup_time:.*", re.IGNORECASE),
+    re.compile(r"^#\s*\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}\s+by\s+RouterOS\b.*", re.IGNORECASE),
+    re.compile(r"^#\s*[a-z]{3}/\d{2}/\d{4}\s+\d{2}:\d{2}:\d{2}\s+by\s+RouterOS\b.*", re.IGNORECASE),
+)
+_LEGACY_CISCO = (
+    re.compile(r"^!\s+Last configuration change.*", re.IGNORECASE),
+    re.compile(r"^!\s+NVRAM config last updated.*", re.IGNORECASE),
+    re.compile(r"^!\s+Time:.*", re.IGNORECASE),
+    re.compile(r"^!\s+.*uptime is.*", re.IGNORECASE),
+    re.compile(r"^Current configuration : \d+ bytes", re.IGNORECASE),
+    re.compile(r"^ntp clock-period \d+", re.IGNORECASE),
+)
+
+
+def _legacy_trim(lines: list[str]) -> list[str]:
+    while lines and not lines[-1].strip():
+        lines.pop()
+    return lines
+
+
+def legacy_mikrotik(text: str) -> str:
+    lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    filtered = []
+    for line in lines:
+        trimmed = line.rstrip()
+        if any(pattern.match(trimmed) for pattern in _LEGACY_MIKROTIK):
+            continue
+        filtered.append(trimmed)
+    return "\n".join(_legacy_trim(filtered))
+
+
+def legacy_cisco(text: str) -> str:
+    lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    filtered = [line for line in lines if not any(pattern.match(line) for pattern in _LEGACY_CISCO)]
+    return "\n".join(_legacy_trim(filtered))
+
+
+def synthetic_cisco(size: int) -> str:
+    lines = [
+        "Building configuration...",
+        "",
+        "Current configuration : 123456 bytes",
+        "! Last configuration change at 10:00:00 UTC Mon Jan 5 2026 by admin",
+        "! NVRAM config last updated at 10:00:00 UTC Mon Jan 5 2026",
+        "!",
+        "version 17.9",
+        "ntp clock-period 36028797",
+    ]
+    index = 0
+    total = 0
+    while total < size:
+        stanza = [
+            f"interface GigabitEthernet{index // 48 + 1}/0/{index % 48 + 1}",
+            f" description access-port-{index}  ",
+            " switchport mode access",
+            f" switchport access vlan {index % 200 + 10}",
+            " spanning-tree portfast",
+            "!",
+        ]
+        total += sum(len(line) + 2 for line in stanza)
+        lines += stanza
+        index += 1
+    lines += ["end", "", ""]
+    return "\r\n".join(lines)
+
+
+def synthetic_mikrotik(size: int) -> str:
+    lines = [
+        "# 2026-01-07 00:49:07 by RouterOS 7.19",
+        "# software id = ABCD-1234",
+        "# backup_time: 2026-01-07_004907",
+        "/ip firewall filter",
+    ]
+    index = 0
+    total = 0
+    while total < size:
+        line = (
+            f"add action=accept chain=forward comment=\"rule {index}\" dst-address=10.{index // 256 % 256}."
+            f"{index % 256}.0/24 protocol=tcp dst-port={1024 + index % 60000}  "
+        )
+        total += len(line) + 1
+        lines.append(line)
+        index += 1
+    lines += ["", ""]
+    return "\n".join(lines)
+
+
+def _time(function: Callable[[str], str], text: str, repeat: int) -> tuple[float, str]:
+    best = float("inf")
+    result = ""
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function(text)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--megabytes", type=float, default=8.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    size = int(args.megabytes * 1024 * 1024)
+    cases = (
+        ("cisco", synthetic_cisco(size), legacy_cisco, normalize_cisco_running_config),
+        ("mikrotik", synthetic_mikrotik(size), legacy_mikrotik, normalize_mikrotik_export),
+    )
+    for vendor, text, legacy, current in cases:
+        megabytes = len(text) / (1024 * 1024)
+        legacy_seconds, expected = _time(legacy, text, args.repeat)
+        seconds, output = _time(current, text, args.repeat)
+        identical = "identical" if output == expected else "differs"
+        print(
+            f"{vendor:>8}: {megabytes:5.1f} MB  per-line loop {megabytes / legacy_seconds:7.1f} MB/s  "
+            f"single pass {megabytes / seconds:7.1f} MB/s  speedup={legacy_seconds / seconds:4.1f}x  "
+            f"output={identical}"
+        )
+
+
+if __name__ == "__main__":
+    main()
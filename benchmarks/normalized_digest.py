@@ -0,0 +1,78 @@
+"""Peak memory and time of hashing a normalized backup, whole-text vs streaming.
+
+Writes a synthetic Cisco running-config and MikroTik export of the requested
+size to a temporary directory, then measures (with :mod:`tracemalloc`) the
+old path that read the whole file, normalized it and hashed the result
+against :func:`app.common.diff._digest_normalized`, which feeds the hash
+chunk by chunk. Both must produce the same digest and line count.
+
+Usage: ``python benchmarks/normalized_digest.py [--megabytes 32]``
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Callable
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+if str(BENCHMARKS_DIR) not in sys.path:
+    sys.path.insert(0, str(BENCHMARKS_DIR))
+
+from app.common.diff import _digest_normalized  # noqa: E402
+from app.core.compression import read_backup_text  # noqa: E402
+from app.core.normalize import normalize_cisco_running_config, normalize_mikrotik_export  # noqa: E402
+from normalize import synthetic_cisco, synthetic_mikrotik  # noqa: E402
+
+
+def whole_text_digest(path: Path, normalizer: Callable[[str], str]) -> tuple[str, int]:
+    text = normalizer(read_backup_text(path))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest(), len(text.splitlines())
+
+
+def _measure(function: Callable[[], tuple[str, int]]) -> tuple[float, float, tuple[str, int]]:
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = function()
+    seconds = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak / (1024 * 1024), result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--megabytes", type=float, default=32.0)
+    args = parser.parse_args()
+
+    size = int(args.megabytes * 1024 * 1024)
+    cases = (
+        ("cisco", synthetic_cisco(size), normalize_cisco_running_config),
+        ("mikrotik", synthetic_mikrotik(size), normalize_mikrotik_export),
+    )
+    with TemporaryDirectory() as tmp:
+        for vendor, text, normalizer in cases:
+            path = Path(tmp) / f"{vendor}.txt"
+            path.write_text(text, encoding="utf-8", newline="")
+            megabytes = path.stat().st_size / (1024 * 1024)
+            del text
+            whole_seconds, whole_peak, expected = _measure(lambda: whole_text_digest(path, normalizer))
+            seconds, peak, result = _measure(lambda: _digest_normalized(path, normalizer))
+            identical = "identical" if result == expected else "differs"
+            print(
+                f"{vendor:>8}: {megabytes:5.1f} MB  whole text {whole_peak:7.1f} MB peak {whole_seconds:6.3f}s  "
+                f"streaming {peak:5.1f} MB peak {seconds:6.3f}s  digest={identical}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Wall time of checking SSH ports one by one vs in a single :func:`sweep_tcp`.
+
+Opens ``--targets`` local listeners whose accept queues are full, so every
+connect hangs like one to a powered-off device, then checks them serially
+with ``socket.create_connection`` (as the per-device ``tcp_check`` does) and
+with one concurrent sweep. Serial time grows with targets x timeout; the
+sweep takes about one timeout.
+
+Usage: ``python benchmarks/tcp_sweep.py [--targets 20] [--timeout 0.5]``
+"""
+
+from __future__ import annotations
+
+import argparse
+import socket
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from app.common.reachability import sweep_tcp  # noqa: E402
+
+
+def _stalled_targets(count: int, keep: list[socket.socket]) -> list[tuple[str, int]]:
+    targets = []
+    for _ in range(count):
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.bind(("127.0.0.1", 0))
+        server.listen(0)
+        keep.append(server)
+        address = server.getsockname()
+        for _ in range(8):
+            filler = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            filler.setblocking(False)
+            filler.connect_ex(address)
+            keep.append(filler)
+        targets.append(address)
+    return targets
+
+
+def _serial(targets: list[tuple[str, int]], timeout: float) -> int:
+    reachable = 0
+    for target in targets:
+        try:
+            with socket.create_connection(target, timeout=timeout):
+                reachable += 1
+        except OSError:
+            pass
+    return reachable
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--targets", type=int, default=20)
+    parser.add_argument("--timeout", type=float, default=0.5)
+    args = parser.parse_args()
+
+    keep: list[socket.socket] = []
+    try:
+        targets = _stalled_targets(args.targets, keep)
+
+        started = time.perf_counter()
+        serial_reachable = _serial(targets, args.timeout)
+        serial = time.perf_counter() - started
+
+        started = time.perf_counter()
+        results = sweep_tcp(targets, timeout=args.timeout)
+        sweep = time.perf_counter() - started
+    finally:
+        for sock in keep:
+            sock.close()
+
+    sweep_reachable = sum(reason is None for reason in results.values())
+    print(f"targets={args.targets} timeout_s={args.timeout:g}")
+    print(f"serial  reachable={serial_reachable} elapsed_s={serial:.2f}")
+    print(f"sweep   reachable={sweep_reachable} elapsed_s={sweep:.2f} speedup={serial / sweep:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
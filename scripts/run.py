@@ -4,12 +4,17 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 import logging
+import signal
 import sys
-from collections import Counter
-from typing import Mapping
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Awaitable, Callable, Mapping
 from pathlib import Path
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 
 # Ensure src/ is on sys.path for local imports when running as a script
 ROOT_DIR = Path(__file__).resolve().parent.parent
@@ -17,17 +22,63 @@ SRC_DIR = ROOT_DIR / "src"
 if str(SRC_DIR) not in sys.path:
     sys.path.insert(0, str(SRC_DIR))
 
-from app.cisco.backup import backup_arp_table, backup_device as backup_cisco  # noqa: E402
+from app.cisco.async_client import AsyncCiscoClient  # noqa: E402
+from app.cisco.backup import (  # noqa: E402
+    backup_arp_table,
+    backup_arp_table_async,
+    fetch_running_config,
+    fetch_running_config_async,
+    finish_running_config,
+)
+from app.cisco.arp import ArpChanges, import_arp_snapshots  # noqa: E402
+from app.cisco.arp_poller import DEFAULT_ARP_MAX_SESSIONS, DEFAULT_ARP_POLL_INTERVAL, ArpPoller  # noqa: E402
 from app.cisco.client import CiscoClient  # noqa: E402
+from app.common.arp_store import ArpStore  # noqa: E402
+from app.common.compaction import compact_device_dir  # noqa: E402
+from app.common.diff import DiffOutcome, commit_backup  # noqa: E402
+from app.common.diff_engine import DEFAULT_DIFF_ENGINE, DIFF_ENGINES  # noqa: E402
+from app.common.diff_stage import DEFAULT_DIFF_WORKERS, DiffStage, PendingDiff  # noqa: E402
+from app.core.blob_store import BlobStore  # noqa: E402
 from app.core.config import load_devices  # noqa: E402
-from app.core.logging import setup_logging  # noqa: E402
+from app.core.logging import device_log_context, setup_logging  # noqa: E402
 from app.core.models import Device  # noqa: E402
+from app.core.normalize import NormalizerRegistry  # noqa: E402
 from app.core.secrets import SecretEntry, Secrets, SecretNotFoundError, load_secrets, resolve_device_secrets  # noqa: E402
-from app.core.storage import load_local_config, resolve_arp_dir, resolve_backup_dir, save_backup_text  # noqa: E402
-from app.mikrotik.backup import fetch_export, log_mikrotik_diff, perform_system_backup  # noqa: E402
+from app.core.compression import COMPRESSION_CHOICES, NO_COMPRESSION, zstd_available  # noqa: E402
+from app.core.storage import (  # noqa: E402
+    DEFAULT_ARP_KEYFRAME_INTERVAL,
+    DEFAULT_DIFF_MODE,
+    DEFAULT_KEYFRAME_INTERVAL,
+    DEFAULT_STORAGE_BACKEND,
+    DIFF_MODES,
+    STORAGE_BACKENDS,
+    BackupStream,
+    StorageOptions,
+    load_local_config,
+    open_backup_stream,
+    resolve_arp_dir,
+    resolve_backup_dir,
+)
+from app.mikrotik.backup import (  # noqa: E402
+    deduplicate_mikrotik_export,
+    log_mikrotik_diff_result,
+    mikrotik_diff_job,
+    store_mikrotik_export_delta,
+    perform_system_backup,
+    perform_system_backup_async,
+)
 from app.common.run_summary import DeviceResultData, RunSummaryBuilder, TaskResultData  # noqa: E402
+from app.common.reachability import DEFAULT_SWEEP_TIMEOUT, sweep_tcp  # noqa: E402
+from app.common.scheduler import DEFAULT_SCHEDULE_INTERVAL, DeviceScheduler, Schedule  # noqa: E402
+from app.mikrotik.async_client import AsyncMikroTikClient  # noqa: E402
 from app.mikrotik.client import MikroTikClient  # noqa: E402
 
+DEFAULT_WORKERS = 1
+DEFAULT_COMPACT_AGE_DAYS = 30
+DEFAULT_ARP_LOOKUP_LIMIT = 20
+DEFAULT_TRANSPORT = "paramiko"
+SSH_TRANSPORTS = ("paramiko", "asyncssh")
+
 
 @dataclass(frozen=True)
 class FeatureSelection:
@@ -43,15 +94,19 @@ class DryRunStats:
     devices_checked: int = 0
     connected: int = 0
     failures: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
 
     def record_attempt(self) -> None:
-        self.devices_checked += 1
+        with self._lock:
+            self.devices_checked += 1
 
     def record_success(self) -> None:
-        self.connected += 1
+        with self._lock:
+            self.connected += 1
 
     def record_failure(self) -> None:
-        self.failures += 1
+        with self._lock:
+            self.failures += 1
 
     def log_summary(self, logger: logging.Logger) -> None:
         logger.info(
@@ -62,6 +117,32 @@ class DryRunStats:
         )
 
 
+@dataclass
+class DeferredTask:
+    """A task whose backup is committed but whose diff may still be running on the diff stage."""
+
+    name: str
+    pending: PendingDiff
+    finish: Callable[[PendingDiff], tuple[Path, TaskResultData]]
+
+
+@dataclass
+class PendingDevice:
+    """A backed-up device whose session is closed; it is recorded once its deferred diffs are done."""
+
+    result: DeviceResultData
+    tasks: list[str]
+    completed_paths: list[Path]
+    deferred: list[DeferredTask] = field(default_factory=list)
+
+    def done(self) -> bool:
+        return all(task.pending.done() for task in self.deferred)
+
+    async def wait(self) -> None:
+        futures = [task.pending.future for task in self.deferred if task.pending.future is not None]
+        await asyncio.gather(*(asyncio.wrap_future(future) for future in futures), return_exceptions=True)
+
+
 def build_parser() -> argparse.ArgumentParser:
     """Create the argument parser for the CLI."""
     feature_flags_parent = argparse.ArgumentParser(add_help=False)
@@ -124,6 +205,9 @@ Examples:
   scripts/run.py --cisco-arp --cisco-running-config backup
       Collect Cisco ARP and running-config in a single run
 
+  scripts/run.py --cisco-arp --arp-keyframe-interval 1 backup
+      Keep every ARP snapshot in full instead of row deltas between full snapshots
+
   scripts/run.py --mikrotik-export --cisco-running-config backup
       Run MikroTik export and Cisco running-config backups
 
@@ -135,6 +219,48 @@ Examples:
 
   scripts/run.py --backup-dir /data/backups backup
       Store backups in custom directory
+
+  scripts/run.py --workers 16 backup
+      Process up to 16 devices concurrently
+
+  scripts/run.py --transport asyncssh --workers 500 backup
+      Drive up to 500 SSH sessions from a single asyncio event loop
+
+  scripts/run.py --workers 32 --diff-workers 8 backup
+      Fetch from 32 devices while 8 processes normalize and diff the results
+
+  scripts/run.py --workers 32 --tcp-sweep-timeout 3 backup
+      Check every device's SSH port at once (3 s timeout) and back up only reachable ones
+
+  scripts/run.py --dedup backup
+      Record unchanged configs as references instead of new files
+
+  scripts/run.py --storage cas backup
+      Store identical configs once in a content-addressed blob store
+
+  scripts/run.py --storage delta --keyframe-interval 24 backup
+      Keep hourly history as deltas with a full backup once a day
+
+  scripts/run.py --compression zstd backup
+      Write backups, diffs and ARP snapshots zstd-compressed (.zst)
+
+  scripts/run.py --diff-engine patience backup
+      Diff large configs with the patience engine instead of difflib
+
+  scripts/run.py --diff-mode structural backup
+      Diff only changed Cisco stanzas / MikroTik sections, with per-section counts
+
+  scripts/run.py compact --older-than-days 90
+      Pack per-device files older than 90 days into history.pack archives
+
+  scripts/run.py arp-lookup --mac aabb.cc00.0100
+      Show where a MAC address was seen in collected Cisco ARP tables, newest first
+
+  scripts/run.py --workers 8 arp-poll --interval 60 --max-sessions 200
+      Keep SSH sessions to Cisco devices open and collect ARP tables every minute until stopped
+
+  scripts/run.py --workers 16 serve
+      Back up every device on its local.yml schedule interval until stopped
     """
 
     parser = argparse.ArgumentParser(
@@ -165,6 +291,110 @@ Examples:
         default=None,
         help="Directory where backup files will be written. Overrides config/local.yml.",
     )
+    parser.add_argument(
+        "--workers",
+        type=_positive_int,
+        default=None,
+        help="Number of devices processed concurrently. Overrides config/local.yml concurrency.workers (default: 1).",
+    )
+    parser.add_argument(
+        "--diff-workers",
+        type=_non_negative_int,
+        default=None,
+        help=(
+            "Number of processes that normalize, hash and diff fetched configs while devices are still "
+            "being fetched; 0 runs the diff inline in each device worker. "
+            f"Overrides config/local.yml concurrency.diff_workers (default: {DEFAULT_DIFF_WORKERS})."
+        ),
+    )
+    parser.add_argument(
+        "--tcp-sweep-timeout",
+        type=_non_negative_float,
+        default=None,
+        help=(
+            "Before backing up, check the SSH port of every selected device concurrently with this connect "
+            "timeout (seconds) and record unreachable devices as failed without starting a worker for them; "
+            "0 disables the sweep. Overrides config/local.yml concurrency.tcp_sweep_timeout "
+            f"(default: {DEFAULT_SWEEP_TIMEOUT:g})."
+        ),
+    )
+    parser.add_argument(
+        "--transport",
+        choices=SSH_TRANSPORTS,
+        default=None,
+        help=(
+            "SSH transport for backup runs: paramiko (threads) or asyncssh (asyncio event loop). "
+            "Overrides config/local.yml ssh.transport (default: paramiko)."
+        ),
+    )
+    parser.add_argument(
+        "--storage",
+        choices=STORAGE_BACKENDS,
+        default=None,
+        help=(
+            "Text backup storage backend: files (one file per backup), cas (content-addressed blobs under "
+            "<backup-dir>/objects, hard-linked into device directories) or delta (a full keyframe every "
+            "--keyframe-interval versions, forward deltas in between). "
+            "Overrides config/local.yml backup.storage (default: files)."
+        ),
+    )
+    parser.add_argument(
+        "--keyframe-interval",
+        type=_positive_int,
+        default=None,
+        help=(
+            "With --storage delta, store a full backup every N versions per device. "
+            f"Overrides config/local.yml backup.keyframe_interval (default: {DEFAULT_KEYFRAME_INTERVAL})."
+        ),
+    )
+    parser.add_argument(
+        "--arp-keyframe-interval",
+        type=_positive_int,
+        default=None,
+        help=(
+            "With --cisco-arp, store a full ARP snapshot every N polls per device and only added/removed "
+            "rows in between. Overrides config/local.yml arp.keyframe_interval "
+            f"(default: {DEFAULT_ARP_KEYFRAME_INTERVAL}; 1 keeps every snapshot in full)."
+        ),
+    )
+    parser.add_argument(
+        "--compression",
+        choices=COMPRESSION_CHOICES,
+        default=None,
+        help=(
+            "Compress stored running-config/export backups, diffs and ARP snapshots (zstd needs the "
+            "'zstandard' package). Overrides config/local.yml backup.compression (default: none)."
+        ),
+    )
+    parser.add_argument(
+        "--diff-mode",
+        choices=DIFF_MODES,
+        default=None,
+        help=(
+            "How config changes are diffed: lines (whole normalized config) or structural (only changed "
+            "Cisco stanzas / MikroTik /path sections, with per-section change counts in the run summary). "
+            f"Overrides config/local.yml backup.diff_mode (default: {DEFAULT_DIFF_MODE})."
+        ),
+    )
+    parser.add_argument(
+        "--diff-engine",
+        choices=sorted(DIFF_ENGINES),
+        default=None,
+        help=(
+            "Line-diff algorithm: difflib (standard library output) or patience (much faster on large configs "
+            "with many repeated lines; may align repeats differently and report more changed lines). "
+            f"Overrides config/local.yml backup.diff_engine (default: {DEFAULT_DIFF_ENGINE})."
+        ),
+    )
+    parser.add_argument(
+        "--dedup",
+        action="store_true",
+        default=None,
+        help=(
+            "Do not write a new text backup when its normalized content equals the last one; "
+            "record a reference in the device index instead. Overrides config/local.yml backup.dedup."
+        ),
+    )
     parser.add_argument(
         "--debug",
         action="store_true",
@@ -179,10 +409,138 @@ Examples:
         parents=[feature_flags_parent, dry_run_parent],
         formatter_class=argparse.RawTextHelpFormatter,
     )
+    compact_parser = subcommands.add_parser(
+        "compact",
+        help="Pack older backups, diffs and ARP snapshots of each device into its history.pack archive",
+    )
+    compact_parser.add_argument(
+        "--older-than-days",
+        type=_positive_int,
+        default=DEFAULT_COMPACT_AGE_DAYS,
+        help=f"Pack loose files last modified more than N days ago (default: {DEFAULT_COMPACT_AGE_DAYS}).",
+    )
+
+    arp_lookup_parser = subcommands.add_parser(
+        "arp-lookup",
+        help="Find where a MAC or IP address was seen in collected Cisco ARP tables",
+    )
+    arp_lookup_parser.add_argument("--mac", default=None, help="MAC address in any common notation.")
+    arp_lookup_parser.add_argument("--ip", default=None, help="IPv4 address.")
+    arp_lookup_parser.add_argument("--device", default=None, help="Only sightings on this device.")
+    arp_lookup_parser.add_argument(
+        "--limit",
+        type=_positive_int,
+        default=DEFAULT_ARP_LOOKUP_LIMIT,
+        help=f"Maximum number of sightings to print (default: {DEFAULT_ARP_LOOKUP_LIMIT}).",
+    )
+    arp_lookup_parser.add_argument(
+        "--reindex",
+        action="store_true",
+        help="First index stored ARP snapshots that are newer than the index (e.g. history from older versions).",
+    )
+
+    arp_poll_parser = subcommands.add_parser(
+        "arp-poll",
+        help="Collect Cisco ARP tables on a schedule over SSH sessions kept open between polls",
+    )
+    arp_poll_parser.add_argument(
+        "--interval",
+        type=_positive_int,
+        default=None,
+        help=(
+            "Seconds between polls of each device. Overrides config/local.yml arp.poll_interval "
+            f"(default: {DEFAULT_ARP_POLL_INTERVAL})."
+        ),
+    )
+    arp_poll_parser.add_argument(
+        "--max-sessions",
+        type=_positive_int,
+        default=None,
+        help=(
+            "Maximum SSH sessions kept open; devices above the cap log in for every poll. "
+            f"Overrides config/local.yml arp.max_sessions (default: {DEFAULT_ARP_MAX_SESSIONS})."
+        ),
+    )
+    arp_poll_parser.add_argument(
+        "--cycles",
+        type=_positive_int,
+        default=None,
+        help="Stop after N polling cycles (default: run until SIGINT/SIGTERM).",
+    )
+
+    serve_parser = subcommands.add_parser(
+        "serve",
+        help="Keep running and back up each device on its schedule interval (local.yml schedule)",
+        parents=[feature_flags_parent],
+    )
+    serve_parser.add_argument(
+        "--interval",
+        type=_positive_int,
+        default=None,
+        help=(
+            "Seconds between backups of devices outside every schedule group. Overrides config/local.yml "
+            f"schedule.default_interval (default: {DEFAULT_SCHEDULE_INTERVAL})."
+        ),
+    )
+    serve_parser.add_argument(
+        "--jitter",
+        type=_fraction,
+        default=None,
+        help=(
+            "Spread first backups over this fraction of each device's interval (0-1). "
+            "Overrides config/local.yml schedule.jitter (default: 0.1)."
+        ),
+    )
+    serve_parser.add_argument(
+        "--max-batches",
+        type=_positive_int,
+        default=None,
+        help="Stop after N batches of due devices (default: run until SIGINT/SIGTERM).",
+    )
 
     return parser
 
 
+def _positive_int(value: str) -> int:
+    try:
+        parsed = int(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"invalid positive integer: {value!r}") from exc
+    if parsed < 1:
+        raise argparse.ArgumentTypeError(f"value must be >= 1: {value!r}")
+    return parsed
+
+
+def _fraction(value: str) -> float:
+    try:
+        parsed = float(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"invalid number: {value!r}") from exc
+    if not 0 <= parsed <= 1:
+        raise argparse.ArgumentTypeError(f"value must be between 0 and 1: {value!r}")
+    return parsed
+
+
+def _non_negative_float(value: str) -> float:
+    try:
+        parsed = float(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"invalid non-negative number: {value!r}") from exc
+    if parsed < 0:
+        raise argparse.ArgumentTypeError(f"value must be >= 0: {value!r}")
+    return parsed
+
+
+def _non_negative_int(value: str) -> int:
+    try:
+        parsed = int(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"invalid non-negative integer: {value!r}") from exc
+    if parsed < 0:
+        raise argparse.ArgumentTypeError(f"value must be >= 0: {value!r}")
+    return parsed
+
+
 def main(argv: list[str] | None = None) -> int:
     """Run the CLI."""
     parser = build_parser()
@@ -203,6 +561,14 @@ def main(argv: list[str] | None = None) -> int:
         parser.print_help()
     elif args.command == "backup":
         exit_code = _run_backup(args, logger)
+    elif args.command == "compact":
+        exit_code = _run_compact(args, logger)
+    elif args.command == "arp-lookup":
+        exit_code = _run_arp_lookup(args, logger)
+    elif args.command == "arp-poll":
+        exit_code = _run_arp_poll(args, logger)
+    elif args.command == "serve":
+        exit_code = _run_serve(args, logger)
     else:
         parser.error(f"Unknown command: {args.command}")
 
@@ -211,6 +577,303 @@ def main(argv: list[str] | None = None) -> int:
     return exit_code
 
 
+def _run_compact(args: argparse.Namespace, logger: logging.Logger) -> int:
+    """Roll older loose files of every device directory into its pack archive."""
+
+    local_config = load_local_config(ROOT_DIR / "config" / "local.yml", logger)
+    try:
+        backup_dir = resolve_backup_dir(getattr(args, "backup_dir", None), local_config, logger)
+        arp_dir = resolve_arp_dir(local_config, logger)
+    except OSError:
+        logger.exception("Backup directory is not available.", extra={"device": "-"})
+        return 2
+
+    older_than = time.time() - args.older_than_days * 86400
+    device_dirs = [
+        device_dir
+        for root, vendors in ((backup_dir, ("cisco", "mikrotik")), (arp_dir, ("cisco",)))
+        for vendor in vendors
+        if (root / vendor).is_dir()
+        for device_dir in sorted((root / vendor).iterdir())
+        if device_dir.is_dir()
+    ]
+
+    exit_code = 0
+    packed_files = 0
+    packed_bytes = 0
+    for device_dir in device_dirs:
+        log_extra = {"device": device_dir.name}
+        try:
+            result = compact_device_dir(device_dir, older_than)
+        except (OSError, ValueError):
+            logger.exception("compact failed device_dir=%s", device_dir, extra=log_extra)
+            exit_code = 1
+            continue
+        if result.packed_files:
+            logger.info(
+                "compact device_dir=%s packed_files=%d packed_bytes=%d",
+                device_dir,
+                result.packed_files,
+                result.packed_bytes,
+                extra=log_extra,
+            )
+        packed_files += result.packed_files
+        packed_bytes += result.packed_bytes
+
+    # Packed copies replace the hard links into the blob store; drop blobs nothing links to any more.
+    try:
+        blobs_removed, blob_bytes_freed = BlobStore.for_backup_dir(backup_dir).collect_garbage()
+    except OSError:
+        logger.exception("compact blob gc failed backup_dir=%s", backup_dir, extra={"device": "-"})
+        blobs_removed = blob_bytes_freed = 0
+        exit_code = 1
+
+    logger.info(
+        "compact summary device_dirs=%d packed_files=%d packed_bytes=%d blobs_removed=%d blob_bytes_freed=%d "
+        "older_than_days=%d",
+        len(device_dirs),
+        packed_files,
+        packed_bytes,
+        blobs_removed,
+        blob_bytes_freed,
+        args.older_than_days,
+    )
+    return exit_code
+
+
+def _run_arp_lookup(args: argparse.Namespace, logger: logging.Logger) -> int:
+    """Print ARP sightings matching ``--mac``/``--ip``/``--device``; exit 1 when there are none."""
+
+    if args.mac is None and args.ip is None and args.device is None:
+        logger.error("arp-lookup needs --mac, --ip or --device")
+        return 2
+
+    local_config = load_local_config(ROOT_DIR / "config" / "local.yml", logger)
+    try:
+        arp_dir = resolve_arp_dir(local_config, logger)
+    except OSError:
+        logger.exception("ARP directory is not available.", extra={"device": "-"})
+        return 2
+
+    store = ArpStore.for_arp_dir(arp_dir)
+    if args.reindex:
+        cisco_dir = arp_dir / "cisco"
+        device_dirs = sorted(path for path in cisco_dir.iterdir() if path.is_dir()) if cisco_dir.is_dir() else []
+        for device_dir in device_dirs:
+            result = import_arp_snapshots(device_dir, store)
+            logger.info(
+                "arp reindex device=%s imported=%d already_indexed=%d",
+                result.device,
+                result.imported,
+                result.skipped,
+                extra={"device": result.device},
+            )
+    if not store.path.exists():
+        logger.error("arp index not found db=%s; collect with --cisco-arp or run arp-lookup --reindex", store.path)
+        return 2
+
+    started = time.perf_counter()
+    try:
+        sightings = store.lookup(mac=args.mac, ip=args.ip, device=args.device, limit=args.limit)
+    except ValueError as exc:
+        logger.error("arp-lookup invalid query: %s", exc)
+        return 2
+    logger.info(
+        "arp-lookup matches=%d elapsed_ms=%.1f db=%s",
+        len(sightings),
+        (time.perf_counter() - started) * 1000,
+        store.path,
+    )
+
+    if sightings:
+        print(
+            f"{'last_seen':<20}  {'first_seen':<20}  {'present':<7}  {'device':<16}  {'interface':<24}  "
+            f"{'vlan':>4}  {'ip':<15}  mac"
+        )
+    for sighting in sightings:
+        present = "yes" if sighting.present else "no"
+        vlan = "-" if sighting.vlan is None else str(sighting.vlan)
+        print(
+            f"{sighting.last_seen:<20}  {sighting.first_seen:<20}  {present:<7}  {sighting.device:<16}  "
+            f"{sighting.interface or '-':<24}  {vlan:>4}  {sighting.ip:<15}  {sighting.mac}"
+        )
+    return 0 if sightings else 1
+
+
+def _run_arp_poll(args: argparse.Namespace, logger: logging.Logger) -> int:
+    """Poll ARP tables of every Cisco device until SIGINT/SIGTERM or ``--cycles``."""
+
+    try:
+        devices = load_devices(Path(args.config), logger)
+        secrets = load_secrets(Path(args.secrets), logger)
+    except Exception:
+        logger.exception("Failed to load devices or secrets configuration.", extra={"device": "-"})
+        return 2
+
+    local_config = load_local_config(ROOT_DIR / "config" / "local.yml", logger)
+    try:
+        arp_dir = resolve_arp_dir(local_config, logger)
+    except OSError:
+        logger.exception("ARP directory is not available.", extra={"device": "-"})
+        return 2
+
+    clients: list[CiscoClient] = []
+    for device in devices:
+        if device.vendor != "cisco":
+            continue
+        try:
+            secret_entry = resolve_device_secrets(device.auth.secret_ref, secrets)
+        except SecretNotFoundError:
+            logger.error(
+                "device=%s missing secrets for secret_ref=%s; not polled",
+                device.name,
+                device.auth.secret_ref,
+                extra={"device": device.name},
+            )
+            continue
+        clients.append(
+            CiscoClient(
+                host=device.host,
+                name=device.name,
+                username=device.username,
+                password=secret_entry.password,
+                port=device.port,
+                enable_password=secret_entry.enable_password,
+            )
+        )
+    if not clients:
+        logger.error("arp-poll found no Cisco devices with secrets in %s", args.config)
+        return 2
+
+    storage = StorageOptions(
+        compression=_resolve_compression(getattr(args, "compression", None), local_config, logger),
+        arp_keyframe_interval=_resolve_arp_keyframe_interval(
+            getattr(args, "arp_keyframe_interval", None), local_config, logger
+        ),
+    )
+    interval = _resolve_arp_poll_interval(args.interval, local_config, logger)
+    max_sessions = _resolve_arp_max_sessions(args.max_sessions, local_config, logger)
+    workers = _resolve_workers(getattr(args, "workers", None), local_config, logger)
+
+    stop = _stop_on_signals("arp-poll", logger)
+    logger.info(
+        "arp-poll starting devices=%d interval_s=%d max_sessions=%d workers=%d",
+        len(clients),
+        interval,
+        max_sessions,
+        min(workers, max_sessions),
+    )
+    with ArpPoller(
+        clients, arp_dir, logger, storage, interval=interval, max_sessions=max_sessions, workers=workers
+    ) as poller:
+        cycles = poller.run(cycles=args.cycles, stop=stop)
+    logger.info("arp-poll stopped cycles=%d", cycles)
+    return 0
+
+
+def _run_serve(args: argparse.Namespace, logger: logging.Logger) -> int:
+    """Back up devices as they fall due until SIGINT/SIGTERM or ``--max-batches``.
+
+    Inventory, secrets, local.yml, storage options and the diff stage are set
+    up once. Every batch of due devices goes through the same pipeline as
+    ``backup`` and writes its own run summary.
+    """
+
+    try:
+        devices = load_devices(Path(args.config), logger)
+        secrets = load_secrets(Path(args.secrets), logger)
+    except Exception:
+        logger.exception("Failed to load devices or secrets configuration.", extra={"device": "-"})
+        return 2
+    if not devices:
+        logger.error("serve found no devices in %s", args.config)
+        return 2
+
+    local_config = load_local_config(ROOT_DIR / "config" / "local.yml", logger)
+    feature_selection = _resolve_feature_selection(args, local_config, logger)
+    _log_selected_features(feature_selection, logger)
+    try:
+        backup_dir = resolve_backup_dir(getattr(args, "backup_dir", None), local_config, logger)
+        arp_dir = resolve_arp_dir(local_config, logger)
+    except OSError:
+        logger.exception("Backup directory is not available.", extra={"device": "-"})
+        return 2
+
+    workers = _resolve_workers(getattr(args, "workers", None), local_config, logger)
+    transport = _resolve_transport(getattr(args, "transport", None), local_config, logger)
+    diff_workers = _resolve_diff_workers(getattr(args, "diff_workers", None), local_config, logger)
+    sweep_timeout = _resolve_tcp_sweep_timeout(getattr(args, "tcp_sweep_timeout", None), local_config, logger)
+    schedule = _resolve_schedule(args.interval, args.jitter, local_config, logger)
+    group_counts = Counter(schedule.group_for(device.name) for device in devices)
+    for group, count in sorted(group_counts.items(), key=lambda item: item[0].interval):
+        logger.info("serve group=%s interval_s=%d devices=%d", group.name, group.interval, count)
+
+    stop = _stop_on_signals("serve", logger)
+    order = {device.name: index for index, device in enumerate(devices)}
+    by_name = {device.name: device for device in devices}
+    batches = 0
+    last_run_id = None
+    with DiffStage(diff_workers) as diff_stage:
+        storage = _resolve_storage_options(args, local_config, logger, diff_stage, ssh_port_checked=sweep_timeout > 0)
+        scheduler = DeviceScheduler(schedule, by_name, time.monotonic())
+        while args.max_batches is None or batches < args.max_batches:
+            if stop.wait(max(0.0, scheduler.next_due() - time.monotonic())):
+                break
+            due, missed = scheduler.pop_due(time.monotonic())
+            if missed:
+                logger.warning("serve behind schedule devices=%d missed_slots=%d", len(due), missed)
+            run_id = _timestamp()
+            if run_id == last_run_id:
+                # Run summaries are named by the second.
+                time.sleep(1 - time.time() % 1)
+                run_id = _timestamp()
+            last_run_id = run_id
+
+            batch = sorted((by_name[name] for name in due), key=lambda device: order[device.name])
+            summary = RunSummaryBuilder(
+                run_id=run_id,
+                timestamp=_iso_timestamp(),
+                dry_run=False,
+                selected_features=_selected_feature_names(feature_selection),
+            )
+            summary.set_devices_total(len(batch))
+            summary.set_device_order(device.name for device in batch)
+            logger.info("serve batch=%d run_id=%s devices=%d", batches + 1, run_id, len(batch))
+            batch = _sweep_reachability(batch, feature_selection, sweep_timeout, logger, summary)
+            _backup_devices(
+                batch, backup_dir, arp_dir, secrets, logger, feature_selection, summary, storage, workers, transport
+            )
+            _save_run_summary(summary, logger, backup_dir)
+            batches += 1
+            logger.info(
+                "serve batch=%d run_id=%s success=%d failed=%d backups_created=%d exit_code=%d next_due_in_s=%.0f",
+                batches,
+                run_id,
+                summary.devices_success,
+                summary.devices_failed,
+                summary.backups_created,
+                _calculate_exit_code(summary),
+                max(0.0, scheduler.next_due() - time.monotonic()),
+            )
+
+    logger.info("serve stopped batches=%d", batches)
+    return 0
+
+
+def _stop_on_signals(command: str, logger: logging.Logger) -> threading.Event:
+    """Event set by SIGINT/SIGTERM so long-running commands finish their current work and exit."""
+
+    stop = threading.Event()
+
+    def _request_stop(signum: int, _frame: object) -> None:
+        logger.info("%s stopping signal=%s", command, signal.Signals(signum).name)
+        stop.set()
+
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, _request_stop)
+    return stop
+
+
 def _run_backup(args: argparse.Namespace, logger: logging.Logger) -> int:
     """Execute the backup workflow for all configured devices."""
 
@@ -227,6 +890,7 @@ def _run_backup(args: argparse.Namespace, logger: logging.Logger) -> int:
     dry_run = bool(getattr(args, "dry_run", False))
     summary = RunSummaryBuilder(run_id=run_id, timestamp=_iso_timestamp(), dry_run=dry_run)
     summary.set_devices_total(len(devices))
+    summary.set_device_order(device.name for device in devices)
     for vendor, count in sorted(Counter(device.vendor for device in devices).items()):
         logger.debug("%s devices selected=%d", vendor, count)
 
@@ -239,18 +903,7 @@ def _run_backup(args: argparse.Namespace, logger: logging.Logger) -> int:
 
     _log_selected_features(feature_selection, logger)
     logger.info("cisco_arp=%s", str(feature_selection.cisco_arp).lower())
-    summary.set_selected_features(
-        [
-            name
-            for name, enabled in (
-                ("mikrotik_export", feature_selection.mikrotik_export),
-                ("mikrotik_system_backup", feature_selection.mikrotik_system_backup),
-                ("cisco_running_config", feature_selection.cisco_running_config),
-                ("cisco_arp", feature_selection.cisco_arp),
-            )
-            if enabled
-        ]
-    )
+    summary.set_selected_features(_selected_feature_names(feature_selection))
 
     secrets_path = Path(args.secrets)
     logger.debug("loading secrets from %s", secrets_path)
@@ -265,8 +918,14 @@ def _run_backup(args: argparse.Namespace, logger: logging.Logger) -> int:
         logger.debug("dry_run active: backup functions not invoked")
         logger.info("dry_run skipping diff")
         stats = DryRunStats()
-        for device in devices:
-            _process_device_dry_run(device, secrets, logger, feature_selection, stats, summary)
+        workers = _resolve_workers(getattr(args, "workers", None), local_config, logger)
+        _run_devices(
+            devices,
+            lambda device: _process_device_dry_run(device, secrets, logger, feature_selection, stats, summary),
+            workers,
+            logger,
+            failed=lambda device, exc: _record_failed_device(device, exc, summary),
+        )
         stats.log_summary(logger)
         logger.info("dry_run skipping file writes and summary persistence")
         return _calculate_exit_code(summary)
@@ -277,47 +936,272 @@ def _run_backup(args: argparse.Namespace, logger: logging.Logger) -> int:
     backup_dir = resolve_backup_dir(args.backup_dir, local_config, logger)
     arp_dir = resolve_arp_dir(local_config, logger)
 
-    logger.info("Starting backup for %d device(s).", len(devices))
-
-    for device in devices:
-        _process_device_backup(device, backup_dir, arp_dir, secrets, logger, feature_selection, summary)
+    workers = _resolve_workers(getattr(args, "workers", None), local_config, logger)
+    transport = _resolve_transport(getattr(args, "transport", None), local_config, logger)
+    diff_workers = _resolve_diff_workers(getattr(args, "diff_workers", None), local_config, logger)
+    sweep_timeout = _resolve_tcp_sweep_timeout(getattr(args, "tcp_sweep_timeout", None), local_config, logger)
+    with DiffStage(diff_workers) as diff_stage:
+        storage = _resolve_storage_options(args, local_config, logger, diff_stage, ssh_port_checked=sweep_timeout > 0)
+
+        logger.info("Starting backup for %d device(s).", len(devices))
+        devices = _sweep_reachability(devices, feature_selection, sweep_timeout, logger, summary)
+        _backup_devices(
+            devices, backup_dir, arp_dir, secrets, logger, feature_selection, summary, storage, workers, transport
+        )
 
     _save_run_summary(summary, logger, backup_dir)
     return _calculate_exit_code(summary)
 
 
-def _calculate_exit_code(summary: RunSummaryBuilder) -> int:
-    """Derive the process exit code from the run summary."""
-
-    success_detected = summary.devices_success > 0 if summary.dry_run else summary.backups_created > 0
-    if not success_detected:
-        return 2
+def _sweep_reachability(
+    devices: list[Device],
+    feature_selection: FeatureSelection,
+    timeout: float,
+    logger: logging.Logger,
+    summary: RunSummaryBuilder,
+) -> list[Device]:
+    """Check the SSH port of every device with selected tasks in one concurrent sweep.
 
-    if summary.devices_failed > 0:
-        return 1
+    Unreachable devices are recorded as failed right away and left out of the
+    returned list, so no worker waits on their connect timeout.
+    """
 
-    return 0
+    if timeout <= 0:
+        return devices
+    candidates = [device for device in devices if _select_device_tasks(device.vendor, feature_selection)]
+    if not candidates:
+        return devices
+
+    started = time.perf_counter()
+    results = sweep_tcp(((device.host, device.port) for device in candidates), timeout=timeout)
+    unreachable: set[str] = set()
+    for device in candidates:
+        reason = results[(device.host, device.port)]
+        if reason is None:
+            continue
+        unreachable.add(device.name)
+        logger.error(
+            "tcp_sweep unreachable host=%s port=%s reason=%s",
+            device.host,
+            device.port,
+            reason,
+            extra={"device": device.name},
+        )
+        summary.add_device(
+            DeviceResultData(name=device.name, vendor=device.vendor, status="failed", error="tcp_unreachable")
+        )
+    logger.info(
+        "tcp_sweep devices=%d reachable=%d unreachable=%d timeout_s=%g elapsed_s=%.2f",
+        len(candidates),
+        len(candidates) - len(unreachable),
+        len(unreachable),
+        timeout,
+        time.perf_counter() - started,
+    )
+    return [device for device in devices if device.name not in unreachable]
 
 
-def _resolve_feature_selection(
-    args: argparse.Namespace, local_config: Mapping[str, object] | None, logger: logging.Logger
-) -> FeatureSelection:
-    """Resolve which backup features are enabled for this run."""
+def _resolve_storage_options(
+    args: argparse.Namespace,
+    local_config: Mapping[str, object] | None,
+    logger: logging.Logger,
+    diff_stage: DiffStage,
+    ssh_port_checked: bool = False,
+) -> StorageOptions:
+    return StorageOptions(
+        dedup=_resolve_dedup(getattr(args, "dedup", None), local_config, logger),
+        backend=_resolve_storage_backend(getattr(args, "storage", None), local_config, logger),
+        compression=_resolve_compression(getattr(args, "compression", None), local_config, logger),
+        keyframe_interval=_resolve_keyframe_interval(getattr(args, "keyframe_interval", None), local_config, logger),
+        diff_mode=_resolve_diff_mode(getattr(args, "diff_mode", None), local_config, logger),
+        diff_engine=_resolve_diff_engine(getattr(args, "diff_engine", None), local_config, logger),
+        arp_keyframe_interval=_resolve_arp_keyframe_interval(
+            getattr(args, "arp_keyframe_interval", None), local_config, logger
+        ),
+        normalization=_resolve_normalization(local_config, logger),
+        diff_stage=diff_stage,
+        ssh_port_checked=ssh_port_checked,
+    )
 
-    cli_features = {
-        "mikrotik_export": getattr(args, "mikrotik_export", False),
-        "mikrotik_system_backup": getattr(args, "mikrotik_system_backup", False),
-        "cisco_running_config": getattr(args, "cisco_running_config", False),
-        "cisco_arp": getattr(args, "cisco_arp", False),
-    }
 
-    if any(cli_features.values()):
-        return FeatureSelection(
-            default_mode=False,
-            mikrotik_export=cli_features["mikrotik_export"],
-            mikrotik_system_backup=cli_features["mikrotik_system_backup"],
-            cisco_running_config=cli_features["cisco_running_config"],
-            cisco_arp=cli_features["cisco_arp"],
+def _backup_devices(
+    devices: list[Device],
+    backup_dir: Path,
+    arp_dir: Path,
+    secrets: Secrets,
+    logger: logging.Logger,
+    feature_selection: FeatureSelection,
+    summary: RunSummaryBuilder,
+    storage: StorageOptions,
+    workers: int,
+    transport: str,
+) -> None:
+    """Back up ``devices`` on the selected transport, recording every device in ``summary``."""
+
+    def complete(pending: PendingDevice) -> None:
+        _complete_device_backup(pending, logger, summary)
+
+    def failed(device: Device, exc: Exception) -> None:
+        _record_failed_device(device, exc, summary)
+
+    if transport == "asyncssh":
+        asyncio.run(
+            _run_devices_async(
+                devices,
+                lambda device: _process_device_backup_async(
+                    device, backup_dir, arp_dir, secrets, logger, feature_selection, summary, storage
+                ),
+                workers,
+                logger,
+                complete,
+                failed,
+            )
+        )
+    else:
+        _run_devices(
+            devices,
+            lambda device: _process_device_backup(
+                device, backup_dir, arp_dir, secrets, logger, feature_selection, summary, storage
+            ),
+            workers,
+            logger,
+            complete,
+            failed,
+        )
+
+
+def _run_devices(
+    devices: list[Device],
+    handler: Callable[[Device], PendingDevice | None],
+    workers: int,
+    logger: logging.Logger,
+    complete: Callable[[PendingDevice], None] | None = None,
+    failed: Callable[[Device, Exception], None] | None = None,
+) -> None:
+    """Run ``handler`` for every device using a bounded pool of worker threads.
+
+    Each device is handled inside :func:`device_log_context` so records emitted
+    without an explicit device extra are still attributed correctly. With a
+    single worker devices are processed sequentially in inventory order.
+
+    A handler may return a :class:`PendingDevice` whose diffs are still
+    running on the diff stage. ``complete`` is called for it on the calling
+    thread, so the worker goes straight on to the next device: as devices
+    finish with several workers, and in inventory order once its diffs are
+    done (or after the last device) with one.
+
+    An exception escaping ``handler`` or ``complete`` is logged and passed to
+    ``failed`` for that device; the other devices still run.
+    """
+
+    def _fail(device: Device, exc: Exception) -> None:
+        logger.exception("Device worker failed.", extra={"device": device.name})
+        if failed is not None:
+            failed(device, exc)
+
+    def _handle(device: Device) -> tuple[Device, PendingDevice | None]:
+        with device_log_context(device.name):
+            try:
+                return device, handler(device)
+            except Exception as exc:
+                _fail(device, exc)
+                return device, None
+
+    def _complete(device: Device, pending: PendingDevice | None) -> None:
+        if pending is not None and complete is not None:
+            with device_log_context(device.name):
+                try:
+                    complete(pending)
+                except Exception as exc:
+                    _fail(device, exc)
+
+    pool_size = max(1, min(workers, len(devices)))
+    logger.info("concurrency workers=%d devices=%d", pool_size, len(devices))
+    if pool_size == 1:
+        waiting: deque[tuple[Device, PendingDevice | None]] = deque()
+        for device in devices:
+            waiting.append(_handle(device))
+            while waiting and (waiting[0][1] is None or waiting[0][1].done()):
+                _complete(*waiting.popleft())
+        while waiting:
+            _complete(*waiting.popleft())
+        return
+
+    with ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="device") as executor:
+        futures = {executor.submit(_handle, device): device for device in devices}
+        for future in as_completed(futures):
+            _complete(*future.result())
+
+
+async def _run_devices_async(
+    devices: list[Device],
+    handler: Callable[[Device], Awaitable[PendingDevice | None]],
+    workers: int,
+    logger: logging.Logger,
+    complete: Callable[[PendingDevice], None] | None = None,
+    failed: Callable[[Device, Exception], None] | None = None,
+) -> None:
+    """Run ``handler`` coroutines for every device on one event loop.
+
+    ``workers`` caps the number of devices with an open SSH session at any
+    time; each device task carries its own :func:`device_log_context`. A
+    returned :class:`PendingDevice` gives its slot back before its diffs are
+    awaited, then ``complete`` runs for it in a worker thread. Exceptions are
+    handled per device as in :func:`_run_devices`.
+    """
+
+    limit = max(1, min(workers, len(devices)))
+    logger.info("concurrency transport=asyncssh sessions=%d devices=%d", limit, len(devices))
+    semaphore = asyncio.Semaphore(limit)
+
+    async def _handle(device: Device) -> None:
+        with device_log_context(device.name):
+            try:
+                async with semaphore:
+                    pending = await handler(device)
+                if pending is not None and complete is not None:
+                    await pending.wait()
+                    await asyncio.to_thread(complete, pending)
+            except Exception as exc:
+                logger.exception("Device worker failed.", extra={"device": device.name})
+                if failed is not None:
+                    failed(device, exc)
+
+    await asyncio.gather(*(_handle(device) for device in devices))
+
+
+def _calculate_exit_code(summary: RunSummaryBuilder) -> int:
+    """Derive the process exit code from the run summary."""
+
+    success_detected = summary.devices_success > 0 if summary.dry_run else summary.backups_created > 0
+    if not success_detected:
+        return 2
+
+    if summary.devices_failed > 0:
+        return 1
+
+    return 0
+
+
+def _resolve_feature_selection(
+    args: argparse.Namespace, local_config: Mapping[str, object] | None, logger: logging.Logger
+) -> FeatureSelection:
+    """Resolve which backup features are enabled for this run."""
+
+    cli_features = {
+        "mikrotik_export": getattr(args, "mikrotik_export", False),
+        "mikrotik_system_backup": getattr(args, "mikrotik_system_backup", False),
+        "cisco_running_config": getattr(args, "cisco_running_config", False),
+        "cisco_arp": getattr(args, "cisco_arp", False),
+    }
+
+    if any(cli_features.values()):
+        return FeatureSelection(
+            default_mode=False,
+            mikrotik_export=cli_features["mikrotik_export"],
+            mikrotik_system_backup=cli_features["mikrotik_system_backup"],
+            cisco_running_config=cli_features["cisco_running_config"],
+            cisco_arp=cli_features["cisco_arp"],
         )
 
     system_backup_enabled = _resolve_mikrotik_system_backup(
@@ -333,6 +1217,19 @@ def _resolve_feature_selection(
     )
 
 
+def _selected_feature_names(feature_selection: FeatureSelection) -> list[str]:
+    return [
+        name
+        for name, enabled in (
+            ("mikrotik_export", feature_selection.mikrotik_export),
+            ("mikrotik_system_backup", feature_selection.mikrotik_system_backup),
+            ("cisco_running_config", feature_selection.cisco_running_config),
+            ("cisco_arp", feature_selection.cisco_arp),
+        )
+        if enabled
+    ]
+
+
 def _log_selected_features(feature_selection: FeatureSelection, logger: logging.Logger) -> None:
     if feature_selection.default_mode:
         logger.info("selected_features=default")
@@ -367,8 +1264,152 @@ def _process_device_backup(
     logger: logging.Logger,
     feature_selection: FeatureSelection,
     summary: RunSummaryBuilder,
-) -> None:
-    """Handle backup for a single device with logging."""
+    storage: StorageOptions,
+) -> PendingDevice | None:
+    """Handle backup for a single device with logging.
+
+    Diffs are submitted to the diff stage once the device session is closed,
+    also when a later task failed, so every committed backup is evaluated;
+    the returned :class:`PendingDevice` is recorded by
+    :func:`_complete_device_backup` when they are done. Returns ``None`` when
+    the device has already been recorded in ``summary``.
+    """
+
+    prepared = _prepare_device_backup(device, secrets, logger, feature_selection, summary)
+    if prepared is None:
+        return None
+
+    device_tasks, secret_entry = prepared
+    log_extra = {"device": device.name}
+    device_result = DeviceResultData(name=device.name, vendor=device.vendor, status="success", tasks={})
+    diff_stage = storage.diff_stage or DiffStage()
+
+    pending = PendingDevice(device_result, device_tasks, [])
+    try:
+        if device.vendor == "cisco":
+            pending.completed_paths = _backup_cisco_device(
+                device,
+                secret_entry,
+                backup_dir,
+                arp_dir,
+                logger,
+                device_tasks,
+                device_result,
+                storage,
+                pending.deferred,
+            )
+        elif device.vendor == "mikrotik":
+            logger.info(
+                "start backup device=%s host=%s", device.name, device.host, extra=log_extra
+            )
+            pending.completed_paths = _backup_mikrotik_device(
+                device,
+                secret_entry.password,
+                backup_dir,
+                logger,
+                run_export="mikrotik_export" in device_tasks,
+                run_system_backup="mikrotik_system_backup" in device_tasks,
+                device_result=device_result,
+                storage=storage,
+                deferred=pending.deferred,
+            )
+        else:
+            logger.info("Unknown vendor=%s; skipping.", device.vendor, extra=log_extra)
+            device_result.status = "skipped"
+            summary.add_device(device_result)
+            return None
+    except Exception as exc:
+        logger.exception("Backup failed for device.", extra=log_extra)
+        device_result.status = "failed"
+        device_result.error = exc.__class__.__name__
+        if not pending.deferred:
+            summary.add_device(device_result)
+            return None
+
+    for task in pending.deferred:
+        task.pending.submit(diff_stage)
+    return pending
+
+
+async def _process_device_backup_async(
+    device: Device,
+    backup_dir: Path,
+    arp_dir: Path,
+    secrets: Secrets,
+    logger: logging.Logger,
+    feature_selection: FeatureSelection,
+    summary: RunSummaryBuilder,
+    storage: StorageOptions,
+) -> PendingDevice | None:
+    """Asyncio counterpart of :func:`_process_device_backup` for the asyncssh transport."""
+
+    prepared = _prepare_device_backup(device, secrets, logger, feature_selection, summary)
+    if prepared is None:
+        return None
+
+    device_tasks, secret_entry = prepared
+    log_extra = {"device": device.name}
+    device_result = DeviceResultData(name=device.name, vendor=device.vendor, status="success", tasks={})
+    diff_stage = storage.diff_stage or DiffStage()
+
+    pending = PendingDevice(device_result, device_tasks, [])
+    try:
+        if device.vendor == "cisco":
+            pending.completed_paths = await _backup_cisco_device_async(
+                device,
+                secret_entry,
+                backup_dir,
+                arp_dir,
+                logger,
+                device_tasks,
+                device_result,
+                storage,
+                pending.deferred,
+            )
+        elif device.vendor == "mikrotik":
+            logger.info(
+                "start backup device=%s host=%s", device.name, device.host, extra=log_extra
+            )
+            pending.completed_paths = await _backup_mikrotik_device_async(
+                device,
+                secret_entry.password,
+                backup_dir,
+                logger,
+                run_export="mikrotik_export" in device_tasks,
+                run_system_backup="mikrotik_system_backup" in device_tasks,
+                device_result=device_result,
+                storage=storage,
+                deferred=pending.deferred,
+            )
+        else:
+            logger.info("Unknown vendor=%s; skipping.", device.vendor, extra=log_extra)
+            device_result.status = "skipped"
+            summary.add_device(device_result)
+            return None
+    except Exception as exc:
+        logger.exception("Backup failed for device.", extra=log_extra)
+        device_result.status = "failed"
+        device_result.error = exc.__class__.__name__
+        if not pending.deferred:
+            summary.add_device(device_result)
+            return None
+
+    for task in pending.deferred:
+        await asyncio.to_thread(task.pending.submit, diff_stage)
+    return pending
+
+
+def _prepare_device_backup(
+    device: Device,
+    secrets: Secrets,
+    logger: logging.Logger,
+    feature_selection: FeatureSelection,
+    summary: RunSummaryBuilder,
+) -> tuple[list[str], SecretEntry] | None:
+    """Select tasks and resolve credentials; record skipped or failed devices.
+
+    Returns ``None`` when the device has already been recorded in the summary.
+    """
 
     log_extra = {"device": device.name}
     logger.info("Beginning processing for device.", extra=log_extra)
@@ -401,7 +1442,7 @@ def _process_device_backup(
         summary.add_device(
             DeviceResultData(name=device.name, vendor=device.vendor, status="skipped", tasks={})
         )
-        return
+        return None
 
     try:
         secret_entry = resolve_device_secrets(device.auth.secret_ref, secrets)
@@ -421,70 +1462,47 @@ def _process_device_backup(
                 tasks={},
             )
         )
-        return
+        return None
 
     logger.info("device=%s secret_ref=%s secrets_loaded=true", device.name, device.auth.secret_ref, extra=log_extra)
+    return device_tasks, secret_entry
 
-    device_result = DeviceResultData(name=device.name, vendor=device.vendor, status="success", tasks={})
 
-    completed_paths: list[Path] = []
+def _complete_device_backup(pending: PendingDevice, logger: logging.Logger, summary: RunSummaryBuilder) -> None:
+    """Wait for the deferred diffs of a device, record their task results and add it to ``summary``."""
+
+    device_result = pending.result
     try:
-        if device.vendor == "cisco":
-            client = CiscoClient(
-                host=device.host,
-                name=device.name,
-                username=device.username,
-                password=secret_entry.password,
-                port=device.port,
-                enable_password=secret_entry.enable_password,
-            )
-            if "cisco_running_config" in device_tasks:
-                path, diff_outcome, diff_path = backup_cisco(client, backup_dir, logger, log_extra)
-                completed_paths.append(path)
-                device_result.tasks["cisco_running_config"] = TaskResultData(
-                    performed=True,
-                    saved_path=str(path),
-                    size_bytes=path.stat().st_size if path.exists() else None,
-                    config_changed=diff_outcome.config_changed,
-                    lines_added=diff_outcome.added if diff_outcome.config_changed else None,
-                    lines_removed=diff_outcome.removed if diff_outcome.config_changed else None,
-                    diff_path=str(diff_path) if diff_path else None,
-                )
-            if "cisco_arp" in device_tasks:
-                arp_path = backup_arp_table(client, arp_dir, logger, log_extra)
-                completed_paths.append(arp_path)
-                device_result.tasks["cisco_arp"] = TaskResultData(
-                    performed=True,
-                    saved_path=str(arp_path),
-                    size_bytes=arp_path.stat().st_size if arp_path.exists() else None,
-                )
-        elif device.vendor == "mikrotik":
-            logger.info(
-                "start backup device=%s host=%s", device.name, device.host, extra=log_extra
-            )
-            completed_paths.extend(
-                _backup_mikrotik_device(
-                    device,
-                    secret_entry.password,
-                    backup_dir,
-                    logger,
-                    run_export="mikrotik_export" in device_tasks,
-                    run_system_backup="mikrotik_system_backup" in device_tasks,
-                    device_result=device_result,
-                )
-            )
-        else:
-            logger.info("Unknown vendor=%s; skipping.", device.vendor, extra=log_extra)
-            device_result.status = "skipped"
-            summary.add_device(device_result)
-            return
+        for task in pending.deferred:
+            path, task_result = task.finish(task.pending)
+            pending.completed_paths.append(path)
+            device_result.tasks[task.name] = task_result
     except Exception as exc:
-        logger.exception("Backup failed for device.", extra=log_extra)
+        logger.exception("Backup failed for device.", extra={"device": device_result.name})
         device_result.status = "failed"
         device_result.error = exc.__class__.__name__
         summary.add_device(device_result)
         return
 
+    _finish_device_backup(device_result, pending.tasks, pending.completed_paths, logger, summary)
+
+
+def _record_failed_device(device: Device, exc: Exception, summary: RunSummaryBuilder) -> None:
+    """Record a device whose worker raised unexpectedly as failed."""
+
+    summary.add_device(
+        DeviceResultData(name=device.name, vendor=device.vendor, status="failed", error=exc.__class__.__name__)
+    )
+
+
+def _finish_device_backup(
+    device_result: DeviceResultData,
+    device_tasks: list[str],
+    completed_paths: list[Path],
+    logger: logging.Logger,
+    summary: RunSummaryBuilder,
+) -> None:
+    log_extra = {"device": device_result.name}
     if completed_paths:
         logger.info(
             "Backup completed successfully tasks=%s paths=%s",
@@ -500,6 +1518,129 @@ def _process_device_backup(
         summary.add_device(device_result)
 
 
+def _backup_cisco_device(
+    device: Device,
+    secret_entry: SecretEntry,
+    backup_dir: Path,
+    arp_dir: Path,
+    logger: logging.Logger,
+    device_tasks: list[str],
+    device_result: DeviceResultData,
+    storage: StorageOptions,
+    deferred: list[DeferredTask],
+) -> list[Path]:
+    log_extra = {"device": device.name}
+    client = CiscoClient(
+        host=device.host,
+        name=device.name,
+        username=device.username,
+        password=secret_entry.password,
+        port=device.port,
+        enable_password=secret_entry.enable_password,
+        tcp_check=not storage.ssh_port_checked,
+    )
+    normalizer = storage.normalization.normalizer_for(device.vendor, device.model)
+    completed: list[Path] = []
+    with client.session(logger, log_extra):
+        if "cisco_running_config" in device_tasks:
+            config = fetch_running_config(client, backup_dir, logger, log_extra, storage, normalizer)
+            deferred.append(
+                DeferredTask(
+                    "cisco_running_config",
+                    config,
+                    lambda pending: _finish_cisco_running_config(pending, logger, log_extra, storage),
+                )
+            )
+        if "cisco_arp" in device_tasks:
+            arp_path, arp_changes = backup_arp_table(client, arp_dir, logger, log_extra, storage)
+            completed.append(arp_path)
+            device_result.tasks["cisco_arp"] = _arp_task_result(arp_path, arp_changes)
+    return completed
+
+
+async def _backup_cisco_device_async(
+    device: Device,
+    secret_entry: SecretEntry,
+    backup_dir: Path,
+    arp_dir: Path,
+    logger: logging.Logger,
+    device_tasks: list[str],
+    device_result: DeviceResultData,
+    storage: StorageOptions,
+    deferred: list[DeferredTask],
+) -> list[Path]:
+    log_extra = {"device": device.name}
+    client = AsyncCiscoClient(
+        host=device.host,
+        name=device.name,
+        username=device.username,
+        password=secret_entry.password,
+        port=device.port,
+        enable_password=secret_entry.enable_password,
+    )
+    normalizer = storage.normalization.normalizer_for(device.vendor, device.model)
+    completed: list[Path] = []
+    async with client.session(logger, log_extra):
+        if "cisco_running_config" in device_tasks:
+            config = await fetch_running_config_async(client, backup_dir, logger, log_extra, storage, normalizer)
+            deferred.append(
+                DeferredTask(
+                    "cisco_running_config",
+                    config,
+                    lambda pending: _finish_cisco_running_config(pending, logger, log_extra, storage),
+                )
+            )
+        if "cisco_arp" in device_tasks:
+            arp_path, arp_changes = await backup_arp_table_async(client, arp_dir, logger, log_extra, storage)
+            completed.append(arp_path)
+            device_result.tasks["cisco_arp"] = _arp_task_result(arp_path, arp_changes)
+    return completed
+
+
+def _finish_cisco_running_config(
+    pending: PendingDiff, logger: logging.Logger, log_extra: dict[str, str], storage: StorageOptions
+) -> tuple[Path, TaskResultData]:
+    path, diff_outcome, diff_path = finish_running_config(pending, logger, log_extra, storage)
+    return path, _config_task_result(path, diff_outcome, diff_path)
+
+
+def _config_task_result(path: Path, diff_outcome: DiffOutcome, diff_path: Path | None) -> TaskResultData:
+    return TaskResultData(
+        performed=True,
+        saved_path=str(path),
+        size_bytes=path.stat().st_size if path.exists() else None,
+        config_changed=diff_outcome.config_changed,
+        lines_added=diff_outcome.added if diff_outcome.config_changed else None,
+        lines_removed=diff_outcome.removed if diff_outcome.config_changed else None,
+        diff_path=str(diff_path) if diff_path else None,
+        deduplicated=diff_outcome.deduplicated,
+        section_changes=_section_changes(diff_outcome),
+    )
+
+
+def _section_changes(diff_outcome: DiffOutcome) -> dict[str, dict[str, int]] | None:
+    if not diff_outcome.section_changes:
+        return None
+    return {
+        name: {"added": added, "removed": removed}
+        for name, (added, removed) in diff_outcome.section_changes.items()
+    }
+
+
+def _arp_task_result(path: Path, changes: ArpChanges | None) -> TaskResultData:
+    result = _file_task_result(path)
+    result.arp_changes = changes.counts() if changes is not None else None
+    return result
+
+
+def _file_task_result(path: Path) -> TaskResultData:
+    return TaskResultData(
+        performed=True,
+        saved_path=str(path),
+        size_bytes=path.stat().st_size if path.exists() else None,
+    )
+
+
 def _process_device_dry_run(
     device: Device,
     secrets: Secrets,
@@ -679,84 +1820,168 @@ def _backup_mikrotik_device(
     run_export: bool,
     run_system_backup: bool,
     device_result: DeviceResultData,
+    storage: StorageOptions,
+    deferred: list[DeferredTask],
 ) -> list[Path]:
     log_extra = {"device": device.name}
-    logger.debug(
-        "checking tcp connectivity host=%s port=%s timeout=%s", device.host, device.port, 5, extra=log_extra
-    )
-    if not _tcp_check(device.host, device.port, timeout=5):
-        logger.error(
-            "tcp_check fail host=%s port=%s", device.host, device.port, extra=log_extra
+    if not storage.ssh_port_checked:
+        logger.debug(
+            "checking tcp connectivity host=%s port=%s timeout=%s", device.host, device.port, 5, extra=log_extra
         )
-        raise ConnectionError(f"TCP check failed for {device.host}:{device.port}")
+        if not _tcp_check(device.host, device.port, timeout=5):
+            logger.error(
+                "tcp_check fail host=%s port=%s", device.host, device.port, extra=log_extra
+            )
+            raise ConnectionError(f"TCP check failed for {device.host}:{device.port}")
 
-    logger.info("tcp_check ok host=%s port=%s", device.host, device.port, extra=log_extra)
+        logger.info("tcp_check ok host=%s port=%s", device.host, device.port, extra=log_extra)
 
     timestamp = _timestamp()
     completed: list[Path] = []
-    if run_export:
-        export_text = fetch_export(device, password, logger)
-        logger.debug("export received bytes=%d", len(export_text.encode("utf-8")), extra=log_extra)
-
-        if not export_text.strip():
-            raise ValueError("Empty export received from device")
-
-        filename = f"{timestamp}_export.rsc"
-        metadata = {
-            "device": device.name,
-            "vendor": device.vendor,
-            "model": device.model or "-",
-            "host": device.host,
-            "backup_time": timestamp,
-        }
-
-        target_path = backup_dir / "mikrotik" / device.name / filename
-        logger.debug("saving backup to %s", target_path, extra=log_extra)
-
-        saved_path = save_backup_text(backup_dir, "mikrotik", device.name, filename, export_text, logger, metadata)
-        completed.append(saved_path)
-        diff_outcome, diff_path = log_mikrotik_diff(saved_path, logger, log_extra)
-        device_result.tasks["mikrotik_export"] = TaskResultData(
-            performed=True,
-            saved_path=str(saved_path),
-            size_bytes=saved_path.stat().st_size if saved_path.exists() else None,
-            config_changed=diff_outcome.config_changed,
-            lines_added=diff_outcome.added if diff_outcome.config_changed else None,
-            lines_removed=diff_outcome.removed if diff_outcome.config_changed else None,
-            diff_path=str(diff_path) if diff_path else None,
-        )
-    else:
-        logger.info("MikroTik export skipped", extra=log_extra)
-
-    if run_system_backup:
-        try:
-            path = perform_system_backup(device, password, timestamp, backup_dir, logger)
-            completed.append(path)
-            device_result.tasks["mikrotik_system_backup"] = TaskResultData(
-                performed=True,
-                saved_path=str(path),
-                size_bytes=path.stat().st_size if path.exists() else None,
-            )
-        except Exception:
-            logger.exception("system-backup failed", extra=log_extra)
-            device_result.status = "failed"
-            device_result.tasks["mikrotik_system_backup"] = TaskResultData(performed=True, error="failed")
-    else:
-        logger.info("mikrotik system-backup disabled (skipping) device=%s", device.name, extra=log_extra)
-        device_result.tasks["mikrotik_system_backup"] = TaskResultData(performed=False)
+    client = MikroTikClient(host=device.host, username=device.username, password=password, port=device.port)
+    with client.session(logger, log_extra):
+        if run_export:
+            with _open_mikrotik_export_stream(device, timestamp, backup_dir, logger, storage) as stream:
+                client.stream_export(stream, logger, log_extra)
+                export = _store_mikrotik_export(device, stream, logger, storage)
+                deferred.append(_mikrotik_export_task(device, export, logger, storage))
+        else:
+            logger.info("MikroTik export skipped", extra=log_extra)
+
+        if run_system_backup:
+            try:
+                path = perform_system_backup(device, password, timestamp, backup_dir, logger, client=client)
+                completed.append(path)
+                device_result.tasks["mikrotik_system_backup"] = _file_task_result(path)
+            except Exception:
+                logger.exception("system-backup failed", extra=log_extra)
+                device_result.status = "failed"
+                device_result.tasks["mikrotik_system_backup"] = TaskResultData(performed=True, error="failed")
+        else:
+            logger.info("mikrotik system-backup disabled (skipping) device=%s", device.name, extra=log_extra)
+            device_result.tasks["mikrotik_system_backup"] = TaskResultData(performed=False)
 
     return completed
 
 
-def _resolve_mikrotik_system_backup(
-    cli_flag: bool | None, local_config: Mapping[str, object] | None, logger: logging.Logger
-) -> bool:
-    """Determine whether MikroTik system backup is enabled.
+async def _backup_mikrotik_device_async(
+    device: Device,
+    password: str,
+    backup_dir: Path,
+    logger: logging.Logger,
+    run_export: bool,
+    run_system_backup: bool,
+    device_result: DeviceResultData,
+    storage: StorageOptions,
+    deferred: list[DeferredTask],
+) -> list[Path]:
+    log_extra = {"device": device.name}
+    timestamp = _timestamp()
+    completed: list[Path] = []
+    client = AsyncMikroTikClient(host=device.host, username=device.username, password=password, port=device.port)
+    async with client.session(logger, log_extra):
+        if run_export:
+            with _open_mikrotik_export_stream(device, timestamp, backup_dir, logger, storage) as stream:
+                await client.stream_export(stream, logger, log_extra)
+                export = await asyncio.to_thread(_store_mikrotik_export, device, stream, logger, storage)
+                deferred.append(_mikrotik_export_task(device, export, logger, storage))
+        else:
+            logger.info("MikroTik export skipped", extra=log_extra)
 
-    Priority: CLI flag > local.yml > default False.
-    """
+        if run_system_backup:
+            try:
+                path = await perform_system_backup_async(
+                    device, password, timestamp, backup_dir, logger, client=client
+                )
+                completed.append(path)
+                device_result.tasks["mikrotik_system_backup"] = _file_task_result(path)
+            except Exception:
+                logger.exception("system-backup failed", extra=log_extra)
+                device_result.status = "failed"
+                device_result.tasks["mikrotik_system_backup"] = TaskResultData(performed=True, error="failed")
+        else:
+            logger.info("mikrotik system-backup disabled (skipping) device=%s", device.name, extra=log_extra)
+            device_result.tasks["mikrotik_system_backup"] = TaskResultData(performed=False)
 
-    local_value = _extract_mikrotik_system_backup(local_config)
+    return completed
+
+
+def _open_mikrotik_export_stream(
+    device: Device, timestamp: str, backup_dir: Path, logger: logging.Logger, storage: StorageOptions
+) -> BackupStream:
+    filename = f"{timestamp}_export.rsc"
+    metadata = {
+        "device": device.name,
+        "vendor": device.vendor,
+        "model": device.model or "-",
+        "host": device.host,
+        "backup_time": timestamp,
+    }
+
+    stream = open_backup_stream(backup_dir, "mikrotik", device.name, filename, metadata, storage)
+    logger.debug("saving backup to %s", stream.path, extra={"device": device.name})
+    return stream
+
+
+def _store_mikrotik_export(
+    device: Device,
+    stream: BackupStream,
+    logger: logging.Logger,
+    storage: StorageOptions,
+) -> PendingDiff:
+    log_extra = {"device": device.name}
+    normalizer = storage.normalization.normalizer_for(device.vendor, device.model)
+    if storage.dedup:
+        diff_outcome = deduplicate_mikrotik_export(stream, logger, log_extra, normalizer)
+        if diff_outcome is not None:
+            return PendingDiff.resolved(diff_outcome.current_path, diff_outcome)
+
+    saved_path = commit_backup(stream, normalizer)
+    logger.info("saved path=%s", saved_path, extra=log_extra)
+    job = mikrotik_diff_job(
+        saved_path,
+        logger,
+        log_extra,
+        storage.diff_mode,
+        normalizer,
+        storage.diff_engine,
+        keep_baseline=storage.backend == "delta",
+    )
+    return PendingDiff(saved_path, job)
+
+
+def _mikrotik_export_task(
+    device: Device, export: PendingDiff, logger: logging.Logger, storage: StorageOptions
+) -> DeferredTask:
+    return DeferredTask(
+        "mikrotik_export", export, lambda pending: _finish_mikrotik_export(device, pending, logger, storage)
+    )
+
+
+def _finish_mikrotik_export(
+    device: Device, pending: PendingDiff, logger: logging.Logger, storage: StorageOptions
+) -> tuple[Path, TaskResultData]:
+    log_extra = {"device": device.name}
+    diff_outcome, diff_path = pending.result()
+    saved_path = pending.path
+    if pending.job is not None:
+        log_mikrotik_diff_result(saved_path, diff_outcome, diff_path, logger, log_extra)
+        if storage.backend == "delta":
+            saved_path = store_mikrotik_export_delta(
+                saved_path, diff_outcome, storage.keyframe_interval, logger, log_extra
+            )
+    return saved_path, _config_task_result(saved_path, diff_outcome, diff_path)
+
+
+def _resolve_mikrotik_system_backup(
+    cli_flag: bool | None, local_config: Mapping[str, object] | None, logger: logging.Logger
+) -> bool:
+    """Determine whether MikroTik system backup is enabled.
+
+    Priority: CLI flag > local.yml > default False.
+    """
+
+    local_value = _extract_mikrotik_system_backup(local_config)
     if cli_flag is True:
         enabled = True
         source = "cli"
@@ -777,6 +2002,442 @@ def _resolve_mikrotik_system_backup(
     return enabled
 
 
+def _resolve_dedup(
+    cli_flag: bool | None, local_config: Mapping[str, object] | None, logger: logging.Logger
+) -> bool:
+    """Determine whether unchanged text backups are stored as references.
+
+    Priority: CLI flag > local.yml > default False.
+    """
+
+    local_value = _extract_backup_dedup(local_config)
+    if cli_flag is True:
+        enabled = True
+        source = "cli"
+    elif isinstance(local_value, bool):
+        enabled = local_value
+        source = "local_yml"
+    else:
+        enabled = False
+        source = "default"
+
+    logger.info("backup_dedup=%s source=%s", str(enabled).lower(), source)
+    return enabled
+
+
+def _resolve_storage_backend(
+    cli_value: str | None, local_config: Mapping[str, object] | None, logger: logging.Logger
+) -> str:
+    """Determine the text backup storage backend.
+
+    Priority: CLI flag > local.yml ``backup.storage`` > default ``files``.
+    """
+
+    local_value = _extract_storage_backend(local_config, logger)
+    if cli_value is not None:
+        backend = cli_value
+        source = "cli"
+    elif local_value is not None:
+        backend = local_value
+        source = "local_yml"
+    else:
+        backend = DEFAULT_STORAGE_BACKEND
+        source = "default"
+
+    logger.info("backup_storage=%s source=%s", backend, source)
+    return backend
+
+
+def _resolve_compression(
+    cli_value: str | None, local_config: Mapping[str, object] | None, logger: logging.Logger
+) -> str:
+    """Determine the compression for stored backups.
+
+    Priority: CLI flag > local.yml ``backup.compression`` > default ``none``.
+    ``zstd`` falls back to ``gzip`` when the ``zstandard`` package is missing.
+    """
+
+    local_value = _extract_compression(local_config, logger)
+    if cli_value is not None:
+        compression = cli_value
+        source = "cli"
+    elif local_value is not None:
+        compression = local_value
+        source = "local_yml"
+    else:
+        compression = NO_COMPRESSION
+        source = "default"
+
+    if compression == "zstd" and not zstd_available():
+        logger.warning("backup_compression=zstd unavailable (zstandard not installed); using gzip")
+        compression = "gzip"
+
+    logger.info("backup_compression=%s source=%s", compression, source)
+    return compression
+
+
+def _resolve_diff_mode(
+    cli_value: str | None, local_config: Mapping[str, object] | None, logger: logging.Logger
+) -> str:
+    """Determine how config changes are diffed.
+
+    Priority: CLI flag > local.yml ``backup.diff_mode`` > default ``lines``.
+    """
+
+    local_value = _extract_diff_mode(local_config, logger)
+    if cli_value is not None:
+        diff_mode = cli_value
+        source = "cli"
+    elif local_value is not None:
+        diff_mode = local_value
+        source = "local_yml"
+    else:
+        diff_mode = DEFAULT_DIFF_MODE
+        source = "default"
+
+    logger.info("backup_diff_mode=%s source=%s", diff_mode, source)
+    return diff_mode
+
+
+def _resolve_normalization(
+    local_config: Mapping[str, object] | None, logger: logging.Logger
+) -> NormalizerRegistry:
+    """Build the normalization rule registry from local.yml ``normalize``.
+
+    Invalid rules are reported and ignored as a whole, leaving the built-in normalizers.
+    """
+
+    section = local_config.get("normalize") if isinstance(local_config, Mapping) else None
+    try:
+        registry = NormalizerRegistry.from_config(section)
+    except ValueError as exc:
+        logger.warning("invalid normalize rules in local.yml (%s); using built-in normalizers only", exc)
+        return NormalizerRegistry()
+
+    logger.info("normalize_rules=%d source=%s", registry.rule_count, "local_yml" if section else "default")
+    return registry
+
+
+def _resolve_schedule(
+    cli_interval: int | None,
+    cli_jitter: float | None,
+    local_config: Mapping[str, object] | None,
+    logger: logging.Logger,
+) -> Schedule:
+    """Build backup intervals from local.yml ``schedule``; CLI flags override the default interval and jitter.
+
+    An invalid section is reported and ignored as a whole.
+    """
+
+    section = local_config.get("schedule") if isinstance(local_config, Mapping) else None
+    try:
+        schedule = Schedule.from_config(section)
+    except ValueError as exc:
+        logger.warning("invalid schedule in local.yml (%s); using default_interval=%d", exc, DEFAULT_SCHEDULE_INTERVAL)
+        schedule = Schedule()
+        section = None
+    if cli_interval is not None:
+        schedule = replace(schedule, default_interval=cli_interval)
+    if cli_jitter is not None:
+        schedule = replace(schedule, jitter=cli_jitter)
+
+    logger.info(
+        "schedule groups=%d default_interval_s=%d jitter=%.2f source=%s",
+        len(schedule.groups),
+        schedule.default_interval,
+        schedule.jitter,
+        "local_yml" if section else "default",
+    )
+    return schedule
+
+
+def _resolve_keyframe_interval(
+    cli_value: int | None, local_config: Mapping[str, object] | None, logger: logging.Logger
+) -> int:
+    """Determine how many versions a delta chain spans, keyframe included.
+
+    Priority: CLI flag > local.yml ``backup.keyframe_interval`` > default 24.
+    """
+
+    local_value = _extract_keyframe_interval(local_config, logger)
+    if cli_value is not None:
+        interval = cli_value
+        source = "cli"
+    elif local_value is not None:
+        interval = local_value
+        source = "local_yml"
+    else:
+        interval = DEFAULT_KEYFRAME_INTERVAL
+        source = "default"
+
+    logger.debug("backup keyframe_interval resolved interval=%d source=%s", interval, source)
+    return interval
+
+
+def _resolve_diff_engine(
+    cli_value: str | None, local_config: Mapping[str, object] | None, logger: logging.Logger
+) -> str:
+    """Determine which line-diff engine computes ``.diff`` files.
+
+    Priority: CLI flag > local.yml ``backup.diff_engine`` > default ``difflib``.
+    """
+
+    local_value = _extract_diff_engine(local_config, logger)
+    if cli_value is not None:
+        diff_engine = cli_value
+        source = "cli"
+    elif local_value is not None:
+        diff_engine = local_value
+        source = "local_yml"
+    else:
+        diff_engine = DEFAULT_DIFF_ENGINE
+        source = "default"
+
+    logger.info("backup_diff_engine=%s source=%s", diff_engine, source)
+    return diff_engine
+
+
+def _resolve_arp_keyframe_interval(
+    cli_value: int | None, local_config: Mapping[str, object] | None, logger: logging.Logger
+) -> int:
+    """Determine how many ARP polls a delta chain spans, full snapshot included.
+
+    Priority: CLI flag > local.yml ``arp.keyframe_interval`` > default 24.
+    """
+
+    local_value = _extract_arp_keyframe_interval(local_config, logger)
+    if cli_value is not None:
+        interval = cli_value
+        source = "cli"
+    elif local_value is not None:
+        interval = local_value
+        source = "local_yml"
+    else:
+        interval = DEFAULT_ARP_KEYFRAME_INTERVAL
+        source = "default"
+
+    logger.debug("arp keyframe_interval resolved interval=%d source=%s", interval, source)
+    return interval
+
+
+def _resolve_arp_poll_interval(
+    cli_value: int | None, local_config: Mapping[str, object] | None, logger: logging.Logger
+) -> int:
+    """Determine the seconds between ARP polls of a device.
+
+    Priority: CLI flag > local.yml ``arp.poll_interval`` > default 60.
+    """
+
+    local_value = _extract_arp_positive_int("poll_interval", DEFAULT_ARP_POLL_INTERVAL, local_config, logger)
+    if cli_value is not None:
+        interval = cli_value
+        source = "cli"
+    elif local_value is not None:
+        interval = local_value
+        source = "local_yml"
+    else:
+        interval = DEFAULT_ARP_POLL_INTERVAL
+        source = "default"
+
+    logger.debug("arp poll_interval resolved interval=%d source=%s", interval, source)
+    return interval
+
+
+def _resolve_arp_max_sessions(
+    cli_value: int | None, local_config: Mapping[str, object] | None, logger: logging.Logger
+) -> int:
+    """Determine how many SSH sessions ``arp-poll`` keeps open.
+
+    Priority: CLI flag > local.yml ``arp.max_sessions`` > default 100.
+    """
+
+    local_value = _extract_arp_positive_int("max_sessions", DEFAULT_ARP_MAX_SESSIONS, local_config, logger)
+    if cli_value is not None:
+        max_sessions = cli_value
+        source = "cli"
+    elif local_value is not None:
+        max_sessions = local_value
+        source = "local_yml"
+    else:
+        max_sessions = DEFAULT_ARP_MAX_SESSIONS
+        source = "default"
+
+    logger.debug("arp max_sessions resolved max_sessions=%d source=%s", max_sessions, source)
+    return max_sessions
+
+
+def _resolve_workers(
+    cli_value: int | None, local_config: Mapping[str, object] | None, logger: logging.Logger
+) -> int:
+    """Determine the number of concurrent device workers.
+
+    Priority: CLI flag > local.yml ``concurrency.workers`` > default 1.
+    """
+
+    local_value = _extract_concurrency_workers(local_config, logger)
+    if cli_value is not None:
+        workers = cli_value
+        source = "cli"
+    elif local_value is not None:
+        workers = local_value
+        source = "local_yml"
+    else:
+        workers = DEFAULT_WORKERS
+        source = "default"
+
+    logger.debug(
+        "concurrency workers resolved workers=%d source=%s cli=%s local_yml=%s",
+        workers,
+        source,
+        cli_value,
+        local_value,
+    )
+    return workers
+
+
+def _resolve_diff_workers(
+    cli_value: int | None, local_config: Mapping[str, object] | None, logger: logging.Logger
+) -> int:
+    """Determine the number of diff stage processes.
+
+    Priority: CLI flag > local.yml ``concurrency.diff_workers`` > default 0 (inline).
+    """
+
+    local_value = _extract_diff_workers(local_config, logger)
+    if cli_value is not None:
+        diff_workers = cli_value
+        source = "cli"
+    elif local_value is not None:
+        diff_workers = local_value
+        source = "local_yml"
+    else:
+        diff_workers = DEFAULT_DIFF_WORKERS
+        source = "default"
+
+    logger.info("diff_workers=%d source=%s", diff_workers, source)
+    return diff_workers
+
+
+def _resolve_tcp_sweep_timeout(
+    cli_value: float | None, local_config: Mapping[str, object] | None, logger: logging.Logger
+) -> float:
+    """Determine the connect timeout of the pre-backup reachability sweep (0 disables it).
+
+    Priority: CLI flag > local.yml ``concurrency.tcp_sweep_timeout`` > default 5.
+    """
+
+    local_value = _extract_tcp_sweep_timeout(local_config, logger)
+    if cli_value is not None:
+        timeout = cli_value
+        source = "cli"
+    elif local_value is not None:
+        timeout = local_value
+        source = "local_yml"
+    else:
+        timeout = DEFAULT_SWEEP_TIMEOUT
+        source = "default"
+
+    logger.info("tcp_sweep_timeout=%g source=%s", timeout, source)
+    return timeout
+
+
+def _resolve_transport(
+    cli_value: str | None, local_config: Mapping[str, object] | None, logger: logging.Logger
+) -> str:
+    """Determine the SSH transport used for backup runs.
+
+    Priority: CLI flag > local.yml ``ssh.transport`` > default ``paramiko``.
+    """
+
+    local_value = _extract_ssh_transport(local_config, logger)
+    if cli_value is not None:
+        transport = cli_value
+        source = "cli"
+    elif local_value is not None:
+        transport = local_value
+        source = "local_yml"
+    else:
+        transport = DEFAULT_TRANSPORT
+        source = "default"
+
+    logger.info("ssh_transport=%s source=%s", transport, source)
+    return transport
+
+
+def _extract_ssh_transport(local_config: Mapping[str, object] | None, logger: logging.Logger) -> str | None:
+    if not isinstance(local_config, Mapping):
+        return None
+
+    ssh_section = local_config.get("ssh")
+    if not isinstance(ssh_section, Mapping):
+        return None
+
+    value = ssh_section.get("transport")
+    if value is None:
+        return None
+    if value not in SSH_TRANSPORTS:
+        logger.warning("invalid ssh.transport=%r in local.yml; using default=%s", value, DEFAULT_TRANSPORT)
+        return None
+    return str(value)
+
+
+def _extract_concurrency_workers(
+    local_config: Mapping[str, object] | None, logger: logging.Logger
+) -> int | None:
+    if not isinstance(local_config, Mapping):
+        return None
+
+    concurrency_section = local_config.get("concurrency")
+    if not isinstance(concurrency_section, Mapping):
+        return None
+
+    value = concurrency_section.get("workers")
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        logger.warning("invalid concurrency.workers=%r in local.yml; using default=%d", value, DEFAULT_WORKERS)
+        return None
+    return value
+
+
+def _extract_diff_workers(local_config: Mapping[str, object] | None, logger: logging.Logger) -> int | None:
+    if not isinstance(local_config, Mapping):
+        return None
+
+    concurrency_section = local_config.get("concurrency")
+    if not isinstance(concurrency_section, Mapping):
+        return None
+
+    value = concurrency_section.get("diff_workers")
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+        logger.warning(
+            "invalid concurrency.diff_workers=%r in local.yml; using default=%d", value, DEFAULT_DIFF_WORKERS
+        )
+        return None
+    return value
+
+
+def _extract_tcp_sweep_timeout(local_config: Mapping[str, object] | None, logger: logging.Logger) -> float | None:
+    if not isinstance(local_config, Mapping):
+        return None
+
+    concurrency_section = local_config.get("concurrency")
+    if not isinstance(concurrency_section, Mapping):
+        return None
+
+    value = concurrency_section.get("tcp_sweep_timeout")
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+        logger.warning(
+            "invalid concurrency.tcp_sweep_timeout=%r in local.yml; using default=%g", value, DEFAULT_SWEEP_TIMEOUT
+        )
+        return None
+    return float(value)
+
+
 def _extract_mikrotik_system_backup(local_config: Mapping[str, object] | None) -> bool | None:
     if not isinstance(local_config, Mapping):
         return None
@@ -789,6 +2450,132 @@ def _extract_mikrotik_system_backup(local_config: Mapping[str, object] | None) -
     return value if isinstance(value, bool) else None
 
 
+def _extract_storage_backend(local_config: Mapping[str, object] | None, logger: logging.Logger) -> str | None:
+    if not isinstance(local_config, Mapping):
+        return None
+
+    backup_section = local_config.get("backup")
+    if not isinstance(backup_section, Mapping):
+        return None
+
+    value = backup_section.get("storage")
+    if value is None:
+        return None
+    if value not in STORAGE_BACKENDS:
+        logger.warning("invalid backup.storage=%r in local.yml; using default=%s", value, DEFAULT_STORAGE_BACKEND)
+        return None
+    return str(value)
+
+
+def _extract_compression(local_config: Mapping[str, object] | None, logger: logging.Logger) -> str | None:
+    if not isinstance(local_config, Mapping):
+        return None
+
+    backup_section = local_config.get("backup")
+    if not isinstance(backup_section, Mapping):
+        return None
+
+    value = backup_section.get("compression")
+    if value is None:
+        return None
+    if value not in COMPRESSION_CHOICES:
+        logger.warning("invalid backup.compression=%r in local.yml; using default=%s", value, NO_COMPRESSION)
+        return None
+    return str(value)
+
+
+def _extract_diff_mode(local_config: Mapping[str, object] | None, logger: logging.Logger) -> str | None:
+    if not isinstance(local_config, Mapping):
+        return None
+
+    backup_section = local_config.get("backup")
+    if not isinstance(backup_section, Mapping):
+        return None
+
+    value = backup_section.get("diff_mode")
+    if value is None:
+        return None
+    if value not in DIFF_MODES:
+        logger.warning("invalid backup.diff_mode=%r in local.yml; using default=%s", value, DEFAULT_DIFF_MODE)
+        return None
+    return str(value)
+
+
+def _extract_keyframe_interval(
+    local_config: Mapping[str, object] | None, logger: logging.Logger
+) -> int | None:
+    if not isinstance(local_config, Mapping):
+        return None
+
+    backup_section = local_config.get("backup")
+    if not isinstance(backup_section, Mapping):
+        return None
+
+    value = backup_section.get("keyframe_interval")
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        logger.warning(
+            "invalid backup.keyframe_interval=%r in local.yml; using default=%d", value, DEFAULT_KEYFRAME_INTERVAL
+        )
+        return None
+    return value
+
+
+def _extract_diff_engine(local_config: Mapping[str, object] | None, logger: logging.Logger) -> str | None:
+    if not isinstance(local_config, Mapping):
+        return None
+
+    backup_section = local_config.get("backup")
+    if not isinstance(backup_section, Mapping):
+        return None
+
+    value = backup_section.get("diff_engine")
+    if value is None:
+        return None
+    if value not in DIFF_ENGINES:
+        logger.warning("invalid backup.diff_engine=%r in local.yml; using default=%s", value, DEFAULT_DIFF_ENGINE)
+        return None
+    return str(value)
+
+
+def _extract_arp_keyframe_interval(
+    local_config: Mapping[str, object] | None, logger: logging.Logger
+) -> int | None:
+    return _extract_arp_positive_int("keyframe_interval", DEFAULT_ARP_KEYFRAME_INTERVAL, local_config, logger)
+
+
+def _extract_arp_positive_int(
+    key: str, default: int, local_config: Mapping[str, object] | None, logger: logging.Logger
+) -> int | None:
+    if not isinstance(local_config, Mapping):
+        return None
+
+    arp_section = local_config.get("arp")
+    if not isinstance(arp_section, Mapping):
+        return None
+
+    value = arp_section.get(key)
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        logger.warning("invalid arp.%s=%r in local.yml; using default=%d", key, value, default)
+        return None
+    return value
+
+
+def _extract_backup_dedup(local_config: Mapping[str, object] | None) -> bool | None:
+    if not isinstance(local_config, Mapping):
+        return None
+
+    backup_section = local_config.get("backup")
+    if not isinstance(backup_section, Mapping):
+        return None
+
+    value = backup_section.get("dedup")
+    return value if isinstance(value, bool) else None
+
+
 def _tcp_check(host: str, port: int, timeout: float = 3.0) -> bool:
     import socket
 
@@ -0,0 +1,304 @@
+"""Parsing of Cisco ``show ip arp`` output, ARP snapshot deltas and indexing of stored snapshots.
+
+Consecutive ARP tables differ in a handful of rows, but every row's age
+changes on every poll, so line diffs of the raw text are useless. Tables are
+compared as sets of rows keyed by ``(IP, MAC, interface, VLAN)`` instead.
+With an ARP keyframe interval above 1, a device keeps the raw table as a
+full snapshot every N polls and, in between, a ``<name>.delta`` holding only
+the rows that appeared or disappeared::
+
+    # ncb-arp-delta v1
+    # base: 2026-01-01_000000_arp.txt
+    # depth: 1
+    +Internet  10.0.0.5                12   aabb.cc00.0200  ARPA   Gi1/0/7
+    -Internet  10.0.0.5                 9   aabb.cc00.0200  ARPA   Gi1/0/1
+
+Rows are written in ``show ip arp`` layout so a delta parses like a table;
+a reconstructed table keeps each row's age from the poll that added it.
+
+Each device directory also keeps ``.arp-head.json`` naming its newest
+snapshot and that snapshot's delta depth, so storing a poll neither lists the
+directory nor reads the previous delta's header. Like the backup index it is
+self-healing: a missing or stale head is rebuilt from the directory listing.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+from app.common.arp_store import ArpEntry, ArpStore, SightingKey, format_timestamp, normalize_mac
+from app.common.delta_chain import delta_path_for, is_delta, strip_delta_suffix
+from app.core.compression import write_backup_text
+from app.core.pack_archive import open_pack, read_stored_text, stored_size
+
+ARP_SNAPSHOT_SUFFIX = "_arp.txt"
+ARP_HEAD_FILENAME = ".arp-head.json"
+_DELTA_MAGIC = "# ncb-arp-delta v1"
+_TIMESTAMP_FORMAT = "%Y-%m-%d_%H%M%S"
+
+# Internet  10.0.0.5   12   aabb.cc00.0200  ARPA   GigabitEthernet1/0/1
+_ARP_LINE = re.compile(
+    r"Internet\s+(?P<ip>\d{1,3}(?:\.\d{1,3}){3})\s+(?P<age>\d+|-)\s+"
+    r"(?P<mac>[0-9a-f]{4}\.[0-9a-f]{4}\.[0-9a-f]{4})\s+\S+(?:\s+(?P<interface>\S+))?",
+    re.IGNORECASE,
+)
+# SVIs carry their VLAN in the name; dot1q subinterfaces after the dot.
+_VLAN_INTERFACE = re.compile(r"(?:vlan|bdi)(\d+)|.*\.(\d+)", re.IGNORECASE)
+
+
+def _interface_vlan(interface: str) -> int | None:
+    match = _VLAN_INTERFACE.fullmatch(interface)
+    if match is None:
+        return None
+    return int(match.group(1) or match.group(2))
+
+
+def parse_arp_table(text: str) -> list[ArpEntry]:
+    """Resolved rows of ``show ip arp``; headers, prompts and ``Incomplete`` entries are skipped."""
+
+    entries: list[ArpEntry] = []
+    for line in text.splitlines():
+        match = _ARP_LINE.fullmatch(line.strip())
+        if match is None:
+            continue
+        age = match.group("age")
+        interface = match.group("interface") or ""
+        entries.append(
+            ArpEntry(
+                ip=match.group("ip"),
+                mac=normalize_mac(match.group("mac")),
+                interface=interface,
+                vlan=_interface_vlan(interface),
+                age_min=None if age == "-" else int(age),
+            )
+        )
+    return entries
+
+
+def format_arp_entry(entry: ArpEntry) -> str:
+    """``entry`` as a ``show ip arp`` row that :func:`parse_arp_table` reads back unchanged."""
+
+    digits = entry.mac.replace(":", "")
+    mac = f"{digits[0:4]}.{digits[4:8]}.{digits[8:12]}"
+    age = "-" if entry.age_min is None else str(entry.age_min)
+    return f"Internet  {entry.ip:<15}  {age:>9}   {mac}  ARPA   {entry.interface}".rstrip()
+
+
+@dataclass(slots=True)
+class ArpChanges:
+    """Row-set difference between two tables of one device.
+
+    A MAC that left one interface and appeared on another counts as ``moved``,
+    not as an added plus a removed row.
+    """
+
+    entries: int
+    added: list[ArpEntry]
+    removed: list[ArpEntry]
+    moved: int = 0
+
+    def counts(self) -> dict[str, int]:
+        return {
+            "entries": self.entries,
+            "added": len(self.added) - self.moved,
+            "removed": len(self.removed) - self.moved,
+            "moved": self.moved,
+        }
+
+
+def compare_arp_tables(previous: list[ArpEntry], current: list[ArpEntry]) -> ArpChanges:
+    previous_rows = {entry.key: entry for entry in previous}
+    current_rows = {entry.key: entry for entry in current}
+    added = [entry for key, entry in current_rows.items() if key not in previous_rows]
+    removed = [entry for key, entry in previous_rows.items() if key not in current_rows]
+    removed_interfaces: dict[str, set[str]] = {}
+    for entry in removed:
+        removed_interfaces.setdefault(entry.mac, set()).add(entry.interface)
+    moved = 0
+    for entry in added:
+        interfaces = removed_interfaces.get(entry.mac)
+        if interfaces and entry.interface not in interfaces:
+            moved += 1
+            del removed_interfaces[entry.mac]
+    return ArpChanges(entries=len(current_rows), added=added, removed=removed, moved=moved)
+
+
+def encode_arp_delta(changes: ArpChanges, base_name: str, depth: int) -> str:
+    lines = [_DELTA_MAGIC, f"# base: {base_name}", f"# depth: {depth}"]
+    lines += ["+" + format_arp_entry(entry) for entry in changes.added]
+    lines += ["-" + format_arp_entry(entry) for entry in changes.removed]
+    return "\n".join(lines) + "\n"
+
+
+def _decode_arp_delta(text: str, path: Path) -> tuple[str, int, list[ArpEntry], list[ArpEntry]]:
+    """``(base name, depth, added rows, removed rows)`` of an ARP delta."""
+
+    lines = text.splitlines()
+    if not lines or lines[0] != _DELTA_MAGIC:
+        raise ValueError(f"Not an ARP delta file: {path}")
+    fields: dict[str, str] = {}
+    position = 1
+    while position < len(lines) and lines[position].startswith("# "):
+        key, _, value = lines[position][2:].partition(":")
+        fields[key.strip()] = value.strip()
+        position += 1
+    try:
+        base, depth = fields["base"], int(fields["depth"])
+    except (KeyError, ValueError) as exc:
+        raise ValueError(f"Corrupt ARP delta header in {path}") from exc
+    body = lines[position:]
+    added = parse_arp_table("\n".join(line[1:] for line in body if line.startswith("+")))
+    removed = parse_arp_table("\n".join(line[1:] for line in body if line.startswith("-")))
+    return base, depth, added, removed
+
+
+def read_arp_snapshot(path: Path) -> list[ArpEntry]:
+    """Rows of a stored snapshot, rebuilding a delta from its full snapshot and the deltas in between.
+
+    Loose and packed (``history.pack``) files are read transparently.
+    """
+
+    deltas: list[tuple[list[ArpEntry], list[ArpEntry]]] = []
+    while is_delta(path):
+        base, _, added, removed = _decode_arp_delta(read_stored_text(path), path)
+        deltas.append((added, removed))
+        path = path.with_name(base)
+
+    rows: dict[SightingKey, ArpEntry] = {entry.key: entry for entry in parse_arp_table(read_stored_text(path))}
+    for added, removed in reversed(deltas):
+        for entry in removed:
+            rows.pop(entry.key, None)
+        for entry in added:
+            rows[entry.key] = entry
+    return list(rows.values())
+
+
+def snapshot_depth(path: Path) -> int:
+    """Number of deltas between ``path`` and its full snapshot (0 for a full snapshot)."""
+
+    if not is_delta(path):
+        return 0
+    return _decode_arp_delta(read_stored_text(path), path)[1]
+
+
+def _snapshot_names(device_dir: Path) -> list[tuple[datetime, str]]:
+    """Stored snapshots of a device, loose or packed, oldest first."""
+
+    names = {path.name for path in device_dir.iterdir() if path.is_file()}
+    archive = open_pack(device_dir)
+    if archive is not None:
+        names.update(archive.members)
+    return sorted((moment, name) for name in names if (moment := snapshot_time(name)) is not None)
+
+
+@dataclass(slots=True)
+class ArpHead:
+    """Newest stored snapshot of a device.
+
+    ``depth`` counts the deltas since its full snapshot. ``rows`` holds the
+    parsed table while the caller still has it in memory (see
+    :class:`app.cisco.arp_poller.ArpPoller`); otherwise it is read back from disk.
+    """
+
+    file: str
+    depth: int = 0
+    rows: list[ArpEntry] | None = None
+
+    def table(self, device_dir: Path) -> list[ArpEntry]:
+        return self.rows if self.rows is not None else read_arp_snapshot(device_dir / self.file)
+
+
+def read_arp_head(device_dir: Path) -> ArpHead | None:
+    """Head recorded in ``device_dir``, rebuilt from the stored snapshots when missing or stale."""
+
+    try:
+        data = json.loads((device_dir / ARP_HEAD_FILENAME).read_text(encoding="utf-8"))
+        head = ArpHead(file=str(data["file"]), depth=int(data["depth"]))
+    except (OSError, ValueError, TypeError, KeyError):
+        head = None
+    if head is not None and stored_size(device_dir / head.file) is not None:
+        return head
+
+    snapshots = _snapshot_names(device_dir) if device_dir.is_dir() else []
+    if not snapshots:
+        return None
+    name = snapshots[-1][1]
+    try:
+        depth = snapshot_depth(device_dir / name)
+    except (OSError, ValueError):
+        # An unreadable baseline cannot be diffed against, so the next poll is stored in full anyway.
+        depth = 0
+    return ArpHead(name, depth)
+
+
+def _write_arp_head(device_dir: Path, head: ArpHead) -> None:
+    path = device_dir / ARP_HEAD_FILENAME
+    temp_path = path.with_name(f"{path.name}.tmp")
+    temp_path.write_text(json.dumps({"file": head.file, "depth": head.depth}), encoding="utf-8")
+    os.replace(temp_path, path)
+
+
+def store_arp_snapshot(
+    snapshot_path: Path,
+    content: str,
+    entries: list[ArpEntry],
+    changes: ArpChanges | None,
+    head: ArpHead | None,
+    keyframe_interval: int,
+) -> ArpHead:
+    """Store a polled table and record it as the device's new head.
+
+    Only the delta against ``head`` is written while the chain since the last
+    full snapshot is shorter than ``keyframe_interval`` polls; otherwise (or
+    without ``changes``) ``content`` is written in full at ``snapshot_path``.
+    The returned head keeps ``entries`` for the next comparison.
+    """
+
+    depth = head.depth + 1 if head is not None and changes is not None else keyframe_interval
+    if depth < keyframe_interval:
+        stored = write_backup_text(delta_path_for(snapshot_path), encode_arp_delta(changes, head.file, depth))
+    else:
+        stored, depth = write_backup_text(snapshot_path, content), 0
+    new_head = ArpHead(stored.name, depth, entries)
+    _write_arp_head(snapshot_path.parent, new_head)
+    return new_head
+
+
+def snapshot_time(name: str) -> datetime | None:
+    """UTC capture time of a ``<YYYY-MM-DD_HHMMSS>_arp.txt[.delta][.gz|.zst]`` snapshot name."""
+
+    name = strip_delta_suffix(name)
+    if not name.endswith(ARP_SNAPSHOT_SUFFIX):
+        return None
+    try:
+        return datetime.strptime(name[: -len(ARP_SNAPSHOT_SUFFIX)], _TIMESTAMP_FORMAT).replace(tzinfo=timezone.utc)
+    except ValueError:
+        return None
+
+
+@dataclass(slots=True)
+class ArpImportResult:
+    """Snapshots of one device read into the store, and those already indexed."""
+
+    device: str
+    imported: int = 0
+    skipped: int = 0
+
+
+def import_arp_snapshots(device_dir: Path, store: ArpStore) -> ArpImportResult:
+    """Index the device's stored snapshots (loose or packed, full or delta) newer than its last indexed one."""
+
+    result = ArpImportResult(device=device_dir.name)
+    last_indexed = store.last_snapshot(device_dir.name)
+    for moment, name in _snapshot_names(device_dir):
+        if last_indexed is not None and format_timestamp(moment) <= last_indexed:
+            result.skipped += 1
+            continue
+        store.record(device_dir.name, moment, read_arp_snapshot(device_dir / name))
+        result.imported += 1
+    return result
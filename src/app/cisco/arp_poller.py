@@ -0,0 +1,281 @@
+"""Repeated Cisco ARP collection over SSH sessions kept open between polls.
+
+A one-shot ``--cisco-arp`` run logs in, enables, disables paging, collects and
+logs out. :class:`ArpPoller` does the login part once per device and then
+re-runs ``show ip arp`` every ``interval`` seconds on the same
+:meth:`CiscoClient.session`, storing each table exactly like
+:func:`backup_arp_table` (snapshot or delta, changes, sighting index). The
+last table of every device stays in memory, so each poll is compared with it
+and written as a delta without reading anything back from disk.
+
+* A reused session that fails (idle timeout on the device, reload) is
+  reopened and the poll retried once straight away.
+* A device that fails on a fresh session is retried in the next cycle, then
+  skips ``2**(n-1) - 1`` cycles after its ``n``-th consecutive failure (at
+  most :data:`MAX_RECONNECT_BACKOFF` seconds' worth), so an unreachable
+  switch or a rejecting AAA server is not hammered every cycle.
+* At most ``max_sessions`` sessions stay open. Above the cap the least
+  recently polled idle session is closed before a new one is opened, so
+  those devices log in on every poll instead.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable
+
+from app.cisco.arp import ArpChanges, ArpHead
+from app.cisco.backup import backup_arp_table
+from app.cisco.client import CiscoClient
+from app.core.logging import device_log_context
+from app.core.storage import StorageOptions
+
+DEFAULT_ARP_POLL_INTERVAL = 60
+DEFAULT_ARP_MAX_SESSIONS = 100
+MAX_RECONNECT_BACKOFF = 900.0
+
+ArpCollector = Callable[..., "tuple[Path, ArpChanges | None]"]
+
+
+@dataclass(slots=True)
+class _PollTarget:
+    client: CiscoClient
+    session: ExitStack | None = None
+    failures: int = 0
+    skip_cycles: int = 0
+
+
+@dataclass(slots=True)
+class ArpPollStats:
+    """Outcome of one polling cycle across all devices."""
+
+    cycle: int
+    polled: int = 0
+    failed: int = 0
+    deferred: int = 0
+    logins: int = 0
+    reconnects: int = 0
+    sessions_open: int = 0
+    changes: dict[str, int] = field(default_factory=lambda: {"added": 0, "removed": 0, "moved": 0})
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record(self, outcome: str, changes: ArpChanges | None = None) -> None:
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+            if changes is not None:
+                for key, value in changes.counts().items():
+                    if key in self.changes:
+                        self.changes[key] += value
+
+
+class ArpPoller:
+    """Poll the ARP table of every client every ``interval`` seconds until stopped.
+
+    Devices of one cycle are polled by up to ``workers`` threads (never more
+    than ``max_sessions``). Use as a context manager, or call :meth:`close`, to
+    log out of every open session.
+    """
+
+    def __init__(
+        self,
+        clients: Iterable[CiscoClient],
+        arp_dir: Path,
+        logger: logging.Logger,
+        storage: StorageOptions | None = None,
+        *,
+        interval: float = DEFAULT_ARP_POLL_INTERVAL,
+        max_sessions: int = DEFAULT_ARP_MAX_SESSIONS,
+        workers: int = 1,
+        collect: ArpCollector = backup_arp_table,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if interval <= 0 or max_sessions < 1:
+            raise ValueError("interval and max_sessions must be positive")
+        self.arp_dir = arp_dir
+        self.logger = logger
+        self.storage = storage
+        self.interval = interval
+        self.max_sessions = max_sessions
+        self._targets = [_PollTarget(client) for client in clients]
+        self._heads: dict[str, ArpHead] = {}
+        self._collect = collect
+        self._clock = clock
+        self._open: OrderedDict[str, _PollTarget] = OrderedDict()
+        self._busy: set[str] = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, min(workers, max_sessions, len(self._targets) or 1)),
+            thread_name_prefix="arp-poll",
+        )
+
+    def __enter__(self) -> ArpPoller:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @property
+    def sessions_open(self) -> int:
+        with self._lock:
+            return len(self._open)
+
+    def run(self, cycles: int | None = None, stop: threading.Event | None = None) -> int:
+        """Poll on schedule until ``stop`` is set or ``cycles`` cycles ran; returns the cycles run.
+
+        Cycles start every ``interval`` seconds; one that overruns its
+        interval is followed by the next immediately rather than by a burst
+        of catch-up cycles.
+        """
+
+        stop = stop or threading.Event()
+        cycle = 0
+        next_start = self._clock()
+        while cycles is None or cycle < cycles:
+            if stop.wait(max(0.0, next_start - self._clock())):
+                break
+            cycle += 1
+            started = self._clock()
+            stats = self.poll_once(cycle)
+            elapsed = self._clock() - started
+            self.logger.info(
+                "arp-poll cycle=%d devices=%d polled=%d failed=%d deferred=%d logins=%d reconnects=%d "
+                "sessions_open=%d added=%d removed=%d moved=%d elapsed_s=%.1f",
+                stats.cycle,
+                len(self._targets),
+                stats.polled,
+                stats.failed,
+                stats.deferred,
+                stats.logins,
+                stats.reconnects,
+                stats.sessions_open,
+                stats.changes["added"],
+                stats.changes["removed"],
+                stats.changes["moved"],
+                elapsed,
+            )
+            next_start += self.interval
+            if self._clock() > next_start:
+                self.logger.warning(
+                    "arp-poll cycle=%d overran interval_s=%s elapsed_s=%.1f", cycle, self.interval, elapsed
+                )
+                next_start = self._clock()
+        return cycle
+
+    def poll_once(self, cycle: int = 1) -> ArpPollStats:
+        """Poll every device once and wait for all of them."""
+
+        stats = ArpPollStats(cycle=cycle)
+        list(self._executor.map(lambda target: self._poll(target, stats), self._targets))
+        stats.sessions_open = self.sessions_open
+        return stats
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            targets = list(self._open.values())
+            self._open.clear()
+        for target in targets:
+            self._close_session(target)
+
+    def _poll(self, target: _PollTarget, stats: ArpPollStats) -> None:
+        client = target.client
+        log_extra = {"device": client.name}
+        if target.skip_cycles > 0:
+            target.skip_cycles -= 1
+            stats.record("deferred")
+            return
+
+        with device_log_context(client.name):
+            self._acquire(target)
+            try:
+                for attempt in range(2):
+                    reused = target.session is not None
+                    try:
+                        if not reused:
+                            self._open_session(target, log_extra)
+                            stats.record("logins")
+                        _, changes = self._collect(
+                            client, self.arp_dir, self.logger, log_extra, self.storage, heads=self._heads
+                        )
+                    except Exception:
+                        self._close_session(target)
+                        if reused and attempt == 0:
+                            self.logger.warning(
+                                "device=%s arp-poll session lost; reconnecting", client.name, extra=log_extra
+                            )
+                            stats.record("reconnects")
+                            continue
+                        target.failures += 1
+                        target.skip_cycles = min(
+                            2 ** (target.failures - 1) - 1, int(MAX_RECONNECT_BACKOFF // self.interval)
+                        )
+                        self.logger.exception(
+                            "device=%s arp-poll failed failures=%d skip_cycles=%d",
+                            client.name,
+                            target.failures,
+                            target.skip_cycles,
+                            extra=log_extra,
+                        )
+                        stats.record("failed")
+                        return
+                    target.failures = 0
+                    stats.record("polled", changes)
+                    return
+            finally:
+                self._release(target)
+
+    def _acquire(self, target: _PollTarget) -> None:
+        """Mark ``target`` busy; above the cap, close least recently polled idle sessions first."""
+
+        name = target.client.name
+        with self._lock:
+            self._busy.add(name)
+            if name in self._open:
+                self._open.move_to_end(name)
+                return
+            evicted: list[_PollTarget] = []
+            for other_name, other in list(self._open.items()):
+                if len(self._open) < self.max_sessions:
+                    break
+                if other_name not in self._busy:
+                    evicted.append(self._open.pop(other_name))
+            # Reserve the slot before logging in outside the lock.
+            self._open[name] = target
+        for other in evicted:
+            self.logger.debug(
+                "device=%s arp-poll session closed to stay within max_sessions=%d",
+                other.client.name,
+                self.max_sessions,
+                extra={"device": other.client.name},
+            )
+            self._close_session(other)
+
+    def _release(self, target: _PollTarget) -> None:
+        name = target.client.name
+        with self._lock:
+            self._busy.discard(name)
+            if target.session is None:
+                self._open.pop(name, None)
+
+    def _open_session(self, target: _PollTarget, log_extra: dict[str, str]) -> None:
+        stack = ExitStack()
+        stack.enter_context(target.client.session(self.logger, log_extra))
+        target.session = stack
+
+    def _close_session(self, target: _PollTarget) -> None:
+        session, target.session = target.session, None
+        if session is None:
+            return
+        try:
+            session.close()
+        except Exception:
+            self.logger.debug(
+                "device=%s arp-poll session close failed", target.client.name, extra={"device": target.client.name}
+            )
@@ -0,0 +1,320 @@
+"""Asyncio-based Cisco SSH client built on ``asyncssh``.
+
+This transport mirrors :class:`app.cisco.client.CiscoClient` but drives the
+interactive shell on an event loop, so a single process can keep thousands of
+device sessions in flight without one OS thread per device. ``asyncssh`` is an
+optional dependency and is only imported when this transport is selected.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Mapping, TextIO
+
+from app.cisco.client import (
+    CiscoAuthenticationError,
+    CiscoClientError,
+    CiscoConnectionError,
+    CiscoEnableError,
+    _ShellBuffer,
+    _command_failed,
+    _extract_command_output,
+    _extract_prompt,
+)
+from app.core.logging import sanitize_log_extra
+
+try:
+    import asyncssh
+except ImportError:  # pragma: no cover - optional dependency
+    asyncssh = None
+
+
+def _require_asyncssh() -> None:
+    if asyncssh is None:
+        raise CiscoClientError("The asyncssh transport requires the 'asyncssh' package.")
+
+
+@dataclass(slots=True)
+class AsyncCiscoSSHSession:
+    """Active asyncssh interactive shell with prompt metadata."""
+
+    connection: Any
+    process: Any
+    timeout: float
+    logger: logging.Logger
+    log_extra: dict[str, Any]
+    device_name: str
+    prompt: str | None = field(init=False, default=None)
+    prompt_mode: str | None = field(init=False, default=None)
+
+    async def initialize_prompt(self) -> None:
+        """Detect the initial prompt after the shell has been opened."""
+
+        self.send("")
+        try:
+            buffer = await self.wait_for_prompt()
+        except (TimeoutError, CiscoClientError):
+            return
+
+        prompt = _extract_prompt(buffer)
+        if prompt is not None:
+            self.logger.debug(
+                "device=%s initial prompt detected prompt=%s",
+                self.device_name,
+                prompt,
+                extra=self.log_extra,
+            )
+
+    def _update_prompt(self, prompt: str) -> None:
+        self.prompt = prompt
+        if prompt.endswith("#"):
+            self.prompt_mode = "privileged"
+        elif prompt.endswith(">"):
+            self.prompt_mode = "user"
+        else:
+            self.prompt_mode = None
+
+    async def _read_chunk(self, deadline: float) -> str:
+        remaining = deadline - asyncio.get_running_loop().time()
+        if remaining <= 0:
+            raise TimeoutError("Timed out reading from SSH channel.")
+        try:
+            data = await asyncio.wait_for(self.process.stdout.read(4096), remaining)
+        except asyncio.TimeoutError as exc:
+            raise TimeoutError("Timed out reading from SSH channel.") from exc
+        if not data:
+            raise CiscoConnectionError("SSH channel closed by device")
+        return data
+
+    async def wait_for(self, substring: str, timeout: float | None = None) -> str:
+        """Read from the shell until ``substring`` is found or timeout expires."""
+
+        buffer = _ShellBuffer()
+        deadline = asyncio.get_running_loop().time() + (timeout or self.timeout)
+        while True:
+            try:
+                text = await self._read_chunk(deadline)
+            except TimeoutError as exc:
+                raise TimeoutError(f"Timed out waiting for substring: {substring}") from exc
+            buffer.feed(text)
+            prompt = buffer.prompt
+            if prompt:
+                self._update_prompt(prompt)
+            if buffer.received(substring, text):
+                return buffer.getvalue()
+
+    async def wait_for_prompt(self, timeout: float | None = None, sink: TextIO | None = None) -> str:
+        """Read from the shell until a prompt (``>`` or ``#``) is detected.
+
+        With ``sink`` the output is written to it as it arrives and ``""`` is returned.
+        """
+
+        buffer = _ShellBuffer(sink)
+        deadline = asyncio.get_running_loop().time() + (timeout or self.timeout)
+        while True:
+            try:
+                buffer.feed(await self._read_chunk(deadline))
+            except TimeoutError as exc:
+                raise TimeoutError("Timed out waiting for prompt.") from exc
+            prompt = buffer.prompt
+            if prompt:
+                self._update_prompt(prompt)
+                return buffer.getvalue()
+
+    def send(self, command: str) -> None:
+        """Send a raw command to the shell with newline."""
+
+        self.process.stdin.write(command + "\n")
+
+    async def run_command(self, command: str, sink: TextIO | None = None) -> str:
+        """Send a command and wait for a prompt, returning the raw buffer."""
+
+        self.send(command)
+        return await self.wait_for_prompt(sink=sink)
+
+    async def close(self) -> None:
+        """Close the shell and the underlying connection."""
+
+        try:
+            self.process.close()
+        finally:
+            self.connection.close()
+            await self.connection.wait_closed()
+            self.logger.debug("device=%s ssh session closed", self.device_name, extra=self.log_extra)
+
+
+@dataclass(slots=True)
+class AsyncCiscoClient:
+    """Asyncio SSH client for Cisco devices."""
+
+    host: str
+    username: str
+    password: str
+    name: str
+    enable_password: str | None = None
+    port: int = 22
+    timeout: float = 5.0
+    initial_prompt: str | None = field(init=False, default=None)
+    prompt_mode: str | None = field(init=False, default=None)
+    _active_session: AsyncCiscoSSHSession | None = field(init=False, default=None, repr=False)
+
+    def _log_extra(self, extra: Mapping[str, Any] | None = None) -> dict[str, Any]:
+        base: dict[str, Any] = {"device": self.name}
+        if extra:
+            base.update(extra)
+        return sanitize_log_extra(base)
+
+    @asynccontextmanager
+    async def session(
+        self, logger: logging.Logger, log_extra: Mapping[str, Any] | None = None
+    ) -> AsyncIterator[AsyncCiscoSSHSession]:
+        """Keep one prepared SSH session open for every command run inside the block.
+
+        Same contract as :meth:`app.cisco.client.CiscoClient.session`.
+        """
+
+        if self._active_session is not None:
+            yield self._active_session
+            return
+
+        resolved_log_extra = self._log_extra(log_extra)
+        session: AsyncCiscoSSHSession | None = None
+        try:
+            session = await self._connect(logger, resolved_log_extra)
+            await self._ensure_enable(session, logger, resolved_log_extra)
+            await self._disable_paging(session, logger, resolved_log_extra)
+            self._active_session = session
+            yield session
+        finally:
+            self._active_session = None
+            if session is not None:
+                await session.close()
+
+    async def _connect(self, logger: logging.Logger, log_extra: dict[str, Any]) -> AsyncCiscoSSHSession:
+        _require_asyncssh()
+        logger.info("device=%s checking ssh connectivity", self.name, extra=log_extra)
+        try:
+            connection = await asyncssh.connect(
+                self.host,
+                port=self.port,
+                username=self.username,
+                password=self.password,
+                known_hosts=None,
+                client_keys=None,
+                agent_path=None,
+                connect_timeout=self.timeout,
+                login_timeout=self.timeout,
+            )
+        except asyncssh.PermissionDenied as exc:  # pragma: no cover - network dependent
+            logger.error("device=%s ssh authentication failed", self.name, extra=log_extra)
+            raise CiscoAuthenticationError("SSH authentication failed") from exc
+        except (asyncssh.Error, OSError, asyncio.TimeoutError) as exc:  # pragma: no cover - network dependent
+            logger.error("device=%s ssh connection error", self.name, extra=log_extra)
+            raise CiscoConnectionError("SSH connection error") from exc
+
+        logger.info("device=%s ssh connected", self.name, extra=log_extra)
+        try:
+            process = await connection.create_process(term_type="vt100", encoding="utf-8", errors="replace")
+        except (asyncssh.Error, OSError) as exc:  # pragma: no cover - network dependent
+            connection.close()
+            raise CiscoConnectionError("Unable to open interactive shell") from exc
+
+        session = AsyncCiscoSSHSession(
+            connection=connection,
+            process=process,
+            timeout=self.timeout,
+            logger=logger,
+            log_extra=log_extra,
+            device_name=self.name,
+        )
+        await session.initialize_prompt()
+        self.initial_prompt = session.prompt
+        self.prompt_mode = session.prompt_mode
+        return session
+
+    async def fetch_running_config(
+        self, logger: logging.Logger, log_extra: Mapping[str, Any] | None = None
+    ) -> str:
+        """Return the raw running-config output, reusing an open session if any."""
+
+        return await self.run_show_command("show running-config", logger, log_extra)
+
+    async def stream_running_config(
+        self, sink: TextIO, logger: logging.Logger, log_extra: Mapping[str, Any] | None = None
+    ) -> None:
+        """Write the raw running-config output to ``sink`` as it arrives."""
+
+        await self.run_show_command("show running-config", logger, log_extra, sink=sink)
+
+    async def fetch_arp_table(
+        self, logger: logging.Logger, log_extra: Mapping[str, Any] | None = None
+    ) -> str:
+        """Return parsed ``show ip arp`` output, reusing an open session if any."""
+
+        raw_output = await self.run_show_command("show ip arp", logger, log_extra)
+        return _extract_command_output(raw_output, "show ip arp")
+
+    async def run_show_command(
+        self,
+        command: str,
+        logger: logging.Logger,
+        log_extra: Mapping[str, Any] | None = None,
+        sink: TextIO | None = None,
+    ) -> str:
+        """Run ``command`` in privileged EXEC and return the raw shell buffer."""
+
+        try:
+            async with self.session(logger, log_extra) as session:
+                return await session.run_command(command, sink=sink)
+        except TimeoutError as exc:
+            raise CiscoClientError("Timed out during Cisco command execution.") from exc
+
+    async def _ensure_enable(
+        self, session: AsyncCiscoSSHSession, logger: logging.Logger, log_extra: Mapping[str, Any]
+    ) -> None:
+        """Move the session to privileged EXEC mode when requested."""
+
+        if session.prompt_mode == "privileged":
+            logger.info("device=%s enable not required (already privileged)", self.name, extra=log_extra)
+            return
+
+        if not self.enable_password:
+            logger.info("device=%s enable skipped (no enable_password)", self.name, extra=log_extra)
+            return
+
+        logger.info("device=%s enable requested", self.name, extra=log_extra)
+        try:
+            session.send("enable")
+            await session.wait_for("Password:")
+            session.send(self.enable_password)
+            await session.wait_for_prompt()
+        except Exception as exc:
+            logger.error("device=%s enable failed", self.name, extra=log_extra)
+            raise CiscoEnableError("Failed to enter privileged EXEC mode.") from exc
+
+        if session.prompt_mode != "privileged":
+            logger.error("device=%s enable failed", self.name, extra=log_extra)
+            raise CiscoEnableError("Privileged prompt not detected after enable.")
+
+        logger.info("device=%s enable ok", self.name, extra=log_extra)
+
+    async def _disable_paging(
+        self, session: AsyncCiscoSSHSession, logger: logging.Logger, log_extra: Mapping[str, Any]
+    ) -> None:
+        """Disable paging to capture full command output."""
+
+        logger.info("device=%s disabling paging", self.name, extra=log_extra)
+        try:
+            output = await session.run_command("terminal length 0")
+        except Exception:
+            logger.warning("device=%s paging disable failed; continuing", self.name, extra=log_extra)
+            return
+
+        if _command_failed(output) or _extract_prompt(output) is None:
+            logger.warning("device=%s paging disable failed; continuing", self.name, extra=log_extra)
+            return
+
+        logger.info("device=%s paging disabled", self.name, extra=log_extra)
@@ -2,15 +2,44 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import sqlite3
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from app.core.logging import sanitize_log_extra
+from app.cisco.arp import (
+    ARP_SNAPSHOT_SUFFIX,
+    ArpChanges,
+    ArpHead,
+    compare_arp_tables,
+    parse_arp_table,
+    read_arp_head,
+    store_arp_snapshot,
+)
 from app.cisco.client import CiscoClient
-from app.core.storage import ensure_directory
-from app.common.diff import DiffOutcome, evaluate_change
-from app.core.normalize import normalize_cisco_running_config
+from app.common.arp_store import ArpEntry, ArpStore
+from app.core.storage import (
+    DEFAULT_ARP_KEYFRAME_INTERVAL,
+    DEFAULT_DIFF_MODE,
+    BackupStream,
+    StorageOptions,
+    ensure_directory,
+)
+from app.common.diff import DiffOutcome, commit_backup, deduplicate_backup, store_as_delta
+from app.common.delta_chain import delta_path_for
+from app.common.diff_engine import DEFAULT_DIFF_ENGINE
+from app.common.diff_stage import DiffJob, DiffStage, PendingDiff
+from app.common.structural_diff import cisco_blocks, format_section_changes
+from app.core.compression import NO_COMPRESSION, compressed_name, open_backup_text
+from app.core.normalize import Normalizer, normalize_cisco_running_config
+
+if TYPE_CHECKING:
+    from app.cisco.async_client import AsyncCiscoClient
+
+RUNNING_CONFIG_PATTERN = "*_running-config.txt"
 
 
 def backup_device(
@@ -18,47 +47,210 @@ def backup_device(
     backup_dir: Path,
     logger: logging.Logger | None = None,
     log_extra: dict | None = None,
+    storage: StorageOptions | None = None,
+    normalizer: Normalizer | None = None,
 ) -> tuple[Path, DiffOutcome, Path | None]:
-    """Perform a backup for a Cisco device and save it to disk."""
+    """Perform a backup for a Cisco device and save it to disk.
+
+    The running-config is streamed into a temporary file while it is read
+    from the device and renamed into place only after it passes validation.
+    ``normalizer`` defaults to :func:`normalize_cisco_running_config`.
+    The diff runs on ``storage.diff_stage`` and is waited for here; callers
+    that close the session first use :func:`fetch_running_config` and
+    :func:`finish_running_config` instead.
+    """
 
     resolved_logger = logger or logging.getLogger(__name__)
-    sanitized_extra = sanitize_log_extra(log_extra)
-    log_extra = {"device": client.name, **sanitized_extra}
+    log_extra = {"device": client.name, **sanitize_log_extra(log_extra)}
+    storage = storage or StorageOptions()
+    pending = fetch_running_config(client, backup_dir, resolved_logger, log_extra, storage, normalizer)
+    pending.submit(storage.diff_stage or DiffStage())
+    return finish_running_config(pending, resolved_logger, log_extra, storage)
 
-    resolved_logger.info("device=%s fetching running-config", client.name, extra=log_extra)
-    try:
-        content = client.fetch_running_config(resolved_logger, log_extra)
-    except Exception:
-        resolved_logger.error("device=%s running-config retrieval failed", client.name, extra=log_extra)
-        raise
 
-    if not _is_valid_running_config(content):
-        resolved_logger.error("device=%s running-config sanity-check failed", client.name, extra=log_extra)
-        raise ValueError("Invalid running-config output.")
+async def backup_device_async(
+    client: AsyncCiscoClient,
+    backup_dir: Path,
+    logger: logging.Logger | None = None,
+    log_extra: dict | None = None,
+    storage: StorageOptions | None = None,
+    normalizer: Normalizer | None = None,
+) -> tuple[Path, DiffOutcome, Path | None]:
+    """Asyncio variant of :func:`backup_device` for the asyncssh transport."""
+
+    resolved_logger = logger or logging.getLogger(__name__)
+    log_extra = {"device": client.name, **sanitize_log_extra(log_extra)}
+    storage = storage or StorageOptions()
+    pending = await fetch_running_config_async(client, backup_dir, resolved_logger, log_extra, storage, normalizer)
+    await asyncio.to_thread(pending.submit, storage.diff_stage or DiffStage())
+    if pending.future is not None:
+        await asyncio.wrap_future(pending.future)
+    return await asyncio.to_thread(finish_running_config, pending, resolved_logger, log_extra, storage)
+
+
+def fetch_running_config(
+    client: CiscoClient,
+    backup_dir: Path,
+    logger: logging.Logger | None = None,
+    log_extra: dict | None = None,
+    storage: StorageOptions | None = None,
+    normalizer: Normalizer | None = None,
+) -> PendingDiff:
+    """Stream, validate and commit the running-config; the diff is left to the caller.
+
+    Submit the returned :class:`PendingDiff` once the session is closed and
+    pass it to :func:`finish_running_config`.
+    """
+
+    resolved_logger = logger or logging.getLogger(__name__)
+    log_extra = {"device": client.name, **sanitize_log_extra(log_extra)}
+
+    storage = storage or StorageOptions()
+    backup_path = _running_config_path(client.name, backup_dir, resolved_logger, log_extra, storage)
+    store = storage.blob_store(backup_dir)
+    with BackupStream(backup_path, store=store, compression=storage.compression) as stream:
+        resolved_logger.info("device=%s fetching running-config", client.name, extra=log_extra)
+        try:
+            client.stream_running_config(stream, resolved_logger, log_extra)
+        except Exception:
+            resolved_logger.error("device=%s running-config retrieval failed", client.name, extra=log_extra)
+            raise
+
+        return _store_running_config(client.name, stream, resolved_logger, log_extra, storage, normalizer)
+
+
+async def fetch_running_config_async(
+    client: AsyncCiscoClient,
+    backup_dir: Path,
+    logger: logging.Logger | None = None,
+    log_extra: dict | None = None,
+    storage: StorageOptions | None = None,
+    normalizer: Normalizer | None = None,
+) -> PendingDiff:
+    """Asyncio variant of :func:`fetch_running_config` for the asyncssh transport.
+
+    Only the network exchange runs on the event loop; committing is handed
+    to a worker thread so it does not stall other sessions.
+    """
 
-    resolved_logger.info("device=%s running-config retrieved", client.name, extra=log_extra)
+    resolved_logger = logger or logging.getLogger(__name__)
+    log_extra = {"device": client.name, **sanitize_log_extra(log_extra)}
+
+    storage = storage or StorageOptions()
+    backup_path = _running_config_path(client.name, backup_dir, resolved_logger, log_extra, storage)
+    store = storage.blob_store(backup_dir)
+    with BackupStream(backup_path, store=store, compression=storage.compression) as stream:
+        resolved_logger.info("device=%s fetching running-config", client.name, extra=log_extra)
+        try:
+            await client.stream_running_config(stream, resolved_logger, log_extra)
+        except Exception:
+            resolved_logger.error("device=%s running-config retrieval failed", client.name, extra=log_extra)
+            raise
+
+        return await asyncio.to_thread(
+            _store_running_config, client.name, stream, resolved_logger, log_extra, storage, normalizer
+        )
+
+
+def finish_running_config(
+    pending: PendingDiff,
+    logger: logging.Logger,
+    log_extra: dict,
+    storage: StorageOptions | None = None,
+) -> tuple[Path, DiffOutcome, Path | None]:
+    """Wait for the diff of a committed running-config, log it and apply the storage backend.
+
+    Returns the stored path (a delta file with ``backend="delta"``), the
+    outcome and the ``.diff`` path when the config changed.
+    """
 
+    diff_outcome, diff_path = pending.result()
+    if pending.job is None:
+        return pending.path, diff_outcome, None
+
+    device_name = log_extra.get("device", "-")
+    _log_cisco_diff(pending.path, diff_outcome, diff_path, logger, log_extra)
+    backup_path = pending.path
+    if storage is not None and storage.backend == "delta":
+        stored_path = store_as_delta(backup_path, diff_outcome, RUNNING_CONFIG_PATTERN, storage.keyframe_interval)
+        if stored_path != backup_path:
+            logger.info("device=%s running-config stored as delta path=%s", device_name, stored_path, extra=log_extra)
+        backup_path = stored_path
+    return backup_path, diff_outcome, diff_path
+
+
+def _running_config_path(
+    device_name: str, backup_dir: Path, logger: logging.Logger, log_extra: dict, storage: StorageOptions
+) -> Path:
     timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%d_%H%M%S")
-    target_dir = ensure_directory(backup_dir / "cisco" / client.name)
-    backup_path = target_dir / f"{timestamp}_running-config.txt"
+    target_dir = ensure_directory(backup_dir / "cisco" / device_name)
+    backup_path = target_dir / compressed_name(f"{timestamp}_running-config.txt", storage.compression)
 
     if backup_path.exists():
-        resolved_logger.error("device=%s running-config retrieval failed", client.name, extra=log_extra)
+        logger.error("device=%s running-config retrieval failed", device_name, extra=log_extra)
         raise FileExistsError(f"Backup file already exists: {backup_path}")
+    return backup_path
 
-    backup_path.write_text(content, encoding="utf-8")
-    size = backup_path.stat().st_size if backup_path.exists() else 0
+
+def _store_running_config(
+    device_name: str,
+    stream: BackupStream,
+    logger: logging.Logger,
+    log_extra: dict,
+    storage: StorageOptions | None = None,
+    normalizer: Normalizer | None = None,
+) -> PendingDiff:
+    """Validate and commit a streamed running-config and prepare its diff job.
+
+    In dedup mode an unchanged config is not committed; the returned path is
+    the existing backup it was deduplicated against.
+    """
+
+    normalizer = normalizer or normalize_cisco_running_config
+    stream.finish()
+    with open_backup_text(stream.temp_path, errors="replace") as handle:
+        valid = any(_is_valid_running_config(line) for line in handle)
+    if not valid:
+        logger.error("device=%s running-config sanity-check failed", device_name, extra=log_extra)
+        raise ValueError("Invalid running-config output.")
+
+    logger.info("device=%s running-config retrieved", device_name, extra=log_extra)
+
+    if storage is not None and storage.dedup:
+        outcome = deduplicate_backup(stream, RUNNING_CONFIG_PATTERN, normalizer)
+        if outcome is not None:
+            logger.info(
+                "device=%s config_changed=false deduplicated=true reference=%s",
+                device_name,
+                outcome.current_path,
+                extra=log_extra,
+            )
+            return PendingDiff.resolved(outcome.current_path, outcome)
+
+    try:
+        backup_path = commit_backup(stream, normalizer)
+    except FileExistsError:
+        logger.error("device=%s running-config retrieval failed", device_name, extra=log_extra)
+        raise
+    size = stream.size
 
     if size <= 0:
-        resolved_logger.error("device=%s running-config retrieval failed", client.name, extra=log_extra)
+        logger.error("device=%s running-config retrieval failed", device_name, extra=log_extra)
         raise ValueError("Backup file is empty after write.")
 
-    resolved_logger.info(
-        "device=%s running-config saved path=%s size=%d", client.name, backup_path, size, extra=log_extra
+    logger.info(
+        "device=%s running-config saved path=%s size=%d sha256=%s",
+        device_name,
+        backup_path,
+        size,
+        stream.sha256,
+        extra=log_extra,
     )
-    diff_outcome, diff_path = _log_cisco_diff(backup_path, resolved_logger, log_extra)
-    return backup_path, diff_outcome, diff_path
-
+    diff_mode = storage.diff_mode if storage is not None else DEFAULT_DIFF_MODE
+    diff_engine = storage.diff_engine if storage is not None else DEFAULT_DIFF_ENGINE
+    keep_baseline = storage is not None and storage.backend == "delta"
+    job = _cisco_diff_job(backup_path, logger, log_extra, diff_mode, normalizer, diff_engine, keep_baseline)
+    return PendingDiff(backup_path, job)
 
 
 def backup_arp_table(
@@ -66,8 +258,16 @@ def backup_arp_table(
     arp_dir: Path,
     logger: logging.Logger | None = None,
     log_extra: dict | None = None,
-) -> Path:
-    """Collect Cisco ARP table and save it to disk."""
+    storage: StorageOptions | None = None,
+    heads: dict[str, ArpHead] | None = None,
+) -> tuple[Path, ArpChanges | None]:
+    """Collect Cisco ARP table and save it to disk.
+
+    Returns the stored snapshot (full or delta) and its row changes against
+    the previous snapshot, ``None`` for a device's first snapshot. ``heads``
+    keeps each device's newest snapshot and its parsed rows between calls, so
+    repeated polls compare against memory instead of rebuilding the table.
+    """
 
     resolved_logger = logger or logging.getLogger(__name__)
     sanitized_extra = sanitize_log_extra(log_extra)
@@ -80,26 +280,144 @@ def backup_arp_table(
         resolved_logger.error("device=%s cisco arp collection failed", client.name, extra=log_extra)
         raise
 
-    if not content.strip():
+    return _store_arp_table(client.name, content, arp_dir, resolved_logger, log_extra, storage, heads)
+
+
+async def backup_arp_table_async(
+    client: AsyncCiscoClient,
+    arp_dir: Path,
+    logger: logging.Logger | None = None,
+    log_extra: dict | None = None,
+    storage: StorageOptions | None = None,
+) -> tuple[Path, ArpChanges | None]:
+    """Asyncio variant of :func:`backup_arp_table` for the asyncssh transport."""
+
+    resolved_logger = logger or logging.getLogger(__name__)
+    sanitized_extra = sanitize_log_extra(log_extra)
+    log_extra = {"device": client.name, **sanitized_extra}
+
+    resolved_logger.info("device=%s collecting cisco arp", client.name, extra=log_extra)
+    try:
+        content = await client.fetch_arp_table(resolved_logger, log_extra)
+    except Exception:
         resolved_logger.error("device=%s cisco arp collection failed", client.name, extra=log_extra)
+        raise
+
+    return await asyncio.to_thread(
+        _store_arp_table, client.name, content, arp_dir, resolved_logger, log_extra, storage
+    )
+
+
+def _store_arp_table(
+    device_name: str,
+    content: str,
+    arp_dir: Path,
+    logger: logging.Logger,
+    log_extra: dict,
+    storage: StorageOptions | None = None,
+    heads: dict[str, ArpHead] | None = None,
+) -> tuple[Path, ArpChanges | None]:
+    """Validate and persist a retrieved ARP table, then record its row changes."""
+
+    if not content.strip():
+        logger.error("device=%s cisco arp collection failed", device_name, extra=log_extra)
         raise ValueError("Empty ARP output received from device.")
 
-    timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%d_%H%M%S")
-    target_dir = ensure_directory(arp_dir / "cisco" / client.name)
-    backup_path = target_dir / f"{timestamp}_arp.txt"
+    taken_at = datetime.now(timezone.utc)
+    timestamp = taken_at.strftime("%Y-%m-%d_%H%M%S")
+    target_dir = ensure_directory(arp_dir / "cisco" / device_name)
+    compression = storage.compression if storage is not None else NO_COMPRESSION
+    backup_path = target_dir / compressed_name(f"{timestamp}{ARP_SNAPSHOT_SUFFIX}", compression)
 
-    if backup_path.exists():
-        resolved_logger.error("device=%s cisco arp collection failed", client.name, extra=log_extra)
+    if backup_path.exists() or delta_path_for(backup_path).exists():
+        logger.error("device=%s cisco arp collection failed", device_name, extra=log_extra)
         raise FileExistsError(f"ARP file already exists: {backup_path}")
 
-    backup_path.write_text(content, encoding="utf-8")
+    head = heads.get(device_name) if heads is not None else None
+    if head is None:
+        head = read_arp_head(target_dir)
+    entries = parse_arp_table(content)
+    changes = _compare_with_previous(device_name, entries, head, target_dir, logger, log_extra)
+    interval = storage.arp_keyframe_interval if storage is not None else DEFAULT_ARP_KEYFRAME_INTERVAL
+    head = store_arp_snapshot(backup_path, content, entries, changes, head, interval)
+    if heads is not None:
+        heads[device_name] = head
+    backup_path = target_dir / head.file
     size = backup_path.stat().st_size if backup_path.exists() else 0
     if size <= 0:
-        resolved_logger.error("device=%s cisco arp collection failed", client.name, extra=log_extra)
+        logger.error("device=%s cisco arp collection failed", device_name, extra=log_extra)
         raise ValueError("ARP file is empty after write.")
 
-    resolved_logger.info("device=%s cisco arp saved path=%s size=%d", client.name, backup_path, size, extra=log_extra)
-    return backup_path
+    logger.info(
+        "device=%s cisco arp saved path=%s size=%d depth=%d",
+        device_name,
+        backup_path,
+        size,
+        head.depth,
+        extra=log_extra,
+    )
+    _index_arp_table(device_name, entries, taken_at, arp_dir, logger, log_extra)
+    return backup_path, changes
+
+
+def _compare_with_previous(
+    device_name: str,
+    entries: list[ArpEntry],
+    head: ArpHead | None,
+    device_dir: Path,
+    logger: logging.Logger,
+    log_extra: dict,
+) -> ArpChanges | None:
+    """Row changes against the previous snapshot; ``None`` when there is none or it cannot be read."""
+
+    if head is None:
+        logger.info("device=%s cisco arp changes baseline=- entries=%d", device_name, len(entries), extra=log_extra)
+        return None
+    previous_path = device_dir / head.file
+    try:
+        changes = compare_arp_tables(head.table(device_dir), entries)
+    except (OSError, ValueError):
+        logger.exception("device=%s cisco arp baseline unreadable path=%s", device_name, previous_path, extra=log_extra)
+        return None
+    counts = changes.counts()
+    logger.info(
+        "device=%s cisco arp changes baseline=%s entries=%d added=%d removed=%d moved=%d",
+        device_name,
+        previous_path.name,
+        counts["entries"],
+        counts["added"],
+        counts["removed"],
+        counts["moved"],
+        extra=log_extra,
+    )
+    return changes
+
+
+def _index_arp_table(
+    device_name: str,
+    entries: list[ArpEntry],
+    taken_at: datetime,
+    arp_dir: Path,
+    logger: logging.Logger,
+    log_extra: dict,
+) -> None:
+    """Merge the parsed table into the ARP sighting index; the saved snapshot stays authoritative."""
+
+    store = ArpStore.for_arp_dir(arp_dir)
+    try:
+        result = store.record(device_name, taken_at, entries)
+    except sqlite3.Error:
+        logger.exception("device=%s cisco arp index update failed db=%s", device_name, store.path, extra=log_extra)
+        return
+    logger.info(
+        "device=%s cisco arp indexed entries=%d appeared=%d disappeared=%d db=%s",
+        device_name,
+        result.entries,
+        result.appeared,
+        result.disappeared,
+        store.path,
+        extra=log_extra,
+    )
 
 
 def _is_valid_running_config(content: str) -> bool:
@@ -110,25 +428,48 @@ def _is_valid_running_config(content: str) -> bool:
     return any(marker in lowered for marker in ("version", "hostname", "!"))
 
 
-def _log_cisco_diff(
-    current_backup: Path, logger: logging.Logger, log_extra: dict[str, str]
-) -> tuple[DiffOutcome, Path | None]:
-    """Log diff status for Cisco running-config backups."""
+def _cisco_diff_job(
+    current_backup: Path,
+    logger: logging.Logger,
+    log_extra: dict[str, str],
+    diff_mode: str = DEFAULT_DIFF_MODE,
+    normalizer: Normalizer = normalize_cisco_running_config,
+    diff_engine: str = DEFAULT_DIFF_ENGINE,
+    keep_baseline: bool = False,
+) -> DiffJob:
+    """Build the diff job for a committed running-config after checking it is in the device directory.
 
-    result: DiffOutcome = evaluate_change(current_backup, "*_running-config.txt", normalize_cisco_running_config)
-    device_name = log_extra.get("device", "-")
-    current_path = result.current_path or current_backup.resolve()
+    ``keep_baseline`` hands the baseline text back for delta storage.
+    """
 
-    if device_name not in ("", "-") and current_path.parent.name != device_name:
+    device_name = log_extra.get("device", "-")
+    expected_path = current_backup.resolve()
+    if device_name not in ("", "-") and expected_path.parent.name != device_name:
         logger.error(
             "device=%s device_path_mismatch expected=%s actual=%s current_path=%s",
             device_name,
             device_name,
-            current_path.parent.name,
-            current_path,
+            expected_path.parent.name,
+            expected_path,
             extra=log_extra,
         )
-        raise ValueError(f"Device path mismatch for {device_name}: {current_path}")
+        raise ValueError(f"Device path mismatch for {device_name}: {expected_path}")
+
+    block_parser = cisco_blocks if diff_mode == "structural" else None
+    return DiffJob(current_backup, RUNNING_CONFIG_PATTERN, normalizer, block_parser, diff_engine, keep_baseline)
+
+
+def _log_cisco_diff(
+    current_backup: Path,
+    result: DiffOutcome,
+    diff_path: Path | None,
+    logger: logging.Logger,
+    log_extra: dict[str, str],
+) -> None:
+    """Log diff status for Cisco running-config backups."""
+
+    device_name = log_extra.get("device", "-")
+    current_path = result.current_path or current_backup.resolve()
 
     logger.info(
         "device=%s diff baseline_path=%s current_path=%s",
@@ -154,11 +495,9 @@ def _log_cisco_diff(
     changed_value = "null" if result.config_changed is None else str(result.config_changed).lower()
     logger.info("device=%s config_changed=%s", device_name, changed_value, extra=log_extra)
 
-    if not result.config_changed:
-        return result, None
+    if diff_path is None:
+        return
 
-    diff_path = current_path.with_suffix(".diff")
-    diff_path.write_text(result.diff_text or "", encoding="utf-8")
     logger.info(
         "device=%s change_summary added=%d removed=%d diff_file=%s",
         device_name,
@@ -167,4 +506,10 @@ def _log_cisco_diff(
         diff_path,
         extra=log_extra,
     )
-    return result, diff_path
+    if result.section_changes:
+        logger.info(
+            "device=%s change_sections=%s",
+            device_name,
+            format_section_changes(result.section_changes),
+            extra=log_extra,
+        )
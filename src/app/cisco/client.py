@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
+import codecs
 import logging
 import socket
 import time
+from contextlib import contextmanager
 from dataclasses import dataclass, field
-from typing import Any, Mapping
+from typing import Any, Iterator, Mapping, TextIO
 
 import paramiko
 
@@ -52,6 +54,88 @@ def _extract_prompt(buffer: str) -> str | None:
     return None
 
 
+# Characters str.splitlines() treats as line boundaries.
+_LINE_BREAKS = frozenset("\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029")
+
+
+def _line_prompt(line: str) -> str | None:
+    stripped = line.strip()
+    if stripped.endswith((">", "#")):
+        return stripped
+    return None
+
+
+class _ShellBuffer:
+    """Accumulate shell output and track the latest prompt in linear time.
+
+    Equivalent to calling :func:`_extract_prompt` on the joined output after
+    every chunk, but only the new text and the unfinished last line are
+    scanned, so capturing a multi-megabyte running-config stays linear. With a
+    ``sink`` the text is written through instead of being kept in memory.
+    """
+
+    __slots__ = ("_chunks", "_sink", "_decoder", "_partial", "_line_prompt", "_carry")
+
+    def __init__(self, sink: TextIO | None = None) -> None:
+        self._chunks: list[str] = []
+        self._sink = sink
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._partial = ""
+        self._line_prompt: str | None = None
+        self._carry = ""
+
+    def feed_bytes(self, data: bytes) -> str:
+        """Decode ``data`` (multi-byte characters may span chunks) and feed it."""
+
+        text = self._decoder.decode(data)
+        self.feed(text)
+        return text
+
+    def feed(self, text: str) -> None:
+        """Append decoded ``text`` and update the prompt seen on complete lines."""
+
+        if not text:
+            return
+        if self._sink is not None:
+            self._sink.write(text)
+        else:
+            self._chunks.append(text)
+        lines = (self._partial + text).splitlines(keepends=True)
+        if lines and lines[-1][-1] not in _LINE_BREAKS:
+            self._partial = lines.pop()
+        else:
+            self._partial = ""
+        for line in reversed(lines):
+            prompt = _line_prompt(line)
+            if prompt is not None:
+                self._line_prompt = prompt
+                break
+
+    @property
+    def prompt(self) -> str | None:
+        """Return the last prompt-like line, including the unfinished one."""
+
+        return _line_prompt(self._partial) or self._line_prompt
+
+    def received(self, substring: str, text: str) -> bool:
+        """Return True if ``substring`` ends within freshly fed ``text``.
+
+        Earlier output is searched only through a carry of ``len(substring) - 1``
+        characters, so matches spanning a chunk boundary are still found.
+        """
+
+        window = self._carry + text
+        if substring in window:
+            return True
+        self._carry = window[-(len(substring) - 1) :] if len(substring) > 1 else ""
+        return False
+
+    def getvalue(self) -> str:
+        value = "".join(self._chunks)
+        self._chunks = [value] if value else []
+        return value
+
+
 @dataclass(slots=True)
 class CiscoSSHSession:
     """Active SSH session with prompt metadata."""
@@ -85,33 +169,49 @@ class CiscoSSHSession:
     def _gather_prompt_buffer(self) -> str:
         """Read from the channel until a prompt is likely present."""
 
-        buffer = ""
+        buffer = _ShellBuffer()
         deadline = time.monotonic() + self.timeout
 
         try:
             self.channel.send("\n")
         except Exception:
-            return buffer
-
-        while time.monotonic() < deadline:
-            if self.channel.recv_ready():
-                try:
-                    data = self.channel.recv(1024)
-                except Exception:
-                    break
-                buffer += data.decode("utf-8", errors="replace")
-                if _extract_prompt(buffer):
-                    break
-            else:
-                time.sleep(0.1)
-
-        return buffer
+            return ""
+
+        while True:
+            try:
+                data = self._read_chunk(self.channel, deadline, 1024)
+            except Exception:
+                break
+            buffer.feed_bytes(data)
+            if buffer.prompt:
+                break
+
+        return buffer.getvalue()
 
     def _ensure_channel(self) -> paramiko.Channel:
         if self.channel is None or self.channel.closed:
             raise CiscoClientError("SSH channel is not available")
         return self.channel
 
+    def _read_chunk(self, channel: paramiko.Channel, deadline: float, size: int = 4096) -> bytes:
+        """Block until data arrives on ``channel`` or ``deadline`` (monotonic) passes.
+
+        ``Channel.recv`` waits on paramiko's internal buffer event, so the call
+        returns as soon as the device sends a byte instead of on a polling tick.
+        """
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError("Timed out reading from SSH channel.")
+        channel.settimeout(remaining)
+        try:
+            data = channel.recv(size)
+        except socket.timeout as exc:
+            raise TimeoutError("Timed out reading from SSH channel.") from exc
+        if not data:
+            raise CiscoConnectionError("SSH channel closed by device")
+        return data
+
     def _update_prompt(self, prompt: str) -> None:
         self.prompt = prompt
         if prompt.endswith("#"):
@@ -125,40 +225,41 @@ class CiscoSSHSession:
         """Read from the channel until ``substring`` is found or timeout expires."""
 
         channel = self._ensure_channel()
-        buffer = ""
+        buffer = _ShellBuffer()
         deadline = time.monotonic() + (timeout or self.timeout)
 
-        while time.monotonic() < deadline:
-            if channel.recv_ready():
-                data = channel.recv(4096)
-                buffer += data.decode("utf-8", errors="replace")
-                prompt = _extract_prompt(buffer)
-                if prompt:
-                    self._update_prompt(prompt)
-                if substring in buffer:
-                    return buffer
-            else:
-                time.sleep(0.1)
-        raise TimeoutError(f"Timed out waiting for substring: {substring}")
-
-    def wait_for_prompt(self, timeout: float | None = None) -> str:
-        """Read from the channel until a prompt (``>`` or ``#``) is detected."""
+        while True:
+            try:
+                data = self._read_chunk(channel, deadline)
+            except TimeoutError as exc:
+                raise TimeoutError(f"Timed out waiting for substring: {substring}") from exc
+            text = buffer.feed_bytes(data)
+            prompt = buffer.prompt
+            if prompt:
+                self._update_prompt(prompt)
+            if buffer.received(substring, text):
+                return buffer.getvalue()
+
+    def wait_for_prompt(self, timeout: float | None = None, sink: TextIO | None = None) -> str:
+        """Read from the channel until a prompt (``>`` or ``#``) is detected.
+
+        With ``sink`` the output is written to it as it arrives and ``""`` is returned.
+        """
 
         channel = self._ensure_channel()
-        buffer = ""
+        buffer = _ShellBuffer(sink)
         deadline = time.monotonic() + (timeout or self.timeout)
 
-        while time.monotonic() < deadline:
-            if channel.recv_ready():
-                data = channel.recv(4096)
-                buffer += data.decode("utf-8", errors="replace")
-                prompt = _extract_prompt(buffer)
-                if prompt:
-                    self._update_prompt(prompt)
-                    return buffer
-            else:
-                time.sleep(0.1)
-        raise TimeoutError("Timed out waiting for prompt.")
+        while True:
+            try:
+                data = self._read_chunk(channel, deadline)
+            except TimeoutError as exc:
+                raise TimeoutError("Timed out waiting for prompt.") from exc
+            buffer.feed_bytes(data)
+            prompt = buffer.prompt
+            if prompt:
+                self._update_prompt(prompt)
+                return buffer.getvalue()
 
     def send(self, command: str) -> None:
         """Send a raw command to the channel with newline."""
@@ -166,11 +267,11 @@ class CiscoSSHSession:
         channel = self._ensure_channel()
         channel.send(command + "\n")
 
-    def run_command(self, command: str) -> str:
+    def run_command(self, command: str, sink: TextIO | None = None) -> str:
         """Send a command and wait for a prompt, returning the raw buffer."""
 
         self.send(command)
-        return self.wait_for_prompt()
+        return self.wait_for_prompt(sink=sink)
 
     def close(self) -> None:
         """Close the SSH session and underlying client."""
@@ -194,8 +295,11 @@ class CiscoClient:
     enable_password: str | None = None
     port: int = 22
     timeout: float = 5.0
+    # Probe the SSH port before connecting; off when a reachability sweep already did.
+    tcp_check: bool = True
     initial_prompt: str | None = field(init=False, default=None)
     prompt_mode: str | None = field(init=False, default=None)
+    _active_session: CiscoSSHSession | None = field(init=False, default=None, repr=False)
 
     def _log_extra(self, extra: Mapping[str, Any] | None = None) -> dict[str, Any]:
         base: dict[str, Any] = {"device": self.name}
@@ -203,17 +307,46 @@ class CiscoClient:
             base.update(extra)
         return sanitize_log_extra(base)
 
+    @contextmanager
+    def session(
+        self, logger: logging.Logger, log_extra: Mapping[str, Any] | None = None
+    ) -> Iterator[CiscoSSHSession]:
+        """Keep one prepared SSH session open for every command run inside the block.
+
+        The session is connected, moved to privileged EXEC and has paging
+        disabled once; ``fetch_*`` calls made while the block is active reuse it
+        instead of logging in again. Nested calls yield the already open session.
+        """
+
+        if self._active_session is not None:
+            yield self._active_session
+            return
+
+        resolved_log_extra = self._log_extra(log_extra)
+        session: CiscoSSHSession | None = None
+        try:
+            session = self._connect(logger, resolved_log_extra)
+            self._ensure_enable(session, logger, resolved_log_extra)
+            self._disable_paging(session, logger, resolved_log_extra)
+            self._active_session = session
+            yield session
+        finally:
+            self._active_session = None
+            if session is not None:
+                session.close()
+
     def _connect(self, logger: logging.Logger, log_extra: dict[str, Any]) -> CiscoSSHSession:
-        logger.info("device=%s checking ssh connectivity", self.name, extra=log_extra)
-        if not _tcp_check(self.host, self.port, timeout=self.timeout):
-            logger.error(
-                "device=%s ssh port unreachable ip=%s port=%s",
-                self.name,
-                self.host,
-                self.port,
-                extra=log_extra,
-            )
-            raise CiscoConnectionError("SSH port unreachable")
+        if self.tcp_check:
+            logger.info("device=%s checking ssh connectivity", self.name, extra=log_extra)
+            if not _tcp_check(self.host, self.port, timeout=self.timeout):
+                logger.error(
+                    "device=%s ssh port unreachable ip=%s port=%s",
+                    self.name,
+                    self.host,
+                    self.port,
+                    extra=log_extra,
+                )
+                raise CiscoConnectionError("SSH port unreachable")
 
         ssh = paramiko.SSHClient()
         ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
@@ -254,40 +387,44 @@ class CiscoClient:
     def fetch_running_config(
         self, logger: logging.Logger, log_extra: Mapping[str, Any] | None = None
     ) -> str:
-        """Establish SSH session and return the raw running-config output."""
+        """Return the raw running-config output, reusing an open session if any."""
 
-        session: CiscoSSHSession | None = None
-        resolved_log_extra = self._log_extra(log_extra)
-        try:
-            session = self._connect(logger, resolved_log_extra)
-            self._ensure_enable(session, logger, resolved_log_extra)
-            self._disable_paging(session, logger, resolved_log_extra)
-            return session.run_command("show running-config")
-        except TimeoutError as exc:
-            raise CiscoClientError("Timed out during Cisco command execution.") from exc
-        finally:
-            if session is not None:
-                session.close()
+        return self.run_show_command("show running-config", logger, log_extra)
 
+    def stream_running_config(
+        self, sink: TextIO, logger: logging.Logger, log_extra: Mapping[str, Any] | None = None
+    ) -> None:
+        """Write the raw running-config output to ``sink`` as it arrives."""
+
+        self.run_show_command("show running-config", logger, log_extra, sink=sink)
 
     def fetch_arp_table(
         self, logger: logging.Logger, log_extra: Mapping[str, Any] | None = None
     ) -> str:
-        """Establish SSH session and return parsed ``show ip arp`` output."""
+        """Return parsed ``show ip arp`` output, reusing an open session if any."""
+
+        raw_output = self.run_show_command("show ip arp", logger, log_extra)
+        return _extract_command_output(raw_output, "show ip arp")
+
+    def run_show_command(
+        self,
+        command: str,
+        logger: logging.Logger,
+        log_extra: Mapping[str, Any] | None = None,
+        sink: TextIO | None = None,
+    ) -> str:
+        """Run ``command`` in privileged EXEC and return the raw channel buffer.
+
+        Inside :meth:`session` the shared session is used; otherwise a session
+        is opened just for this command. With ``sink`` the raw output is
+        streamed to it instead of being returned.
+        """
 
-        session: CiscoSSHSession | None = None
-        resolved_log_extra = self._log_extra(log_extra)
         try:
-            session = self._connect(logger, resolved_log_extra)
-            self._ensure_enable(session, logger, resolved_log_extra)
-            self._disable_paging(session, logger, resolved_log_extra)
-            raw_output = session.run_command("show ip arp")
-            return _extract_command_output(raw_output, "show ip arp")
+            with self.session(logger, log_extra) as session:
+                return session.run_command(command, sink=sink)
         except TimeoutError as exc:
             raise CiscoClientError("Timed out during Cisco command execution.") from exc
-        finally:
-            if session is not None:
-                session.close()
 
     def _ensure_enable(
         self, session: CiscoSSHSession, logger: logging.Logger, log_extra: Mapping[str, Any]
@@ -0,0 +1,250 @@
+"""SQLite index of ARP sightings across runs.
+
+Every parsed ARP row is a *sighting* of an ``(IP, MAC, interface, VLAN)``
+tuple on a device. Only changes are written: a tuple that was already in the
+device's previous snapshot costs nothing, a new (or returning) tuple inserts
+one row, and a tuple that disappeared gets its ``last_seen`` set to the last
+snapshot that still had it. Sightings that are still present keep
+``last_seen`` empty and take it from the device's latest snapshot when
+queried. A year of hourly snapshots of a stable network therefore stays
+close to one row per host, and the ``mac``/``ip`` indexes answer "where was
+this MAC last seen" in milliseconds.
+
+Timestamps are stored as ISO 8601 UTC strings (``2026-01-02T10:00:00Z``),
+which sort chronologically.
+"""
+
+from __future__ import annotations
+
+import ipaddress
+import re
+import sqlite3
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Iterator
+
+ARP_DB_FILENAME = "arp.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS arp_devices (
+    device TEXT PRIMARY KEY,
+    last_snapshot TEXT NOT NULL,
+    snapshots INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS arp_sightings (
+    id INTEGER PRIMARY KEY,
+    device TEXT NOT NULL,
+    ip TEXT NOT NULL,
+    mac TEXT NOT NULL,
+    interface TEXT NOT NULL,
+    vlan INTEGER,
+    age_min INTEGER,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT
+);
+CREATE INDEX IF NOT EXISTS arp_sightings_mac ON arp_sightings (mac);
+CREATE INDEX IF NOT EXISTS arp_sightings_ip ON arp_sightings (ip);
+CREATE INDEX IF NOT EXISTS arp_sightings_device ON arp_sightings (device, first_seen);
+CREATE INDEX IF NOT EXISTS arp_sightings_present ON arp_sightings (device) WHERE last_seen IS NULL;
+"""
+_MAC_SEPARATORS = re.compile(r"[.:\-]")
+_MAC_DIGITS = re.compile(r"[0-9a-f]{12}")
+
+SightingKey = tuple[str, str, str, "int | None"]
+
+
+def normalize_mac(value: str) -> str:
+    """``aabb.cc00.0100``, ``AA-BB-CC-00-01-00`` or ``aabbcc000100`` as ``aa:bb:cc:00:01:00``."""
+
+    digits = _MAC_SEPARATORS.sub("", value.strip().lower())
+    if not _MAC_DIGITS.fullmatch(digits):
+        raise ValueError(f"invalid MAC address: {value!r}")
+    return ":".join(digits[index : index + 2] for index in range(0, 12, 2))
+
+
+def normalize_ip(value: str) -> str:
+    return str(ipaddress.ip_address(value.strip()))
+
+
+def format_timestamp(moment: datetime) -> str:
+    return moment.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+@dataclass(slots=True, frozen=True)
+class ArpEntry:
+    """One resolved row of a device's ARP table; ``age_min`` is ``None`` for the device's own addresses."""
+
+    ip: str
+    mac: str
+    interface: str = ""
+    vlan: int | None = None
+    age_min: int | None = None
+
+    @property
+    def key(self) -> SightingKey:
+        return (self.ip, self.mac, self.interface, self.vlan)
+
+
+@dataclass(slots=True, frozen=True)
+class ArpSighting:
+    """A tuple seen on ``device`` from ``first_seen`` to ``last_seen``; ``present`` while still in its table."""
+
+    device: str
+    ip: str
+    mac: str
+    interface: str
+    vlan: int | None
+    age_min: int | None
+    first_seen: str
+    last_seen: str
+    present: bool
+
+
+@dataclass(slots=True)
+class ArpRecordResult:
+    """What one snapshot changed; ``skipped`` when it is not newer than the device's last indexed snapshot."""
+
+    entries: int = 0
+    appeared: int = 0
+    disappeared: int = 0
+    skipped: bool = False
+
+
+class ArpStore:
+    """ARP sightings of every device in one SQLite database (usually ``<ARP_DIR>/arp.sqlite3``).
+
+    Each call opens its own connection, so a store can be shared by device
+    worker threads; writers are serialized by SQLite (WAL mode).
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    @classmethod
+    def for_arp_dir(cls, arp_dir: Path) -> ArpStore:
+        return cls(arp_dir / ARP_DB_FILENAME)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
+            yield connection
+        finally:
+            connection.close()
+
+    def record(self, device: str, taken_at: datetime, entries: Iterable[ArpEntry]) -> ArpRecordResult:
+        """Merge one snapshot of ``device``'s ARP table taken at ``taken_at``.
+
+        Snapshots must arrive in time order per device; older ones are skipped,
+        which makes re-importing the same files harmless.
+        """
+
+        stamp = format_timestamp(taken_at)
+        unique = {entry.key: entry for entry in entries}
+        result = ArpRecordResult(entries=len(unique))
+        with self._connect() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = connection.execute(
+                    "SELECT last_snapshot FROM arp_devices WHERE device = ?", (device,)
+                ).fetchone()
+                if row is not None and row[0] >= stamp:
+                    result.skipped = True
+                    connection.execute("ROLLBACK")
+                    return result
+
+                present = {
+                    (ip, mac, interface, vlan): sighting_id
+                    for sighting_id, ip, mac, interface, vlan in connection.execute(
+                        "SELECT id, ip, mac, interface, vlan FROM arp_sightings "
+                        "WHERE device = ? AND last_seen IS NULL",
+                        (device,),
+                    )
+                }
+                appeared = [
+                    (device, entry.ip, entry.mac, entry.interface, entry.vlan, entry.age_min, stamp)
+                    for key, entry in unique.items()
+                    if present.pop(key, None) is None
+                ]
+                connection.executemany(
+                    "INSERT INTO arp_sightings (device, ip, mac, interface, vlan, age_min, first_seen) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    appeared,
+                )
+                if present:
+                    connection.executemany(
+                        "UPDATE arp_sightings SET last_seen = ? WHERE id = ?",
+                        [(row[0], sighting_id) for sighting_id in present.values()],
+                    )
+                connection.execute(
+                    "INSERT INTO arp_devices (device, last_snapshot, snapshots) VALUES (?, ?, 1) "
+                    "ON CONFLICT (device) DO UPDATE SET last_snapshot = excluded.last_snapshot, "
+                    "snapshots = snapshots + 1",
+                    (device, stamp),
+                )
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        result.appeared = len(appeared)
+        result.disappeared = len(present)
+        return result
+
+    def lookup(
+        self,
+        *,
+        mac: str | None = None,
+        ip: str | None = None,
+        device: str | None = None,
+        limit: int = 20,
+    ) -> list[ArpSighting]:
+        """Sightings matching every given filter, most recently seen first.
+
+        Raises :class:`ValueError` for malformed addresses or when no filter is given.
+        """
+
+        clauses: list[str] = []
+        params: list[object] = []
+        if mac is not None:
+            clauses.append("s.mac = ?")
+            params.append(normalize_mac(mac))
+        if ip is not None:
+            clauses.append("s.ip = ?")
+            params.append(normalize_ip(ip))
+        if device is not None:
+            clauses.append("s.device = ?")
+            params.append(device)
+        if not clauses:
+            raise ValueError("lookup needs a MAC, an IP or a device")
+
+        query = (
+            "SELECT s.device, s.ip, s.mac, s.interface, s.vlan, s.age_min, s.first_seen, "
+            "COALESCE(s.last_seen, d.last_snapshot) AS seen, s.last_seen IS NULL "
+            "FROM arp_sightings s JOIN arp_devices d ON d.device = s.device "
+            f"WHERE {' AND '.join(clauses)} ORDER BY seen DESC, s.first_seen DESC LIMIT ?"
+        )
+        with self._connect() as connection:
+            rows = connection.execute(query, (*params, limit)).fetchall()
+        return [
+            ArpSighting(
+                device=row[0],
+                ip=row[1],
+                mac=row[2],
+                interface=row[3],
+                vlan=row[4],
+                age_min=row[5],
+                first_seen=row[6],
+                last_seen=row[7],
+                present=bool(row[8]),
+            )
+            for row in rows
+        ]
+
+    def last_snapshot(self, device: str) -> str | None:
+        with self._connect() as connection:
+            row = connection.execute("SELECT last_snapshot FROM arp_devices WHERE device = ?", (device,)).fetchone()
+        return row[0] if row else None
@@ -0,0 +1,220 @@
+"""Per-device index of saved text backups.
+
+Each device directory carries an append-only ``.backup-index.jsonl`` with one
+entry per saved backup (file name, timestamp, normalized SHA256, size and
+line count). Looking up the baseline for a new backup reads the index from
+its tail instead of globbing and stat-ing every file in the directory.
+Deduplicated backups are entries whose ``ref`` names the earlier file that
+holds the identical content. Patterns match file names without their
+compression and delta suffixes, so ``*_export.rsc`` also covers
+``*_export.rsc.gz`` and ``*_export.rsc.delta``.
+
+The index is self-healing: when it is missing, unreadable, has no entry for
+the requested pattern, or points at a file that is gone or has a different
+size, it is rebuilt from the directory listing, ordered by the timestamp in
+the file names (see :func:`app.core.storage.backup_time`).
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import json
+import os
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator
+
+from app.common.delta_chain import DELTA_SUFFIX, strip_delta_suffix
+from app.core.compression import COMPRESSION_SUFFIXES
+from app.core.pack_archive import stored_size
+from app.core.storage import backup_time
+
+INDEX_FILENAME = ".backup-index.jsonl"
+_READ_BLOCK_SIZE = 64 * 1024
+
+
+@dataclass(slots=True)
+class IndexEntry:
+    """Single saved backup recorded in the device index."""
+
+    pattern: str
+    file: str
+    timestamp: str
+    size: int
+    sha256: str | None = None
+    lines: int | None = None
+    ref: str | None = None
+
+    @property
+    def stored_file(self) -> str:
+        """Name of the file holding the content (the referenced one for dedup entries)."""
+
+        return self.ref or self.file
+
+
+def _iso_backup_time(path: Path) -> str:
+    return datetime.fromtimestamp(backup_time(path), tz=timezone.utc).isoformat()
+
+
+def _matches(name: str, pattern: str) -> bool:
+    return fnmatch.fnmatch(strip_delta_suffix(name), pattern)
+
+
+def _parse_entry(raw: bytes) -> IndexEntry | None:
+    try:
+        data = json.loads(raw)
+        return IndexEntry(**data)
+    except (ValueError, TypeError):
+        return None
+
+
+class BackupIndex:
+    """Index of the backups stored in one device directory."""
+
+    def __init__(self, device_dir: Path) -> None:
+        self.device_dir = device_dir
+        self.path = device_dir / INDEX_FILENAME
+
+    def _iter_reversed(self) -> Iterator[IndexEntry]:
+        """Yield entries newest first, reading the file backwards in blocks."""
+
+        with self.path.open("rb") as handle:
+            position = handle.seek(0, os.SEEK_END)
+            remainder = b""
+            while position > 0:
+                step = min(_READ_BLOCK_SIZE, position)
+                position -= step
+                handle.seek(position)
+                block = handle.read(step) + remainder
+                lines = block.split(b"\n")
+                remainder = lines.pop(0)
+                for raw in reversed(lines):
+                    if raw.strip():
+                        entry = _parse_entry(raw)
+                        if entry is None:
+                            raise ValueError(f"Corrupt index entry in {self.path}")
+                        yield entry
+            if remainder.strip():
+                entry = _parse_entry(remainder)
+                if entry is None:
+                    raise ValueError(f"Corrupt index entry in {self.path}")
+                yield entry
+
+    def _entry_is_current(self, entry: IndexEntry) -> bool:
+        try:
+            return stored_size(self.device_dir / entry.stored_file) == entry.size
+        except (OSError, ValueError):
+            return False
+
+    def latest(self, pattern: str, exclude: Path | None = None) -> IndexEntry | None:
+        """Return the newest entry for ``pattern``, rebuilding the index if stale.
+
+        ``exclude`` skips the backup currently being evaluated.
+        """
+
+        excluded_name = exclude.name if exclude is not None else None
+        try:
+            for entry in self._iter_reversed():
+                if entry.pattern != pattern or entry.file == excluded_name:
+                    continue
+                if self._entry_is_current(entry):
+                    return entry
+                break
+        except (OSError, ValueError):
+            pass
+
+        self.rebuild(pattern, exclude=exclude)
+        for entry in self._iter_reversed():
+            if entry.pattern == pattern and entry.file != excluded_name:
+                return entry
+        return None
+
+    def heads(self) -> dict[str, IndexEntry]:
+        """Return the newest entry for every pattern in the index (empty when unreadable)."""
+
+        heads: dict[str, IndexEntry] = {}
+        try:
+            for entry in self._iter_reversed():
+                heads.setdefault(entry.pattern, entry)
+        except (OSError, ValueError):
+            return {}
+        return heads
+
+    def rebuild(self, pattern: str, exclude: Path | None = None) -> None:
+        """Rewrite the index for ``pattern`` from the directory contents (ordered by backup time).
+
+        Entries for other patterns are kept. Rebuilt entries carry no
+        normalized hash or line count; those are filled in as backups are
+        recorded. Dedup references for ``pattern`` are dropped.
+        """
+
+        kept: list[IndexEntry] = []
+        try:
+            kept = [entry for entry in reversed(list(self._iter_reversed())) if entry.pattern != pattern]
+        except (OSError, ValueError):
+            kept = []
+
+        candidates = [
+            self.device_dir.glob(pattern + stored_suffix + suffix)
+            for stored_suffix in ("", DELTA_SUFFIX)
+            for suffix in ("", *COMPRESSION_SUFFIXES.values())
+        ]
+        files = sorted(
+            (
+                path
+                for matches in candidates
+                for path in matches
+                if path.is_file() and (exclude is None or path.name != exclude.name)
+            ),
+            key=lambda path: (backup_time(path), path.name),
+        )
+        rebuilt = [
+            IndexEntry(pattern=pattern, file=path.name, timestamp=_iso_backup_time(path), size=path.stat().st_size)
+            for path in files
+        ]
+
+        temp_path = self.path.with_name(f"{self.path.name}.tmp")
+        with temp_path.open("w", encoding="utf-8") as handle:
+            for entry in kept + rebuilt:
+                handle.write(json.dumps(asdict(entry), separators=(",", ":")) + "\n")
+        os.replace(temp_path, self.path)
+
+    def record(self, pattern: str, path: Path, sha256: str | None, lines: int | None) -> IndexEntry:
+        """Append an entry for a newly saved backup."""
+
+        if not _matches(path.name, pattern):
+            raise ValueError(f"{path.name} does not match index pattern {pattern}")
+        entry = IndexEntry(
+            pattern=pattern,
+            file=path.name,
+            timestamp=_iso_backup_time(path),
+            size=path.stat().st_size,
+            sha256=sha256,
+            lines=lines,
+        )
+        self._append(entry)
+        return entry
+
+    def record_reference(
+        self, pattern: str, name: str, target: IndexEntry, sha256: str, lines: int | None
+    ) -> IndexEntry:
+        """Append a dedup entry: backup ``name`` has the same content as ``target``."""
+
+        if not _matches(name, pattern):
+            raise ValueError(f"{name} does not match index pattern {pattern}")
+        entry = IndexEntry(
+            pattern=pattern,
+            file=name,
+            timestamp=_iso_backup_time(self.device_dir / name),
+            size=target.size,
+            sha256=sha256,
+            lines=lines,
+            ref=target.stored_file,
+        )
+        self._append(entry)
+        return entry
+
+    def _append(self, entry: IndexEntry) -> None:
+        with self.path.open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps(asdict(entry), separators=(",", ":")) + "\n")
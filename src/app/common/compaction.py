@@ -0,0 +1,68 @@
+"""Compaction of loose per-device history into pack archives."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+
+from app.common.backup_index import BackupIndex
+from app.core.pack_archive import PACK_FILENAME, append_to_pack
+from app.core.storage import backup_time
+
+# Binary MikroTik system backups are large and already opaque; they stay loose.
+_SKIPPED_SUFFIXES = (".backup",)
+
+
+@dataclass(slots=True)
+class CompactionResult:
+    """Outcome of compacting one device directory."""
+
+    device_dir: Path
+    packed_files: int = 0
+    packed_bytes: int = 0
+
+
+def _protected_names(device_dir: Path) -> set[str]:
+    """Files the next run's baseline lookup reads directly: the newest index entry per pattern."""
+
+    protected: set[str] = set()
+    for entry in BackupIndex(device_dir).heads().values():
+        protected.update((entry.file, entry.stored_file))
+    return protected
+
+
+def compact_device_dir(device_dir: Path, older_than: float) -> CompactionResult:
+    """Pack loose files taken before ``older_than`` (epoch seconds) into the device pack.
+
+    Age comes from the timestamp in the file name, not the mtime, which
+    blob-backed names share with older backups of the same content.
+
+    Hidden files (index, in-flight ``.part`` files), binary system backups and
+    the current baseline of every backup pattern stay loose. Loose files are
+    removed only after the pack has been written and fsynced.
+    """
+
+    result = CompactionResult(device_dir=device_dir)
+    protected = _protected_names(device_dir)
+    candidates = sorted(
+        (
+            path
+            for path in device_dir.iterdir()
+            if path.is_file()
+            and not path.name.startswith(".")
+            and path.name != PACK_FILENAME
+            and path.name not in protected
+            and not path.name.endswith(_SKIPPED_SUFFIXES)
+            and backup_time(path) < older_than
+        ),
+        key=lambda path: (backup_time(path), path.name),
+    )
+    if not candidates:
+        return result
+
+    members = append_to_pack(device_dir, candidates)
+    for path in candidates:
+        path.unlink()
+    result.packed_files = len(members)
+    result.packed_bytes = sum(member.size for member in members)
+    return result
@@ -0,0 +1,213 @@
+"""Forward-delta storage of config history.
+
+In ``delta`` storage mode a device keeps a full backup (a keyframe) every N
+versions and, in between, a ``<name>.delta`` file holding only the line edits
+against the previous version. A delta is self-describing: its header names the
+base file in the same directory, its depth in the chain and the SHA256 of the
+text it reproduces, so no separate manifest is needed and any version is
+rebuilt from its keyframe plus at most N-1 deltas. Bases that compaction has
+moved into the device pack are read from there.
+
+Delta file layout (UTF-8, optionally compressed like any other backup)::
+
+    # ncb-delta v1
+    # base: 2026-01-01_000000_export.rsc
+    # depth: 1
+    # sha256: <sha256 of the reconstructed text>
+    @ <start> <end> <count>
+    <count replacement lines>
+    ...
+
+Each ``@`` hunk replaces base lines ``[start, end)`` with the lines that
+follow. Line endings are kept exactly, so reconstruction is byte-exact.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from pathlib import Path
+
+from app.common.diff_engine import patience_opcodes
+from app.core.compression import (
+    compressed_name,
+    compression_from_name,
+    strip_compression_suffix,
+    write_backup_text,
+)
+from app.core.pack_archive import read_stored_text
+
+DELTA_SUFFIX = ".delta"
+_MAGIC = "# ncb-delta v1\n"
+
+
+@dataclass(slots=True)
+class DeltaHeader:
+    """Metadata at the top of a delta file."""
+
+    base: str
+    depth: int
+    sha256: str
+
+
+def is_delta(path: Path) -> bool:
+    return strip_compression_suffix(path.name).endswith(DELTA_SUFFIX)
+
+
+def strip_delta_suffix(name: str) -> str:
+    """Return ``name`` without its compression and ``.delta`` suffixes."""
+
+    plain = strip_compression_suffix(name)
+    return plain[: -len(DELTA_SUFFIX)] if plain.endswith(DELTA_SUFFIX) else plain
+
+
+def delta_path_for(backup_path: Path) -> Path:
+    """Path of the delta replacing ``backup_path``, compressed the same way."""
+
+    compression = compression_from_name(backup_path.name)
+    plain_name = strip_compression_suffix(backup_path.name) + DELTA_SUFFIX
+    return backup_path.with_name(compressed_name(plain_name, compression))
+
+
+def _split_lines(text: str) -> list[str]:
+    """Split on ``\\n`` only, keeping line endings (``\\r`` stays part of the line)."""
+
+    lines = [line + "\n" for line in text.split("\n")]
+    lines[-1] = lines[-1][:-1]
+    if not lines[-1]:
+        lines.pop()
+    return lines
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def encode_delta(base_text: str, text: str, base_name: str, depth: int) -> str:
+    """Return the delta turning ``base_text`` into ``text``.
+
+    Hunks come from the patience engine, which anchors on unique lines and
+    stays near-linear on configs full of repeated lines.
+    """
+
+    base_lines = _split_lines(base_text)
+    lines = _split_lines(text)
+    parts = [_MAGIC, f"# base: {base_name}\n", f"# depth: {depth}\n", f"# sha256: {_sha256(text)}\n"]
+    for tag, start, end, new_start, new_end in patience_opcodes(base_lines, lines):
+        if tag == "equal":
+            continue
+        parts.append(f"@ {start} {end} {new_end - new_start}\n")
+        parts.extend(lines[new_start:new_end])
+    return "".join(parts)
+
+
+def _parse_header(lines: list[str], path: Path) -> tuple[DeltaHeader, int]:
+    if not lines or lines[0] != _MAGIC:
+        raise ValueError(f"Not a delta file: {path}")
+
+    fields: dict[str, str] = {}
+    position = 1
+    while position < len(lines) and lines[position].startswith("# "):
+        key, _, value = lines[position][2:].partition(":")
+        fields[key.strip()] = value.strip()
+        position += 1
+    try:
+        return DeltaHeader(base=fields["base"], depth=int(fields["depth"]), sha256=fields["sha256"]), position
+    except (KeyError, ValueError) as exc:
+        raise ValueError(f"Corrupt delta header in {path}") from exc
+
+
+def read_delta_header(path: Path) -> DeltaHeader:
+    """Read the header of a delta file."""
+
+    return _parse_header(_split_lines(read_stored_text(path, newline="")), path)[0]
+
+
+def chain_depth(path: Path) -> int:
+    """Number of deltas between ``path`` and its keyframe (0 for a full backup)."""
+
+    return read_delta_header(path).depth if is_delta(path) else 0
+
+
+def _apply_delta(base_lines: list[str], delta_lines: list[str], start: int, path: Path) -> list[str]:
+    result: list[str] = []
+    base_position = 0
+    position = start
+    try:
+        while position < len(delta_lines):
+            _, hunk_start, hunk_end, count = delta_lines[position].split()
+            hunk_start, hunk_end, count = int(hunk_start), int(hunk_end), int(count)
+            position += 1
+            result.extend(base_lines[base_position:hunk_start])
+            result.extend(delta_lines[position : position + count])
+            position += count
+            base_position = hunk_end
+    except ValueError as exc:
+        raise ValueError(f"Corrupt delta hunk in {path}") from exc
+    result.extend(base_lines[base_position:])
+    return result
+
+
+def reconstruct(path: Path) -> str:
+    """Return the exact text of the backup stored at ``path`` (full file or delta).
+
+    The chain is walked back to its keyframe and the deltas are applied
+    forward; every step is checked against the SHA256 recorded in its header.
+    """
+
+    chain: list[tuple[Path, DeltaHeader, list[str], int]] = []
+    current = path
+    while is_delta(current):
+        delta_lines = _split_lines(read_stored_text(current, newline=""))
+        header, start = _parse_header(delta_lines, current)
+        if chain and header.depth != chain[-1][1].depth - 1:
+            raise ValueError(f"Broken delta chain at {current}")
+        chain.append((current, header, delta_lines, start))
+        current = current.with_name(header.base)
+
+    if chain and chain[-1][1].depth != 1:
+        raise ValueError(f"Broken delta chain at {chain[-1][0]}")
+
+    text = read_stored_text(current, newline="")
+    lines = _split_lines(text)
+    for delta_path, header, delta_lines, start in reversed(chain):
+        lines = _apply_delta(lines, delta_lines, start, delta_path)
+        text = "".join(lines)
+        if _sha256(text) != header.sha256:
+            raise ValueError(f"Delta checksum mismatch in {delta_path}")
+    return text
+
+
+def universal_newlines(text: str) -> str:
+    """Translate ``\r\n`` and ``\r`` to ``\n`` like text-mode reads do."""
+
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def read_version(path: Path) -> str:
+    """Return the text of a stored backup (plain, compressed, packed or delta) with universal newlines."""
+
+    if not is_delta(path):
+        return read_stored_text(path)
+    return universal_newlines(reconstruct(path))
+
+
+def materialize(path: Path, destination: Path) -> Path:
+    """Write the full text of the backup stored at ``path`` to ``destination``."""
+
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    return write_backup_text(destination, reconstruct(path))
+
+
+def write_delta(current: Path, base: Path, depth: int, base_text: str | None = None) -> Path:
+    """Write the delta from ``base`` to the full backup ``current``; ``current`` is left in place.
+
+    ``base_text`` is the exact text of ``base`` when the caller has already
+    read it; otherwise the base is reconstructed from its chain.
+    """
+
+    if base_text is None:
+        base_text = reconstruct(base)
+    delta_path = delta_path_for(current)
+    text = encode_delta(base_text, read_stored_text(current, newline=""), base.name, depth)
+    return write_backup_text(delta_path, text)
@@ -2,11 +2,28 @@
 
 from __future__ import annotations
 
-import difflib
 import hashlib
+import re
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable
+from typing import TYPE_CHECKING, Callable
+
+from app.common.backup_index import BackupIndex
+from app.common.delta_chain import chain_depth, read_version, reconstruct, universal_newlines, write_delta
+from app.common.diff_engine import DEFAULT_DIFF_ENGINE, unified_diff
+from app.common.structural_diff import BlockParser, structural_diff
+from app.core.compression import open_backup_text, read_backup_text
+from app.core.normalize import line_normalizer
+
+if TYPE_CHECKING:
+    from app.core.storage import BackupStream
+
+# Characters read per step when a backup is normalized and hashed as a stream.
+_DIGEST_CHUNK_CHARS = 1 << 20
+
+# Line boundaries str.splitlines() honours besides "\n"; line counts match len(text.splitlines()).
+_OTHER_LINE_BREAKS = "\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"
+_OTHER_LINE_BREAK_RE = re.compile(f"[{_OTHER_LINE_BREAKS}]")
 
 
 @dataclass(slots=True)
@@ -26,55 +43,189 @@ class DiffOutcome:
     added: int = 0
     removed: int = 0
     diff_text: str | None = None
+    deduplicated: bool = False
+    section_changes: dict[str, tuple[int, int]] | None = None
+    baseline_text: str | None = None
 
 
 def _hash_text(text: str) -> str:
     return hashlib.sha256(text.encode("utf-8")).hexdigest()
 
 
+def _line_breaks(text: str) -> int:
+    """Number of line boundaries :meth:`str.splitlines` finds in ``text`` (``\\r\\n`` counts once)."""
+
+    breaks = text.count("\n")
+    if _OTHER_LINE_BREAK_RE.search(text) is not None:
+        breaks += sum(text.count(char) for char in _OTHER_LINE_BREAKS) - text.count("\r\n")
+    return breaks
+
+
+def _ends_with_line_break(text: str) -> bool:
+    return text[-1:] == "\n" or _OTHER_LINE_BREAK_RE.fullmatch(text[-1:]) is not None
+
+
+def _count_lines(text: str) -> int:
+    """``len(text.splitlines())`` without building the list."""
+
+    if not text:
+        return 0
+    return _line_breaks(text) + (0 if _ends_with_line_break(text) else 1)
+
+
+def _digest_normalized(path: Path, normalizer: Callable[[str], str]) -> tuple[str, int]:
+    """SHA256 and line count of ``normalizer(read_backup_text(path))``.
+
+    Streamable normalizers (see :func:`app.core.normalize.line_normalizer`)
+    are fed the file in chunks of complete lines, so neither the raw nor the
+    normalized text is held in memory as a whole. Blank lines are held back
+    until a non-blank line follows, which trims trailing blank lines exactly
+    as the whole-text normalizer does.
+    """
+
+    streaming = line_normalizer(normalizer)
+    if streaming is None:
+        text = normalizer(read_backup_text(path))
+        return _hash_text(text), _count_lines(text)
+
+    digest = hashlib.sha256()
+    breaks = 0
+    last = ""
+    held = ""
+    carry = ""
+    with open_backup_text(path) as handle:
+        while True:
+            block = handle.read(_DIGEST_CHUNK_CHARS)
+            if block:
+                block = carry + block
+                cut = block.rfind("\n") + 1
+                chunk, carry = block[:cut], block[cut:]
+            else:
+                chunk, carry = carry, ""
+            normalized = streaming.normalize_lines(chunk)
+            end = streaming.content_end(normalized)
+            if end:
+                piece = held + normalized[:end]
+                digest.update(piece.encode("utf-8"))
+                # Line normalizers turn every "\r" into "\n", so no "\r\n" is split between pieces.
+                breaks += _line_breaks(piece)
+                last = piece[-1]
+                held = normalized[end:]
+            else:
+                held += normalized
+            if not block:
+                break
+    if not last:
+        return digest.hexdigest(), 0
+    return digest.hexdigest(), breaks + (0 if _ends_with_line_break(last) else 1)
+
+
 def _count_added_removed(diff_lines: list[str]) -> tuple[int, int]:
     added = sum(1 for line in diff_lines if line.startswith("+") and not line.startswith("+++"))
     removed = sum(1 for line in diff_lines if line.startswith("-") and not line.startswith("---"))
     return added, removed
 
 
-def _generate_diff(prev: str, curr: str, from_label: str, to_label: str) -> tuple[str, int, int]:
+def _generate_diff(
+    prev: str, curr: str, from_label: str, to_label: str, engine: str = DEFAULT_DIFF_ENGINE
+) -> tuple[str, int, int]:
     diff_lines = list(
-        difflib.unified_diff(prev.splitlines(), curr.splitlines(), fromfile=from_label, tofile=to_label, lineterm="")
+        unified_diff(prev.splitlines(), curr.splitlines(), fromfile=from_label, tofile=to_label, engine=engine)
     )
     added, removed = _count_added_removed(diff_lines)
+    return _join_diff_lines(diff_lines), added, removed
+
+
+def _join_diff_lines(diff_lines: list[str]) -> str:
     diff_text = "\n".join(diff_lines)
-    if diff_text:
-        diff_text += "\n"
-    return diff_text, added, removed
+    return diff_text + "\n" if diff_text else diff_text
+
 
+def commit_backup(stream: BackupStream, normalizer: Callable[[str], str]) -> Path:
+    """Commit ``stream``; blob-backed streams are keyed by the SHA256 of their normalized text.
 
-def _select_previous_file(current_backup: Path, glob_pattern: str) -> Path | None:
-    if not current_backup.exists():
+    Volatile lines (``ntp clock-period``, export timestamps) then no longer
+    give every backup its own blob.
+    """
+
+    if stream.store is None:
+        return stream.commit()
+    stream.finish()
+    key, _ = _digest_normalized(stream.temp_path, normalizer)
+    return stream.commit(key=key)
+
+
+def deduplicate_backup(
+    stream: BackupStream, glob_pattern: str, normalizer: Callable[[str], str]
+) -> DiffOutcome | None:
+    """Drop an uncommitted backup whose normalized content equals the baseline.
+
+    When the hash of the streamed text matches the indexed baseline hash, the
+    stream is discarded and a reference entry pointing at the baseline file is
+    added to the index. Returns ``None`` (stream untouched) otherwise.
+    """
+
+    target = stream.path.resolve()
+    index = BackupIndex(target.parent)
+    baseline_entry = index.latest(glob_pattern, exclude=target)
+    if baseline_entry is None or baseline_entry.sha256 is None:
         return None
 
-    backups = sorted((path for path in current_backup.parent.glob(glob_pattern) if path.is_file()), key=lambda p: p.stat().st_mtime)
-    for index, path in enumerate(backups):
-        if path.resolve() == current_backup.resolve():
-            return backups[index - 1] if index > 0 else None
+    stream.finish()
+    current_hash, current_lines = _digest_normalized(stream.temp_path, normalizer)
+    if current_hash != baseline_entry.sha256:
+        return None
 
-    return backups[-2] if len(backups) > 1 else None
+    stream.discard()
+    index.record_reference(glob_pattern, target.name, baseline_entry, current_hash, current_lines)
+    baseline_path = target.parent / baseline_entry.stored_file
+    return DiffOutcome(
+        previous_path=baseline_path,
+        current_path=baseline_path,
+        normalized_hash=current_hash,
+        config_changed=False,
+        baseline_sha256=baseline_entry.sha256,
+        current_sha256=current_hash,
+        baseline_size_bytes=baseline_entry.size,
+        current_size_bytes=baseline_entry.size,
+        baseline_lines=baseline_entry.lines,
+        current_lines=current_lines,
+        deduplicated=True,
+    )
 
 
 def evaluate_change(
     current_backup: Path,
     glob_pattern: str,
     normalizer: Callable[[str], str],
+    diff_engine: str = DEFAULT_DIFF_ENGINE,
+    block_parser: BlockParser | None = None,
+    keep_baseline: bool = False,
 ) -> DiffOutcome:
-    """Compare current backup against previous one using the provided normalizer."""
+    """Compare current backup against previous one using the provided normalizer.
+
+    The baseline is taken from the device's :class:`BackupIndex`, and the
+    current backup is recorded there afterwards. When the indexed normalized
+    hash of the baseline matches, the baseline file is not read at all.
+    The current backup is hashed as a stream; both texts are materialized
+    only when they have to be diffed.
+    Plain, compressed and delta-stored baselines are read transparently.
+    ``diff_engine`` names an engine from :data:`app.common.diff_engine.DIFF_ENGINES`.
+    With a ``block_parser`` (see :mod:`app.common.structural_diff`) only
+    changed config blocks are diffed and per-section counts are returned.
+    With ``keep_baseline`` the exact baseline text, when it had to be read, is
+    returned as ``baseline_text`` so :func:`store_as_delta` does not read it
+    again.
+    """
 
     current_backup = current_backup.resolve()
-    previous_backup = _select_previous_file(current_backup, glob_pattern)
+    index = BackupIndex(current_backup.parent)
+    baseline_entry = index.latest(glob_pattern, exclude=current_backup)
+    previous_backup = current_backup.parent / baseline_entry.stored_file if baseline_entry else None
 
-    curr_text = normalizer(current_backup.read_text(encoding="utf-8"))
-    current_hash = _hash_text(curr_text)
-    current_lines = len(curr_text.splitlines())
+    current_hash, current_lines = _digest_normalized(current_backup, normalizer)
     current_size = current_backup.stat().st_size if current_backup.exists() else None
+    index.record(glob_pattern, current_backup, current_hash, current_lines)
 
     if previous_backup is None:
         return DiffOutcome(
@@ -88,9 +239,29 @@ def evaluate_change(
         )
 
     previous_backup = previous_backup.resolve()
-    prev_text = normalizer(previous_backup.read_text(encoding="utf-8"))
+    if baseline_entry.sha256 == current_hash:
+        # Unchanged config: the indexed hash is enough, skip reading the baseline.
+        return DiffOutcome(
+            previous_path=previous_backup,
+            current_path=current_backup,
+            normalized_hash=current_hash,
+            config_changed=False,
+            baseline_sha256=baseline_entry.sha256,
+            current_sha256=current_hash,
+            baseline_size_bytes=baseline_entry.size,
+            current_size_bytes=current_size,
+            baseline_lines=baseline_entry.lines,
+            current_lines=current_lines,
+        )
+
+    if keep_baseline:
+        baseline_text = reconstruct(previous_backup)
+        prev_text = normalizer(universal_newlines(baseline_text))
+    else:
+        baseline_text = None
+        prev_text = normalizer(read_version(previous_backup))
     prev_hash = _hash_text(prev_text)
-    baseline_lines = len(prev_text.splitlines())
+    baseline_lines = _count_lines(prev_text)
     baseline_size = previous_backup.stat().st_size if previous_backup.exists() else None
 
     if prev_hash == current_hash:
@@ -105,9 +276,26 @@ def evaluate_change(
             current_size_bytes=current_size,
             baseline_lines=baseline_lines,
             current_lines=current_lines,
+            baseline_text=baseline_text,
         )
 
-    diff_text, added, removed = _generate_diff(prev_text, curr_text, str(previous_backup), str(current_backup))
+    curr_text = normalizer(read_backup_text(current_backup))
+    section_changes = None
+    if block_parser is None:
+        diff_text, added, removed = _generate_diff(
+            prev_text, curr_text, str(previous_backup), str(current_backup), diff_engine
+        )
+    else:
+        structural = structural_diff(
+            prev_text.splitlines(),
+            curr_text.splitlines(),
+            block_parser,
+            str(previous_backup),
+            str(current_backup),
+            engine=diff_engine,
+        )
+        diff_text = _join_diff_lines(structural.lines)
+        added, removed, section_changes = structural.added, structural.removed, structural.sections
     return DiffOutcome(
         previous_path=previous_backup,
         current_path=current_backup,
@@ -122,4 +310,34 @@ def evaluate_change(
         added=added,
         removed=removed,
         diff_text=diff_text,
+        section_changes=section_changes,
+        baseline_text=baseline_text,
+    )
+
+
+def store_as_delta(
+    current_backup: Path, outcome: DiffOutcome, glob_pattern: str, keyframe_interval: int
+) -> Path:
+    """Replace a freshly evaluated full backup with a forward delta against its baseline.
+
+    The full file is kept as a keyframe when there is no baseline or when the
+    baseline chain already holds ``keyframe_interval - 1`` deltas. Returns the
+    path the backup is stored at and records it in the device index. The
+    baseline is only read again when ``outcome`` carries no ``baseline_text``.
+    """
+
+    baseline = outcome.previous_path
+    if baseline is None or outcome.deduplicated:
+        return current_backup
+
+    depth = chain_depth(baseline) + 1
+    if depth >= keyframe_interval:
+        return current_backup
+
+    current_backup = current_backup.resolve()
+    delta_path = write_delta(current_backup, baseline, depth, outcome.baseline_text)
+    current_backup.unlink()
+    BackupIndex(current_backup.parent).record(
+        glob_pattern, delta_path, outcome.current_sha256, outcome.current_lines
     )
+    return delta_path
@@ -0,0 +1,242 @@
+"""Pluggable line-diff engines producing unified diffs.
+
+An engine turns two line sequences into ``difflib``-style opcodes
+(``(tag, i1, i2, j1, j2)``); :func:`unified_diff` formats them exactly like
+:func:`difflib.unified_diff` with ``lineterm=""``.
+
+``difflib`` (the default) is the standard-library matcher; with it the
+``.diff`` files and added/removed counts are byte-for-byte those of
+:func:`difflib.unified_diff`. ``patience`` anchors on lines that occur
+exactly once on both sides, in order, and only falls back to ``difflib``
+inside the small gaps between anchors. Configs are full of repeated lines
+(``!``, ``exit``, ``switchport mode access``) that make ``difflib`` search
+the whole file for the longest match over and over; unique lines such as
+interface names, ACL entries and descriptions pin the alignment instead, so
+typical changes diff in near-linear time. Its diffs are always valid but can
+align repeated lines differently from ``difflib``, and then report more
+changed lines (``[g, g, b]`` -> ``[b, g, g, f]`` is 3 added / 2 removed
+instead of 2 / 1), so it is opt-in.
+"""
+
+from __future__ import annotations
+
+import difflib
+from bisect import bisect_left
+from typing import Callable, Iterator, Sequence
+
+Opcode = tuple[str, int, int, int, int]
+DiffEngine = Callable[[Sequence[str], Sequence[str]], list[Opcode]]
+
+DEFAULT_DIFF_ENGINE = "difflib"
+# Gaps without unique anchors larger than this (lines x lines) are emitted as a plain replace.
+_FALLBACK_MAX_CELLS = 4_000_000
+
+
+def difflib_opcodes(a: Sequence[str], b: Sequence[str]) -> list[Opcode]:
+    return difflib.SequenceMatcher(None, a, b).get_opcodes()
+
+
+def _unique_common_anchors(
+    a: Sequence[str], alo: int, ahi: int, b: Sequence[str], blo: int, bhi: int
+) -> list[tuple[int, int]]:
+    """Longest increasing run of lines unique in both ranges, as ``(i, j)`` pairs."""
+
+    a_positions: dict[str, int] = {}
+    for i in range(alo, ahi):
+        line = a[i]
+        a_positions[line] = -1 if line in a_positions else i
+    b_positions: dict[str, int] = {}
+    for j in range(blo, bhi):
+        line = b[j]
+        if line in a_positions:
+            b_positions[line] = -1 if line in b_positions else j
+
+    pairs = sorted(
+        (a_positions[line], j) for line, j in b_positions.items() if j >= 0 and a_positions[line] >= 0
+    )
+    if not pairs:
+        return []
+
+    # Patience sorting: longest increasing subsequence of j over pairs ordered by i.
+    tails: list[int] = []
+    tail_index: list[int] = []
+    previous: list[int] = [-1] * len(pairs)
+    for index, (_, j) in enumerate(pairs):
+        position = bisect_left(tails, j)
+        if position == len(tails):
+            tails.append(j)
+            tail_index.append(index)
+        else:
+            tails[position] = j
+            tail_index[position] = index
+        previous[index] = tail_index[position - 1] if position else -1
+
+    anchors: list[tuple[int, int]] = []
+    index = tail_index[-1]
+    while index >= 0:
+        anchors.append(pairs[index])
+        index = previous[index]
+    anchors.reverse()
+    return anchors
+
+
+def _fallback_matches(
+    a: Sequence[str], alo: int, ahi: int, b: Sequence[str], blo: int, bhi: int
+) -> list[tuple[int, int]]:
+    if (ahi - alo) * (bhi - blo) > _FALLBACK_MAX_CELLS:
+        return []
+    matcher = difflib.SequenceMatcher(None, a[alo:ahi], b[blo:bhi], autojunk=False)
+    return [
+        (alo + i + offset, blo + j + offset)
+        for i, j, size in matcher.get_matching_blocks()
+        for offset in range(size)
+    ]
+
+
+def patience_opcodes(a: Sequence[str], b: Sequence[str]) -> list[Opcode]:
+    matches: list[tuple[int, int]] = []
+    regions = [(0, len(a), 0, len(b))]
+    while regions:
+        alo, ahi, blo, bhi = regions.pop()
+        while alo < ahi and blo < bhi and a[alo] == b[blo]:
+            matches.append((alo, blo))
+            alo += 1
+            blo += 1
+        while alo < ahi and blo < bhi and a[ahi - 1] == b[bhi - 1]:
+            ahi -= 1
+            bhi -= 1
+            matches.append((ahi, bhi))
+        if alo == ahi or blo == bhi:
+            continue
+
+        anchors = _unique_common_anchors(a, alo, ahi, b, blo, bhi)
+        if not anchors:
+            matches.extend(_fallback_matches(a, alo, ahi, b, blo, bhi))
+            continue
+
+        for i, j in anchors:
+            matches.append((i, j))
+            regions.append((alo, i, blo, j))
+            alo, blo = i + 1, j + 1
+        regions.append((alo, ahi, blo, bhi))
+
+    matches.sort()
+    return _opcodes_from_matches(matches, len(a), len(b))
+
+
+def _opcodes_from_matches(matches: list[tuple[int, int]], a_len: int, b_len: int) -> list[Opcode]:
+    opcodes: list[Opcode] = []
+    i = j = 0
+    index = 0
+    while index <= len(matches):
+        next_i, next_j = matches[index] if index < len(matches) else (a_len, b_len)
+        if i < next_i and j < next_j:
+            opcodes.append(("replace", i, next_i, j, next_j))
+        elif i < next_i:
+            opcodes.append(("delete", i, next_i, j, j))
+        elif j < next_j:
+            opcodes.append(("insert", i, i, j, next_j))
+        if index == len(matches):
+            break
+
+        size = 1
+        while (
+            index + size < len(matches)
+            and matches[index + size] == (next_i + size, next_j + size)
+        ):
+            size += 1
+        opcodes.append(("equal", next_i, next_i + size, next_j, next_j + size))
+        i, j = next_i + size, next_j + size
+        index += size
+    return opcodes
+
+
+DIFF_ENGINES: dict[str, DiffEngine] = {"difflib": difflib_opcodes, "patience": patience_opcodes}
+
+
+def _grouped_opcodes(codes: list[Opcode], n: int) -> Iterator[list[Opcode]]:
+    """Hunks with ``n`` lines of context, as :meth:`difflib.SequenceMatcher.get_grouped_opcodes`."""
+
+    if not codes:
+        codes = [("equal", 0, 1, 0, 1)]
+    if codes[0][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[0]
+        codes[0] = tag, max(i1, i2 - n), i2, max(j1, j2 - n), j2
+    if codes[-1][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[-1]
+        codes[-1] = tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)
+
+    group: list[Opcode] = []
+    for tag, i1, i2, j1, j2 in codes:
+        if tag == "equal" and i2 - i1 > n + n:
+            group.append((tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)))
+            yield group
+            group = []
+            i1, j1 = max(i1, i2 - n), max(j1, j2 - n)
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == "equal"):
+        yield group
+
+
+def _format_range(start: int, stop: int) -> str:
+    beginning = start + 1
+    length = stop - start
+    if length == 1:
+        return str(beginning)
+    if not length:
+        beginning -= 1
+    return f"{beginning},{length}"
+
+
+def unified_hunks(
+    a: Sequence[str],
+    b: Sequence[str],
+    n: int = 3,
+    engine: str = DEFAULT_DIFF_ENGINE,
+    a_start: int = 0,
+    b_start: int = 0,
+    section: str = "",
+) -> Iterator[str]:
+    """Yield the ``@@`` hunks of a unified diff of ``a`` and ``b``, without file headers.
+
+    ``a_start``/``b_start`` shift reported line numbers when ``a`` and ``b``
+    are slices of larger files; ``section`` is appended to every ``@@`` line
+    as hunk context.
+    """
+
+    context = f" {section}" if section else ""
+    for group in _grouped_opcodes(DIFF_ENGINES[engine](a, b), n):
+        first, last = group[0], group[-1]
+        old_range = _format_range(a_start + first[1], a_start + last[2])
+        new_range = _format_range(b_start + first[3], b_start + last[4])
+        yield f"@@ -{old_range} +{new_range} @@{context}"
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                for line in a[i1:i2]:
+                    yield " " + line
+                continue
+            if tag in ("replace", "delete"):
+                for line in a[i1:i2]:
+                    yield "-" + line
+            if tag in ("replace", "insert"):
+                for line in b[j1:j2]:
+                    yield "+" + line
+
+
+def unified_diff(
+    a: Sequence[str],
+    b: Sequence[str],
+    fromfile: str = "",
+    tofile: str = "",
+    n: int = 3,
+    engine: str = DEFAULT_DIFF_ENGINE,
+) -> Iterator[str]:
+    """Yield unified diff lines (without terminators) computed by ``engine``."""
+
+    started = False
+    for line in unified_hunks(a, b, n, engine):
+        if not started:
+            started = True
+            yield f"--- {fromfile}"
+            yield f"+++ {tofile}"
+        yield line
@@ -0,0 +1,157 @@
+"""Post-fetch diff stage: normalize, hash, diff and write the ``.diff`` file.
+
+Evaluating a change is pure-Python CPU work. Run inline in the device
+workers it serializes on the GIL with the SSH sessions of every other
+device. A :class:`DiffStage` with ``workers > 0`` hands each committed
+backup to a :class:`~concurrent.futures.ProcessPoolExecutor` instead.
+
+The network stage commits a backup into a :class:`PendingDiff` while the
+device session is open and submits its :class:`DiffJob` only after the
+session is closed. The device worker then moves on to the next device;
+outcomes are collected once the diffs are done, so neither the SSH session
+nor the worker slot is held during CPU work. With ``workers=0`` jobs run
+inline at submission, after the session is closed.
+
+Jobs and results cross the process boundary by pickling, so a job carries
+only paths, a normalizer (a built-in normalizer or a compiled
+:class:`~app.core.normalize.LineNormalizer`) and a module-level block
+parser. Workers do not log; the caller logs the returned outcome.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from app.common.diff import DiffOutcome, evaluate_change
+from app.common.diff_engine import DEFAULT_DIFF_ENGINE
+from app.common.structural_diff import BlockParser
+from app.core.compression import diff_path_for, write_backup_text
+from app.core.normalize import Normalizer
+
+DEFAULT_DIFF_WORKERS = 0
+
+
+@dataclass(slots=True, frozen=True)
+class DiffJob:
+    """One committed backup to evaluate against its indexed baseline."""
+
+    current_backup: Path
+    glob_pattern: str
+    normalizer: Normalizer
+    block_parser: BlockParser | None = None
+    diff_engine: str = DEFAULT_DIFF_ENGINE
+    keep_baseline: bool = False
+
+
+def run_diff_job(job: DiffJob) -> tuple[DiffOutcome, Path | None]:
+    """Evaluate ``job`` and write its ``.diff`` file when the config changed."""
+
+    outcome = evaluate_change(
+        job.current_backup,
+        job.glob_pattern,
+        job.normalizer,
+        job.diff_engine,
+        block_parser=job.block_parser,
+        keep_baseline=job.keep_baseline,
+    )
+    if not outcome.config_changed:
+        return outcome, None
+    current_path = outcome.current_path or job.current_backup.resolve()
+    return outcome, write_backup_text(diff_path_for(current_path), outcome.diff_text or "")
+
+
+@dataclass(slots=True)
+class PendingDiff:
+    """A committed backup and the diff still to run for it.
+
+    ``job`` is ``None`` for a deduplicated backup, whose outcome is known
+    without a diff (see :meth:`resolved`). ``future`` is set by :meth:`submit`.
+    """
+
+    path: Path
+    job: DiffJob | None = None
+    future: Future[tuple[DiffOutcome, Path | None]] | None = None
+
+    @classmethod
+    def resolved(cls, path: Path, outcome: DiffOutcome) -> PendingDiff:
+        return cls(path, future=_completed(lambda: (outcome, None)))
+
+    def submit(self, stage: DiffStage) -> PendingDiff:
+        if self.future is None and self.job is not None:
+            self.future = stage.submit(self.job)
+        return self
+
+    def done(self) -> bool:
+        return self.future is not None and self.future.done()
+
+    def result(self) -> tuple[DiffOutcome, Path | None]:
+        """Wait for the diff; exceptions from the worker are re-raised."""
+
+        if self.future is None:
+            raise RuntimeError(f"Diff for {self.path} was not submitted")
+        return self.future.result()
+
+
+def _completed(call: Callable[[], tuple[DiffOutcome, Path | None]]) -> Future[tuple[DiffOutcome, Path | None]]:
+    future: Future[tuple[DiffOutcome, Path | None]] = Future()
+    try:
+        future.set_result(call())
+    except BaseException as exc:
+        future.set_exception(exc)
+    return future
+
+
+class DiffStage:
+    """Runs :class:`DiffJob` s inline (``workers=0``) or on a pool of ``workers`` processes.
+
+    The pool is started on first use with the ``spawn`` method, so worker
+    processes never inherit locks held by the device threads, and is shut
+    down by :meth:`close` (or on leaving the ``with`` block).
+    """
+
+    def __init__(self, workers: int = DEFAULT_DIFF_WORKERS) -> None:
+        self.workers = workers
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def submit(self, job: DiffJob) -> Future[tuple[DiffOutcome, Path | None]]:
+        """Queue ``job``; errors, including a broken pool, surface from the future's result."""
+
+        if self.workers < 1:
+            return _completed(lambda: run_diff_job(job))
+        try:
+            return self._pool().submit(run_diff_job, job)
+        except Exception as exc:
+            future: Future[tuple[DiffOutcome, Path | None]] = Future()
+            future.set_exception(exc)
+            return future
+
+    def run(self, job: DiffJob) -> tuple[DiffOutcome, Path | None]:
+        """Submit ``job`` and wait for its result; exceptions from the worker are re-raised."""
+
+        return self.submit(job).result()
+
+    def close(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def __enter__(self) -> DiffStage:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
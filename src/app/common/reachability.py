@@ -0,0 +1,151 @@
+"""Concurrent TCP reachability sweep of many ``host:port`` pairs.
+
+Connecting to the SSH port of each device in turn costs a full timeout for
+every dead one. :func:`sweep_tcp` starts non-blocking connects to all targets
+at once and waits for them on a single :mod:`selectors` loop (epoll on
+Linux), so a sweep of thousands of devices takes about one timeout. Host
+names are resolved before the sweep on a small thread pool, to IPv4 only like
+the per-device check in :mod:`app.cisco.client`.
+"""
+
+from __future__ import annotations
+
+import errno
+import selectors
+import socket
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable
+
+DEFAULT_SWEEP_TIMEOUT = 5.0
+DEFAULT_SWEEP_SOCKETS = 4096
+# File descriptors left for logging, the inventory and the process itself.
+_RESERVED_FDS = 64
+# Blocking getaddrinfo() calls in flight while host names are resolved.
+_RESOLVER_THREADS = 32
+
+Target = tuple[str, int]
+
+
+def _socket_budget(max_sockets: int) -> int:
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - non-POSIX
+        return max_sockets
+    soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft == resource.RLIM_INFINITY:
+        return max_sockets
+    return max(1, min(max_sockets, soft - _RESERVED_FDS))
+
+
+def _reason(code: int) -> str:
+    if code == errno.ECONNREFUSED:
+        return "refused"
+    return errno.errorcode.get(code, str(code)).lower()
+
+
+def _resolve(host: str) -> str | None:
+    try:
+        return socket.getaddrinfo(host, None, socket.AF_INET, socket.SOCK_STREAM)[0][4][0]
+    except (socket.gaierror, UnicodeError):
+        return None
+
+
+def _resolve_hosts(hosts: Iterable[str]) -> dict[str, str | None]:
+    """IPv4 address of every host (``None`` when it does not resolve); names are looked up concurrently."""
+
+    addresses: dict[str, str | None] = {}
+    names: list[str] = []
+    for host in hosts:
+        try:
+            socket.inet_pton(socket.AF_INET, host)
+        except (OSError, ValueError):
+            names.append(host)
+        else:
+            addresses[host] = host
+    if names:
+        with ThreadPoolExecutor(
+            max_workers=min(_RESOLVER_THREADS, len(names)), thread_name_prefix="sweep-resolve"
+        ) as executor:
+            addresses.update(zip(names, executor.map(_resolve, names)))
+    return addresses
+
+
+def _start_connect(address: tuple[str, int]) -> tuple[socket.socket | None, str | None]:
+    """Begin a non-blocking connect; returns the pending socket or the finished outcome."""
+
+    try:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    except OSError as exc:
+        return None, _reason(exc.errno or 0)
+    sock.setblocking(False)
+    code = sock.connect_ex(address)
+    if code in (errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EALREADY):
+        return sock, None
+    sock.close()
+    return None, None if code == 0 else _reason(code)
+
+
+def sweep_tcp(
+    targets: Iterable[Target],
+    timeout: float = DEFAULT_SWEEP_TIMEOUT,
+    max_sockets: int = DEFAULT_SWEEP_SOCKETS,
+) -> dict[Target, str | None]:
+    """Map every distinct target to ``None`` when it accepts a TCP connection, else the reason it did not.
+
+    Reasons are ``"timeout"``, ``"refused"``, ``"unresolved"`` or the
+    lowercased errno name (``"ehostunreach"``, ...). At most ``max_sockets``
+    connects are in flight at once, further capped by the open-file limit;
+    each gets its own ``timeout`` from the moment it starts.
+    """
+
+    queue = deque(dict.fromkeys(targets))
+    addresses = _resolve_hosts(dict.fromkeys(host for host, _ in queue))
+    results: dict[Target, str | None] = {}
+    limit = _socket_budget(max_sockets)
+    # Deadlines grow in start order, so the first entry always expires first.
+    inflight: dict[socket.socket, tuple[Target, float]] = {}
+    selector = selectors.DefaultSelector()
+    try:
+        while queue or inflight:
+            while queue and len(inflight) < limit:
+                target = queue.popleft()
+                host, port = target
+                address = addresses[host]
+                if address is None:
+                    results[target] = "unresolved"
+                    continue
+                sock, outcome = _start_connect((address, port))
+                if sock is None:
+                    results[target] = outcome
+                    continue
+                inflight[sock] = (target, time.monotonic() + timeout)
+                selector.register(sock, selectors.EVENT_WRITE)
+            if not inflight:
+                continue
+
+            first_deadline = next(iter(inflight.values()))[1]
+            for key, _ in selector.select(max(0.0, first_deadline - time.monotonic())):
+                sock = key.fileobj
+                target, _ = inflight.pop(sock)
+                code = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                results[target] = None if code == 0 else _reason(code)
+                selector.unregister(sock)
+                sock.close()
+
+            now = time.monotonic()
+            while inflight:
+                sock, (target, deadline) = next(iter(inflight.items()))
+                if deadline > now:
+                    break
+                del inflight[sock]
+                results[target] = "timeout"
+                selector.unregister(sock)
+                sock.close()
+    finally:
+        for sock in inflight:
+            selector.unregister(sock)
+            sock.close()
+        selector.close()
+    return results
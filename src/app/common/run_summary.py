@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import json
+import threading
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Iterable
@@ -20,6 +21,9 @@ class TaskResultData:
     lines_removed: int | None = None
     diff_path: str | None = None
     error: str | None = None
+    deduplicated: bool | None = None
+    section_changes: dict[str, dict[str, int]] | None = None
+    arp_changes: dict[str, int] | None = None
 
     def to_dict(self) -> dict[str, object]:
         return {
@@ -31,6 +35,9 @@ class TaskResultData:
             "lines_removed": self.lines_removed,
             "diff_path": self.diff_path,
             "error": self.error,
+            "deduplicated": self.deduplicated,
+            "section_changes": self.section_changes,
+            "arp_changes": self.arp_changes,
         }
 
 
@@ -55,7 +62,13 @@ class DeviceResultData:
 
 
 class RunSummaryBuilder:
-    """Accumulate per-run data and store it as JSON."""
+    """Accumulate per-run data and store it as JSON.
+
+    ``add_device`` may be called from several worker threads at once; totals
+    and the device list are updated under a lock. Devices are reported in the
+    order given to :meth:`set_device_order` (inventory order), not in the
+    order they finished.
+    """
 
     def __init__(
         self,
@@ -76,30 +89,40 @@ class RunSummaryBuilder:
         self.backups_created = 0
         self.configs_changed = 0
         self._devices: list[DeviceResultData] = []
+        self._device_order: dict[str, int] = {}
+        self._lock = threading.Lock()
 
     def set_devices_total(self, total: int) -> None:
         self.devices_total = max(0, total)
 
+    def set_device_order(self, names: Iterable[str]) -> None:
+        self._device_order = {name: index for index, name in enumerate(names)}
+
     def set_selected_features(self, features: Iterable[str]) -> None:
         self.selected_features = list(features)
 
     def add_device(self, device: DeviceResultData) -> None:
-        self._devices.append(device)
-
-        if device.status != "skipped":
-            self.devices_processed += 1
-            if device.status == "success":
-                self.devices_success += 1
-            elif device.status == "failed":
-                self.devices_failed += 1
-
-        for task in device.tasks.values():
-            if task.performed and task.saved_path:
-                self.backups_created += 1
-            if task.config_changed is True:
-                self.configs_changed += 1
+        with self._lock:
+            self._devices.append(device)
+
+            if device.status != "skipped":
+                self.devices_processed += 1
+                if device.status == "success":
+                    self.devices_success += 1
+                elif device.status == "failed":
+                    self.devices_failed += 1
+
+            for task in device.tasks.values():
+                if task.performed and task.saved_path:
+                    self.backups_created += 1
+                if task.config_changed is True:
+                    self.configs_changed += 1
 
     def build(self) -> dict[str, object]:
+        with self._lock:
+            unknown = len(self._device_order)
+            ordered = sorted(self._devices, key=lambda device: self._device_order.get(device.name, unknown))
+            devices = [device.to_dict() for device in ordered]
         return {
             "run_id": self.run_id,
             "timestamp": self.timestamp,
@@ -113,7 +136,7 @@ class RunSummaryBuilder:
                 "backups_created": self.backups_created,
                 "configs_changed": self.configs_changed,
             },
-            "devices": [device.to_dict() for device in self._devices],
+            "devices": devices,
         }
 
     def save(self, backup_dir: Path, logger) -> Path:
@@ -0,0 +1,136 @@
+"""Per-device backup intervals for the long-running ``serve`` mode.
+
+Intervals come from ``local.yml``::
+
+    schedule:
+      default_interval: 86400
+      jitter: 0.1
+      groups:
+        - name: core
+          interval: 900
+          devices: ["*-core-*", "dc1-edge1"]
+
+A device takes the interval of the first group with a matching
+case-insensitive :mod:`fnmatch` name pattern, else ``default_interval``
+(seconds). Each device gets a random phase in ``[0, interval * jitter)`` so
+devices sharing an interval do not all connect at the same moment; after that
+it is due every ``interval`` seconds from its first slot, so the cadence does
+not drift with run time.
+"""
+
+from __future__ import annotations
+
+import heapq
+import random
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from typing import Iterable, Mapping
+
+DEFAULT_SCHEDULE_INTERVAL = 3600
+DEFAULT_SCHEDULE_JITTER = 0.1
+DEFAULT_GROUP = "default"
+
+
+@dataclass(slots=True, frozen=True)
+class ScheduleGroup:
+    """Devices whose names match one of ``devices`` are backed up every ``interval`` seconds."""
+
+    name: str
+    interval: int
+    devices: tuple[str, ...] = ()
+
+    def matches(self, device_name: str) -> bool:
+        return any(fnmatchcase(device_name.lower(), pattern.lower()) for pattern in self.devices)
+
+
+@dataclass(slots=True, frozen=True)
+class Schedule:
+    """Backup intervals of every group, the fallback interval and the start-time jitter."""
+
+    groups: tuple[ScheduleGroup, ...] = ()
+    default_interval: int = DEFAULT_SCHEDULE_INTERVAL
+    jitter: float = DEFAULT_SCHEDULE_JITTER
+
+    @classmethod
+    def from_config(cls, section: object) -> Schedule:
+        """Parse ``local.yml`` ``schedule``; raises :class:`ValueError` on malformed entries."""
+
+        if section is None:
+            return cls()
+        if not isinstance(section, Mapping):
+            raise ValueError("schedule must be a mapping")
+        default_interval = _interval(section.get("default_interval", DEFAULT_SCHEDULE_INTERVAL), "default_interval")
+        jitter = section.get("jitter", DEFAULT_SCHEDULE_JITTER)
+        if isinstance(jitter, bool) or not isinstance(jitter, (int, float)) or not 0 <= jitter <= 1:
+            raise ValueError(f"schedule.jitter must be a number between 0 and 1, got {jitter!r}")
+        raw_groups = section.get("groups") or []
+        if not isinstance(raw_groups, list):
+            raise ValueError("schedule.groups must be a list")
+        groups: list[ScheduleGroup] = []
+        for index, entry in enumerate(raw_groups, start=1):
+            where = f"schedule.groups[{index}]"
+            if not isinstance(entry, Mapping):
+                raise ValueError(f"{where} must be a mapping with 'interval' and 'devices'")
+            patterns = entry.get("devices")
+            if isinstance(patterns, str):
+                patterns = [patterns]
+            if not isinstance(patterns, list) or not patterns or not all(isinstance(item, str) for item in patterns):
+                raise ValueError(f"{where}.devices must be a non-empty list of device name patterns")
+            groups.append(
+                ScheduleGroup(
+                    name=str(entry.get("name") or f"group{index}"),
+                    interval=_interval(entry.get("interval"), f"groups[{index}].interval"),
+                    devices=tuple(patterns),
+                )
+            )
+        return cls(groups=tuple(groups), default_interval=default_interval, jitter=float(jitter))
+
+    def group_for(self, device_name: str) -> ScheduleGroup:
+        for group in self.groups:
+            if group.matches(device_name):
+                return group
+        return ScheduleGroup(DEFAULT_GROUP, self.default_interval)
+
+
+def _interval(value: object, key: str) -> int:
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        raise ValueError(f"schedule.{key} must be a positive number of seconds, got {value!r}")
+    return value
+
+
+class DeviceScheduler:
+    """Due times of every device on a monotonic clock, earliest first."""
+
+    def __init__(
+        self, schedule: Schedule, device_names: Iterable[str], start: float, rng: random.Random | None = None
+    ) -> None:
+        rng = rng or random.Random()
+        self.intervals = {name: schedule.group_for(name).interval for name in device_names}
+        self._heap = [
+            (start + rng.uniform(0, interval * schedule.jitter), name) for name, interval in self.intervals.items()
+        ]
+        heapq.heapify(self._heap)
+
+    def next_due(self) -> float | None:
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: float) -> tuple[list[str], int]:
+        """Names due at ``now`` and how many of their slots were missed; each is rescheduled.
+
+        A device that is late by more than an interval (a long previous
+        batch) runs once and resumes at its next slot after ``now``.
+        """
+
+        due: list[str] = []
+        missed = 0
+        while self._heap and self._heap[0][0] <= now:
+            slot, name = heapq.heappop(self._heap)
+            interval = self.intervals[name]
+            slot += interval
+            if slot <= now:
+                skipped = int((now - slot) // interval) + 1
+                missed += skipped
+                slot += skipped * interval
+            due.append(name)
+            heapq.heappush(self._heap, (slot, name))
+        return due, missed
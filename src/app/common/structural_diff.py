@@ -0,0 +1,194 @@
+"""Hierarchy-aware diff of config blocks.
+
+Cisco running-config is split into top-level stanzas (a line at column 0 plus
+every indented line under it); MikroTik exports into ``/path`` sections.
+Blocks are matched by header (and occurrence, for repeated headers) and
+hashed, and only blocks whose hash differs are line-diffed. A stanza that
+moved is therefore not reported as a change, and an edit inside one
+interface costs one small diff instead of a diff of the whole file.
+
+Hunks carry the real line numbers of the normalized files and the block
+header as section context, like ``git diff``::
+
+    @@ -120,4 +120,4 @@ interface GigabitEthernet1/0/7
+
+Blocks that are new or gone are emitted as pure insertions or deletions,
+anchored after the nearest preceding block both versions share.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass, field
+from typing import Callable, Sequence
+
+from app.common.diff_engine import DEFAULT_DIFF_ENGINE, unified_hunks
+
+GLOBAL_SECTION = "global"
+
+
+@dataclass(slots=True)
+class ConfigBlock:
+    """A header line and the lines nested under it, starting at line index ``start``."""
+
+    header: str
+    start: int
+    section: str
+    lines: list[str] = field(default_factory=list)
+
+    @property
+    def end(self) -> int:
+        return self.start + len(self.lines)
+
+    def digest(self) -> bytes:
+        return hashlib.sha256("\n".join(self.lines).encode("utf-8")).digest()
+
+
+BlockParser = Callable[[Sequence[str]], list[ConfigBlock]]
+
+
+@dataclass(slots=True)
+class StructuralDiff:
+    """Diff lines plus added/removed totals and per-section ``(added, removed)`` counts."""
+
+    lines: list[str]
+    added: int = 0
+    removed: int = 0
+    sections: dict[str, tuple[int, int]] = field(default_factory=dict)
+
+
+def _banner_delimiter(line: str) -> str | None:
+    """Closing delimiter of a multi-line ``banner`` command, if ``line`` opens one."""
+
+    parts = line.split(maxsplit=2)
+    if len(parts) < 3 or parts[0] != "banner":
+        return None
+    body = parts[2]
+    delimiter = "^C" if body.startswith("^C") else body[0]
+    if delimiter in body[len(delimiter) :]:
+        return None
+    return delimiter
+
+
+def cisco_blocks(lines: Sequence[str]) -> list[ConfigBlock]:
+    """Split running-config into top-level stanzas.
+
+    Indented lines belong to the stanza above them; ``!`` separators and blank
+    lines belong to no block. Single-line commands (``hostname``, ``ip route``)
+    are blocks of their own and are counted under :data:`GLOBAL_SECTION`.
+    Multi-line ``banner`` bodies stay with their ``banner`` line.
+    """
+
+    blocks: list[ConfigBlock] = []
+    current: ConfigBlock | None = None
+    banner_end: str | None = None
+    for index, line in enumerate(lines):
+        if banner_end is not None:
+            current.lines.append(line)
+            if banner_end in line:
+                banner_end = None
+            continue
+        if line[:1] in (" ", "\t"):
+            if current is not None:
+                current.lines.append(line)
+                continue
+        elif not line or line[0] == "!":
+            current = None
+            continue
+
+        current = ConfigBlock(header=line.strip(), start=index, section=GLOBAL_SECTION, lines=[line])
+        blocks.append(current)
+        if line.startswith("banner "):
+            banner_end = _banner_delimiter(line)
+
+    for block in blocks:
+        if len(block.lines) > 1:
+            block.section = block.header
+    return blocks
+
+
+def mikrotik_blocks(lines: Sequence[str]) -> list[ConfigBlock]:
+    """Split an export into ``/path`` sections; comments before the first path form a global block."""
+
+    blocks: list[ConfigBlock] = []
+    current: ConfigBlock | None = None
+    for index, line in enumerate(lines):
+        if line.startswith("/"):
+            current = ConfigBlock(header=line.strip(), start=index, section=line.strip(), lines=[line])
+            blocks.append(current)
+        elif current is None:
+            current = ConfigBlock(header="", start=index, section=GLOBAL_SECTION, lines=[line])
+            blocks.append(current)
+        else:
+            current.lines.append(line)
+    return blocks
+
+
+def _keyed(blocks: list[ConfigBlock]) -> dict[tuple[str, int], ConfigBlock]:
+    """Blocks by ``(header, occurrence)`` so repeated headers pair up in order."""
+
+    seen: dict[str, int] = {}
+    keyed: dict[tuple[str, int], ConfigBlock] = {}
+    for block in blocks:
+        occurrence = seen.get(block.header, 0)
+        seen[block.header] = occurrence + 1
+        keyed[(block.header, occurrence)] = block
+    return keyed
+
+
+def structural_diff(
+    prev_lines: Sequence[str],
+    curr_lines: Sequence[str],
+    parser: BlockParser,
+    fromfile: str = "",
+    tofile: str = "",
+    n: int = 3,
+    engine: str = DEFAULT_DIFF_ENGINE,
+) -> StructuralDiff:
+    """Diff two configs block by block using ``parser`` to find the blocks."""
+
+    prev_blocks = _keyed(parser(prev_lines))
+    curr_blocks = _keyed(parser(curr_lines))
+    # (new-file position, removals first, old-file position, section, hunk lines)
+    hunks: list[tuple[int, int, int, str, list[str]]] = []
+
+    prev_anchor = 0
+    for key, block in curr_blocks.items():
+        old = prev_blocks.get(key)
+        if old is None:
+            lines = list(unified_hunks([], block.lines, n, engine, prev_anchor, block.start, block.header))
+            hunks.append((block.start, 1, prev_anchor, block.section, lines))
+            continue
+        if old.digest() != block.digest():
+            lines = list(unified_hunks(old.lines, block.lines, n, engine, old.start, block.start, block.header))
+            hunks.append((block.start, 1, old.start, block.section, lines))
+        prev_anchor = old.end
+
+    curr_anchor = 0
+    for key, old in prev_blocks.items():
+        block = curr_blocks.get(key)
+        if block is not None:
+            curr_anchor = block.end
+            continue
+        lines = list(unified_hunks(old.lines, [], n, engine, old.start, curr_anchor, old.header))
+        hunks.append((curr_anchor, 0, old.start, old.section, lines))
+
+    hunks.sort(key=lambda hunk: hunk[:3])
+    result = StructuralDiff(lines=[])
+    if hunks:
+        result.lines += [f"--- {fromfile}", f"+++ {tofile}"]
+    for _, _, _, section, lines in hunks:
+        added = sum(1 for line in lines if line.startswith("+"))
+        removed = sum(1 for line in lines if line.startswith("-"))
+        result.lines += lines
+        result.added += added
+        result.removed += removed
+        section_added, section_removed = result.sections.get(section, (0, 0))
+        result.sections[section] = (section_added + added, section_removed + removed)
+    return result
+
+
+def format_section_changes(sections: dict[str, tuple[int, int]]) -> str:
+    """Compact log form: ``interface Gi1/0/1(+1/-1);global(+2/-0)``."""
+
+    return ";".join(f"{name}(+{added}/-{removed})" for name, (added, removed) in sections.items())
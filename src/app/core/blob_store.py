@@ -0,0 +1,161 @@
+"""Content-addressed blob store for text backups.
+
+Blobs live under ``<backup_dir>/objects/<key[:2]>/<key>``. Callers choose the
+key; backups are keyed by the SHA256 of their normalized text (plus
+``.gz``/``.zst`` for compressed blobs), so configs that differ only in
+volatile lines (timestamps, ``ntp clock-period``) or in the per-backup
+metadata header are stored once, as the first raw copy seen. Blobs never
+contain the metadata header.
+
+Each device directory keeps a ``.timeline.jsonl`` manifest with one entry per
+backup: its ``<timestamp>_...`` file name, blob key and metadata header.
+Every file name is also a hard link to its blob, so reading a backup by
+timestamp is still a single ``open()`` and existing readers (diff, backup
+index, run summaries) need no changes. The link count of a blob is its
+reference count; :meth:`BlobStore.collect_garbage` removes blobs no device
+directory links to any more (for example after compaction packed them).
+Because linked names share the blob's inode, they also share its mtime:
+order and age backups by the timestamp in their names, never by mtime.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterator
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX
+    fcntl = None
+
+OBJECTS_DIRNAME = "objects"
+TIMELINE_FILENAME = ".timeline.jsonl"
+_LOCK_FILENAME = ".lock"
+
+
+@dataclass(slots=True, frozen=True)
+class TimelineEntry:
+    """One backup of a device: its file name, the blob holding it and its metadata header."""
+
+    file: str
+    blob: str
+    header: str = ""
+
+
+class Timeline:
+    """Append-only per-device manifest of blob-backed backups."""
+
+    def __init__(self, device_dir: Path) -> None:
+        self.device_dir = device_dir
+        self.path = device_dir / TIMELINE_FILENAME
+
+    def append(self, entry: TimelineEntry) -> None:
+        with self.path.open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps(asdict(entry), separators=(",", ":")) + "\n")
+
+    def entries(self) -> list[TimelineEntry]:
+        """All entries in the order they were saved (empty when there is no manifest)."""
+
+        try:
+            with self.path.open("r", encoding="utf-8") as handle:
+                return [TimelineEntry(**json.loads(line)) for line in handle if line.strip()]
+        except FileNotFoundError:
+            return []
+        except (ValueError, TypeError) as exc:
+            raise ValueError(f"Corrupt timeline entry in {self.path}") from exc
+
+    def get(self, name: str) -> TimelineEntry | None:
+        for entry in reversed(self.entries()):
+            if entry.file == name:
+                return entry
+        return None
+
+
+class BlobStore:
+    """Store of immutable blobs addressed by caller-chosen keys."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    @classmethod
+    def for_backup_dir(cls, backup_dir: Path) -> BlobStore:
+        return cls(backup_dir / OBJECTS_DIRNAME)
+
+    def blob_path(self, key: str) -> Path:
+        return self.root / key[:2] / key
+
+    def add(self, source: Path, key: str, target: Path) -> Path:
+        """Expose blob ``key`` at ``target``, moving ``source`` into the store when the blob is new.
+
+        ``source`` is dropped when the blob already exists. Holds the store
+        lock shared, so :meth:`collect_garbage` cannot remove the blob
+        between the existence check and the link.
+        """
+
+        blob = self.blob_path(key)
+        with self._locked(exclusive=False):
+            try:
+                self._link(blob, target)
+            except FileNotFoundError:
+                blob.parent.mkdir(parents=True, exist_ok=True)
+                source.chmod(0o444)
+                os.replace(source, blob)
+                self._link(blob, target)
+            else:
+                source.unlink()
+        return blob
+
+    def iter_unreferenced(self) -> Iterator[Path]:
+        """Yield blobs no device timeline links to any more (hard-link count 1)."""
+
+        if not self.root.exists():
+            return
+        for blob in self.root.glob("??/*"):
+            if blob.is_file() and blob.stat().st_nlink == 1:
+                yield blob
+
+    def collect_garbage(self) -> tuple[int, int]:
+        """Delete unreferenced blobs; returns how many were removed and the bytes freed."""
+
+        if not self.root.exists():
+            return 0, 0
+        removed = freed = 0
+        with self._locked(exclusive=True):
+            for blob in list(self.iter_unreferenced()):
+                freed += blob.stat().st_size
+                blob.unlink()
+                removed += 1
+        return removed, freed
+
+    @staticmethod
+    def _link(blob: Path, target: Path) -> None:
+        """Hard-link ``blob`` at ``target``; raises :class:`FileNotFoundError` when the blob is missing.
+
+        Filesystems without hard links get a plain copy instead; symlinks are
+        avoided because readers resolve paths and expect the device directory.
+        """
+
+        try:
+            os.link(blob, target)
+        except (FileExistsError, FileNotFoundError):
+            raise
+        except OSError:
+            shutil.copyfile(blob, target)
+
+    @contextmanager
+    def _locked(self, exclusive: bool) -> Iterator[None]:
+        if fcntl is None:  # pragma: no cover - non-POSIX
+            yield
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        with (self.root / _LOCK_FILENAME).open("a") as handle:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
@@ -0,0 +1,128 @@
+"""Optional compression of stored backup text.
+
+Writers compress with the algorithm configured in ``backup.compression`` and
+append its suffix to the file name (``.gz`` / ``.zst``). Readers do not need
+to know how a file was written: :func:`open_backup_text` detects gzip and zstd
+by their magic bytes and falls back to plain UTF-8, so compressed and plain
+backups can sit side by side in one device directory. ``zstd`` needs the
+optional ``zstandard`` package; ``gzip`` is always available.
+"""
+
+from __future__ import annotations
+
+import gzip
+import io
+from pathlib import Path
+from typing import BinaryIO, TextIO
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+NO_COMPRESSION = "none"
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+COMPRESSION_CHOICES = (NO_COMPRESSION, *COMPRESSION_SUFFIXES)
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+_GZIP_LEVEL = 6
+_ZSTD_LEVEL = 3
+
+
+def zstd_available() -> bool:
+    return zstandard is not None
+
+
+def _require_zstandard() -> None:
+    if zstandard is None:
+        raise RuntimeError("zstd compression requires the 'zstandard' package.")
+
+
+def compression_suffix(compression: str) -> str:
+    return COMPRESSION_SUFFIXES.get(compression, "")
+
+
+def compression_from_name(name: str) -> str:
+    """Return the compression implied by the suffix of ``name``."""
+
+    for compression, suffix in COMPRESSION_SUFFIXES.items():
+        if name.endswith(suffix):
+            return compression
+    return NO_COMPRESSION
+
+
+def strip_compression_suffix(name: str) -> str:
+    suffix = compression_suffix(compression_from_name(name))
+    return name[: -len(suffix)] if suffix else name
+
+
+def compressed_name(name: str, compression: str) -> str:
+    return name + compression_suffix(compression)
+
+
+def diff_path_for(backup_path: Path) -> Path:
+    """Path of the ``.diff`` file next to ``backup_path``, compressed the same way."""
+
+    compression = compression_from_name(backup_path.name)
+    plain_path = backup_path.with_name(strip_compression_suffix(backup_path.name)).with_suffix(".diff")
+    return plain_path.with_name(compressed_name(plain_path.name, compression))
+
+
+def open_compressed_writer(raw: BinaryIO, compression: str) -> BinaryIO:
+    """Wrap ``raw`` in a compressor; closing the wrapper finishes the stream but leaves ``raw`` open.
+
+    gzip output carries no file name or mtime, so equal text compresses to
+    equal bytes.
+    """
+
+    if compression == "gzip":
+        return gzip.GzipFile(filename="", mode="wb", fileobj=raw, compresslevel=_GZIP_LEVEL, mtime=0)
+    if compression == "zstd":
+        _require_zstandard()
+        return zstandard.ZstdCompressor(level=_ZSTD_LEVEL).stream_writer(raw, closefd=False)
+    return raw
+
+
+def open_backup_text(path: Path, errors: str = "strict", newline: str | None = None) -> TextIO:
+    """Open a plain, gzip or zstd backup file for reading as UTF-8 text.
+
+    ``newline=""`` returns line endings untranslated.
+    """
+
+    with path.open("rb") as handle:
+        magic = handle.read(len(_ZSTD_MAGIC))
+
+    if magic.startswith(_GZIP_MAGIC):
+        return gzip.open(path, "rt", encoding="utf-8", errors=errors, newline=newline)
+    if magic == _ZSTD_MAGIC:
+        _require_zstandard()
+        return zstandard.open(path, "rt", encoding="utf-8", errors=errors, newline=newline)
+    return path.open("r", encoding="utf-8", errors=errors, newline=newline)
+
+
+def read_backup_text(path: Path, newline: str | None = None) -> str:
+    with open_backup_text(path, newline=newline) as handle:
+        return handle.read()
+
+
+def decode_backup_bytes(data: bytes, newline: str | None = None) -> str:
+    """In-memory counterpart of :func:`read_backup_text` for the raw bytes of a stored file."""
+
+    if data.startswith(_GZIP_MAGIC):
+        data = gzip.decompress(data)
+    elif data.startswith(_ZSTD_MAGIC):
+        _require_zstandard()
+        data = zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    return io.TextIOWrapper(io.BytesIO(data), encoding="utf-8", newline=newline).read()
+
+
+def write_backup_text(path: Path, text: str) -> Path:
+    """Write ``text`` to ``path``, compressed according to its suffix."""
+
+    with path.open("wb") as raw:
+        writer = open_compressed_writer(raw, compression_from_name(path.name))
+        writer.write(text.encode("utf-8"))
+        if writer is not raw:
+            writer.close()
+    return path
@@ -12,9 +12,11 @@ from __future__ import annotations
 import logging
 import re
 import sys
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Mapping
+from typing import Any, Iterator, Mapping
 
 import yaml
 
@@ -53,6 +55,8 @@ RESERVED_LOG_RECORD_KEYS: set[str] = {
     "taskName",
 }
 
+_DEVICE_CONTEXT: ContextVar[str] = ContextVar("netconfigbackup_device", default="-")
+
 
 @dataclass(slots=True)
 class LoggingConfig:
@@ -64,14 +68,34 @@ class LoggingConfig:
 
 
 class DeviceContextFilter(logging.Filter):
-    """Ensure every record contains a device name."""
+    """Ensure every record contains a device name.
+
+    Records without an explicit ``device`` extra inherit the device bound via
+    :func:`device_log_context` for the current thread, falling back to ``-``.
+    """
 
     def filter(self, record: logging.LogRecord) -> bool:  # pragma: no cover - logging hook
         if not getattr(record, "device", None):
-            record.device = "-"
+            record.device = _DEVICE_CONTEXT.get()
         return True
 
 
+@contextmanager
+def device_log_context(device_name: str) -> Iterator[None]:
+    """Bind ``device_name`` as the default log context for the current thread.
+
+    Worker threads processing devices concurrently use this so that log records
+    emitted without an explicit ``extra={"device": ...}`` (storage helpers,
+    library code) are still attributed to the right device.
+    """
+
+    token = _DEVICE_CONTEXT.set(device_name or "-")
+    try:
+        yield
+    finally:
+        _DEVICE_CONTEXT.reset(token)
+
+
 class SecretScrubberFilter(logging.Filter):
     """Remove obvious secrets from log messages."""
 
@@ -1,33 +1,103 @@
-"""Normalization helpers for backup configuration texts."""
+"""Normalization helpers for backup configuration texts.
+
+Each vendor's volatile-line patterns are combined into one compiled
+alternation that starts with the literal line break before the line, so
+:mod:`re` scans ahead for candidate lines in C and drops every volatile line
+in a single :func:`re.sub` pass, instead of a Python loop trying every
+pattern on every line. A lookahead on the line's first character rejects
+ordinary config lines before any alternative is tried. Patterns use
+``[^\\S\\n]`` instead of ``\\s`` so a match never crosses a line.
+User rules from ``local.yml`` cannot be trusted to do the same (``\\s*``
+would eat the next line), so they are applied to each line on its own.
+"""
 
 from __future__ import annotations
 
 import re
+import threading
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from typing import Callable, Mapping
 
 
 def _normalize_line_endings(text: str) -> str:
     """Convert CRLF/CR line endings to LF for consistent processing."""
 
+    if "\r" not in text:
+        return text
     return text.replace("\r\n", "\n").replace("\r", "\n")
 
 
-def _trim_trailing_blank_lines(lines: list[str]) -> list[str]:
-    """Remove trailing empty lines while preserving internal spacing."""
+def _volatile_line_pattern(first_chars: str, patterns: tuple[str, ...]) -> re.Pattern[str]:
+    """``\\n`` plus a whole volatile line; the text is searched with a leading ``\\n`` prepended.
 
-    while lines and not lines[-1].strip():
-        lines.pop()
-    return lines
+    ``patterns`` are case-insensitive and pre-filtered on ``first_chars``.
+    """
 
+    alternation = "|".join(f"(?:{pattern})" for pattern in patterns)
+    return re.compile(f"\\n(?=[{re.escape(first_chars)}])(?:{alternation})[^\\n]*", re.IGNORECASE | re.MULTILINE)
 
-_MIKROTIK_VOLATILE_PATTERNS: tuple[re.Pattern[str], ...] = (
-    re.compile(r"^#\s*backup_time:.*", re.IGNORECASE),
-    re.compile(r"^#\s*\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}\s+by\s+RouterOS\b.*", re.IGNORECASE),
-    re.compile(r"^#\s*[a-z]{3}/\d{2}/\d{4}\s+\d{2}:\d{2}:\d{2}\s+by\s+RouterOS\b.*", re.IGNORECASE),
-)
 
+def _drop_volatile_lines(text: str, pattern: re.Pattern[str]) -> str:
+    return pattern.sub("", "\n" + _normalize_line_endings(text))[1:]
+
+
+Masks = tuple[tuple[re.Pattern[str], str], ...]
+
+
+@dataclass(slots=True, frozen=True)
+class LineNormalizer:
+    """A compiled vendor normalizer, usable on a whole text or on a stream of chunks.
+
+    :meth:`normalize_lines` handles any run of complete lines on its own, so
+    a file can be normalized chunk by chunk; only the final trim of trailing
+    blank lines needs to see the end of the text (:meth:`content_end`).
+    ``strip_lines`` rstrips every line (MikroTik); otherwise lines keep their
+    trailing whitespace and whitespace-only lines count as blank (Cisco).
+    ``drop`` and ``masks`` are user rules, applied line by line after the
+    built-in ``volatile`` pass.
+    """
+
+    volatile: re.Pattern[str]
+    masks: Masks = ()
+    strip_lines: bool = False
+    drop: re.Pattern[str] | None = None
+
+    def normalize_lines(self, text: str) -> str:
+        text = _drop_volatile_lines(text, self.volatile)
+        if not self.strip_lines and self.drop is None and not self.masks:
+            return text
+        lines = text.split("\n")
+        if self.drop is not None:
+            lines = [line for line in lines if self.drop.match(line) is None]
+        if self.strip_lines:
+            lines = [line.rstrip() for line in lines]
+        for pattern, replacement in self.masks:
+            lines = [pattern.sub(replacement, line) for line in lines]
+        return "\n".join(lines)
 
-def _is_volatile_mikrotik_line(line: str) -> bool:
-    return any(pattern.match(line) for pattern in _MIKROTIK_VOLATILE_PATTERNS)
+    def content_end(self, normalized: str) -> int:
+        """End of the last non-blank line in ``normalized`` (0 when every line is blank)."""
+
+        if self.strip_lines:
+            return len(normalized.rstrip("\n"))
+        stripped = normalized.rstrip()
+        if not stripped:
+            return 0
+        end = normalized.find("\n", len(stripped))
+        return len(normalized) if end == -1 else end
+
+    def __call__(self, text: str) -> str:
+        normalized = self.normalize_lines(text)
+        return normalized[: self.content_end(normalized)]
+
+
+_MIKROTIK_VOLATILE_PATTERNS: tuple[str, ...] = (
+    r"#[^\S\n]*backup_time:",
+    r"#[^\S\n]*\d{4}-\d{2}-\d{2}[^\S\n]+\d{2}:\d{2}:\d{2}[^\S\n]+by[^\S\n]+RouterOS\b",
+    r"#[^\S\n]*[a-z]{3}/\d{2}/\d{4}[^\S\n]+\d{2}:\d{2}:\d{2}[^\S\n]+by[^\S\n]+RouterOS\b",
+)
+_MIKROTIK = LineNormalizer(_volatile_line_pattern("#", _MIKROTIK_VOLATILE_PATTERNS), strip_lines=True)
 
 
 def normalize_mikrotik_export(text: str) -> str:
@@ -39,30 +109,18 @@ def normalize_mikrotik_export(text: str) -> str:
     - drop blank lines at the end
     """
 
-    normalized = _normalize_line_endings(text)
-    lines = normalized.split("\n")
-    filtered: list[str] = []
-    for line in lines:
-        trimmed_line = line.rstrip()
-        if _is_volatile_mikrotik_line(trimmed_line):
-            continue
-        filtered.append(trimmed_line)
-    trimmed = _trim_trailing_blank_lines(filtered)
-    return "\n".join(trimmed)
-
-
-_CISCO_VOLATILE_PATTERNS: tuple[re.Pattern[str], ...] = (
-    re.compile(r"^!\s+Last configuration change.*", re.IGNORECASE),
-    re.compile(r"^!\s+NVRAM config last updated.*", re.IGNORECASE),
-    re.compile(r"^!\s+Time:.*", re.IGNORECASE),
-    re.compile(r"^!\s+.*uptime is.*", re.IGNORECASE),
-    re.compile(r"^Current configuration : \d+ bytes", re.IGNORECASE),
-    re.compile(r"^ntp clock-period \d+", re.IGNORECASE),
-)
+    return _MIKROTIK(text)
 
 
-def _is_volatile_cisco_line(line: str) -> bool:
-    return any(pattern.match(line) for pattern in _CISCO_VOLATILE_PATTERNS)
+_CISCO_VOLATILE_PATTERNS: tuple[str, ...] = (
+    r"![^\S\n]+Last configuration change",
+    r"![^\S\n]+NVRAM config last updated",
+    r"![^\S\n]+Time:",
+    r"![^\S\n]+[^\n]*uptime is",
+    r"Current configuration : \d+ bytes",
+    r"ntp clock-period \d+",
+)
+_CISCO = LineNormalizer(_volatile_line_pattern("!cn", _CISCO_VOLATILE_PATTERNS))
 
 
 def normalize_cisco_running_config(text: str) -> str:
@@ -72,14 +130,152 @@ def normalize_cisco_running_config(text: str) -> str:
     standardizes line endings while keeping configuration commands intact.
     """
 
-    normalized = _normalize_line_endings(text)
-    lines = normalized.split("\n")
+    return _CISCO(text)
+
+
+Normalizer = Callable[[str], str]
+
+# vendor -> (first characters of built-in volatile lines, built-in patterns, strip_lines, built-in normalizer)
+_VENDORS: dict[str, Normalizer] = {
+    "cisco": normalize_cisco_running_config,
+    "mikrotik": normalize_mikrotik_export,
+}
+_BUILTIN_LINE_NORMALIZERS: dict[Normalizer, LineNormalizer] = {
+    normalize_cisco_running_config: _CISCO,
+    normalize_mikrotik_export: _MIKROTIK,
+}
+
+
+def line_normalizer(normalizer: Normalizer) -> LineNormalizer | None:
+    """The streamable form of ``normalizer``, or ``None`` for arbitrary callables."""
+
+    if isinstance(normalizer, LineNormalizer):
+        return normalizer
+    return _BUILTIN_LINE_NORMALIZERS.get(normalizer)
+
+
+@dataclass(slots=True, frozen=True)
+class NormalizationRules:
+    """Extra normalization for one vendor/model key.
+
+    ``drop``: regexes matched at the start of a line; matching lines are
+    removed. ``mask``: ``(pattern, replacement)`` pairs applied with
+    :func:`re.sub`, e.g. to blank rotating secrets. Both see one line at a
+    time (without its line break), so a rule never affects a neighbouring line.
+    """
+
+    drop: tuple[str, ...] = ()
+    mask: tuple[tuple[str, str], ...] = ()
+
+    def merged(self, other: NormalizationRules) -> NormalizationRules:
+        return NormalizationRules(drop=self.drop + other.drop, mask=self.mask + other.mask)
+
+
+def _string_list(value: object, where: str) -> tuple[str, ...]:
+    if value is None:
+        return ()
+    if isinstance(value, str):
+        value = [value]
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise ValueError(f"{where} must be a regex or a list of regexes")
+    for pattern in value:
+        try:
+            re.compile(pattern)
+        except re.error as exc:
+            raise ValueError(f"{where}: invalid regex {pattern!r}: {exc}") from exc
+    return tuple(value)
+
+
+def _mask_list(value: object, where: str) -> tuple[tuple[str, str], ...]:
+    if value is None:
+        return ()
+    if not isinstance(value, list):
+        raise ValueError(f"{where} must be a list of {{pattern, replace}} mappings")
+    masks: list[tuple[str, str]] = []
+    for item in value:
+        if not isinstance(item, Mapping) or not isinstance(item.get("pattern"), str):
+            raise ValueError(f"{where} entries need a 'pattern' string")
+        replacement = item.get("replace", "<masked>")
+        if not isinstance(replacement, str):
+            raise ValueError(f"{where}: 'replace' must be a string")
+        (pattern,) = _string_list(item["pattern"], where)
+        try:
+            re.compile(pattern).sub(replacement, "")
+        except re.error as exc:
+            raise ValueError(f"{where}: invalid replacement {replacement!r}: {exc}") from exc
+        masks.append((pattern, replacement))
+    return tuple(masks)
+
+
+class NormalizerRegistry:
+    """Per-vendor, per-model normalizers built from the ``normalize`` section of ``local.yml``.
+
+    Rules are keyed by vendor, then by a case-insensitive :mod:`fnmatch`
+    pattern on ``Device.model`` (``"*"`` matches every model, including
+    devices without one). The rule sets of every matching key are applied on
+    top of the built-in volatile patterns. Each normalizer is compiled on first
+    use and cached per ``(vendor, model)`` for the rest of the run.
+    """
+
+    def __init__(self, rules: Mapping[str, Mapping[str, NormalizationRules]] | None = None) -> None:
+        self._rules = {vendor: dict(models) for vendor, models in (rules or {}).items()}
+        self._cache: dict[tuple[str, str | None], Normalizer] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, section: object) -> NormalizerRegistry:
+        """Parse ``local.yml`` ``normalize``; raises :class:`ValueError` on unknown vendors or bad regexes."""
+
+        if section is None:
+            return cls()
+        if not isinstance(section, Mapping):
+            raise ValueError("normalize must be a mapping of vendor -> model pattern -> rules")
+        rules: dict[str, dict[str, NormalizationRules]] = {}
+        for vendor, models in section.items():
+            if vendor not in _VENDORS:
+                raise ValueError(f"normalize.{vendor}: unknown vendor (expected one of {', '.join(_VENDORS)})")
+            if not isinstance(models, Mapping):
+                raise ValueError(f"normalize.{vendor} must be a mapping of model pattern -> rules")
+            rules[vendor] = {}
+            for model_pattern, entry in models.items():
+                where = f"normalize.{vendor}.{model_pattern}"
+                if not isinstance(entry, Mapping):
+                    raise ValueError(f"{where} must be a mapping with 'drop' and/or 'mask'")
+                rules[vendor][str(model_pattern)] = NormalizationRules(
+                    drop=_string_list(entry.get("drop"), f"{where}.drop"),
+                    mask=_mask_list(entry.get("mask"), f"{where}.mask"),
+                )
+        return cls(rules)
+
+    @property
+    def rule_count(self) -> int:
+        return sum(
+            len(rules.drop) + len(rules.mask) for models in self._rules.values() for rules in models.values()
+        )
+
+    def rules_for(self, vendor: str, model: str | None) -> NormalizationRules:
+        merged = NormalizationRules()
+        for model_pattern, rules in self._rules.get(vendor, {}).items():
+            if fnmatchcase((model or "").lower(), model_pattern.lower()):
+                merged = merged.merged(rules)
+        return merged
+
+    def normalizer_for(self, vendor: str, model: str | None) -> Normalizer:
+        """Normalizer for ``vendor`` devices of ``model``; the built-in one when no rules apply."""
 
-    filtered: list[str] = []
-    for line in lines:
-        if _is_volatile_cisco_line(line):
-            continue
-        filtered.append(line)
+        key = (vendor, model)
+        with self._lock:
+            normalizer = self._cache.get(key)
+            if normalizer is None:
+                normalizer = self._cache[key] = self._compile(vendor, self.rules_for(vendor, model))
+        return normalizer
 
-    trimmed = _trim_trailing_blank_lines(filtered)
-    return "\n".join(trimmed)
+    @staticmethod
+    def _compile(vendor: str, rules: NormalizationRules) -> Normalizer:
+        builtin = _VENDORS[vendor]
+        if not rules.drop and not rules.mask:
+            return builtin
+        base = _BUILTIN_LINE_NORMALIZERS[builtin]
+        drop = re.compile("|".join(f"(?:{pattern})" for pattern in rules.drop)) if rules.drop else None
+        masks = tuple((re.compile(pattern), replacement) for pattern, replacement in rules.mask)
+        return LineNormalizer(base.volatile, masks, base.strip_lines, drop)
@@ -0,0 +1,182 @@
+"""Per-device pack archive for long-term backup history.
+
+Compaction rolls older loose files of a device directory (backups, deltas,
+diffs, ARP snapshots) into a single ``history.pack`` next to them. Members are
+stored byte-for-byte (compressed files stay compressed), followed by a JSON
+index and a fixed-size footer pointing at it::
+
+    [member bytes ...][index JSON][b"NCBPACK1" + index offset (uint64 BE)]
+
+The file is append-only: a later compaction appends new members and a new
+index/footer after the old ones, so a failed append never touches data that
+was already packed. Readers map the file with :mod:`mmap` and slice members
+out by offset. Readers that take a path fall back to the pack when the loose
+file is gone, so the diff and restore code paths keep working on packed
+history.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import shutil
+import struct
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterable
+
+from app.core.compression import decode_backup_bytes, read_backup_text
+from app.core.storage import backup_time
+
+PACK_FILENAME = "history.pack"
+_MAGIC = b"NCBPACK1"
+_FOOTER = struct.Struct(">8sQ")
+# Mapped packs kept open at once; the least recently used one is closed beyond this.
+_MAX_OPEN_PACKS = 128
+
+
+@dataclass(slots=True, frozen=True)
+class PackMember:
+    """Location of one packed file inside the archive."""
+
+    name: str
+    offset: int
+    size: int
+    mtime: float
+
+
+class PackArchive:
+    """Read-only, memory-mapped view of a pack file."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with path.open("rb") as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        self.members = _parse_index(self._mmap, path)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.members
+
+    def read_bytes(self, name: str) -> bytes:
+        member = self.members[name]
+        return self._mmap[member.offset : member.offset + member.size]
+
+    def close(self) -> None:
+        self._mmap.close()
+
+
+def _parse_index(data: mmap.mmap, path: Path) -> dict[str, PackMember]:
+    if len(data) < _FOOTER.size:
+        raise ValueError(f"Corrupt pack file: {path}")
+    magic, index_offset = _FOOTER.unpack(data[-_FOOTER.size :])
+    if magic != _MAGIC or index_offset > len(data) - _FOOTER.size:
+        raise ValueError(f"Corrupt pack file: {path}")
+    try:
+        entries = json.loads(data[index_offset : len(data) - _FOOTER.size])["members"]
+        return {entry["name"]: PackMember(**entry) for entry in entries}
+    except (ValueError, KeyError, TypeError) as exc:
+        raise ValueError(f"Corrupt pack index in {path}") from exc
+
+
+_open_packs: OrderedDict[Path, tuple[tuple[int, int], PackArchive]] = OrderedDict()
+_open_packs_lock = threading.Lock()
+
+
+def open_pack(device_dir: Path) -> PackArchive | None:
+    """Return the device's pack archive, or ``None`` when the directory has none.
+
+    One mapping is cached per pack file, so repeated reads share it. When the
+    file's size or mtime changes (an append), the old mapping is closed and
+    replaced, so long-running modes do not keep superseded mappings open.
+    """
+
+    path = device_dir / PACK_FILENAME
+    stale: list[PackArchive] = []
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        with _open_packs_lock:
+            cached = _open_packs.pop(path, None)
+        if cached is not None:
+            cached[1].close()
+        return None
+
+    version = (stat.st_size, stat.st_mtime_ns)
+    with _open_packs_lock:
+        cached = _open_packs.get(path)
+        if cached is not None and cached[0] == version:
+            _open_packs.move_to_end(path)
+            return cached[1]
+        archive = PackArchive(path)
+        if cached is not None:
+            stale.append(cached[1])
+        _open_packs[path] = (version, archive)
+        _open_packs.move_to_end(path)
+        while len(_open_packs) > _MAX_OPEN_PACKS:
+            stale.append(_open_packs.popitem(last=False)[1][1])
+    for old in stale:
+        old.close()
+    return archive
+
+
+def append_to_pack(device_dir: Path, paths: Iterable[Path]) -> list[PackMember]:
+    """Append ``paths`` to the device's pack and fsync it; the loose files are left in place.
+
+    A member whose name is already packed is superseded by the new copy.
+    """
+
+    pack_path = device_dir / PACK_FILENAME
+    existing = open_pack(device_dir)
+    members = dict(existing.members) if existing is not None else {}
+    added: list[PackMember] = []
+
+    with pack_path.open("r+b" if existing is not None else "xb") as handle:
+        start = handle.seek(0, os.SEEK_END)
+        try:
+            for path in paths:
+                offset = handle.tell()
+                with path.open("rb") as source:
+                    shutil.copyfileobj(source, handle)
+                member = PackMember(
+                    name=path.name, offset=offset, size=handle.tell() - offset, mtime=backup_time(path)
+                )
+                members[member.name] = member
+                added.append(member)
+
+            index_offset = handle.tell()
+            index = {"members": [asdict(member) for member in members.values()]}
+            handle.write(json.dumps(index, separators=(",", ":")).encode("utf-8"))
+            handle.write(_FOOTER.pack(_MAGIC, index_offset))
+            handle.flush()
+            os.fsync(handle.fileno())
+        except BaseException:
+            handle.truncate(start)
+            raise
+    return added
+
+
+def stored_size(path: Path) -> int | None:
+    """Size of the stored backup at ``path``, loose or packed; ``None`` when missing."""
+
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        archive = open_pack(path.parent)
+        if archive is not None and path.name in archive:
+            return archive.members[path.name].size
+        return None
+
+
+def read_stored_text(path: Path, newline: str | None = None) -> str:
+    """Like :func:`app.core.compression.read_backup_text`, falling back to the device pack."""
+
+    try:
+        return read_backup_text(path, newline=newline)
+    except FileNotFoundError:
+        archive = open_pack(path.parent)
+        if archive is None or path.name not in archive:
+            raise
+        return decode_backup_bytes(archive.read_bytes(path.name), newline=newline)
@@ -2,16 +2,91 @@
 
 from __future__ import annotations
 
+import hashlib
 import logging
+import os
+import re
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Mapping
+from typing import TYPE_CHECKING, Any, Mapping
 
 import yaml
 
+from app.common.diff_engine import DEFAULT_DIFF_ENGINE
+from app.core.blob_store import BlobStore, Timeline, TimelineEntry
+from app.core.compression import (
+    NO_COMPRESSION,
+    compressed_name,
+    compression_suffix,
+    open_compressed_writer,
+    write_backup_text,
+)
+from app.core.normalize import NormalizerRegistry
+
+if TYPE_CHECKING:
+    from app.common.diff_stage import DiffStage
+
 PROJECT_ROOT = Path(__file__).resolve().parents[3]
 FALLBACK_BACKUP_DIR = PROJECT_ROOT / "backup"
 DEFAULT_ARP_DIR = Path("./arp")
 DEFAULT_LOCAL_CONFIG = PROJECT_ROOT / "config" / "local.yml"
+DEFAULT_STORAGE_BACKEND = "files"
+STORAGE_BACKENDS = ("files", "cas", "delta")
+DEFAULT_KEYFRAME_INTERVAL = 24
+DEFAULT_ARP_KEYFRAME_INTERVAL = 24
+DEFAULT_DIFF_MODE = "lines"
+DIFF_MODES = ("lines", "structural")
+BACKUP_TIMESTAMP_FORMAT = "%Y-%m-%d_%H%M%S"
+_BACKUP_TIMESTAMP = re.compile(r"\d{4}-\d{2}-\d{2}_\d{6}")
+
+
+@dataclass(slots=True, frozen=True)
+class StorageOptions:
+    """How text backups are persisted.
+
+    ``dedup``: when the normalized content equals the last backup, record a
+    reference to that file in the device index instead of writing a new one.
+    ``backend``: ``files`` writes every backup as its own file; ``cas`` stores
+    normalized-identical content once in a :class:`BlobStore`, hard-links it
+    into the device directory and keeps the metadata header in the device's
+    :class:`Timeline`; ``delta`` keeps a full keyframe every ``keyframe_interval``
+    versions and forward deltas in between (see :mod:`app.common.delta_chain`).
+    ``compression``: ``none``, ``gzip`` or ``zstd`` for backups, diffs and ARP
+    snapshots (see :mod:`app.core.compression`).
+    ``diff_mode``: ``lines`` diffs whole normalized configs; ``structural``
+    diffs only changed Cisco stanzas / MikroTik sections and reports
+    per-section counts (see :mod:`app.common.structural_diff`).
+    ``normalization``: per-vendor/model rules from ``local.yml`` applied on
+    top of the built-in normalizers before hashing and diffing.
+    ``diff_engine``: line-diff engine from
+    :data:`app.common.diff_engine.DIFF_ENGINES` (``difflib`` or ``patience``).
+    ``arp_keyframe_interval``: keep a full ARP snapshot every N polls and
+    row deltas in between (see :mod:`app.cisco.arp`); ``1`` keeps every
+    snapshot in full.
+    ``diff_stage``: where committed backups are normalized, hashed and
+    diffed; ``None`` evaluates them inline in the device worker (see
+    :mod:`app.common.diff_stage`).
+    ``ssh_port_checked``: the run already swept every device's SSH port
+    (see :mod:`app.common.reachability`), so workers skip their own TCP check.
+    """
+
+    dedup: bool = False
+    backend: str = DEFAULT_STORAGE_BACKEND
+    compression: str = NO_COMPRESSION
+    keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL
+    diff_mode: str = DEFAULT_DIFF_MODE
+    normalization: NormalizerRegistry = field(default_factory=NormalizerRegistry)
+    diff_engine: str = DEFAULT_DIFF_ENGINE
+    arp_keyframe_interval: int = DEFAULT_ARP_KEYFRAME_INTERVAL
+    diff_stage: DiffStage | None = None
+    ssh_port_checked: bool = False
+
+    def blob_store(self, backup_dir: Path) -> BlobStore | None:
+        if self.backend == "cas":
+            return BlobStore.for_backup_dir(backup_dir)
+        return None
 
 
 def _format_metadata(metadata: Mapping[str, Any]) -> str:
@@ -25,6 +100,24 @@ def _format_metadata(metadata: Mapping[str, Any]) -> str:
     return "\n".join(lines)
 
 
+def backup_time(path: Path) -> float:
+    """Epoch seconds a backup was taken, from the UTC timestamp in its file name.
+
+    Blob-backed names share the inode (and mtime) of whichever backup first
+    stored the content, so the mtime is only used for names without one.
+    """
+
+    match = _BACKUP_TIMESTAMP.search(path.name)
+    if match is not None:
+        try:
+            taken = datetime.strptime(match.group(), BACKUP_TIMESTAMP_FORMAT)
+        except ValueError:
+            pass
+        else:
+            return taken.replace(tzinfo=timezone.utc).timestamp()
+    return path.stat().st_mtime
+
+
 def ensure_directory(path: Path) -> Path:
     """Ensure the target directory exists and return it."""
 
@@ -48,19 +141,149 @@ def save_backup_text(
     content: str,
     logger: logging.Logger,
     metadata: Mapping[str, Any] | None = None,
+    compression: str = NO_COMPRESSION,
 ) -> Path:
-    """Persist backup content to a structured path and return the saved file path."""
+    """Persist backup content to a structured path and return the saved file path.
+
+    With ``compression`` the file name gets the matching suffix (``.gz``/``.zst``).
+    """
 
     target_dir = backup_dir / vendor / device_name
     ensure_directory(target_dir)
 
-    backup_path = target_dir / filename
+    backup_path = target_dir / compressed_name(filename, compression)
     meta_header = _format_metadata(metadata or {})
-    backup_path.write_text(meta_header + content, encoding="utf-8")
+    write_backup_text(backup_path, meta_header + content)
     logger.info("saved path=%s", backup_path, extra={"device": device_name})
     return backup_path
 
 
+class BackupStream:
+    """Write backup text to disk as it arrives, then publish it atomically.
+
+    Text goes to a hidden ``.part`` file next to ``path`` and is hashed on the
+    fly, so the caller never has to hold the full output in memory.
+    :meth:`commit` renames the temporary file into place (or, with a ``store``,
+    into the blob store and hard-links it to ``path``); leaving the ``with``
+    block without committing (e.g. on a read error) removes it.
+
+    With a ``store`` the ``header`` is not written to the file; it is kept in
+    the device :class:`Timeline` so it does not make every blob unique.
+    With ``compression`` the file is compressed as it is written; ``size``
+    and ``sha256`` always describe the uncompressed text in the file.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        header: str = "",
+        store: BlobStore | None = None,
+        compression: str = NO_COMPRESSION,
+    ) -> None:
+        self.path = path
+        self.header = header
+        self.store = store
+        self.compression = compression
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.temp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.part")
+        self._handle = self.temp_path.open("xb")
+        self._writer = open_compressed_writer(self._handle, compression)
+        self._sha256 = hashlib.sha256()
+        self._size = 0
+        self._finished = False
+        self._committed = False
+        if header and store is None:
+            self.write(header)
+
+    def __enter__(self) -> BackupStream:
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, traceback: Any) -> None:
+        if not self._committed:
+            self.discard()
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def sha256(self) -> str:
+        return self._sha256.hexdigest()
+
+    def write(self, text: str) -> int:
+        data = text.encode("utf-8")
+        self._writer.write(data)
+        self._sha256.update(data)
+        self._size += len(data)
+        return len(text)
+
+    def flush(self) -> None:
+        self._writer.flush()
+        self._handle.flush()
+
+    def finish(self) -> None:
+        """End the (compressed) stream so :attr:`temp_path` can be read back; no more writes."""
+
+        if not self._finished:
+            if self._writer is not self._handle:
+                self._writer.close()
+            self._finished = True
+        self._handle.flush()
+
+    def commit(self, key: str | None = None) -> Path:
+        """Flush, fsync and rename the temporary file to :attr:`path`.
+
+        With a blob store the file is moved into the store instead under
+        ``key`` (default: :attr:`sha256`), :attr:`path` becomes a hard link
+        to the blob and a :class:`TimelineEntry` is appended for it.
+        """
+
+        if self.path.exists():
+            self.discard()
+            raise FileExistsError(f"Backup file already exists: {self.path}")
+
+        self.finish()
+        os.fsync(self._handle.fileno())
+        self._handle.close()
+        if self.store is not None:
+            blob_key = (key or self.sha256) + compression_suffix(self.compression)
+            self.store.add(self.temp_path, blob_key, self.path)
+            Timeline(self.path.parent).append(TimelineEntry(self.path.name, blob_key, self.header))
+        else:
+            os.replace(self.temp_path, self.path)
+        self._committed = True
+        return self.path
+
+    def discard(self) -> None:
+        if not self._handle.closed:
+            try:
+                if not self._finished and self._writer is not self._handle:
+                    self._writer.close()
+            finally:
+                self._handle.close()
+        self.temp_path.unlink(missing_ok=True)
+
+
+def open_backup_stream(
+    backup_dir: Path,
+    vendor: str,
+    device_name: str,
+    filename: str,
+    metadata: Mapping[str, Any] | None = None,
+    storage: StorageOptions | None = None,
+) -> BackupStream:
+    """Streaming counterpart of :func:`save_backup_text` for the same structured path."""
+
+    storage = storage or StorageOptions()
+    target_dir = backup_dir / vendor / device_name
+    return BackupStream(
+        target_dir / compressed_name(filename, storage.compression),
+        header=_format_metadata(metadata or {}),
+        store=storage.blob_store(backup_dir),
+        compression=storage.compression,
+    )
+
+
 def load_local_config(
     config_path: str | Path | None = None, logger: logging.Logger | None = None
 ) -> Mapping[str, Any] | None:
@@ -0,0 +1,261 @@
+"""Asyncio-based MikroTik SSH client built on ``asyncssh``.
+
+Implements the same ``fetch_export`` and ``fetch_system_backup`` operations as
+:class:`app.mikrotik.client.MikroTikClient` on an event loop. ``asyncssh`` is an
+optional dependency and is only imported when this transport is selected.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import codecs
+import io
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, TextIO
+
+from app.core.logging import sanitize_log_extra
+from app.mikrotik.client import (
+    STREAM_CHUNK_SIZE,
+    MikroTikAuthenticationError,
+    MikroTikClientError,
+    MikroTikCommandError,
+    verify_binary_backup,
+)
+
+try:
+    import asyncssh
+except ImportError:  # pragma: no cover - optional dependency
+    asyncssh = None
+
+
+@dataclass(slots=True)
+class AsyncMikroTikClient:
+    """Asyncio SSH client for MikroTik devices."""
+
+    host: str
+    username: str
+    password: str
+    port: int = 22
+    timeout: float = 5.0
+    _active_connection: Any = field(init=False, default=None, repr=False)
+
+    @asynccontextmanager
+    async def session(self, logger: logging.Logger, log_extra: dict[str, Any]) -> AsyncIterator[Any]:
+        """Keep one authenticated connection open for every operation inside the block.
+
+        Same contract as :meth:`app.mikrotik.client.MikroTikClient.session`.
+        """
+
+        if self._active_connection is not None:
+            yield self._active_connection
+            return
+
+        connection = await self._connect(logger, log_extra)
+        self._active_connection = connection
+        try:
+            yield connection
+        finally:
+            self._active_connection = None
+            connection.close()
+            await connection.wait_closed()
+
+    async def _acquire(self, logger: logging.Logger, log_extra: dict[str, Any]) -> Any:
+        if self._active_connection is not None:
+            return self._active_connection
+        return await self._connect(logger, log_extra)
+
+    async def _release(self, connection: Any) -> None:
+        if connection is not self._active_connection:
+            connection.close()
+            await connection.wait_closed()
+
+    async def fetch_export(self, logger: logging.Logger, log_extra: dict[str, Any]) -> str:
+        """Retrieve the export configuration from the device."""
+
+        buffer = io.StringIO()
+        await self.stream_export(buffer, logger, log_extra)
+        return buffer.getvalue()
+
+    async def stream_export(self, sink: TextIO, logger: logging.Logger, log_extra: dict[str, Any]) -> int:
+        """Write the export configuration to ``sink`` as it arrives.
+
+        Returns the number of bytes received from the device.
+        """
+
+        log_extra = sanitize_log_extra(log_extra)
+        command = "/export"
+        logger.debug(
+            "connecting to device=%s host=%s port=%s",
+            log_extra.get("device", "-"),
+            self.host,
+            self.port,
+            extra=log_extra,
+        )
+        connection = await self._acquire(logger, log_extra)
+        try:
+            logger.debug("executing mikrotik command='%s'", command, extra=log_extra)
+            received, has_content, error_output, exit_status = await self._stream_command(
+                connection, command, sink
+            )
+            if exit_status == 0 and has_content:
+                logger.debug("export received bytes=%d", received, extra=log_extra)
+                return received
+
+            error_message = error_output or f"exit_status={exit_status}"
+            logger.warning("export command failed command=%s status=%s", command, exit_status, extra=log_extra)
+            raise MikroTikCommandError(error_message)
+        finally:
+            await self._release(connection)
+
+    async def _connect(self, logger: logging.Logger, log_extra: dict[str, Any]) -> Any:
+        if asyncssh is None:
+            raise MikroTikClientError("The asyncssh transport requires the 'asyncssh' package.")
+
+        log_extra = sanitize_log_extra(log_extra)
+        logger.debug("opening ssh session host=%s port=%s", self.host, self.port, extra=log_extra)
+        try:
+            connection = await asyncssh.connect(
+                self.host,
+                port=self.port,
+                username=self.username,
+                password=self.password,
+                known_hosts=None,
+                client_keys=None,
+                agent_path=None,
+                connect_timeout=self.timeout,
+                login_timeout=self.timeout,
+            )
+        except asyncssh.PermissionDenied as exc:  # pragma: no cover - network dependent
+            raise MikroTikAuthenticationError("SSH authentication failed") from exc
+        except (asyncssh.Error, OSError, asyncio.TimeoutError) as exc:  # pragma: no cover - network dependent
+            raise MikroTikClientError("SSH connection failed") from exc
+
+        logger.info("ssh ok host=%s port=%s", self.host, self.port, extra=log_extra)
+        return connection
+
+    async def _run_command(self, connection: Any, command: str) -> tuple[str, str, int]:
+        """Run ``command`` and collect its output.
+
+        Like the paramiko client, ``self.timeout`` bounds each read, not the
+        whole command, so a slow ``/system backup save`` is not cut off.
+        """
+
+        output = io.StringIO()
+        _, _, error_output, exit_status = await self._stream_command(connection, command, output)
+        return output.getvalue(), error_output, exit_status
+
+    async def _stream_command(self, connection: Any, command: str, sink: TextIO) -> tuple[int, bool, str, int]:
+        """Asyncio counterpart of :meth:`MikroTikClient._stream_command`.
+
+        ``self.timeout`` bounds each read rather than the whole command, so
+        large exports are not cut off while data keeps flowing.
+        """
+
+        try:
+            process = await connection.create_process(command, encoding=None)
+        except asyncssh.Error as exc:  # pragma: no cover - network dependent
+            raise MikroTikCommandError(f"Unable to execute command '{command}'") from exc
+
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        received = 0
+        has_content = False
+        try:
+            while chunk := await asyncio.wait_for(process.stdout.read(STREAM_CHUNK_SIZE), self.timeout):
+                received += len(chunk)
+                text = decoder.decode(chunk)
+                has_content = has_content or bool(text.strip())
+                sink.write(text)
+            sink.write(decoder.decode(b"", final=True))
+            error_output = (await asyncio.wait_for(process.stderr.read(), self.timeout)).decode(
+                "utf-8", errors="replace"
+            )
+            await asyncio.wait_for(process.wait_closed(), self.timeout)
+        except (asyncssh.Error, asyncio.TimeoutError) as exc:  # pragma: no cover - network dependent
+            process.close()
+            raise MikroTikCommandError(f"Unable to execute command '{command}'") from exc
+
+        exit_status = process.exit_status if process.exit_status is not None else -1
+        return received, has_content, error_output, exit_status
+
+    async def fetch_system_backup(
+        self,
+        backup_name: str,
+        destination: Path,
+        logger: logging.Logger,
+        log_extra: dict[str, Any],
+    ) -> int:
+        """Create and download a binary system backup.
+
+        Returns the downloaded file size after verification.
+        """
+
+        remote_filename = f"{backup_name}.backup"
+        command = f"/system backup save name={backup_name} dont-encrypt=yes"
+        log_extra = sanitize_log_extra({**log_extra, "remote_file": remote_filename})
+
+        logger.info(
+            "start system-backup device=%s remote_file=%s",
+            log_extra.get("device", "-"),
+            remote_filename,
+            extra=log_extra,
+        )
+        connection = await self._acquire(logger, log_extra)
+        try:
+            logger.debug("executing mikrotik command='%s'", command, extra=log_extra)
+            _, error_output, exit_status = await self._run_command(connection, command)
+            if exit_status != 0:
+                error_message = error_output or f"exit_status={exit_status}"
+                logger.error(
+                    "system-backup command failed command=%s status=%s", command, exit_status, extra=log_extra
+                )
+                raise MikroTikCommandError(error_message)
+
+            logger.debug("system-backup created on device file=%s", remote_filename, extra=log_extra)
+
+            try:
+                sftp = await connection.start_sftp_client()
+            except asyncssh.Error as exc:  # pragma: no cover - network dependent
+                raise MikroTikClientError("Unable to open SFTP session") from exc
+
+            async with sftp:
+                try:
+                    remote_stats = await sftp.stat(remote_filename)
+                except asyncssh.SFTPNoSuchFile as exc:
+                    logger.error("system-backup missing file=%s", remote_filename, extra=log_extra)
+                    raise MikroTikCommandError(f"Backup file not found: {remote_filename}") from exc
+                except asyncssh.SFTPError as exc:
+                    logger.error(
+                        "system-backup access failed file=%s reason=\"%s\"",
+                        remote_filename,
+                        exc,
+                        extra=log_extra,
+                    )
+                    raise MikroTikClientError("Unable to access backup file") from exc
+
+                if not remote_stats.size:
+                    logger.error("system-backup empty file=%s size=%d", remote_filename, 0, extra=log_extra)
+                    raise MikroTikCommandError("Backup file is empty on device")
+
+                destination.parent.mkdir(parents=True, exist_ok=True)
+
+                try:
+                    await sftp.get(remote_filename, str(destination))
+                except (OSError, asyncssh.Error) as exc:  # pragma: no cover - network dependent
+                    logger.error(
+                        "system-backup download failed file=%s reason=\"%s\"",
+                        remote_filename,
+                        exc,
+                        extra=log_extra,
+                    )
+                    raise MikroTikClientError("Unable to download system backup") from exc
+
+            local_size = verify_binary_backup(destination, logger, log_extra)
+            if local_size <= 0:
+                raise MikroTikClientError("Downloaded backup file failed verification")
+
+            return local_size
+        finally:
+            await self._release(connection)
@@ -7,22 +7,45 @@ from pathlib import Path
 from typing import Any
 
 from app.core.logging import sanitize_log_extra
-from app.core.storage import write_backup
+from app.core.storage import DEFAULT_DIFF_MODE, BackupStream, write_backup
 from app.mikrotik.client import MikroTikClient
-from app.common.diff import DiffOutcome, evaluate_change
-from app.core.normalize import normalize_mikrotik_export
+from app.common.diff import DiffOutcome, deduplicate_backup, store_as_delta
+from app.common.diff_engine import DEFAULT_DIFF_ENGINE
+from app.common.diff_stage import DiffJob, DiffStage
+from app.common.structural_diff import format_section_changes, mikrotik_blocks
+from app.core.normalize import Normalizer, normalize_mikrotik_export
+from app.mikrotik.async_client import AsyncMikroTikClient
 
+EXPORT_PATTERN = "*_export.rsc"
 
-def fetch_export(device: Any, password: str, logger: logging.Logger) -> str:
-    """Fetch export configuration text for a MikroTik device."""
+
+def fetch_export(
+    device: Any, password: str, logger: logging.Logger, client: MikroTikClient | None = None
+) -> str:
+    """Fetch export configuration text for a MikroTik device.
+
+    Pass ``client`` to reuse a client whose :meth:`MikroTikClient.session` is open.
+    """
 
     log_extra = sanitize_log_extra({"device": getattr(device, "name", "-")})
-    client = MikroTikClient(
+    client = client or MikroTikClient(
         host=device.host, username=device.username, password=password, port=device.port
     )
     return client.fetch_export(logger, log_extra)
 
 
+async def fetch_export_async(
+    device: Any, password: str, logger: logging.Logger, client: AsyncMikroTikClient | None = None
+) -> str:
+    """Fetch export configuration text using the asyncssh transport."""
+
+    log_extra = sanitize_log_extra({"device": getattr(device, "name", "-")})
+    client = client or AsyncMikroTikClient(
+        host=device.host, username=device.username, password=password, port=device.port
+    )
+    return await client.fetch_export(logger, log_extra)
+
+
 def backup_device(client: MikroTikClient, output_path: Path) -> Path:
     """Perform a backup for a MikroTik device and save it to disk."""
 
@@ -31,14 +54,50 @@ def backup_device(client: MikroTikClient, output_path: Path) -> Path:
 
 
 def perform_system_backup(
-    device: Any, password: str, timestamp: str, backup_dir: Path, logger: logging.Logger
+    device: Any,
+    password: str,
+    timestamp: str,
+    backup_dir: Path,
+    logger: logging.Logger,
+    client: MikroTikClient | None = None,
 ) -> Path:
-    """Create and download a binary system backup for a MikroTik device."""
+    """Create and download a binary system backup for a MikroTik device.
 
-    log_extra = sanitize_log_extra({"device": getattr(device, "name", "-")})
-    client = MikroTikClient(
+    Pass ``client`` to reuse a client whose :meth:`MikroTikClient.session` is open.
+    """
+
+    client = client or MikroTikClient(
+        host=device.host, username=device.username, password=password, port=device.port
+    )
+    device_name, destination, log_extra = _prepare_system_backup(device, backup_dir, logger)
+    downloaded_size = client.fetch_system_backup(device_name, destination, logger, log_extra)
+    return _finalize_system_backup(device_name, destination, downloaded_size, timestamp, logger, log_extra)
+
+
+async def perform_system_backup_async(
+    device: Any,
+    password: str,
+    timestamp: str,
+    backup_dir: Path,
+    logger: logging.Logger,
+    client: AsyncMikroTikClient | None = None,
+) -> Path:
+    """Asyncio variant of :func:`perform_system_backup` for the asyncssh transport."""
+
+    client = client or AsyncMikroTikClient(
         host=device.host, username=device.username, password=password, port=device.port
     )
+    device_name, destination, log_extra = _prepare_system_backup(device, backup_dir, logger)
+    downloaded_size = await client.fetch_system_backup(device_name, destination, logger, log_extra)
+    return _finalize_system_backup(device_name, destination, downloaded_size, timestamp, logger, log_extra)
+
+
+def _prepare_system_backup(
+    device: Any, backup_dir: Path, logger: logging.Logger
+) -> tuple[str, Path, dict[str, Any]]:
+    """Validate the device name and compute the download destination."""
+
+    log_extra = sanitize_log_extra({"device": getattr(device, "name", "-")})
     device_name = getattr(device, "name", "")
     if " " in device_name:
         raise ValueError("Device name cannot contain spaces for system backup filename")
@@ -48,9 +107,21 @@ def perform_system_backup(
     destination = backup_dir_device / remote_filename
     log_extra = sanitize_log_extra({**log_extra, "remote_file": remote_filename})
     logger.info("creating system-backup device=%s remote_file=%s", device_name, remote_filename, extra=log_extra)
+    return device_name, destination, log_extra
 
-    downloaded_size = client.fetch_system_backup(device_name, destination, logger, log_extra)
 
+def _finalize_system_backup(
+    device_name: str,
+    destination: Path,
+    downloaded_size: int,
+    timestamp: str,
+    logger: logging.Logger,
+    log_extra: dict[str, Any],
+) -> Path:
+    """Verify the downloaded backup and rename it with the run timestamp."""
+
+    remote_filename = destination.name
+    backup_dir_device = destination.parent
     if not destination.exists():
         raise FileNotFoundError(f"Downloaded system-backup not found: {destination}")
 
@@ -73,26 +144,114 @@ def perform_system_backup(
     return timestamped_path
 
 
+def deduplicate_mikrotik_export(
+    stream: BackupStream,
+    logger: logging.Logger,
+    log_extra: dict[str, str],
+    normalizer: Normalizer = normalize_mikrotik_export,
+) -> DiffOutcome | None:
+    """Record an unchanged export as a reference to the previous one instead of saving it.
+
+    Returns ``None`` when the export differs and should be committed as usual.
+    """
+
+    log_extra = sanitize_log_extra(log_extra)
+    result = deduplicate_backup(stream, EXPORT_PATTERN, normalizer)
+    if result is not None:
+        logger.info(
+            "device=%s config_changed=false deduplicated=true reference=%s",
+            log_extra.get("device", "-"),
+            result.current_path,
+            extra=log_extra,
+        )
+    return result
+
+
+def store_mikrotik_export_delta(
+    current_export: Path,
+    outcome: DiffOutcome,
+    keyframe_interval: int,
+    logger: logging.Logger,
+    log_extra: dict[str, str],
+) -> Path:
+    """Keep an evaluated export as a forward delta unless it is due to be a keyframe."""
+
+    log_extra = sanitize_log_extra(log_extra)
+    stored_path = store_as_delta(current_export, outcome, EXPORT_PATTERN, keyframe_interval)
+    if stored_path != current_export:
+        logger.info(
+            "device=%s export stored as delta path=%s", log_extra.get("device", "-"), stored_path, extra=log_extra
+        )
+    return stored_path
+
+
 def log_mikrotik_diff(
-    current_export: Path, logger: logging.Logger, log_extra: dict[str, str]
+    current_export: Path,
+    logger: logging.Logger,
+    log_extra: dict[str, str],
+    diff_mode: str = DEFAULT_DIFF_MODE,
+    normalizer: Normalizer = normalize_mikrotik_export,
+    diff_stage: DiffStage | None = None,
+    diff_engine: str = DEFAULT_DIFF_ENGINE,
 ) -> tuple[DiffOutcome, Path | None]:
-    """Log MikroTik diff status for the latest export and persist diff when needed."""
+    """Log MikroTik diff status for the latest export and persist diff when needed.
+
+    ``diff_mode="structural"`` diffs only changed ``/path`` sections. The
+    diff itself runs on ``diff_stage`` (inline when ``None``) with ``diff_engine``
+    and is waited for here; see :func:`mikrotik_diff_job` and
+    :func:`log_mikrotik_diff_result` to run it after the session is closed.
+    """
+
+    job = mikrotik_diff_job(current_export, logger, log_extra, diff_mode, normalizer, diff_engine)
+    result, diff_path = (diff_stage or DiffStage()).run(job)
+    log_mikrotik_diff_result(current_export, result, diff_path, logger, log_extra)
+    return result, diff_path
+
+
+def mikrotik_diff_job(
+    current_export: Path,
+    logger: logging.Logger,
+    log_extra: dict[str, str],
+    diff_mode: str = DEFAULT_DIFF_MODE,
+    normalizer: Normalizer = normalize_mikrotik_export,
+    diff_engine: str = DEFAULT_DIFF_ENGINE,
+    keep_baseline: bool = False,
+) -> DiffJob:
+    """Build the diff job for a committed export after checking it is in the device directory.
+
+    ``keep_baseline`` hands the baseline text back for delta storage.
+    """
 
     log_extra = sanitize_log_extra(log_extra)
-    result: DiffOutcome = evaluate_change(current_export, "*_export.rsc", normalize_mikrotik_export)
     device_name = log_extra.get("device", "-")
-    current_path = result.current_path or current_export.resolve()
-
-    if device_name not in ("", "-") and current_path.parent.name != device_name:
+    expected_path = current_export.resolve()
+    if device_name not in ("", "-") and expected_path.parent.name != device_name:
         logger.error(
             "device=%s device_path_mismatch expected=%s actual=%s current_path=%s",
             device_name,
             device_name,
-            current_path.parent.name,
-            current_path,
+            expected_path.parent.name,
+            expected_path,
             extra=log_extra,
         )
-        raise ValueError(f"Device path mismatch for {device_name}: {current_path}")
+        raise ValueError(f"Device path mismatch for {device_name}: {expected_path}")
+
+    block_parser = mikrotik_blocks if diff_mode == "structural" else None
+    return DiffJob(current_export, EXPORT_PATTERN, normalizer, block_parser, diff_engine, keep_baseline)
+
+
+def log_mikrotik_diff_result(
+    current_export: Path,
+    result: DiffOutcome,
+    diff_path: Path | None,
+    logger: logging.Logger,
+    log_extra: dict[str, str],
+) -> None:
+    """Log the outcome of a MikroTik export diff."""
+
+    log_extra = sanitize_log_extra(log_extra)
+    device_name = log_extra.get("device", "-")
+    current_path = result.current_path or current_export.resolve()
 
     logger.info(
         "device=%s diff baseline_path=%s current_path=%s",
@@ -118,11 +277,9 @@ def log_mikrotik_diff(
     changed_value = "null" if result.config_changed is None else str(result.config_changed).lower()
     logger.info("device=%s config_changed=%s", device_name, changed_value, extra=log_extra)
 
-    if not result.config_changed:
-        return result, None
+    if diff_path is None:
+        return
 
-    diff_path = current_path.with_suffix(".diff")
-    diff_path.write_text(result.diff_text or "", encoding="utf-8")
     logger.info(
         "device=%s change_summary added=%d removed=%d diff_file=%s",
         device_name,
@@ -131,4 +288,10 @@ def log_mikrotik_diff(
         diff_path,
         extra=log_extra,
     )
-    return result, diff_path
+    if result.section_changes:
+        logger.info(
+            "device=%s change_sections=%s",
+            device_name,
+            format_section_changes(result.section_changes),
+            extra=log_extra,
+        )
@@ -2,16 +2,23 @@
 
 from __future__ import annotations
 
+import codecs
+import io
 import logging
 import socket
-from dataclasses import dataclass
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator, TextIO
 
 import paramiko
 
 from app.core.logging import sanitize_log_extra
 
+# Read size used when streaming command output to a sink.
+STREAM_CHUNK_SIZE = 32 * 1024
+
+
 class MikroTikClientError(RuntimeError):
     """Base exception for MikroTik client errors."""
 
@@ -24,6 +31,26 @@ class MikroTikCommandError(MikroTikClientError):
     """Raised when a command cannot be executed successfully."""
 
 
+def verify_binary_backup(path: Path, logger: logging.Logger, log_extra: dict[str, Any]) -> int:
+    """Ensure downloaded binary backup exists and is non-empty.
+
+    Returns the file size when verification succeeds, otherwise 0.
+    """
+
+    log_extra = sanitize_log_extra(log_extra)
+    if not path.exists():
+        logger.error("binary-backup verification failed reason=missing", extra=log_extra)
+        return 0
+
+    size = path.stat().st_size
+    if size <= 0:
+        logger.error("binary-backup verification failed reason=zero-size", extra=log_extra)
+        return 0
+
+    logger.info("binary-backup verification passed size=%d", size, extra=log_extra)
+    return size
+
+
 @dataclass(slots=True)
 class MikroTikClient:
     """SSH client for MikroTik devices."""
@@ -33,6 +60,37 @@ class MikroTikClient:
     password: str
     port: int = 22
     timeout: float = 5.0
+    _active_client: paramiko.SSHClient | None = field(init=False, default=None, repr=False)
+
+    @contextmanager
+    def session(self, logger: logging.Logger, log_extra: dict[str, Any]) -> Iterator[paramiko.SSHClient]:
+        """Keep one authenticated SSH transport open for every operation inside the block.
+
+        ``fetch_export`` and ``fetch_system_backup`` called while the block is
+        active open their exec and SFTP channels on this transport instead of
+        connecting again. Nested calls yield the already open client.
+        """
+
+        if self._active_client is not None:
+            yield self._active_client
+            return
+
+        client = self._connect(logger, log_extra)
+        self._active_client = client
+        try:
+            yield client
+        finally:
+            self._active_client = None
+            client.close()
+
+    def _acquire(self, logger: logging.Logger, log_extra: dict[str, Any]) -> paramiko.SSHClient:
+        if self._active_client is not None:
+            return self._active_client
+        return self._connect(logger, log_extra)
+
+    def _release(self, client: paramiko.SSHClient) -> None:
+        if client is not self._active_client:
+            client.close()
 
     def verify_binary_backup(
         self, path: Path, logger: logging.Logger, log_extra: dict[str, Any]
@@ -42,22 +100,21 @@ class MikroTikClient:
         Returns the file size when verification succeeds, otherwise 0.
         """
 
-        log_extra = sanitize_log_extra(log_extra)
-        if not path.exists():
-            logger.error("binary-backup verification failed reason=missing", extra=log_extra)
-            return 0
-
-        size = path.stat().st_size
-        if size <= 0:
-            logger.error("binary-backup verification failed reason=zero-size", extra=log_extra)
-            return 0
-
-        logger.info("binary-backup verification passed size=%d", size, extra=log_extra)
-        return size
+        return verify_binary_backup(path, logger, log_extra)
 
     def fetch_export(self, logger: logging.Logger, log_extra: dict[str, Any]) -> str:
         """Retrieve the export configuration from the device."""
 
+        buffer = io.StringIO()
+        self.stream_export(buffer, logger, log_extra)
+        return buffer.getvalue()
+
+    def stream_export(self, sink: TextIO, logger: logging.Logger, log_extra: dict[str, Any]) -> int:
+        """Write the export configuration to ``sink`` as it arrives.
+
+        Returns the number of bytes received from the device.
+        """
+
         log_extra = sanitize_log_extra(log_extra)
         command = "/export"
         logger.debug(
@@ -67,19 +124,19 @@ class MikroTikClient:
             self.port,
             extra=log_extra,
         )
-        client = self._connect(logger, log_extra)
+        client = self._acquire(logger, log_extra)
         try:
             logger.debug("executing mikrotik command='%s'", command, extra=log_extra)
-            output, error_output, exit_status = self._run_command(client, command)
-            if exit_status == 0 and output.strip():
-                logger.debug("export received bytes=%d", len(output.encode("utf-8")), extra=log_extra)
-                return output
+            received, has_content, error_output, exit_status = self._stream_command(client, command, sink)
+            if exit_status == 0 and has_content:
+                logger.debug("export received bytes=%d", received, extra=log_extra)
+                return received
 
             error_message = error_output or f"exit_status={exit_status}"
             logger.warning("export command failed command=%s status=%s", command, exit_status, extra=log_extra)
             raise MikroTikCommandError(error_message)
         finally:
-            client.close()
+            self._release(client)
 
     def _connect(self, logger: logging.Logger, log_extra: dict[str, Any]) -> paramiko.SSHClient:
         ssh = paramiko.SSHClient()
@@ -117,6 +174,37 @@ class MikroTikClient:
         exit_status = stdout.channel.recv_exit_status()
         return output, error_output, exit_status
 
+    def _stream_command(
+        self, client: paramiko.SSHClient, command: str, sink: TextIO
+    ) -> tuple[int, bool, str, int]:
+        """Run ``command`` writing stdout to ``sink`` chunk by chunk.
+
+        Returns bytes received, whether any non-whitespace output arrived,
+        stderr text and the exit status.
+        """
+
+        try:
+            stdin, stdout, stderr = client.exec_command(command, timeout=self.timeout)
+        except paramiko.SSHException as exc:  # pragma: no cover - network dependent
+            raise MikroTikCommandError(f"Unable to execute command '{command}'") from exc
+
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        received = 0
+        has_content = False
+        try:
+            for chunk in iter(lambda: stdout.read(STREAM_CHUNK_SIZE), b""):
+                received += len(chunk)
+                text = decoder.decode(chunk)
+                has_content = has_content or bool(text.strip())
+                sink.write(text)
+        except socket.timeout as exc:  # pragma: no cover - network dependent
+            raise MikroTikCommandError(f"Timed out reading output of '{command}'") from exc
+        sink.write(decoder.decode(b"", final=True))
+
+        error_output = stderr.read().decode("utf-8", errors="replace")
+        exit_status = stdout.channel.recv_exit_status()
+        return received, has_content, error_output, exit_status
+
     def fetch_system_backup(
         self,
         backup_name: str,
@@ -139,7 +227,7 @@ class MikroTikClient:
             remote_filename,
             extra=log_extra,
         )
-        client = self._connect(logger, log_extra)
+        client = self._acquire(logger, log_extra)
         sftp: paramiko.SFTPClient | None = None
         try:
             logger.debug("executing mikrotik command='%s'", command, extra=log_extra)
@@ -197,4 +285,4 @@ class MikroTikClient:
         finally:
             if sftp is not None:
                 sftp.close()
-            client.close()
+            self._release(client)
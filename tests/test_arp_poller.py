@@ -0,0 +1,107 @@
+import logging
+import sys
+import unittest
+from contextlib import contextmanager
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from app.cisco.arp_poller import ArpPoller
+from app.cisco.client import CiscoConnectionError
+
+LOGGER = logging.getLogger("test_arp_poller")
+
+
+class FakeClient:
+    """Stands in for CiscoClient: counts logins and fails polls from a script."""
+
+    open_sessions = 0
+    peak_sessions = 0
+
+    def __init__(self, name: str, login_errors: int = 0, poll_errors: tuple[int, ...] = ()) -> None:
+        self.name = name
+        self.logins = 0
+        self.polls = 0
+        self.login_errors = login_errors
+        self.poll_errors = poll_errors
+        self.connected = False
+
+    @contextmanager
+    def session(self, logger, log_extra):
+        self.logins += 1
+        if self.login_errors:
+            self.login_errors -= 1
+            raise CiscoConnectionError("SSH port unreachable")
+        self.connected = True
+        FakeClient.open_sessions += 1
+        FakeClient.peak_sessions = max(FakeClient.peak_sessions, FakeClient.open_sessions)
+        try:
+            yield self
+        finally:
+            self.connected = False
+            FakeClient.open_sessions -= 1
+
+
+def fake_collect(client, arp_dir, logger, log_extra, storage, heads):
+    assert client.connected
+    client.polls += 1
+    if client.polls in client.poll_errors:
+        raise CiscoConnectionError("SSH channel closed by device")
+    return arp_dir / f"{client.name}_arp.txt", None
+
+
+class ArpPollerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        FakeClient.open_sessions = FakeClient.peak_sessions = 0
+
+    def _poller(self, clients: list[FakeClient], **options) -> ArpPoller:
+        options.setdefault("interval", 0.01)
+        return ArpPoller(clients, Path("arp"), LOGGER, collect=fake_collect, **options)
+
+    def test_sessions_stay_open_across_cycles_until_close(self) -> None:
+        clients = [FakeClient("sw1"), FakeClient("sw2")]
+        with self._poller(clients, workers=2) as poller:
+            self.assertEqual(3, poller.run(cycles=3))
+            self.assertEqual(2, poller.sessions_open)
+
+        self.assertEqual([(1, 3), (1, 3)], [(client.logins, client.polls) for client in clients])
+        self.assertEqual(0, FakeClient.open_sessions)
+
+    def test_lost_session_is_reopened_within_the_same_cycle(self) -> None:
+        client = FakeClient("sw1", poll_errors=(2,))
+        with self._poller([client]) as poller:
+            poller.poll_once(1)
+            stats = poller.poll_once(2)
+
+        self.assertEqual((1, 0, 1), (stats.polled, stats.failed, stats.reconnects))
+        self.assertEqual((2, 3), (client.logins, client.polls))
+
+    def test_failed_logins_back_off_exponentially(self) -> None:
+        client = FakeClient("sw1", login_errors=3)
+        with self._poller([client]) as poller:
+            outcomes = []
+            for cycle in range(1, 8):
+                stats = poller.poll_once(cycle)
+                outcomes.append("polled" if stats.polled else "failed" if stats.failed else "deferred")
+
+        self.assertEqual(
+            ["failed", "failed", "deferred", "failed", "deferred", "deferred", "deferred"], outcomes
+        )
+        self.assertEqual(3, client.logins)
+
+    def test_open_sessions_never_exceed_the_cap(self) -> None:
+        clients = [FakeClient(f"sw{number}") for number in range(5)]
+        with self._poller(clients, max_sessions=2, workers=4) as poller:
+            for cycle in range(1, 4):
+                stats = poller.poll_once(cycle)
+                self.assertEqual((5, 2), (stats.polled, stats.sessions_open))
+
+        self.assertEqual(2, FakeClient.peak_sessions)
+        self.assertEqual([3] * 5, [client.polls for client in clients])
+
+
+if __name__ == "__main__":
+    unittest.main()
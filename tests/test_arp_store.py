@@ -0,0 +1,197 @@
+import logging
+import sys
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from app.cisco import backup
+from app.cisco.arp import (
+    ARP_HEAD_FILENAME,
+    compare_arp_tables,
+    format_arp_entry,
+    import_arp_snapshots,
+    parse_arp_table,
+    read_arp_head,
+    read_arp_snapshot,
+    store_arp_snapshot,
+)
+from app.common.arp_store import ArpEntry, ArpStore, normalize_mac
+from app.core.compression import write_backup_text
+from app.core.storage import StorageOptions
+
+SHOW_IP_ARP = (
+    "Protocol  Address          Age (min)  Hardware Addr   Type   Interface\r\n"
+    "Internet  10.0.0.1                -   aabb.cc00.0100  ARPA   Vlan10\r\n"
+    "Internet  10.0.0.5               12   AABB.CC00.0200  ARPA   GigabitEthernet1/0/1.200\r\n"
+    "Internet  10.0.0.9                0   Incomplete      ARPA\r\n"
+    "Internet  10.0.0.7                3   aabb.cc00.0300  ARPA\r\n"
+    "sw1#"
+)
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+class ArpParseTests(unittest.TestCase):
+    def test_parses_resolved_rows_with_vlan_and_age(self) -> None:
+        self.assertEqual(
+            [
+                ArpEntry("10.0.0.1", "aa:bb:cc:00:01:00", "Vlan10", 10, None),
+                ArpEntry("10.0.0.5", "aa:bb:cc:00:02:00", "GigabitEthernet1/0/1.200", 200, 12),
+                ArpEntry("10.0.0.7", "aa:bb:cc:00:03:00", "", None, 3),
+            ],
+            parse_arp_table(SHOW_IP_ARP),
+        )
+
+    def test_mac_notations_normalize_to_colon_form(self) -> None:
+        for value in ("aabb.cc00.0100", "AA-BB-CC-00-01-00", "aa:bb:cc:00:01:00", "aabbcc000100"):
+            self.assertEqual("aa:bb:cc:00:01:00", normalize_mac(value))
+        with self.assertRaises(ValueError):
+            normalize_mac("aabb.cc00")
+
+
+class ArpDeltaTests(unittest.TestCase):
+    HOST = ArpEntry("10.0.0.5", "aa:bb:cc:00:02:00", "Gi1/0/1", None, 12)
+    GATEWAY = ArpEntry("10.0.0.1", "aa:bb:cc:00:01:00", "Vlan10", 10, None)
+    PRINTER = ArpEntry("10.0.0.7", "aa:bb:cc:00:03:00", "Gi1/0/3", None, 3)
+
+    def test_compare_counts_moves_separately_and_ignores_age(self) -> None:
+        moved = ArpEntry("10.0.0.5", "aa:bb:cc:00:02:00", "Gi1/0/7", None, 0)
+        aged_gateway = ArpEntry("10.0.0.1", "aa:bb:cc:00:01:00", "Vlan10", 10, 240)
+
+        changes = compare_arp_tables([self.HOST, self.GATEWAY], [moved, aged_gateway, self.PRINTER])
+
+        self.assertEqual({"entries": 3, "added": 1, "removed": 0, "moved": 1}, changes.counts())
+        self.assertEqual([moved, self.PRINTER], changes.added)
+        self.assertEqual([self.HOST], changes.removed)
+
+    def test_deltas_between_full_snapshots_rebuild_each_table(self) -> None:
+        tables = [
+            [self.HOST, self.GATEWAY],
+            [self.HOST, self.GATEWAY, self.PRINTER],
+            [self.GATEWAY, self.PRINTER],
+            [self.GATEWAY],
+        ]
+        with TemporaryDirectory() as tmp:
+            device_dir = Path(tmp) / "sw1"
+            device_dir.mkdir()
+            stored = self._store_tables(device_dir, tables)
+
+            self.assertEqual(
+                ["2026-01-01_000000_arp.txt", "2026-01-01_010000_arp.txt.delta",
+                 "2026-01-01_020000_arp.txt.delta", "2026-01-01_030000_arp.txt"],
+                sorted(path.name for path in device_dir.glob("*_arp.txt*")),
+            )
+            for path, table in zip(stored, tables):
+                self.assertCountEqual(table, read_arp_snapshot(path))
+
+            store = ArpStore(Path(tmp) / "arp.sqlite3")
+            self.assertEqual(4, import_arp_snapshots(device_dir, store).imported)
+            (printer,) = store.lookup(mac="aabb.cc00.0300")
+            self.assertEqual(("2026-01-01T01:00:00Z", "2026-01-01T02:00:00Z", False),
+                             (printer.first_seen, printer.last_seen, printer.present))
+
+    def test_head_is_rebuilt_from_the_directory_when_missing_or_stale(self) -> None:
+        with TemporaryDirectory() as tmp:
+            device_dir = Path(tmp) / "sw1"
+            device_dir.mkdir()
+            self._store_tables(device_dir, [[self.HOST], [self.HOST, self.GATEWAY], [self.GATEWAY]])
+            head_path = device_dir / ARP_HEAD_FILENAME
+            expected = ("2026-01-01_020000_arp.txt.delta", 2)
+
+            self.assertEqual(expected, (read_arp_head(device_dir).file, read_arp_head(device_dir).depth))
+            head_path.write_text('{"file": "2025-12-31_230000_arp.txt", "depth": 0}', encoding="utf-8")
+            self.assertEqual(expected, (read_arp_head(device_dir).file, read_arp_head(device_dir).depth))
+            head_path.unlink()
+            self.assertEqual(expected, (read_arp_head(device_dir).file, read_arp_head(device_dir).depth))
+
+    def test_repeated_polls_compare_against_the_head_kept_in_memory(self) -> None:
+        heads = {}
+        tables = [[self.HOST, self.GATEWAY], [self.HOST, self.GATEWAY, self.PRINTER]]
+        moments = iter([T0, T0 + timedelta(minutes=1)])
+        with TemporaryDirectory() as tmp, mock.patch.object(backup, "datetime") as clock:
+            clock.now.side_effect = lambda tz: next(moments)
+            storage = StorageOptions(arp_keyframe_interval=24)
+            arp_dir = Path(tmp)
+            logger = logging.getLogger("test_arp_store")
+            for number, table in enumerate(tables):
+                text = "\r\n".join(format_arp_entry(entry) for entry in table)
+                with mock.patch.object(backup, "read_arp_head", wraps=backup.read_arp_head) as read_head, \
+                        mock.patch("app.cisco.arp.read_arp_snapshot") as read_snapshot:
+                    path, changes = backup._store_arp_table("sw1", text, arp_dir, logger, {}, storage, heads)
+                self.assertEqual(1 - number, read_head.call_count)
+                read_snapshot.assert_not_called()
+
+            self.assertEqual("2026-01-01_000100_arp.txt.delta", path.name)
+            self.assertEqual({"entries": 3, "added": 1, "removed": 0, "moved": 0}, changes.counts())
+            self.assertCountEqual(tables[1], read_arp_snapshot(path))
+            self.assertEqual((path.name, 1), (read_arp_head(path.parent).file, read_arp_head(path.parent).depth))
+
+    @staticmethod
+    def _store_tables(device_dir: Path, tables: list[list[ArpEntry]]) -> list[Path]:
+        """Store ``tables`` hourly with a keyframe interval of 3, reading the head back from disk each time."""
+
+        stored = []
+        for hour, table in enumerate(tables):
+            head = read_arp_head(device_dir)
+            changes = compare_arp_tables(head.table(device_dir), table) if head is not None else None
+            text = "\r\n".join(format_arp_entry(entry) for entry in table)
+            path = device_dir / f"2026-01-01_{hour:02d}0000_arp.txt"
+            head = store_arp_snapshot(path, text, table, changes, head, keyframe_interval=3)
+            stored.append(device_dir / head.file)
+        return stored
+
+
+class ArpStoreTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = TemporaryDirectory()
+        self.store = ArpStore(Path(self._tmp.name) / "arp.sqlite3")
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_unchanged_rows_extend_one_sighting_until_they_move(self) -> None:
+        host = ArpEntry("10.0.0.5", "aa:bb:cc:00:02:00", "Gi1/0/1", None, 1)
+        moved = ArpEntry("10.0.0.5", "aa:bb:cc:00:02:00", "Gi1/0/7", None, 0)
+        for hour in range(3):
+            self.store.record("sw1", T0 + timedelta(hours=hour), [host])
+        result = self.store.record("sw1", T0 + timedelta(hours=3), [moved])
+        self.store.record("sw1", T0 + timedelta(hours=4), [moved])
+
+        self.assertEqual((1, 1, 1), (result.entries, result.appeared, result.disappeared))
+        latest, previous = self.store.lookup(mac="aabb.cc00.0200")
+        self.assertEqual(("Gi1/0/7", "2026-01-01T03:00:00Z", "2026-01-01T04:00:00Z", True),
+                         (latest.interface, latest.first_seen, latest.last_seen, latest.present))
+        self.assertEqual(("Gi1/0/1", "2026-01-01T00:00:00Z", "2026-01-01T02:00:00Z", False),
+                         (previous.interface, previous.first_seen, previous.last_seen, previous.present))
+        self.assertEqual(2, len(self.store.lookup(ip="10.0.0.5", device="sw1")))
+
+    def test_older_snapshots_are_skipped_and_filters_are_required(self) -> None:
+        self.store.record("sw1", T0 + timedelta(hours=1), [])
+
+        self.assertTrue(self.store.record("sw1", T0, parse_arp_table(SHOW_IP_ARP)).skipped)
+        self.assertEqual([], self.store.lookup(device="sw1"))
+        with self.assertRaises(ValueError):
+            self.store.lookup()
+
+    def test_import_indexes_stored_snapshots_once(self) -> None:
+        device_dir = Path(self._tmp.name) / "cisco" / "sw1"
+        device_dir.mkdir(parents=True)
+        write_backup_text(device_dir / "2026-01-01_000000_arp.txt.gz", SHOW_IP_ARP)
+        write_backup_text(device_dir / "2026-01-01_010000_arp.txt", SHOW_IP_ARP.replace("Vlan10", "Vlan20"))
+
+        first = import_arp_snapshots(device_dir, self.store)
+        second = import_arp_snapshots(device_dir, self.store)
+
+        self.assertEqual((2, 0), (first.imported, first.skipped))
+        self.assertEqual((0, 2), (second.imported, second.skipped))
+        self.assertEqual([20, 10], [sighting.vlan for sighting in self.store.lookup(mac="aabb.cc00.0100")])
+
+
+if __name__ == "__main__":
+    unittest.main()
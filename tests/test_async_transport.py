@@ -0,0 +1,168 @@
+import asyncio
+import logging
+import sys
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from types import SimpleNamespace
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+try:
+    import asyncssh
+except ImportError:  # pragma: no cover - optional dependency
+    asyncssh = None
+
+from app.cisco.async_client import AsyncCiscoClient
+from app.cisco.backup import backup_device_async
+from app.mikrotik.async_client import AsyncMikroTikClient
+from app.mikrotik.backup import fetch_export_async, perform_system_backup_async
+
+RUNNING_CONFIG = "Building configuration...\r\n!\r\nversion 15.2\r\nhostname sw1\r\n!\r\nend\r\n"
+ARP_TABLE = (
+    "Protocol  Address          Age (min)  Hardware Addr   Type   Interface\r\n"
+    "Internet  10.0.0.1                -   aabb.cc00.0100  ARPA   Vlan10\r\n"
+)
+EXPORT = "# 2026-01-07 00:49:07 by RouterOS 7.19\n/interface bridge\nadd name=bridge1\n"
+
+
+async def _cisco_shell(process) -> None:
+    """Minimal IOS-like interactive shell: user prompt, enable, show commands."""
+
+    prompt = "sw1>"
+    process.stdout.write(f"\r\n{prompt}")
+    while True:
+        line = await process.stdin.readline()
+        if not line:
+            break
+        command = line.strip()
+        process.stdout.write(command + "\r\n")
+        if command == "enable":
+            process.stdout.write("Password: ")
+            secret = (await process.stdin.readline()).strip()
+            if secret == "enable-secret":
+                prompt = "sw1#"
+            process.stdout.write("\r\n")
+        elif command == "show running-config":
+            process.stdout.write(RUNNING_CONFIG)
+        elif command == "show ip arp":
+            process.stdout.write(ARP_TABLE)
+        process.stdout.write(prompt)
+    process.exit(0)
+
+
+def _make_process_handler(sftp_root: Path):
+    async def _handle(process) -> None:
+        if process.command is None:
+            await _cisco_shell(process)
+            return
+        if process.command == "/export":
+            process.stdout.write(EXPORT)
+        elif process.command.startswith("/system backup save name="):
+            name = process.command.split("name=", 1)[1].split()[0]
+            if name.startswith("slow"):
+                # Slow RouterOS CPUs: saving outlasts the client timeout while progress keeps arriving.
+                for _ in range(6):
+                    process.stdout.write(".")
+                    await asyncio.sleep(0.1)
+            (sftp_root / f"{name}.backup").write_bytes(b"\x88\xac\xa1\xb1binary")
+        else:
+            process.stderr.write("bad command\n")
+            process.exit(1)
+            return
+        process.exit(0)
+
+    return _handle
+
+
+class _PasswordServer(asyncssh.SSHServer if asyncssh else object):
+    def begin_auth(self, username: str) -> bool:
+        return True
+
+    def password_auth_supported(self) -> bool:
+        return True
+
+    def validate_password(self, username: str, password: str) -> bool:
+        return username == "backup" and password == "secret"
+
+
+@unittest.skipIf(asyncssh is None, "asyncssh is not installed")
+class AsyncTransportTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self._tmp = TemporaryDirectory()
+        self.tmp_path = Path(self._tmp.name)
+        self.sftp_root = self.tmp_path / "device-fs"
+        self.sftp_root.mkdir()
+        self.server = await asyncssh.listen(
+            "127.0.0.1",
+            0,
+            server_host_keys=[asyncssh.generate_private_key("ssh-ed25519")],
+            server_factory=_PasswordServer,
+            process_factory=_make_process_handler(self.sftp_root),
+            sftp_factory=lambda chan: asyncssh.SFTPServer(chan, chroot=str(self.sftp_root)),
+            line_editor=False,
+        )
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.logger = logging.getLogger("async.transport.test")
+
+    async def asyncTearDown(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+        self._tmp.cleanup()
+
+    def _cisco_client(self) -> AsyncCiscoClient:
+        return AsyncCiscoClient(
+            host="127.0.0.1",
+            username="backup",
+            password="secret",
+            name="sw1",
+            enable_password="enable-secret",
+            port=self.port,
+        )
+
+    async def test_cisco_running_config_backup(self) -> None:
+        path, outcome, diff_path = await backup_device_async(self._cisco_client(), self.tmp_path / "backup", self.logger)
+
+        self.assertEqual(self.tmp_path / "backup" / "cisco" / "sw1", path.parent)
+        self.assertIn("hostname sw1", path.read_text(encoding="utf-8"))
+        self.assertIsNone(outcome.config_changed)
+        self.assertIsNone(diff_path)
+
+    async def test_cisco_arp_table_strips_echo_and_prompt(self) -> None:
+        output = await self._cisco_client().fetch_arp_table(self.logger)
+
+        self.assertTrue(output.startswith("Protocol"))
+        self.assertIn("aabb.cc00.0100", output)
+        self.assertNotIn("sw1#", output)
+
+    async def test_concurrent_cisco_sessions(self) -> None:
+        outputs = await asyncio.gather(*(self._cisco_client().fetch_running_config(self.logger) for _ in range(20)))
+
+        self.assertTrue(all("hostname sw1" in output for output in outputs))
+
+    async def test_mikrotik_export_and_system_backup(self) -> None:
+        device = SimpleNamespace(name="mt1", host="127.0.0.1", username="backup", port=self.port)
+
+        export = await fetch_export_async(device, "secret", self.logger)
+        backup_path = await perform_system_backup_async(
+            device, "secret", "2026-01-01_000000", self.tmp_path / "backup", self.logger
+        )
+
+        self.assertIn("add name=bridge1", export)
+        self.assertEqual("mt1_2026-01-01_000000.backup", backup_path.name)
+        self.assertGreater(backup_path.stat().st_size, 0)
+
+    async def test_slow_system_backup_is_bounded_per_read(self) -> None:
+        client = AsyncMikroTikClient("127.0.0.1", "backup", "secret", port=self.port, timeout=0.3)
+        destination = self.tmp_path / "slow.backup"
+
+        size = await client.fetch_system_backup("slow", destination, self.logger, {"device": "mt1"})
+
+        self.assertEqual(destination.stat().st_size, size)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import os
+import sys
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from app.common import backup_index
+from app.common.backup_index import INDEX_FILENAME, BackupIndex
+
+PATTERN = "*_export.rsc"
+
+
+class BackupIndexTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = TemporaryDirectory()
+        self.device_dir = Path(self._tmp.name) / "mikrotik" / "router1"
+        self.device_dir.mkdir(parents=True)
+        self.index = BackupIndex(self.device_dir)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _write(self, name: str, content: str, mtime: int) -> Path:
+        path = self.device_dir / name
+        path.write_text(content, encoding="utf-8")
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def test_missing_index_is_rebuilt_in_mtime_order(self) -> None:
+        older = self._write("b_export.rsc", "old\n", 1)
+        self._write("a_export.rsc", "new\n", 2)
+        current = self._write("c_export.rsc", "current\n", 3)
+        self._write("a_export.diff", "diff\n", 4)
+
+        entry = self.index.latest(PATTERN, exclude=current)
+
+        self.assertEqual("a_export.rsc", entry.file)
+        self.assertIsNone(entry.sha256)
+        self.assertTrue((self.device_dir / INDEX_FILENAME).exists())
+        self.assertNotEqual(older.name, entry.file)
+
+    def test_recorded_entry_is_found_without_listing_directory(self) -> None:
+        first = self._write("1_export.rsc", "one\n", 1)
+        self.index.latest(PATTERN, exclude=first)
+        self.index.record(PATTERN, first, "abc", 1)
+        current = self._write("2_export.rsc", "two\n", 2)
+
+        with mock.patch.object(Path, "glob", side_effect=AssertionError("directory listed")):
+            entry = self.index.latest(PATTERN, exclude=current)
+
+        self.assertEqual("1_export.rsc", entry.file)
+        self.assertEqual("abc", entry.sha256)
+        self.assertEqual(1, entry.lines)
+
+    def test_deleted_baseline_triggers_rebuild(self) -> None:
+        kept = self._write("1_export.rsc", "one\n", 1)
+        removed = self._write("2_export.rsc", "two\n", 2)
+        self.index.record(PATTERN, kept, "h1", 1)
+        self.index.record(PATTERN, removed, "h2", 1)
+        removed.unlink()
+
+        entry = self.index.latest(PATTERN)
+
+        self.assertEqual("1_export.rsc", entry.file)
+
+    def test_corrupt_index_is_rebuilt(self) -> None:
+        self._write("1_export.rsc", "one\n", 1)
+        (self.device_dir / INDEX_FILENAME).write_text("{not json\n", encoding="utf-8")
+
+        entry = self.index.latest(PATTERN)
+
+        self.assertEqual("1_export.rsc", entry.file)
+
+    def test_reads_entries_spanning_blocks(self) -> None:
+        paths = [self._write(f"{number:03d}_export.rsc", f"{number}\n", number) for number in range(1, 40)]
+        for number, path in enumerate(paths):
+            self.index.record(PATTERN, path, f"hash-{number}", 1)
+
+        with mock.patch.object(backup_index, "_READ_BLOCK_SIZE", 50):
+            entries = list(self.index._iter_reversed())
+
+        self.assertEqual([path.name for path in reversed(paths)], [entry.file for entry in entries])
+
+    def test_record_rejects_file_outside_pattern(self) -> None:
+        path = self._write("1_running-config.txt", "x\n", 1)
+
+        with self.assertRaises(ValueError):
+            self.index.record(PATTERN, path, None, None)
+
+    def test_reference_entry_takes_timestamp_from_file_name(self) -> None:
+        target = self.index.record(PATTERN, self._write("2026-01-01_000000_export.rsc", "x\n", 1), "abc", 1)
+
+        entry = self.index.record_reference(PATTERN, "2026-01-02_030405_export.rsc", target, "abc", 1)
+
+        self.assertEqual("2026-01-02T03:04:05+00:00", entry.timestamp)
+
+
+if __name__ == "__main__":
+    unittest.main()
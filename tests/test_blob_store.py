@@ -0,0 +1,117 @@
+import os
+import sys
+import time
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from app.common.backup_index import BackupIndex
+from app.common.compaction import compact_device_dir
+from app.common.diff import commit_backup
+from app.core.blob_store import BlobStore, Timeline
+from app.core.normalize import normalize_cisco_running_config
+from app.core.pack_archive import read_stored_text
+from app.core.storage import StorageOptions, backup_time, open_backup_stream
+
+PATTERN = "*_running-config.txt"
+
+
+class BlobStoreTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = TemporaryDirectory()
+        self.tmp_path = Path(self._tmp.name)
+        self.storage = StorageOptions(backend="cas")
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _save(self, device: str, filename: str, text: str, metadata: dict | None = None) -> Path:
+        with open_backup_stream(self.tmp_path, "cisco", device, filename, metadata, self.storage) as stream:
+            stream.write(text)
+            return commit_backup(stream, normalize_cisco_running_config)
+
+    def _blobs(self) -> list[Path]:
+        return sorted(BlobStore.for_backup_dir(self.tmp_path).root.glob("??/*"))
+
+    def test_identical_backups_share_one_blob(self) -> None:
+        first = self._save("sw1", "2026-01-01_000000_running-config.txt", "hostname edge\n")
+        second = self._save("sw2", "2026-01-01_000000_running-config.txt", "hostname edge\n")
+        third = self._save("sw1", "2026-01-02_000000_running-config.txt", "hostname core\n")
+
+        self.assertEqual(2, len(self._blobs()))
+        self.assertEqual(first.stat().st_ino, second.stat().st_ino)
+        self.assertNotEqual(first.stat().st_ino, third.stat().st_ino)
+        self.assertEqual("hostname edge\n", first.read_text(encoding="utf-8"))
+        self.assertEqual([], list(first.parent.glob(".*.part")))
+
+    def test_headers_and_volatile_lines_do_not_split_blobs(self) -> None:
+        first = self._save(
+            "sw1",
+            "2026-01-01_000000_running-config.txt",
+            "ntp clock-period 17208\nhostname edge\n",
+            {"backup_time": "2026-01-01_000000"},
+        )
+        second = self._save(
+            "sw1",
+            "2026-01-02_000000_running-config.txt",
+            "ntp clock-period 17180\nhostname edge\n",
+            {"backup_time": "2026-01-02_000000"},
+        )
+
+        self.assertEqual(1, len(self._blobs()))
+        self.assertEqual(first.stat().st_ino, second.stat().st_ino)
+        self.assertNotIn("backup_metadata", second.read_text(encoding="utf-8"))
+        entries = Timeline(second.parent).entries()
+        self.assertEqual([first.name, second.name], [entry.file for entry in entries])
+        self.assertEqual({self._blobs()[0].name}, {entry.blob for entry in entries})
+        self.assertIn("# backup_time: 2026-01-02_000000", Timeline(second.parent).get(second.name).header)
+
+    def test_reused_blob_is_ordered_and_aged_by_its_name(self) -> None:
+        first = self._save("sw1", "2026-01-01_000000_running-config.txt", "hostname a\n")
+        self._save("sw1", "2026-01-02_000000_running-config.txt", "hostname b\n")
+        relinked = self._save("sw1", "2026-01-03_000000_running-config.txt", "hostname a\n")
+        os.utime(first, (backup_time(first), backup_time(first)))
+
+        self.assertEqual(relinked.name, BackupIndex(first.parent).latest(PATTERN).file)
+        self._save("sw1", "2026-01-04_000000_running-config.txt", "hostname c\n")
+
+        result = compact_device_dir(first.parent, older_than=backup_time(first) + 1)
+        self.assertEqual(1, result.packed_files)
+        self.assertFalse(first.exists())
+        self.assertTrue(relinked.exists())
+
+    def test_collect_garbage_removes_only_unlinked_blobs(self) -> None:
+        kept = self._save("sw1", "2026-01-01_000000_running-config.txt", "hostname edge\n")
+        packed = self._save("sw1", "2026-01-02_000000_running-config.txt", "hostname core\n")
+        self._save("sw1", "2026-01-03_000000_running-config.txt", "hostname edge\n")
+        BackupIndex(kept.parent).rebuild(PATTERN)
+
+        compact_device_dir(kept.parent, older_than=time.time())
+        store = self.storage.blob_store(self.tmp_path)
+        self.assertEqual(1, len(list(store.iter_unreferenced())))
+
+        self.assertEqual((1, len("hostname core\n")), store.collect_garbage())
+        self.assertEqual(1, len(self._blobs()))
+        self.assertEqual("hostname core\n", read_stored_text(packed))
+        self.assertEqual((0, 0), store.collect_garbage())
+
+    def test_existing_target_is_not_replaced(self) -> None:
+        target = self._save("sw1", "2026-01-01_000000_running-config.txt", "hostname edge\n")
+
+        with self.assertRaises(FileExistsError):
+            self._save("sw1", target.name, "hostname core\n")
+
+        self.assertEqual("hostname edge\n", target.read_text(encoding="utf-8"))
+        self.assertEqual(1, len(self._blobs()))
+
+    def test_files_backend_has_no_store(self) -> None:
+        self.assertIsNone(StorageOptions().blob_store(self.tmp_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
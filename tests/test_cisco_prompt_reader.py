@@ -0,0 +1,157 @@
+import logging
+import random
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from app.cisco.client import CiscoConnectionError, CiscoSSHSession, _ShellBuffer, _extract_prompt
+
+
+class _FakeChannel:
+    """Channel double that answers each command after ``delay`` seconds."""
+
+    def __init__(self, responses: dict[str, list[bytes]], delay: float = 0.0) -> None:
+        self._responses = responses
+        self._delay = delay
+        self._pending: list[bytes] = []
+        self._condition = threading.Condition()
+        self._timeout: float | None = None
+        self._eof = False
+        self.closed = False
+
+    def settimeout(self, timeout: float | None) -> None:
+        self._timeout = timeout
+
+    def send(self, data: str) -> int:
+        chunks = self._responses.get(data.strip(), [])
+
+        def _deliver() -> None:
+            time.sleep(self._delay)
+            with self._condition:
+                self._pending.extend(chunks)
+                self._condition.notify_all()
+
+        threading.Thread(target=_deliver, daemon=True).start()
+        return len(data)
+
+    def recv(self, size: int) -> bytes:
+        with self._condition:
+            if not self._pending and not self._condition.wait_for(lambda: self._pending or self._eof, self._timeout):
+                raise TimeoutError("timed out")
+            if not self._pending:
+                return b""
+            chunk = self._pending.pop(0)
+            if len(chunk) > size:
+                self._pending.insert(0, chunk[size:])
+                chunk = chunk[:size]
+            return chunk
+
+    def hang_up(self) -> None:
+        with self._condition:
+            self._eof = True
+            self._condition.notify_all()
+
+
+class CiscoPromptReaderTests(unittest.TestCase):
+    def _session(self, channel: _FakeChannel, timeout: float = 2.0) -> CiscoSSHSession:
+        session = CiscoSSHSession(
+            client=None,
+            timeout=timeout,
+            logger=logging.getLogger("cisco.reader.test"),
+            log_extra={},
+            device_name="sw1",
+        )
+        session.channel = channel
+        return session
+
+    def test_prompt_returned_as_soon_as_bytes_arrive(self) -> None:
+        channel = _FakeChannel({"show clock": [b"show clock\r\n", b"*10:00:00 UTC\r\n", b"sw1#"]})
+        session = self._session(channel)
+
+        started = time.monotonic()
+        output = session.run_command("show clock")
+        elapsed = time.monotonic() - started
+
+        self.assertTrue(output.endswith("sw1#"))
+        self.assertEqual("privileged", session.prompt_mode)
+        self.assertLess(elapsed, 0.05)
+
+    def test_wait_for_substring_split_across_chunks(self) -> None:
+        channel = _FakeChannel({"enable": [b"enable\r\nPass", b"word: "]})
+        session = self._session(channel)
+
+        session.send("enable")
+
+        self.assertIn("Password:", session.wait_for("Password:"))
+
+    def test_deadline_raises_timeout(self) -> None:
+        channel = _FakeChannel({})
+        session = self._session(channel)
+
+        started = time.monotonic()
+        with self.assertRaises(TimeoutError):
+            session.wait_for_prompt(timeout=0.2)
+        self.assertLess(time.monotonic() - started, 1.0)
+
+    def test_closed_channel_raises_connection_error(self) -> None:
+        channel = _FakeChannel({})
+        session = self._session(channel)
+        channel.hang_up()
+
+        with self.assertRaises(CiscoConnectionError):
+            session.wait_for_prompt()
+
+
+class ShellBufferTests(unittest.TestCase):
+    def test_prompt_matches_full_rescan_for_any_chunking(self) -> None:
+        output = (
+            "show running-config\r\nBuilding configuration...\r\n!\r\ninterface Vlan10\r\n"
+            " description uplink>\r\n!\r\nend\r\n\r\nsw1#"
+        )
+        rng = random.Random(7)
+        for _ in range(200):
+            buffer = _ShellBuffer()
+            position = 0
+            while position < len(output):
+                step = rng.randint(1, 12)
+                buffer.feed(output[position : position + step])
+                position += step
+                self.assertEqual(_extract_prompt(output[:position]), buffer.prompt)
+            self.assertEqual(output, buffer.getvalue())
+
+    def test_partial_prompt_is_dropped_when_line_continues(self) -> None:
+        buffer = _ShellBuffer()
+        buffer.feed("sw1>")
+        self.assertEqual("sw1>", buffer.prompt)
+
+        buffer.feed(" not a prompt")
+
+        self.assertIsNone(buffer.prompt)
+
+    def test_multibyte_character_split_across_chunks(self) -> None:
+        encoded = "description Київ\r\nsw1#".encode("utf-8")
+        split = encoded.index("ї".encode("utf-8")) + 1
+        buffer = _ShellBuffer()
+
+        buffer.feed_bytes(encoded[:split])
+        buffer.feed_bytes(encoded[split:])
+
+        self.assertEqual("description Київ\r\nsw1#", buffer.getvalue())
+        self.assertEqual("sw1#", buffer.prompt)
+
+    def test_substring_spanning_chunks_is_found(self) -> None:
+        buffer = _ShellBuffer()
+
+        self.assertFalse(buffer.received("Password:", "enable\r\nPass"))
+        self.assertTrue(buffer.received("Password:", "word: "))
+
+
+if __name__ == "__main__":
+    unittest.main()
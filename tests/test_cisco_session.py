@@ -0,0 +1,77 @@
+import logging
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+import paramiko
+
+from app.cisco.client import CiscoClient, CiscoConnectionError
+
+
+class _FakeSession:
+    prompt_mode = "privileged"
+
+    def __init__(self) -> None:
+        self.commands: list[str] = []
+        self.closed = False
+
+    def run_command(self, command: str, sink=None) -> str:
+        self.commands.append(command)
+        if command == "show ip arp":
+            return "show ip arp\nInternet  10.0.0.1  -  aabb.cc00.0100  ARPA  Vlan10\nsw1#"
+        return f"{command}\nhostname sw1\nsw1#"
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class CiscoSessionScopeTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client = CiscoClient(host="192.0.2.1", username="backup", password="secret", name="sw1")
+        self.logger = logging.getLogger("cisco.session.test")
+
+    def test_commands_share_one_login_inside_session(self) -> None:
+        fake = _FakeSession()
+        with mock.patch.object(CiscoClient, "_connect", return_value=fake) as connect:
+            with self.client.session(self.logger):
+                config = self.client.fetch_running_config(self.logger)
+                arp = self.client.fetch_arp_table(self.logger)
+
+        self.assertEqual(1, connect.call_count)
+        self.assertEqual(["terminal length 0", "show running-config", "show ip arp"], fake.commands)
+        self.assertIn("hostname sw1", config)
+        self.assertTrue(arp.startswith("Internet"))
+        self.assertTrue(fake.closed)
+
+    def test_fetch_without_session_opens_and_closes_its_own(self) -> None:
+        sessions = [_FakeSession(), _FakeSession()]
+        with mock.patch.object(CiscoClient, "_connect", side_effect=sessions) as connect:
+            self.client.fetch_running_config(self.logger)
+            self.client.fetch_arp_table(self.logger)
+
+        self.assertEqual(2, connect.call_count)
+        self.assertTrue(all(session.closed for session in sessions))
+
+    def test_port_probe_is_skipped_when_the_sweep_already_ran(self) -> None:
+        swept = CiscoClient(host="192.0.2.1", username="backup", password="secret", name="sw1", tcp_check=False)
+        with mock.patch("app.cisco.client._tcp_check", return_value=False) as probe, mock.patch(
+            "app.cisco.client.paramiko.SSHClient"
+        ) as ssh_client:
+            ssh_client.return_value.connect.side_effect = paramiko.SSHException("banner timeout")
+            with self.assertRaisesRegex(CiscoConnectionError, "port unreachable"):
+                self.client._connect(self.logger, {})
+            with self.assertRaisesRegex(CiscoConnectionError, "connection error"):
+                swept._connect(self.logger, {})
+
+        self.assertEqual(1, probe.call_count)
+        self.assertEqual(1, ssh_client.call_count)
+
+
+if __name__ == "__main__":
+    unittest.main()
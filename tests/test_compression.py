@@ -0,0 +1,76 @@
+import gzip
+import logging
+import os
+import sys
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from app.core.compression import diff_path_for, read_backup_text, write_backup_text, zstd_available
+from app.core.storage import StorageOptions, open_backup_stream
+from app.mikrotik.backup import log_mikrotik_diff
+
+EXPORT = "/interface bridge\nadd name=bridge1\n"
+
+
+class CompressionTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = TemporaryDirectory()
+        self.tmp_path = Path(self._tmp.name)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _save(self, filename: str, text: str, compression: str) -> Path:
+        storage = StorageOptions(compression=compression)
+        with open_backup_stream(self.tmp_path, "mikrotik", "mt1", filename, storage=storage) as stream:
+            stream.write(text)
+            return stream.commit()
+
+    def test_stream_writes_gzip_with_suffix(self) -> None:
+        path = self._save("2026-01-01_000000_export.rsc", EXPORT, "gzip")
+
+        self.assertEqual("2026-01-01_000000_export.rsc.gz", path.name)
+        self.assertEqual(EXPORT, gzip.decompress(path.read_bytes()).decode("utf-8"))
+        self.assertEqual(EXPORT, read_backup_text(path))
+        self.assertEqual([path], list(path.parent.iterdir()))
+
+    def test_gzip_output_is_deterministic(self) -> None:
+        first = write_backup_text(self.tmp_path / "a.txt.gz", EXPORT)
+        second = write_backup_text(self.tmp_path / "b.txt.gz", EXPORT)
+
+        self.assertEqual(first.read_bytes(), second.read_bytes())
+
+    def test_diff_against_plain_baseline_is_compressed(self) -> None:
+        baseline = self.tmp_path / "mikrotik" / "mt1" / "2026-01-01_000000_export.rsc"
+        baseline.parent.mkdir(parents=True)
+        baseline.write_text(EXPORT, encoding="utf-8")
+        os.utime(baseline, (1, 1))
+        current = self._save("2026-01-02_000000_export.rsc", EXPORT + "/system ntp client\n", "gzip")
+
+        outcome, diff_path = log_mikrotik_diff(current, logging.getLogger("compression.test"), {"device": "mt1"})
+
+        self.assertTrue(outcome.config_changed)
+        self.assertEqual(baseline.resolve(), outcome.previous_path)
+        self.assertEqual("2026-01-02_000000_export.diff.gz", diff_path.name)
+        self.assertIn("+/system ntp client", read_backup_text(diff_path))
+
+    def test_diff_path_keeps_compression_suffix(self) -> None:
+        self.assertEqual(Path("x/a_export.diff"), diff_path_for(Path("x/a_export.rsc")))
+        self.assertEqual(Path("x/a_export.diff.zst"), diff_path_for(Path("x/a_export.rsc.zst")))
+
+    @unittest.skipUnless(zstd_available(), "zstandard not installed")
+    def test_zstd_round_trip(self) -> None:
+        path = self._save("2026-01-01_000000_export.rsc", EXPORT, "zstd")
+
+        self.assertEqual("2026-01-01_000000_export.rsc.zst", path.name)
+        self.assertEqual(EXPORT, read_backup_text(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
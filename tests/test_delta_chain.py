@@ -0,0 +1,110 @@
+import os
+import sys
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from app.common.backup_index import BackupIndex
+from app.common.delta_chain import encode_delta, materialize, reconstruct, read_version
+from app.common.diff import evaluate_change, store_as_delta
+from app.core.compression import write_backup_text
+from app.core.normalize import normalize_mikrotik_export
+
+PATTERN = "*_export.rsc"
+
+
+class DeltaChainTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = TemporaryDirectory()
+        self.device_dir = Path(self._tmp.name) / "mikrotik" / "mt1"
+        self.device_dir.mkdir(parents=True)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _backup(self, day: int, text: str, keyframe_interval: int = 3, suffix: str = "") -> Path:
+        path = write_backup_text(self.device_dir / f"2026-01-{day:02d}_000000_export.rsc{suffix}", text)
+        os.utime(path, (day, day))
+        outcome = evaluate_change(path, PATTERN, normalize_mikrotik_export, keep_baseline=True)
+        return store_as_delta(path, outcome, PATTERN, keyframe_interval)
+
+    def test_keyframe_every_interval_and_exact_reconstruction(self) -> None:
+        versions = [
+            f"/system identity\r\nset name=r{day}\r\n/ip address\r\nadd address=10.0.0.{day}" for day in range(1, 6)
+        ]
+        stored = [self._backup(day, text) for day, text in enumerate(versions, start=1)]
+
+        self.assertEqual(
+            [".rsc", ".delta", ".delta", ".rsc", ".delta"],
+            [path.suffix for path in stored],
+        )
+        self.assertEqual("2026-01-02_000000_export.rsc.delta", stored[1].name)
+        for path, text in zip(stored, versions):
+            self.assertTrue(path.exists())
+            self.assertEqual(text, reconstruct(path))
+        self.assertEqual(versions[2].replace("\r\n", "\n"), read_version(stored[2]))
+        self.assertEqual(stored[-1], self.device_dir / BackupIndex(self.device_dir).latest(PATTERN).stored_file)
+
+    def test_changed_config_diffs_against_delta_baseline(self) -> None:
+        self._backup(1, "/ip address\nadd address=10.0.0.1\n")
+        self._backup(2, "/ip address\nadd address=10.0.0.2\n")
+        current = write_backup_text(
+            self.device_dir / "2026-01-03_000000_export.rsc", "/ip address\nadd address=10.0.0.3\n"
+        )
+        os.utime(current, (3, 3))
+
+        outcome = evaluate_change(current, PATTERN, normalize_mikrotik_export)
+
+        self.assertTrue(outcome.config_changed)
+        self.assertEqual("2026-01-02_000000_export.rsc.delta", outcome.previous_path.name)
+        self.assertIn("-add address=10.0.0.2", outcome.diff_text)
+
+    def test_delta_reuses_baseline_text_from_evaluation(self) -> None:
+        self._backup(1, "/ip address\r\nadd address=10.0.0.1\r\n")
+        current = write_backup_text(
+            self.device_dir / "2026-01-02_000000_export.rsc", "/ip address\r\nadd address=10.0.0.2\r\n"
+        )
+
+        outcome = evaluate_change(current, PATTERN, normalize_mikrotik_export, keep_baseline=True)
+        with mock.patch("app.common.delta_chain.reconstruct", side_effect=AssertionError("baseline read twice")):
+            stored = store_as_delta(current, outcome, PATTERN, 3)
+
+        self.assertEqual("/ip address\r\nadd address=10.0.0.1\r\n", outcome.baseline_text)
+        self.assertEqual("/ip address\r\nadd address=10.0.0.2\r\n", reconstruct(stored))
+
+    def test_compressed_chain_and_materialize(self) -> None:
+        first = self._backup(1, "a\nb\nc\n", suffix=".gz")
+        second = self._backup(2, "a\nB\nc\nd\n", suffix=".gz")
+
+        self.assertEqual("2026-01-02_000000_export.rsc.delta.gz", second.name)
+        restored = materialize(second, self.device_dir.parent / "restored.rsc")
+        self.assertEqual("a\nB\nc\nd\n", restored.read_text(encoding="utf-8"))
+        self.assertEqual("a\nb\nc\n", reconstruct(first))
+
+    def test_index_rebuild_sees_delta_files(self) -> None:
+        self._backup(1, "a\n")
+        second = self._backup(2, "b\n")
+        (self.device_dir / ".backup-index.jsonl").unlink()
+
+        entry = BackupIndex(self.device_dir).latest(PATTERN)
+
+        self.assertEqual(second.name, entry.file)
+
+    def test_checksum_mismatch_is_reported(self) -> None:
+        base = write_backup_text(self.device_dir / "base.rsc", "a\nb\n")
+        delta = self.device_dir / "current.rsc.delta"
+        delta.write_text(encode_delta("a\nb\n", "a\nc\n", base.name, 1), encoding="utf-8")
+        base.write_text("z\nb\n", encoding="utf-8")
+
+        with self.assertRaises(ValueError):
+            reconstruct(delta)
+
+
+if __name__ == "__main__":
+    unittest.main()
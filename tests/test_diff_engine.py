@@ -0,0 +1,80 @@
+import difflib
+import random
+import sys
+import unittest
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from app.common.diff import _generate_diff
+from app.common.diff_engine import patience_opcodes, unified_diff
+
+LINES = ["!", " exit", " switchport mode access", "interface Gi1/0/1", "interface Gi1/0/2", "vlan 10", " name a"]
+
+
+def _random_pair(rng: random.Random) -> tuple[list[str], list[str]]:
+    before = [rng.choice(LINES) for _ in range(rng.randint(0, 40))]
+    after = list(before)
+    for _ in range(rng.randint(0, 6)):
+        position = rng.randint(0, len(after))
+        if rng.random() < 0.5 or not after:
+            after.insert(position, rng.choice(LINES + [f"new {rng.randint(0, 9)}"]))
+        else:
+            del after[min(position, len(after) - 1)]
+    return before, after
+
+
+class DiffEngineTests(unittest.TestCase):
+    def test_difflib_engine_matches_stdlib_output(self) -> None:
+        rng = random.Random(3)
+        for _ in range(300):
+            before, after = _random_pair(rng)
+            expected = list(difflib.unified_diff(before, after, "a", "b", lineterm=""))
+            self.assertEqual(expected, list(unified_diff(before, after, "a", "b", engine="difflib")))
+
+    def test_patience_opcodes_rebuild_target(self) -> None:
+        rng = random.Random(5)
+        for _ in range(300):
+            before, after = _random_pair(rng)
+            rebuilt: list[str] = []
+            position = 0
+            for tag, i1, i2, j1, j2 in patience_opcodes(before, after):
+                self.assertEqual(position, i1)
+                if tag == "equal":
+                    self.assertEqual(before[i1:i2], after[j1:j2])
+                rebuilt.extend(after[j1:j2])
+                position = i2
+            self.assertEqual(len(before), position)
+            self.assertEqual(after, rebuilt)
+
+    def test_patience_matches_difflib_on_config_change(self) -> None:
+        before = []
+        for port in range(1, 200):
+            before += [f"interface Gi1/0/{port}", " switchport mode access", f" switchport access vlan {port}", "!"]
+        after = list(before)
+        after[41] = " switchport access vlan 999"
+        after[400:400] = ["interface Vlan10", " ip address 10.0.0.1 255.255.255.0", "!"]
+        del after[702]
+
+        prev, curr = "\n".join(before), "\n".join(after)
+        self.assertEqual(
+            _generate_diff(prev, curr, "a", "b", "difflib"), _generate_diff(prev, curr, "a", "b", "patience")
+        )
+        _, added, removed = _generate_diff(prev, curr, "a", "b", "patience")
+        self.assertEqual((4, 2), (added, removed))
+
+    def test_default_engine_keeps_difflib_output(self) -> None:
+        before, after = ["g", "g", "b"], ["b", "g", "g", "f"]
+        expected = list(difflib.unified_diff(before, after, "a", "b", lineterm=""))
+
+        self.assertEqual(expected, list(unified_diff(before, after, "a", "b")))
+        self.assertEqual((2, 1), _generate_diff("\n".join(before), "\n".join(after), "a", "b")[1:])
+        # Patience anchors on the unique "b" and reports a larger (still valid) change.
+        self.assertEqual((3, 2), _generate_diff("\n".join(before), "\n".join(after), "a", "b", "patience")[1:])
+
+
+if __name__ == "__main__":
+    unittest.main()
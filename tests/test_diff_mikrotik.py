@@ -10,7 +10,10 @@ SRC_DIR = ROOT_DIR / "src"
 if str(SRC_DIR) not in sys.path:
     sys.path.insert(0, str(SRC_DIR))
 
-from app.mikrotik.backup import log_mikrotik_diff
+from app.common.diff import evaluate_change
+from app.core.normalize import normalize_mikrotik_export
+from app.core.storage import open_backup_stream
+from app.mikrotik.backup import deduplicate_mikrotik_export, log_mikrotik_diff
 
 
 class MikroTikDiffTests(unittest.TestCase):
@@ -68,6 +71,88 @@ class MikroTikDiffTests(unittest.TestCase):
             self.assertIsNone(diff_path)
             self.assertFalse((current.with_suffix(".diff")).exists())
 
+    def test_unchanged_config_uses_indexed_baseline_hash(self) -> None:
+        with TemporaryDirectory() as tmpdir:
+            device_dir = Path(tmpdir) / "mikrotik" / "router1"
+            device_dir.mkdir(parents=True, exist_ok=True)
+            normalized: list[str] = []
+
+            def normalizer(text: str) -> str:
+                normalized.append(text)
+                return normalize_mikrotik_export(text)
+
+            first = self._write_export(device_dir / "2026-01-01_000000_export.rsc", "# by RouterOS\n/ip dns\n")
+            os.utime(first, (1, 1))
+            evaluate_change(first, "*_export.rsc", normalizer)
+            second = self._write_export(device_dir / "2026-01-02_000000_export.rsc", "# by RouterOS\n/ip dns\n")
+            os.utime(second, (2, 2))
+            normalized.clear()
+
+            outcome = evaluate_change(second, "*_export.rsc", normalizer)
+
+            self.assertFalse(outcome.config_changed)
+            self.assertEqual(first.resolve(), outcome.previous_path)
+            self.assertEqual(outcome.current_sha256, outcome.baseline_sha256)
+            self.assertEqual(1, len(normalized))
+
+    def test_changed_config_still_diffs_against_baseline_file(self) -> None:
+        with TemporaryDirectory() as tmpdir:
+            device_dir = Path(tmpdir) / "mikrotik" / "router1"
+            device_dir.mkdir(parents=True, exist_ok=True)
+
+            first = self._write_export(device_dir / "2026-01-01_000000_export.rsc", "/ip dns\nset servers=1.1.1.1\n")
+            os.utime(first, (1, 1))
+            evaluate_change(first, "*_export.rsc", normalize_mikrotik_export)
+            second = self._write_export(device_dir / "2026-01-02_000000_export.rsc", "/ip dns\nset servers=8.8.8.8\n")
+            os.utime(second, (2, 2))
+
+            outcome = evaluate_change(second, "*_export.rsc", normalize_mikrotik_export)
+
+            self.assertTrue(outcome.config_changed)
+            self.assertEqual((1, 1), (outcome.added, outcome.removed))
+
+    def test_dedup_replaces_unchanged_export_with_reference(self) -> None:
+        with TemporaryDirectory() as tmpdir:
+            backup_dir = Path(tmpdir)
+            device_dir = backup_dir / "mikrotik" / "router1"
+            device_dir.mkdir(parents=True, exist_ok=True)
+            logger = logging.getLogger("mikrotik.diff.test")
+            first = self._write_export(
+                device_dir / "2026-01-01_000000_export.rsc",
+                "# backup_metadata\n# backup_time: 2026-01-01\n/ip dns\nset servers=1.1.1.1\n",
+            )
+            log_mikrotik_diff(first, logger, {"device": "router1"})
+
+            with open_backup_stream(
+                backup_dir, "mikrotik", "router1", "2026-01-02_000000_export.rsc", {"backup_time": "2026-01-02"}
+            ) as stream:
+                stream.write("/ip dns\nset servers=1.1.1.1\n")
+                outcome = deduplicate_mikrotik_export(stream, logger, {"device": "router1"})
+
+            self.assertIsNotNone(outcome)
+            self.assertTrue(outcome.deduplicated)
+            self.assertFalse(outcome.config_changed)
+            self.assertEqual(first.resolve(), outcome.current_path)
+            self.assertEqual([first.name], sorted(path.name for path in device_dir.glob("*_export.rsc")))
+            self.assertEqual([".backup-index.jsonl", first.name], sorted(path.name for path in device_dir.iterdir()))
+
+    def test_dedup_keeps_changed_export(self) -> None:
+        with TemporaryDirectory() as tmpdir:
+            backup_dir = Path(tmpdir)
+            device_dir = backup_dir / "mikrotik" / "router1"
+            device_dir.mkdir(parents=True, exist_ok=True)
+            logger = logging.getLogger("mikrotik.diff.test")
+            first = self._write_export(device_dir / "2026-01-01_000000_export.rsc", "/ip dns\nset servers=1.1.1.1\n")
+            log_mikrotik_diff(first, logger, {"device": "router1"})
+
+            with open_backup_stream(backup_dir, "mikrotik", "router1", "2026-01-02_000000_export.rsc") as stream:
+                stream.write("/ip dns\nset servers=8.8.8.8\n")
+                outcome = deduplicate_mikrotik_export(stream, logger, {"device": "router1"})
+                saved = stream.commit()
+
+            self.assertIsNone(outcome)
+            self.assertTrue(saved.exists())
+
 
 if __name__ == "__main__":
     unittest.main()
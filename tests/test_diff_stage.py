@@ -0,0 +1,106 @@
+import sys
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from app.common.diff_stage import DiffJob, DiffStage, PendingDiff
+from app.common.structural_diff import mikrotik_blocks
+from app.core.normalize import NormalizerRegistry, normalize_mikrotik_export
+
+BEFORE = "# 2026-01-01 00:00:00 by RouterOS 7.19\n/ip address\nadd address=10.0.0.1/24\n/ip route\nadd gateway=10.0.0.254\n"
+AFTER = "# 2026-01-02 00:00:00 by RouterOS 7.19\n/ip address\nadd address=10.0.0.2/24\n/ip route\nadd gateway=10.0.0.254\n"
+
+
+class DiffStageTests(unittest.TestCase):
+    def _evaluate(self, tmp: str, stage: DiffStage, job_for) -> list:
+        device_dir = Path(tmp) / "mt1"
+        device_dir.mkdir()
+        results = []
+        for stamp, text in (("2026-01-01_000000", BEFORE), ("2026-01-02_000000", AFTER), ("2026-01-03_000000", AFTER)):
+            path = device_dir / f"{stamp}_export.rsc"
+            path.write_text(text, encoding="utf-8")
+            results.append(stage.run(job_for(path)))
+        return results
+
+    def test_process_pool_matches_inline_evaluation(self) -> None:
+        normalizer = NormalizerRegistry.from_config(
+            {"mikrotik": {"*": {"mask": [{"pattern": r"gateway=\S+", "replace": "gateway=<gw>"}]}}}
+        ).normalizer_for("mikrotik", None)
+
+        def job_for(path: Path) -> DiffJob:
+            return DiffJob(path, "*_export.rsc", normalizer, mikrotik_blocks)
+
+        with TemporaryDirectory() as inline_tmp, TemporaryDirectory() as pool_tmp:
+            inline = self._evaluate(inline_tmp, DiffStage(), job_for)
+            with DiffStage(workers=2) as stage:
+                pooled = self._evaluate(pool_tmp, stage, job_for)
+
+            self.assertEqual([None, True, False], [outcome.config_changed for outcome, _ in pooled])
+            for (expected, expected_diff), (outcome, diff_path) in zip(inline, pooled):
+                self.assertEqual(expected.current_sha256, outcome.current_sha256)
+                self.assertEqual((expected.added, expected.removed), (outcome.added, outcome.removed))
+                self.assertEqual(expected.section_changes, outcome.section_changes)
+                self.assertEqual(expected_diff is None, diff_path is None)
+            diff_path = pooled[1][1]
+            self.assertEqual("2026-01-02_000000_export.diff", diff_path.name)
+            self.assertIn("+add address=10.0.0.2/24", diff_path.read_text(encoding="utf-8"))
+
+    def test_job_engine_is_used_for_the_diff(self) -> None:
+        counts = {}
+        for engine in ("difflib", "patience"):
+            with TemporaryDirectory() as tmp:
+                device_dir = Path(tmp) / "mt1"
+                device_dir.mkdir()
+                for day, text in ((1, "/a\ng\ng\nb\n"), (2, "/a\nb\ng\ng\nf\n")):
+                    path = device_dir / f"2026-01-0{day}_000000_export.rsc"
+                    path.write_text(text, encoding="utf-8")
+                    job = DiffJob(path, "*_export.rsc", normalize_mikrotik_export, diff_engine=engine)
+                    outcome, _ = DiffStage().run(job)
+                counts[engine] = (outcome.added, outcome.removed)
+
+        self.assertEqual({"difflib": (2, 1), "patience": (3, 2)}, counts)
+
+    def test_pending_diff_runs_only_once_submitted(self) -> None:
+        with TemporaryDirectory() as tmp:
+            device_dir = Path(tmp) / "mt1"
+            device_dir.mkdir()
+            first = device_dir / "2026-01-01_000000_export.rsc"
+            first.write_text(BEFORE, encoding="utf-8")
+            DiffStage().run(DiffJob(first, "*_export.rsc", normalize_mikrotik_export))
+            second = device_dir / "2026-01-02_000000_export.rsc"
+            second.write_text(AFTER, encoding="utf-8")
+
+            pending = PendingDiff(second, DiffJob(second, "*_export.rsc", normalize_mikrotik_export))
+            self.assertFalse(pending.done())
+            with self.assertRaises(RuntimeError):
+                pending.result()
+            self.assertEqual([], list(device_dir.glob("*.diff")))
+
+            with DiffStage(workers=1) as stage:
+                future = pending.submit(stage).future
+                outcome, diff_path = pending.result()
+                self.assertIs(future, pending.submit(stage).future)
+
+            self.assertTrue(pending.done())
+            self.assertTrue(outcome.config_changed)
+            self.assertEqual("2026-01-02_000000_export.diff", diff_path.name)
+
+            resolved = PendingDiff.resolved(first, outcome)
+            self.assertTrue(resolved.done())
+            self.assertEqual((outcome, None), resolved.result())
+
+    def test_worker_errors_are_raised_in_the_caller(self) -> None:
+        with TemporaryDirectory() as tmp, DiffStage(workers=1) as stage:
+            job = DiffJob(Path(tmp) / "missing_export.rsc", "*_export.rsc", normalize_mikrotik_export)
+
+            with self.assertRaises(FileNotFoundError):
+                stage.run(job)
+
+
+if __name__ == "__main__":
+    unittest.main()
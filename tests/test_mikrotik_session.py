@@ -0,0 +1,63 @@
+import logging
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from app.mikrotik.client import MikroTikClient
+
+
+class _FakeSSHClient:
+    def __init__(self) -> None:
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def _fake_stream_command(client, command, sink):
+    sink.write("/interface bridge\n")
+    return 18, True, "", 0
+
+
+class MikroTikSessionScopeTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client = MikroTikClient(host="192.0.2.1", username="backup", password="secret")
+        self.logger = logging.getLogger("mikrotik.session.test")
+        self.log_extra = {"device": "mt1"}
+
+    def test_operations_share_one_connection_inside_session(self) -> None:
+        fake = _FakeSSHClient()
+        with mock.patch.object(MikroTikClient, "_connect", return_value=fake) as connect, mock.patch.object(
+            MikroTikClient, "_stream_command", side_effect=_fake_stream_command
+        ) as run_command:
+            with self.client.session(self.logger, self.log_extra):
+                export = self.client.fetch_export(self.logger, self.log_extra)
+                self.client.fetch_export(self.logger, self.log_extra)
+                self.assertFalse(fake.closed)
+
+        self.assertEqual("/interface bridge\n", export)
+        self.assertEqual(1, connect.call_count)
+        self.assertEqual(2, run_command.call_count)
+        self.assertTrue(all(call.args[0] is fake for call in run_command.call_args_list))
+        self.assertTrue(fake.closed)
+
+    def test_fetch_without_session_opens_and_closes_its_own(self) -> None:
+        clients = [_FakeSSHClient(), _FakeSSHClient()]
+        with mock.patch.object(MikroTikClient, "_connect", side_effect=clients) as connect, mock.patch.object(
+            MikroTikClient, "_stream_command", side_effect=_fake_stream_command
+        ):
+            self.client.fetch_export(self.logger, self.log_extra)
+            self.client.fetch_export(self.logger, self.log_extra)
+
+        self.assertEqual(2, connect.call_count)
+        self.assertTrue(all(client.closed for client in clients))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,13 +1,17 @@
+import hashlib
 import sys
 import unittest
 from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
 
 ROOT_DIR = Path(__file__).resolve().parents[1]
 SRC_DIR = ROOT_DIR / "src"
 if str(SRC_DIR) not in sys.path:
     sys.path.insert(0, str(SRC_DIR))
 
-from app.core.normalize import normalize_mikrotik_export
+from app.common import diff
+from app.core.normalize import NormalizerRegistry, normalize_cisco_running_config, normalize_mikrotik_export
 
 
 class NormalizeMikroTikExportTests(unittest.TestCase):
@@ -43,5 +47,121 @@ add name=bridge1
         )
 
 
+class NormalizeCiscoRunningConfigTests(unittest.TestCase):
+    def test_drops_volatile_lines_and_trailing_blank_lines(self) -> None:
+        text = (
+            "Building configuration...\r\n\r\nCurrent configuration : 1234 bytes\r\n"
+            "! Last configuration change at 10:00:00 UTC Mon Jan 5 2026\r\n!\r\nhostname sw1\r\n"
+            "NTP clock-period 36028797\r\nend  \r\n  \r\n"
+        )
+
+        self.assertEqual(
+            "Building configuration...\n\n!\nhostname sw1\nend  ",
+            normalize_cisco_running_config(text),
+        )
+
+    def test_volatile_pattern_does_not_span_lines(self) -> None:
+        text = "!\nTime: 10:00\nhostname sw1\n! Time: 10:00"
+
+        self.assertEqual("!\nTime: 10:00\nhostname sw1", normalize_cisco_running_config(text))
+
+
+class NormalizerRegistryTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.registry = NormalizerRegistry.from_config(
+            {
+                "cisco": {
+                    "*": {"mask": [{"pattern": r"^( (?:enable )?secret \d+ )\S+", "replace": r"\1<masked>"}]},
+                    "C9300*": {"drop": [r"^! Uptime counter"]},
+                },
+                "mikrotik": {"RB4011*": {"drop": "# software id"}},
+            }
+        )
+
+    def test_model_rules_stack_on_vendor_rules(self) -> None:
+        text = "hostname sw1\n! Uptime counter 12\n enable secret 9 $9$abc\nend"
+
+        self.assertEqual(
+            "hostname sw1\n enable secret 9 <masked>\nend",
+            self.registry.normalizer_for("cisco", "c9300-48P")(text),
+        )
+        self.assertEqual(
+            "hostname sw1\n! Uptime counter 12\n enable secret 9 <masked>\nend",
+            self.registry.normalizer_for("cisco", None)(text),
+        )
+
+    def test_builtin_normalizer_is_used_without_rules_and_compiled_once(self) -> None:
+        self.assertIs(normalize_mikrotik_export, self.registry.normalizer_for("mikrotik", "hEX"))
+        normalizer = self.registry.normalizer_for("mikrotik", "RB4011iGS+")
+        self.assertIs(normalizer, self.registry.normalizer_for("mikrotik", "RB4011iGS+"))
+        self.assertEqual(
+            "/ip address", normalizer("# 2026-01-07 00:49:07 by RouterOS 7.19\n# software id = X\n/ip address\n")
+        )
+
+    def test_rules_cannot_reach_into_the_next_line(self) -> None:
+        registry = NormalizerRegistry.from_config(
+            {"mikrotik": {"*": {"drop": [r"^# software id\s*"], "mask": [{"pattern": r"x\s+", "replace": "y"}]}}}
+        )
+        text = "/a\n# software id\n\n/ip address\nadd x\nx\n"
+        normalizer = registry.normalizer_for("mikrotik", None)
+
+        self.assertEqual("/a\n\n/ip address\nadd x\nx", normalizer(text))
+
+    def test_invalid_rules_are_rejected(self) -> None:
+        for section in ({"juniper": {}}, {"cisco": {"*": {"drop": ["("]}}}, {"cisco": {"*": {"mask": ["x"]}}}):
+            with self.assertRaises(ValueError):
+                NormalizerRegistry.from_config(section)
+
+
+class StreamingDigestTests(unittest.TestCase):
+    CISCO = (
+        "Current configuration : 1234 bytes\r\n! Last configuration change at 10:00\r\n"
+        "hostname sw1  \r\n \r\ninterface Gi1/0/1\r\n description uplink\r\n"
+        "username admin secret 5 $1$abc\r\n!\r\nend\r\n  \r\n\r\n\r\n"
+    )
+    MIKROTIK = (
+        "# 2026-01-07 00:49:07 by RouterOS 7.19\n# software id = ABCD-1234  \n\n\n"
+        "/ip address\nadd address=10.0.0.1/24  \n\n/ip route\nadd gateway=10.0.0.254\n  \n\n"
+    )
+
+    def _assert_streaming_matches_whole_text(self, text: str, normalizer) -> None:
+        expected = normalizer(text)
+        expected_digest = hashlib.sha256(expected.encode("utf-8")).hexdigest()
+        expected_lines = len(expected.splitlines())
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp) / "config.txt"
+            path.write_bytes(text.encode("utf-8"))
+            for chunk_chars in (1, 2, 7, 1 << 20):
+                with self.subTest(chunk_chars=chunk_chars), mock.patch.object(
+                    diff, "_DIGEST_CHUNK_CHARS", chunk_chars
+                ):
+                    self.assertEqual((expected_digest, expected_lines), diff._digest_normalized(path, normalizer))
+
+    def test_builtin_normalizers_stream_across_chunk_boundaries(self) -> None:
+        self._assert_streaming_matches_whole_text(self.CISCO, normalize_cisco_running_config)
+        self._assert_streaming_matches_whole_text(self.MIKROTIK, normalize_mikrotik_export)
+
+    def test_rule_normalizers_and_empty_results_stream(self) -> None:
+        registry = NormalizerRegistry.from_config(
+            {"cisco": {"*": {"drop": ["hostname "], "mask": [{"pattern": r"(\bsecret \d+ )\S+"}]}}}
+        )
+
+        self._assert_streaming_matches_whole_text(self.CISCO, registry.normalizer_for("cisco", None))
+        registry = NormalizerRegistry.from_config({"mikrotik": {"*": {"drop": [r"^# software id\s*"]}}})
+        self._assert_streaming_matches_whole_text(self.MIKROTIK, registry.normalizer_for("mikrotik", None))
+        self._assert_streaming_matches_whole_text("! Time: 10:00\n\n  \n", normalize_cisco_running_config)
+        self._assert_streaming_matches_whole_text("", normalize_mikrotik_export)
+
+    def test_arbitrary_callables_fall_back_to_whole_text(self) -> None:
+        self._assert_streaming_matches_whole_text(self.MIKROTIK, lambda text: text.upper().strip())
+
+    def test_line_count_matches_splitlines_for_other_line_breaks(self) -> None:
+        text = "banner motd ^C\x0cWelcome\u2028\x1c\x85^C\nhostname sw1\n"
+
+        self._assert_streaming_matches_whole_text(text, normalize_cisco_running_config)
+        self._assert_streaming_matches_whole_text(text, lambda text: text)
+        self.assertEqual(len(text.splitlines()), diff._count_lines(text))
+
+
 if __name__ == "__main__":
     unittest.main()
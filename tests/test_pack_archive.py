@@ -0,0 +1,107 @@
+import os
+import sys
+import time
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from app.common.backup_index import BackupIndex
+from app.common.compaction import compact_device_dir
+from app.common.delta_chain import reconstruct
+from app.common.diff import evaluate_change, store_as_delta
+from app.core.compression import write_backup_text
+from app.core import pack_archive
+from app.core.normalize import normalize_mikrotik_export
+from app.core.pack_archive import PACK_FILENAME, append_to_pack, open_pack, read_stored_text
+
+PATTERN = "*_export.rsc"
+
+
+class PackArchiveTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = TemporaryDirectory()
+        self.device_dir = Path(self._tmp.name) / "mikrotik" / "mt1"
+        self.device_dir.mkdir(parents=True)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _backup(self, day: int, text: str, suffix: str = "") -> Path:
+        path = write_backup_text(self.device_dir / f"2026-01-{day:02d}_000000_export.rsc{suffix}", text)
+        os.utime(path, (day * 86400, day * 86400))
+        outcome = evaluate_change(path, PATTERN, normalize_mikrotik_export)
+        stored = store_as_delta(path, outcome, PATTERN, keyframe_interval=4)
+        os.utime(stored, (day * 86400, day * 86400))
+        return stored
+
+    def test_appends_keep_earlier_members_readable(self) -> None:
+        first = write_backup_text(self.device_dir / "a.txt", "alpha\n")
+        second = write_backup_text(self.device_dir / "b.txt.gz", "beta\n")
+        append_to_pack(self.device_dir, [first])
+        append_to_pack(self.device_dir, [second])
+        first.unlink()
+        second.unlink()
+
+        archive = open_pack(self.device_dir)
+        self.assertEqual({"a.txt", "b.txt.gz"}, set(archive.members))
+        self.assertEqual("alpha\n", read_stored_text(first))
+        self.assertEqual("beta\n", read_stored_text(second))
+
+    def test_append_replaces_and_closes_the_cached_mapping(self) -> None:
+        append_to_pack(self.device_dir, [write_backup_text(self.device_dir / "a.txt", "alpha\n")])
+        first = open_pack(self.device_dir)
+        self.assertIs(first, open_pack(self.device_dir))
+
+        append_to_pack(self.device_dir, [write_backup_text(self.device_dir / "b.txt", "beta\n")])
+        second = open_pack(self.device_dir)
+
+        self.assertIsNot(first, second)
+        self.assertTrue(first._mmap.closed)
+        self.assertEqual({"a.txt", "b.txt"}, set(second.members))
+        self.assertEqual(1, sum(path.parent == self.device_dir for path in pack_archive._open_packs))
+
+    def test_corrupt_tail_is_reported(self) -> None:
+        append_to_pack(self.device_dir, [write_backup_text(self.device_dir / "a.txt", "alpha\n")])
+        with (self.device_dir / PACK_FILENAME).open("ab") as handle:
+            handle.write(b"partial member")
+
+        with self.assertRaises(ValueError):
+            open_pack(self.device_dir)
+
+    def test_compaction_keeps_baseline_and_history_stays_readable(self) -> None:
+        versions = [f"/ip address\nadd address=10.0.0.{day}\n" for day in range(1, 5)]
+        stored = [self._backup(day, text, ".gz") for day, text in enumerate(versions, start=1)]
+        (self.device_dir / "2026-01-02_000000_export.diff").write_text("old diff\n", encoding="utf-8")
+        os.utime(self.device_dir / "2026-01-02_000000_export.diff", (86400, 86400))
+
+        result = compact_device_dir(self.device_dir, older_than=time.time())
+
+        self.assertEqual(4, result.packed_files)
+        loose = sorted(path.name for path in self.device_dir.iterdir())
+        self.assertEqual([".backup-index.jsonl", stored[-1].name, PACK_FILENAME], loose)
+        for path, text in zip(stored, versions):
+            self.assertEqual(text, reconstruct(path))
+
+        current = write_backup_text(self.device_dir / "2026-01-05_000000_export.rsc", "/ip address\n")
+        outcome = evaluate_change(current, PATTERN, normalize_mikrotik_export)
+        self.assertEqual(stored[-1].name, outcome.previous_path.name)
+        self.assertTrue(outcome.config_changed)
+
+    def test_index_accepts_packed_baseline(self) -> None:
+        baseline = self._backup(1, "/ip address\n")
+        append_to_pack(self.device_dir, [baseline])
+        baseline.unlink()
+
+        entry = BackupIndex(self.device_dir).latest(PATTERN)
+
+        self.assertEqual(baseline.name, entry.stored_file)
+        self.assertIsNotNone(entry.sha256)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import socket
+import sys
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from app.common.reachability import sweep_tcp
+
+
+def _listener(backlog: int) -> socket.socket:
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("127.0.0.1", 0))
+    server.listen(backlog)
+    return server
+
+
+def _stalled_listener(fillers: list[socket.socket]) -> socket.socket:
+    """A listener whose accept queue is full, so further connects hang until they time out."""
+
+    server = _listener(0)
+    address = server.getsockname()
+    for _ in range(8):
+        filler = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        filler.setblocking(False)
+        filler.connect_ex(address)
+        fillers.append(filler)
+    return server
+
+
+class SweepTcpTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.sockets: list[socket.socket] = []
+
+    def tearDown(self) -> None:
+        for sock in self.sockets:
+            sock.close()
+
+    def test_reports_open_refused_and_unresolved_targets(self) -> None:
+        server = _listener(16)
+        self.sockets.append(server)
+        closed = _listener(1)
+        closed_port = closed.getsockname()[1]
+        closed.close()
+        open_target = ("127.0.0.1", server.getsockname()[1])
+
+        results = sweep_tcp(
+            [open_target, ("127.0.0.1", closed_port), ("sw1.invalid", 22), open_target], timeout=2
+        )
+
+        self.assertEqual(
+            {open_target: None, ("127.0.0.1", closed_port): "refused", ("sw1.invalid", 22): "unresolved"},
+            results,
+        )
+
+    def test_host_names_resolve_concurrently_to_ipv4(self) -> None:
+        server = _listener(16)
+        self.sockets.append(server)
+        port = server.getsockname()[1]
+        families = []
+
+        def slow_getaddrinfo(host, port, family=0, type=0, proto=0, flags=0):
+            families.append(family)
+            time.sleep(0.3)
+            return [(socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP, "", ("127.0.0.1", 0))]
+
+        targets = [(f"sw{number}.example", port) for number in range(4)]
+        started = time.monotonic()
+        with mock.patch("socket.getaddrinfo", side_effect=slow_getaddrinfo):
+            results = sweep_tcp(targets, timeout=2)
+        elapsed = time.monotonic() - started
+
+        self.assertEqual(dict.fromkeys(targets), results)
+        self.assertEqual([socket.AF_INET] * 4, families)
+        self.assertLess(elapsed, 0.9)
+
+    def test_silent_targets_time_out_together(self) -> None:
+        fillers: list[socket.socket] = []
+        targets = []
+        for _ in range(4):
+            server = _stalled_listener(fillers)
+            self.sockets.append(server)
+            targets.append(("127.0.0.1", server.getsockname()[1]))
+        self.sockets.extend(fillers)
+
+        started = time.monotonic()
+        results = sweep_tcp(targets, timeout=0.5)
+        elapsed = time.monotonic() - started
+
+        self.assertEqual({"timeout"}, set(results.values()))
+        self.assertLess(elapsed, 1.5)
+
+    def test_socket_cap_still_checks_every_target(self) -> None:
+        servers = [_listener(16) for _ in range(5)]
+        self.sockets.extend(servers)
+        targets = [("127.0.0.1", server.getsockname()[1]) for server in servers]
+
+        results = sweep_tcp(targets, timeout=2, max_sockets=1)
+
+        self.assertEqual(dict.fromkeys(targets), results)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import sys
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from app.common.run_summary import DeviceResultData, RunSummaryBuilder, TaskResultData
+
+
+class RunSummaryBuilderTests(unittest.TestCase):
+    def test_concurrent_add_device_keeps_totals_consistent(self) -> None:
+        summary = RunSummaryBuilder(run_id="2026-01-01_000000", timestamp="2026-01-01T00:00:00Z", dry_run=False)
+
+        def _add(index: int) -> None:
+            status = "success" if index % 2 == 0 else "failed"
+            tasks = {"cisco_running_config": TaskResultData(performed=True, saved_path=f"/tmp/{index}.txt")}
+            summary.add_device(DeviceResultData(name=f"sw{index}", vendor="cisco", status=status, tasks=tasks))
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            list(executor.map(_add, range(400)))
+
+        built = summary.build()
+        self.assertEqual(400, built["totals"]["devices_processed"])
+        self.assertEqual(200, built["totals"]["devices_success"])
+        self.assertEqual(200, built["totals"]["devices_failed"])
+        self.assertEqual(400, built["totals"]["backups_created"])
+        self.assertEqual(400, len(built["devices"]))
+
+    def test_devices_are_reported_in_inventory_order(self) -> None:
+        summary = RunSummaryBuilder(run_id="2026-01-01_000000", timestamp="2026-01-01T00:00:00Z", dry_run=False)
+        summary.set_device_order(["sw1", "sw2", "sw3"])
+
+        for name in ("sw3", "extra", "sw1", "sw2"):
+            summary.add_device(DeviceResultData(name=name, vendor="cisco", status="success"))
+
+        self.assertEqual(["sw1", "sw2", "sw3", "extra"], [device["name"] for device in summary.build()["devices"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
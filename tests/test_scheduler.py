@@ -0,0 +1,80 @@
+import random
+import sys
+import unittest
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from app.common.scheduler import DeviceScheduler, Schedule
+
+SECTION = {
+    "default_interval": 86400,
+    "jitter": 0.5,
+    "groups": [
+        {"name": "core", "interval": 900, "devices": ["*-CORE-*", "dc1-edge1"]},
+        {"name": "lab", "interval": 60, "devices": "lab-*"},
+    ],
+}
+
+
+class ScheduleTests(unittest.TestCase):
+    def test_first_matching_group_wins_and_others_use_default(self) -> None:
+        schedule = Schedule.from_config(SECTION)
+
+        self.assertEqual(
+            [("core", 900), ("core", 900), ("core", 900), ("lab", 60), ("default", 86400)],
+            [
+                (group.name, group.interval)
+                for group in map(
+                    schedule.group_for, ("hq-core-sw1", "dc1-edge1", "lab-core-1", "lab-sw1", "hq-acc-sw7")
+                )
+            ],
+        )
+
+    def test_malformed_sections_are_rejected(self) -> None:
+        for section in (
+            {"default_interval": 0},
+            {"jitter": 2},
+            {"groups": {"core": 900}},
+            {"groups": [{"interval": 900}]},
+            {"groups": [{"interval": "15m", "devices": ["*"]}]},
+        ):
+            with self.subTest(section=section), self.assertRaises(ValueError):
+                Schedule.from_config(section)
+
+
+class DeviceSchedulerTests(unittest.TestCase):
+    def test_jittered_phases_then_fixed_cadence(self) -> None:
+        names = ["hq-core-sw1", "hq-core-sw2", "hq-acc-sw1"]
+        scheduler = DeviceScheduler(Schedule.from_config(SECTION), names, start=0.0, rng=random.Random(3))
+
+        first = scheduler.next_due()
+        self.assertLess(first, 450)
+        runs: dict[str, list[float]] = {name: [] for name in names}
+        while scheduler.next_due() < 3600:
+            now = scheduler.next_due()
+            due, missed = scheduler.pop_due(now)
+            self.assertEqual(0, missed)
+            for name in due:
+                runs[name].append(now)
+
+        self.assertEqual([4, 4], [len(runs[name]) for name in names[:2]])
+        self.assertNotEqual(runs["hq-core-sw1"][0], runs["hq-core-sw2"][0])
+        self.assertEqual({900.0}, {round(b - a, 6) for a, b in zip(runs["hq-core-sw1"], runs["hq-core-sw1"][1:])})
+        self.assertEqual(86400, scheduler.intervals["hq-acc-sw1"])
+
+    def test_late_devices_run_once_and_skip_missed_slots(self) -> None:
+        scheduler = DeviceScheduler(Schedule(default_interval=60, jitter=0), ["a", "b"], start=0.0)
+
+        self.assertEqual((["a", "b"], 0), scheduler.pop_due(0.0))
+        due, missed = scheduler.pop_due(250.0)
+
+        self.assertEqual((["a", "b"], 6), (sorted(due), missed))
+        self.assertEqual(300.0, scheduler.next_due())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import hashlib
+import sys
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from app.core.storage import BackupStream, open_backup_stream
+
+
+class BackupStreamTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = TemporaryDirectory()
+        self.tmp_path = Path(self._tmp.name)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_commit_publishes_file_with_running_hash(self) -> None:
+        target = self.tmp_path / "mikrotik" / "mt1" / "2026-01-01_000000_export.rsc"
+        with open_backup_stream(self.tmp_path, "mikrotik", "mt1", target.name, {"device": "mt1"}) as stream:
+            stream.write("/interface bridge\n")
+            stream.write("add name=bridge1\n")
+            self.assertFalse(target.exists())
+            saved = stream.commit()
+
+        content = target.read_bytes()
+        self.assertEqual(target, saved)
+        self.assertTrue(content.startswith(b"# backup_metadata\n# device: mt1\n"))
+        self.assertTrue(content.endswith(b"add name=bridge1\n"))
+        self.assertEqual(hashlib.sha256(content).hexdigest(), stream.sha256)
+        self.assertEqual(len(content), stream.size)
+        self.assertEqual([target], list(target.parent.iterdir()))
+
+    def test_failure_before_commit_leaves_no_files(self) -> None:
+        target = self.tmp_path / "sw1" / "running-config.txt"
+
+        with self.assertRaises(ConnectionError):
+            with BackupStream(target) as stream:
+                stream.write("partial output")
+                raise ConnectionError("channel closed")
+
+        self.assertEqual([], list(target.parent.iterdir()))
+
+    def test_commit_refuses_to_overwrite(self) -> None:
+        target = self.tmp_path / "running-config.txt"
+        target.write_text("existing", encoding="utf-8")
+
+        with BackupStream(target) as stream:
+            stream.write("new")
+            with self.assertRaises(FileExistsError):
+                stream.commit()
+
+        self.assertEqual("existing", target.read_text(encoding="utf-8"))
+        self.assertEqual([target], list(self.tmp_path.iterdir()))
+
+
+if __name__ == "__main__":
+    unittest.main()
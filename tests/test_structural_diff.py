@@ -0,0 +1,94 @@
+import sys
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from app.common.diff import evaluate_change
+from app.common.structural_diff import GLOBAL_SECTION, cisco_blocks, mikrotik_blocks, structural_diff
+from app.core.normalize import normalize_mikrotik_export
+
+CISCO = [
+    "hostname sw1",
+    "!",
+    "interface Gi1/0/1",
+    " switchport mode access",
+    " switchport access vlan 10",
+    "!",
+    "interface Gi1/0/2",
+    " switchport mode access",
+    " switchport access vlan 20",
+    "!",
+    "banner motd ^C",
+    "Authorized access only",
+    "^C",
+    "ip route 0.0.0.0 0.0.0.0 10.0.0.1",
+    "end",
+]
+
+
+class StructuralDiffTests(unittest.TestCase):
+    def test_cisco_blocks_follow_indentation_and_banners(self) -> None:
+        blocks = cisco_blocks(CISCO)
+
+        self.assertEqual(
+            ["hostname sw1", "interface Gi1/0/1", "interface Gi1/0/2", "banner motd ^C",
+             "ip route 0.0.0.0 0.0.0.0 10.0.0.1", "end"],
+            [block.header for block in blocks],
+        )
+        self.assertEqual(3, len(blocks[1].lines))
+        self.assertEqual(3, len(blocks[3].lines))
+        self.assertEqual(GLOBAL_SECTION, blocks[0].section)
+        self.assertEqual("interface Gi1/0/2", blocks[2].section)
+
+    def test_moved_stanza_is_not_a_change(self) -> None:
+        moved = CISCO[:2] + CISCO[6:10] + CISCO[2:6] + CISCO[10:]
+
+        result = structural_diff(CISCO, moved, cisco_blocks)
+
+        self.assertEqual([], result.lines)
+        self.assertEqual({}, result.sections)
+
+    def test_changes_are_counted_per_section_with_file_line_numbers(self) -> None:
+        changed = list(CISCO)
+        changed[8] = " switchport access vlan 30"
+        changed[0] = "hostname sw2"
+        changed[13:13] = ["interface Vlan10", " ip address 10.0.0.2 255.255.255.0"]
+
+        result = structural_diff(CISCO, changed, cisco_blocks, "a", "b")
+
+        self.assertEqual(
+            {GLOBAL_SECTION: (1, 1), "interface Gi1/0/2": (1, 1), "interface Vlan10": (2, 0)}, result.sections
+        )
+        self.assertEqual((4, 2), (result.added, result.removed))
+        self.assertEqual(["--- a", "+++ b"], result.lines[:2])
+        self.assertIn("@@ -7,3 +7,3 @@ interface Gi1/0/2", result.lines)
+        self.assertIn("@@ -13,0 +14,2 @@ interface Vlan10", result.lines)
+        self.assertLess(result.lines.index("-hostname sw1"), result.lines.index("+hostname sw2"))
+
+    def test_mikrotik_sections_through_evaluate_change(self) -> None:
+        before = "# model = RB4011\n/ip address\nadd address=10.0.0.1/24\n/ip route\nadd gateway=10.0.0.254\n"
+        after = "# model = RB4011\n/ip address\nadd address=10.0.0.2/24\n/ip route\nadd gateway=10.0.0.254\n"
+        with TemporaryDirectory() as tmp:
+            device_dir = Path(tmp) / "mt1"
+            device_dir.mkdir()
+            (device_dir / "2026-01-01_000000_export.rsc").write_text(before, encoding="utf-8")
+            evaluate_change(device_dir / "2026-01-01_000000_export.rsc", "*_export.rsc", normalize_mikrotik_export)
+            current = device_dir / "2026-01-02_000000_export.rsc"
+            current.write_text(after, encoding="utf-8")
+
+            outcome = evaluate_change(
+                current, "*_export.rsc", normalize_mikrotik_export, block_parser=mikrotik_blocks
+            )
+
+        self.assertTrue(outcome.config_changed)
+        self.assertEqual({"/ip address": (1, 1)}, outcome.section_changes)
+        self.assertIn("@@ -2,2 +2,2 @@ /ip address", outcome.diff_text)
+
+
+if __name__ == "__main__":
+    unittest.main()